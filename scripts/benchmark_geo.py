@@ -0,0 +1,84 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Compare the vectorized geospatial parsing of `superset.utils.geo` with applying
+python-geohash and geopy row by row, as the post-processing operators and the
+deck.gl visualizations used to.
+
+    python scripts/benchmark_geo.py --rows 1000000
+"""
+import argparse
+import time
+from typing import Any, Callable
+
+import geohash
+import numpy as np
+import pandas as pd
+from geopy.point import Point
+
+from superset.utils import geo
+
+
+def timed(label: str, func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40}{elapsed:>10.3f}s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    latitudes = rng.uniform(-90, 90, args.rows)
+    longitudes = rng.uniform(-180, 180, args.rows)
+    df = pd.DataFrame({"latitude": latitudes, "longitude": longitudes})
+    codes = pd.Series(geo.geohash_encode(latitudes, longitudes))
+    points = pd.Series(
+        [f"{lat:.6f}, {lon:.6f}" for lat, lon in zip(latitudes, longitudes)]
+    )
+
+    print(f"{args.rows} rows")
+    for label, row_by_row, vectorized in [
+        (
+            "geohash encode",
+            lambda: df.apply(
+                lambda row: geohash.encode(row["latitude"], row["longitude"]), axis=1
+            ),
+            lambda: geo.geohash_encode(df["latitude"], df["longitude"]),
+        ),
+        (
+            "geohash decode",
+            lambda: codes.apply(geohash.decode),
+            lambda: geo.geohash_decode(codes),
+        ),
+        (
+            "delimited points",
+            lambda: points.apply(lambda point: tuple(Point(point))),
+            lambda: geo.parse_points(points),
+        ),
+    ]:
+        before = timed(f"{label} (row by row)", row_by_row)
+        after = timed(f"{label} (vectorized)", vectorized)
+        print(f"{'speedup':<40}{before / after:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
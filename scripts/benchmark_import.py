@@ -0,0 +1,187 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Time the import of a synthetic dashboard export, in the original JSON format, into
+an empty metadata database and then over the objects it created.
+
+    python scripts/benchmark_import.py --datasets 20 --columns 100 --metrics 50 \\
+        --dashboards 100 --charts 70
+"""
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from flask_appbuilder import Model
+from sqlalchemy import create_engine
+
+from superset.app import create_app
+
+DATABASE_NAME = "benchmark"
+
+
+def timed(label: str, func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40}{elapsed:>10.3f}s")
+    return elapsed
+
+
+def build_bundle(  # pylint: disable=too-many-arguments
+    datasets: int, columns: int, metrics: int, dashboards: int, charts: int
+) -> str:
+    """Build an export in the format of Dashboard.export_dashboards"""
+    datasources: List[Dict[str, Any]] = []
+    for i in range(datasets):
+        datasources.append(
+            {
+                "__SqlaTable__": {
+                    "id": i + 1,
+                    "table_name": f"table_{i}",
+                    "params": json.dumps(
+                        {"remote_id": i + 1, "database_name": DATABASE_NAME}
+                    ),
+                    "columns": [
+                        {"__TableColumn__": {"column_name": f"column_{j}"}}
+                        for j in range(columns)
+                    ],
+                    "metrics": [
+                        {
+                            "__SqlMetric__": {
+                                "metric_name": f"metric_{j}",
+                                "expression": f"SUM(column_{j % columns})",
+                            }
+                        }
+                        for j in range(metrics)
+                    ],
+                }
+            }
+        )
+
+    exported_dashboards: List[Dict[str, Any]] = []
+    for i in range(dashboards):
+        slices = []
+        position: Dict[str, Any] = {}
+        for j in range(charts):
+            slice_id = i * charts + j + 1
+            slices.append(
+                {
+                    "__Slice__": {
+                        "id": slice_id,
+                        "slice_name": f"chart {slice_id}",
+                        "datasource_type": "table",
+                        "viz_type": "table",
+                        "params": json.dumps(
+                            {
+                                "remote_id": slice_id,
+                                "datasource_name": f"table_{slice_id % datasets}",
+                                "schema": None,
+                                "database_name": DATABASE_NAME,
+                            }
+                        ),
+                    }
+                }
+            )
+            position[f"CHART-{slice_id}"] = {
+                "type": "CHART",
+                "id": f"CHART-{slice_id}",
+                "children": [],
+                "meta": {"chartId": slice_id, "width": 4, "height": 50},
+            }
+        exported_dashboards.append(
+            {
+                "__Dashboard__": {
+                    "id": i + 1,
+                    "dashboard_title": f"dashboard {i}",
+                    "position_json": json.dumps(position),
+                    "json_metadata": json.dumps({"remote_id": i + 1}),
+                    "slices": slices,
+                }
+            }
+        )
+
+    return json.dumps({"dashboards": exported_dashboards, "datasources": datasources})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--datasets", type=int, default=20)
+    parser.add_argument("--columns", type=int, default=100)
+    parser.add_argument("--metrics", type=int, default=50)
+    parser.add_argument("--dashboards", type=int, default=100)
+    parser.add_argument("--charts", type=int, default=70)
+    args = parser.parse_args()
+
+    app = create_app()
+    # the importers log every object
+    logging.disable(logging.INFO)
+    with app.app_context(), tempfile.TemporaryDirectory() as tmp_dir:
+        # pylint: disable=import-outside-toplevel
+        from superset import appbuilder, db
+        from superset.connectors.sqla.models import SqlaTable
+        from superset.dashboards.commands.importers.v0 import import_dashboards
+        from superset.models.core import Database
+        from superset.models.dashboard import Dashboard
+        from superset.models.slice import Slice
+
+        # import into an empty metadata database
+        engine = create_engine(
+            "sqlite:///" + os.path.join(tmp_dir, "superset.db"),
+            connect_args={"check_same_thread": False},
+        )
+        # the tables of the imported models, and of the permissions they create
+        Model.metadata.create_all(engine)
+        assert {Dashboard.__tablename__, SqlaTable.__tablename__} <= set(
+            engine.table_names()
+        )
+        db.session.remove()
+        db.session = db.create_scoped_session(options={"bind": engine, "binds": {}})
+        appbuilder.session = db.session
+        db.session.add(
+            Database(database_name=DATABASE_NAME, sqlalchemy_uri="sqlite://")
+        )
+        db.session.commit()
+
+        content = build_bundle(
+            args.datasets, args.columns, args.metrics, args.dashboards, args.charts
+        )
+        objects = args.datasets * (
+            1 + args.columns + args.metrics
+        ) + args.dashboards * (1 + args.charts)
+        print(f"{objects} objects")
+        timed("import", lambda: import_dashboards(db.session, content, import_time=1))
+        db.session.expunge_all()
+        timed(
+            "import over the existing objects",
+            lambda: import_dashboards(db.session, content, import_time=2),
+        )
+        print(
+            "{} dashboards, {} charts and {} datasets imported".format(
+                db.session.query(Dashboard).count(),
+                db.session.query(Slice).count(),
+                db.session.query(SqlaTable).count(),
+            )
+        )
+        db.session.remove()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Compare running chart post processing pipelines through the planner of
+`superset.common.post_processing` with applying their operations one after
+another.
+
+    python scripts/benchmark_post_processing.py --rows 1000000
+"""
+import argparse
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from superset.app import create_app
+
+PIPELINES: Dict[str, List[Dict[str, Any]]] = {
+    "time series comparison": [
+        {
+            "operation": "cum",
+            "options": {"columns": {"m0": "m0_cum"}, "operator": "sum"},
+        },
+        {"operation": "diff", "options": {"columns": {"m1": "m1_diff"}}},
+        {
+            "operation": "rolling",
+            "options": {
+                "columns": {"m2": "m2_rolling"},
+                "rolling_type": "mean",
+                "window": 7,
+            },
+        },
+        {"operation": "select", "options": {"exclude": ["m3", "m4"]}},
+        {"operation": "sort", "options": {"columns": {"m0_cum": False}}},
+    ],
+    "top categories": [
+        {"operation": "sort", "options": {"columns": {"category": True, "m0": False}}},
+        {
+            "operation": "select",
+            "options": {
+                "columns": ["category", "m0", "m1"],
+                "rename": {"m0": "value"},
+            },
+        },
+    ],
+    "cumulative metrics": [
+        {
+            "operation": "cum",
+            "options": {
+                "columns": {f"m{i}": f"m{i}" for i in range(5)},
+                "operator": "sum",
+            },
+        },
+        {
+            "operation": "rolling",
+            "options": {
+                "columns": {f"m{i}": f"m{i}_rolling" for i in range(5, 10)},
+                "rolling_type": "sum",
+                "window": 30,
+                "min_periods": 30,
+            },
+        },
+    ],
+}
+
+
+def timed(label: str, func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40}{elapsed:>10.3f}s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({f"m{i}": rng.normal(size=args.rows) for i in range(10)})
+    df["category"] = rng.choice([f"cat{i}" for i in range(100)], args.rows)
+    df["__timestamp"] = pd.date_range("2000-01-01", periods=args.rows, freq="min")
+
+    app = create_app()
+    with app.app_context():
+        # pylint: disable=import-outside-toplevel
+        from superset.common.post_processing import PostProcessingPipeline
+        from superset.utils import pandas_postprocessing
+
+        def sequential(post_processing: List[Dict[str, Any]]) -> pd.DataFrame:
+            result = df
+            for post_process in post_processing:
+                operation = getattr(pandas_postprocessing, post_process["operation"])
+                result = operation(result, **post_process["options"])
+            return result
+
+        print(f"{args.rows} rows")
+        for name, post_processing in PIPELINES.items():
+            before = timed(f"{name} (sequential)", lambda: sequential(post_processing))
+            # chart data requests hand over the frames they query to the planner
+            owned_df = df.copy()
+            after = timed(
+                f"{name} (planned)",
+                lambda: PostProcessingPipeline(post_processing).execute(
+                    owned_df, owned=True
+                ),
+            )
+            print(f"{'speedup':<40}{before / after:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
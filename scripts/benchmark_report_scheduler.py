@@ -0,0 +1,113 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Compare a tick of the report scheduler, which only loads the report schedules
+that are due according to their `next_eval_dttm`, with loading every active
+schedule and parsing all of their crontabs.
+
+    python scripts/benchmark_report_scheduler.py --schedules 10000 100000
+"""
+import argparse
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterator
+from unittest.mock import patch
+
+import croniter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from superset.app import create_app
+
+
+def timed(label: str, func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40}{elapsed:>10.3f}s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--schedules", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        # pylint: disable=import-outside-toplevel
+        from superset.models.reports import ReportSchedule, ReportScheduleType
+        from superset.tasks import scheduler
+
+        def scan_all(session: Session) -> None:
+            utc_now = datetime.utcnow()
+            start_at = utc_now - timedelta(seconds=1)
+            stop_at = utc_now + timedelta(seconds=10)
+            for report_schedule in (
+                session.query(ReportSchedule)
+                .filter(ReportSchedule.active.is_(True))
+                .all()
+            ):
+                crons = croniter.croniter(report_schedule.crontab, start_at)
+                for schedule in crons.all_next(datetime):
+                    if schedule >= stop_at:
+                        break
+
+        for count in args.schedules:
+            engine = create_engine("sqlite://")
+            ReportSchedule.metadata.create_all(
+                engine, tables=[ReportSchedule.__table__]
+            )
+            session = sessionmaker(bind=engine)()
+            rng = random.Random(0)
+            session.bulk_insert_mappings(
+                ReportSchedule,
+                [
+                    {
+                        "type": ReportScheduleType.REPORT,
+                        "name": f"report {i}",
+                        "active": True,
+                        # daily reports, about count / 1440 of them are due each tick
+                        "crontab": f"{rng.randrange(60)} {rng.randrange(24)} * * *",
+                    }
+                    for i in range(count)
+                ],
+            )
+            session.commit()
+
+            @contextmanager
+            def session_scope(nullpool: bool) -> Iterator[Session]:
+                yield session
+                session.commit()
+
+            with patch.object(scheduler, "session_scope", session_scope), patch.object(
+                scheduler.execute, "apply_async"
+            ), patch.object(scheduler.execute_alerts, "apply_async"):
+                print(f"{count} report schedules")
+                before = timed("scan all schedules", lambda: scan_all(session))
+                # the first tick computes the next evaluation time of every schedule
+                timed("first indexed tick", scheduler.scheduler.run)
+                session.expunge_all()
+                after = timed("indexed tick", scheduler.scheduler.run)
+                print(f"{'speedup':<40}{before / after:>10.1f}x")
+            session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,7 @@ import { shallow } from 'enzyme';
 import sinon from 'sinon';
 import thunk from 'redux-thunk';
 import configureStore from 'redux-mock-store';
+import fetchMock from 'fetch-mock';
 
 import QueryAutoRefresh from 'src/SqlLab/components/QueryAutoRefresh';
 import { initialState, runningQuery } from './fixtures';
@@ -68,4 +69,25 @@ describe('QueryAutoRefresh', () => {
     });
     expect(spy.callCount).toBe(1);
   });
+
+  it('polls the queries feed with the version of the previous poll', () => {
+    const feedEndpoint = 'glob:*/superset/queries_feed/*';
+    fetchMock.get(
+      feedEndpoint,
+      { version: 3, queries: {} },
+      { overwriteRoutes: true },
+    );
+    wrapper = getWrapper();
+    wrapper.instance().stopTimer();
+    return wrapper
+      .instance()
+      .stopwatch()
+      .then(() => wrapper.instance().stopwatch())
+      .then(() => {
+        const calls = fetchMock.calls(feedEndpoint);
+        expect(calls).toHaveLength(2);
+        expect(calls[0][0]).not.toContain('version=');
+        expect(calls[1][0]).toContain('version=3');
+      });
+  });
 });
@@ -75,26 +75,33 @@ class QueryAutoRefresh extends React.PureComponent {
   }
 
   stopwatch() {
-    // only poll /superset/queries/ if there are started or running queries
+    // only poll /superset/queries_feed/ if there are started or running queries
     if (this.shouldCheckForQueries()) {
-      SupersetClient.get({
-        endpoint: `/superset/queries/${
-          this.props.queriesLastUpdate - QUERY_UPDATE_BUFFER_MS
-        }`,
+      const lastUpdatedMs =
+        this.props.queriesLastUpdate - QUERY_UPDATE_BUFFER_MS;
+      // with the version of the previous poll, the server can tell that
+      // nothing changed without querying the metadata database
+      const version =
+        this.version === undefined || this.version === null
+          ? ''
+          : `&version=${this.version}`;
+      return SupersetClient.get({
+        endpoint: `/superset/queries_feed/?last_updated_ms=${lastUpdatedMs}${version}`,
         timeout: QUERY_TIMEOUT_LIMIT,
       })
         .then(({ json }) => {
-          if (Object.keys(json).length > 0) {
-            this.props.actions.refreshQueries(json);
+          this.version = json.version;
+          if (Object.keys(json.queries).length > 0) {
+            this.props.actions.refreshQueries(json.queries);
           }
           this.setState({ offline: false });
         })
         .catch(() => {
           this.setState({ offline: true });
         });
-    } else {
-      this.setState({ offline: false });
     }
+    this.setState({ offline: false });
+    return Promise.resolve();
   }
 
   render() {
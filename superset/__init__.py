@@ -15,6 +15,13 @@
 # specific language governing permissions and limitations
 # under the License.
 """Package's main module!"""
+from superset.utils.startup_profile import startup_profiler  # isort:skip
+
+# time the imports of the package too when profiling the start-up, see
+# STARTUP_PROFILE
+startup_profiler.start()
+
+# pylint: disable=wrong-import-order,wrong-import-position
 from flask import current_app, Flask
 from werkzeug.local import LocalProxy
 
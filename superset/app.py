@@ -45,11 +45,12 @@ from superset.security import SupersetSecurityManager
 from superset.typing import FlaskResponse
 from superset.utils.core import pessimistic_connection_handling
 from superset.utils.log import DBEventLogger, get_event_logger_from_cfg_value
+from superset.utils.startup_profile import startup_profiler
 
 logger = logging.getLogger(__name__)
 
 
-def create_app() -> Flask:
+def create_app(celery_worker: bool = False) -> Flask:
     app = Flask(__name__)
 
     try:
@@ -58,6 +59,7 @@ def create_app() -> Flask:
         app.config.from_object(config_module)
 
         app_initializer = app.config.get("APP_INITIALIZER", SupersetAppInitializer)(app)
+        app_initializer.celery_worker = celery_worker
         app_initializer.init_app()
 
         return app
@@ -81,6 +83,12 @@ class SupersetAppInitializer:
         self.flask_app = app
         self.config = app.config
         self.manifest: Dict[Any, Any] = {}
+        self.celery_worker = False
+        # already timing the imports of the superset package when enabled by the
+        # SUPERSET_STARTUP_PROFILE environment variable
+        self.startup_profiler = startup_profiler
+        if app.config["STARTUP_PROFILE"]:
+            self.startup_profiler.enabled = True
 
     def pre_init(self) -> None:
         """
@@ -129,13 +137,6 @@ class SupersetAppInitializer:
         from superset.annotation_layers.annotations.api import AnnotationRestApi
         from superset.cachekeys.api import CacheRestApi
         from superset.charts.api import ChartRestApi
-        from superset.connectors.druid.views import (
-            Druid,
-            DruidClusterModelView,
-            DruidColumnInlineView,
-            DruidDatasourceModelView,
-            DruidMetricInlineView,
-        )
         from superset.connectors.sqla.views import (
             RowLevelSecurityFiltersModelView,
             SqlMetricInlineView,
@@ -173,6 +174,7 @@ class SupersetAppInitializer:
             DashboardModelViewAsync,
         )
         from superset.views.database.views import (
+            ColumnarToDatabaseView,
             CsvToDatabaseView,
             DatabaseView,
             ExcelToDatabaseView,
@@ -282,6 +284,7 @@ class SupersetAppInitializer:
         #
         appbuilder.add_view_no_menu(Api)
         appbuilder.add_view_no_menu(CssTemplateAsyncModelView)
+        appbuilder.add_view_no_menu(ColumnarToDatabaseView)
         appbuilder.add_view_no_menu(CsvToDatabaseView)
         appbuilder.add_view_no_menu(ExcelToDatabaseView)
         appbuilder.add_view_no_menu(Dashboard)
@@ -372,6 +375,18 @@ class SupersetAppInitializer:
                 )
         except ImportError:
             pass
+        if self.config["COLUMNAR_EXTENSIONS"].intersection(
+            self.config["ALLOWED_EXTENSIONS"]
+        ):
+            appbuilder.add_link(
+                "Upload a Columnar File",
+                label=__("Upload a Columnar File"),
+                href="/columnartodatabaseview/form",
+                icon="fa-upload",
+                category="Data",
+                category_label=__("Data"),
+                category_icon="fa-wrench",
+            )
 
         #
         # Conditionally setup log views
@@ -438,6 +453,14 @@ class SupersetAppInitializer:
         # Conditionally setup Druid Views
         #
         if self.config["DRUID_IS_ACTIVE"]:
+            from superset.connectors.druid.views import (
+                Druid,
+                DruidClusterModelView,
+                DruidColumnInlineView,
+                DruidDatasourceModelView,
+                DruidMetricInlineView,
+            )
+
             appbuilder.add_separator("Data")
             appbuilder.add_view(
                 DruidDatasourceModelView,
@@ -485,40 +508,62 @@ class SupersetAppInitializer:
         """
         Runs init logic in the context of the app
         """
-        self.configure_feature_flags()
-        self.configure_fab()
-        self.configure_url_map_converters()
-        self.configure_data_sources()
-        self.configure_auth_provider()
+        self.run_steps(
+            self.configure_feature_flags,
+            self.configure_fab,
+            self.configure_url_map_converters,
+            self.configure_data_sources,
+            self.configure_auth_provider,
+        )
 
         # Hook that provides administrators a handle on the Flask APP
         # after initialization
         flask_app_mutator = self.config["FLASK_APP_MUTATOR"]
         if flask_app_mutator:
-            flask_app_mutator(self.flask_app)
+            with self.startup_profiler.step("FLASK_APP_MUTATOR"):
+                flask_app_mutator(self.flask_app)
 
-        self.init_views()
+        if self.celery_worker and not self.config["CELERY_WORKER_INIT_VIEWS"]:
+            logger.info("Skipping the registration of the views on a Celery worker")
+            return
+        self.run_steps(self.init_views)
 
     def init_app(self) -> None:
         """
         Main entry point which will delegate to other methods in
         order to fully init the app
         """
-        self.pre_init()
-        self.setup_db()
-        self.configure_celery()
-        self.setup_event_logger()
-        self.setup_bundle_manifest()
-        self.register_blueprints()
-        self.configure_wtf()
-        self.configure_logging()
-        self.configure_middlewares()
-        self.configure_cache()
+        self.startup_profiler.start()
+        try:
+            self.run_steps(
+                self.pre_init,
+                self.setup_db,
+                self.configure_celery,
+                self.setup_event_logger,
+                self.setup_bundle_manifest,
+                self.register_blueprints,
+                self.configure_wtf,
+                self.configure_logging,
+                self.configure_middlewares,
+                self.configure_cache,
+            )
 
-        with self.flask_app.app_context():  # type: ignore
-            self.init_app_in_ctx()
+            with self.flask_app.app_context():  # type: ignore
+                self.init_app_in_ctx()
+
+            self.run_steps(self.post_init)
+        finally:
+            self.startup_profiler.stop()
+
+        self.startup_profiler.log_report(self.config["STARTUP_PROFILE_MODULES"])
 
-        self.post_init()
+    def run_steps(self, *steps: Callable[[], None]) -> None:
+        """
+        Runs init steps in order, timing them when STARTUP_PROFILE is enabled
+        """
+        for step in steps:
+            with self.startup_profiler.step(step.__name__):
+                step()
 
     def configure_auth_provider(self) -> None:
         machine_auth_provider_factory.init_app(self.flask_app)
@@ -17,12 +17,20 @@
 import json
 import logging
 from datetime import datetime
-from io import BytesIO
+from itertools import chain
 from typing import Any, Dict
 from zipfile import ZipFile
 
 import simplejson
-from flask import g, make_response, redirect, request, Response, send_file, url_for
+from flask import (
+    g,
+    make_response,
+    redirect,
+    request,
+    Response,
+    stream_with_context,
+    url_for,
+)
 from flask_appbuilder.api import expose, protect, rison, safe
 from flask_appbuilder.models.sqla.interface import SQLAInterface
 from flask_babel import gettext as _, ngettext
@@ -61,12 +69,13 @@ from superset.charts.schemas import (
     thumbnail_query_schema,
 )
 from superset.commands.exceptions import CommandInvalidError
+from superset.commands.export import stream_zip
 from superset.commands.importers.v1.utils import remove_root
 from superset.constants import RouteMethod
 from superset.exceptions import SupersetSecurityException
 from superset.extensions import event_logger
 from superset.models.slice import Slice
-from superset.tasks.thumbnails import cache_chart_thumbnail
+from superset.tasks.thumbnails import schedule_chart_thumbnail
 from superset.utils.core import ChartDataResultFormat, json_int_dttm_ser
 from superset.utils.screenshots import ChartScreenshot
 from superset.utils.urls import get_url_path
@@ -572,7 +581,7 @@ class ChartRestApi(BaseSupersetModelRestApi):
             500:
               $ref: '#/components/responses/500'
         """
-        rison_dict = kwargs["rison"]
+        rison_dict: Dict[str, Any] = kwargs["rison"]
         window_size = rison_dict.get("window_size") or (800, 600)
 
         # Don't shrink the image if thumb_size is not specified
@@ -591,14 +600,14 @@ class ChartRestApi(BaseSupersetModelRestApi):
 
         def trigger_celery() -> WerkzeugResponse:
             logger.info("Triggering screenshot ASYNC")
-            kwargs = {
-                "url": chart_url,
-                "digest": chart.digest,
-                "force": True,
-                "window_size": window_size,
-                "thumb_size": thumb_size,
-            }
-            cache_chart_thumbnail.delay(**kwargs)
+            schedule_chart_thumbnail(
+                chart_url,
+                chart.digest,
+                force=True,
+                countdown=0,
+                window_size=window_size,
+                thumb_size=thumb_size,
+            )
             return self.response(
                 202, cache_key=cache_key, chart_url=chart_url, image_url=image_url
             )
@@ -709,7 +718,7 @@ class ChartRestApi(BaseSupersetModelRestApi):
             logger.info(
                 "Triggering thumbnail compute (chart id: %s) ASYNC", str(chart.id)
             )
-            cache_chart_thumbnail.delay(url, chart.digest, force=True)
+            schedule_chart_thumbnail(url, chart.digest, force=True, countdown=0)
             return self.response(202, message="OK Async")
         # fetch the chart screenshot using the current user and cache if set
         screenshot = ChartScreenshot(url, chart.digest).get_from_cache(
@@ -720,7 +729,7 @@ class ChartRestApi(BaseSupersetModelRestApi):
             logger.info(
                 "Triggering thumbnail compute (chart id: %s) ASYNC", str(chart.id)
             )
-            cache_chart_thumbnail.delay(url, chart.digest, force=True)
+            schedule_chart_thumbnail(url, chart.digest, countdown=0)
             return self.response(202, message="OK Async")
         # If digests
         if chart.digest != digest:
@@ -772,23 +781,18 @@ class ChartRestApi(BaseSupersetModelRestApi):
         requested_ids = kwargs["rison"]
         timestamp = datetime.now().strftime("%Y%m%dT%H%M%S")
         root = f"chart_export_{timestamp}"
-        filename = f"{root}.zip"
-
-        buf = BytesIO()
-        with ZipFile(buf, "w") as bundle:
-            try:
-                for file_name, file_content in ExportChartsCommand(requested_ids).run():
-                    with bundle.open(f"{root}/{file_name}", "w") as fp:
-                        fp.write(file_content.encode())
-            except ChartNotFoundError:
-                return self.response_404()
-        buf.seek(0)
-
-        return send_file(
-            buf,
+
+        contents = ExportChartsCommand(requested_ids).run()
+        try:
+            # the charts are validated before their first file is exported
+            first_file = next(contents)
+        except ChartNotFoundError:
+            return self.response_404()
+
+        return Response(
+            stream_with_context(stream_zip(root, chain([first_file], contents))),
             mimetype="application/zip",
-            as_attachment=True,
-            attachment_filename=filename,
+            headers=generate_download_headers("zip", root),
         )
 
     @expose("/favorite_status/", methods=["GET"])
@@ -16,10 +16,12 @@
 # specific language governing permissions and limitations
 # under the License.
 import logging
+import time
 from datetime import datetime, timedelta
+from functools import partial
 from subprocess import Popen
 from sys import stdout
-from typing import Any, Dict, List, Type, Union
+from typing import Any, Dict, List, Optional, Type, Union
 
 import click
 import yaml
@@ -181,6 +183,15 @@ def set_database_uri(database_name: str, uri: str) -> None:
     utils.get_or_create_db(database_name, uri)
 
 
+def _print_refresh_progress(
+    cluster_name: str, start_time: float, done: int, total: int
+) -> None:
+    print(
+        f"Merged {done}/{total} datasources of cluster [{cluster_name}] "
+        f"in {time.time() - start_time:.1f}s"
+    )
+
+
 @superset.command()
 @with_appcontext
 @click.option(
@@ -196,20 +207,44 @@ def set_database_uri(database_name: str, uri: str) -> None:
     default=False,
     help="Specify using 'merge' property during operation. " "Default value is False.",
 )
-def refresh_druid(datasource: str, merge: bool) -> None:
+@click.option(
+    "--concurrency",
+    "-c",
+    type=int,
+    help="Number of datasources whose metadata is fetched at once, "
+    "defaults to DRUID_METADATA_REFRESH_CONCURRENCY",
+)
+@click.option(
+    "--batch-size",
+    "-b",
+    type=int,
+    help="Number of datasources merged per commit, "
+    "defaults to DRUID_METADATA_REFRESH_BATCH_SIZE",
+)
+def refresh_druid(
+    datasource: str, merge: bool, concurrency: Optional[int], batch_size: Optional[int],
+) -> None:
     """Refresh druid datasources"""
     session = db.session()
     from superset.connectors.druid.models import DruidCluster
 
     for cluster in session.query(DruidCluster).all():
+        cluster_name = cluster.cluster_name
         try:
-            cluster.refresh_datasources(datasource_name=datasource, merge_flag=merge)
+            cluster.refresh_datasources(
+                datasource_name=datasource,
+                merge_flag=merge,
+                concurrency=concurrency,
+                batch_size=batch_size,
+                progress=partial(_print_refresh_progress, cluster_name, time.time()),
+            )
         except Exception as ex:  # pylint: disable=broad-except
             print("Error while processing cluster '{}'\n{}".format(cluster, str(ex)))
             logger.exception(ex)
+            session.rollback()
         cluster.metadata_last_refreshed = datetime.now()
-        print("Refreshed metadata from cluster " "[" + cluster.cluster_name + "]")
-    session.commit()
+        session.commit()
+        print("Refreshed metadata from cluster " "[" + cluster_name + "]")
 
 
 @superset.command()
@@ -388,22 +423,61 @@ def export_datasource_schema(back_references: bool) -> None:
 
 @superset.command()
 @with_appcontext
-def update_datasources_cache() -> None:
+@click.option(
+    "--concurrency",
+    "-c",
+    type=int,
+    help="Number of databases refreshed at once, "
+    "defaults to DATASOURCES_CACHE_REFRESH_CONCURRENCY",
+)
+@click.option(
+    "--timeout",
+    "-t",
+    type=int,
+    help="Time in seconds after which the refresh of a database is abandoned, "
+    "defaults to DATASOURCES_CACHE_REFRESH_TIMEOUT",
+)
+@click.option(
+    "--asynchronous",
+    "-a",
+    is_flag=True,
+    default=False,
+    help="Refresh the databases in the celery workers",
+)
+def update_datasources_cache(
+    concurrency: Optional[int], timeout: Optional[int], asynchronous: bool
+) -> None:
     """Refresh sqllab datasources cache"""
     from superset.models.core import Database
-
-    for database in db.session.query(Database).all():
-        if database.allow_multi_schema_metadata_fetch:
-            print("Fetching {} datasources ...".format(database.name))
-            try:
-                database.get_all_table_names_in_database(
-                    force=True, cache=True, cache_timeout=24 * 60 * 60
-                )
-                database.get_all_view_names_in_database(
-                    force=True, cache=True, cache_timeout=24 * 60 * 60
-                )
-            except Exception as ex:  # pylint: disable=broad-except
-                print("{}".format(str(ex)))
+    from superset.tasks import cache
+
+    databases = {
+        database.id: database.name
+        for database in db.session.query(Database).all()
+        if database.allow_multi_schema_metadata_fetch
+    }
+    if asynchronous:
+        for database_id, database_name in databases.items():
+            cache.update_datasources_cache.apply_async(
+                (database_id,),
+                soft_time_limit=timeout
+                or app.config["DATASOURCES_CACHE_REFRESH_TIMEOUT"],
+            )
+            print("Queued the refresh of {} datasources".format(database_name))
+        return
+
+    print("Fetching the datasources of {} databases ...".format(len(databases)))
+    results = cache.refresh_datasources_caches(
+        list(databases), concurrency=concurrency, timeout=timeout
+    )
+    for database_id, result in results.items():
+        if "error" in result:
+            print("{}: {}".format(databases[database_id], result["error"]))
+        else:
+            print(
+                "{database}: {tables} tables and {views} views in {schemas} schemas, "
+                "{duration:.1f}s".format(**result)
+            )
 
 
 @superset.command()
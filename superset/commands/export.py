@@ -16,9 +16,12 @@
 # under the License.
 # isort:skip_file
 
+import io
+import logging
 from datetime import datetime
 from datetime import timezone
-from typing import Iterator, List, Tuple
+from typing import cast, IO, Iterator, List, Tuple
+from zipfile import ZipFile
 
 import yaml
 from flask_appbuilder import Model
@@ -30,6 +33,8 @@ from superset.utils.dict_import_export import EXPORT_VERSION
 
 METADATA_FILE_NAME = "metadata.yaml"
 
+logger = logging.getLogger(__name__)
+
 
 class ExportModelsCommand(BaseCommand):
 
@@ -67,3 +72,50 @@ class ExportModelsCommand(BaseCommand):
         self._models = self.dao.find_by_ids(self.model_ids)
         if len(self._models) != len(self.model_ids):
             raise self.not_found()
+
+
+class ZipStream(io.RawIOBase):
+    """An unseekable file that keeps what is written to it until it is read"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:  # type: ignore
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def read_written(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_zip(root: str, contents: Iterator[Tuple[str, str]]) -> Iterator[bytes]:
+    """
+    Write the files of an export to a ZIP archive, yielding the archive as it is
+    written so that only one file is held in memory at a time.
+
+    If a file fails to export, the error is raised before the central directory
+    is yielded: the response streaming the archive is aborted, and the part of it
+    already sent can't be read as a ZIP file.
+
+    :param root: The directory of the files in the archive
+    :param contents: The names and contents of the files
+    :return: The bytes of the archive
+    """
+    stream = ZipStream()
+    with ZipFile(cast(IO[bytes], stream), "w") as bundle:
+        try:
+            for file_name, file_content in contents:
+                with bundle.open(f"{root}/{file_name}", "w") as fp:
+                    fp.write(file_content.encode())
+                yield stream.read_written()
+        except Exception:
+            logger.exception("Error exporting %s, the archive is incomplete", root)
+            raise
+    # the central directory
+    yield stream.read_written()
@@ -0,0 +1,128 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Cached retrieval of the distinct values of a datasource column, used to
+populate filter widgets.
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+from superset import app, is_feature_enabled
+from superset.connectors.base.models import BaseDatasource
+from superset.extensions import cache_manager, security_manager
+from superset.stats_logger import BaseStatsLogger
+from superset.utils.hashing import md5_sha_from_dict
+
+config = app.config
+stats_logger: BaseStatsLogger = config["STATS_LOGGER"]
+logger = logging.getLogger(__name__)
+
+
+def get_cache_timeout(datasource: BaseDatasource) -> int:
+    if config["FILTER_SELECT_CACHE_TIMEOUT"] is not None:
+        return config["FILTER_SELECT_CACHE_TIMEOUT"]
+    if datasource.cache_timeout is not None:
+        return datasource.cache_timeout
+    if (
+        hasattr(datasource, "database") and datasource.database.cache_timeout
+    ) is not None:
+        return datasource.database.cache_timeout
+    return config["CACHE_DEFAULT_TIMEOUT"]
+
+
+def get_cache_key(  # pylint: disable=too-many-arguments
+    datasource: BaseDatasource,
+    column_name: str,
+    limit: Optional[int] = None,
+    search: Optional[str] = None,
+    offset: int = 0,
+    sample_percent: Optional[float] = None,
+) -> str:
+    """
+    Build the cache key of a distinct values lookup. Besides the arguments of
+    the lookup the key covers the fetch values predicate, the row level security
+    filters applied for the current user and, when any of those are templated
+    with `ExtraCache` calls, the keys those calls add.
+    """
+    cache_dict: Dict[str, Any] = {
+        "datasource": datasource.uid,
+        "column": column_name,
+        "limit": limit,
+        "search": search,
+        "offset": offset,
+        "sample_percent": sample_percent,
+        "predicate": getattr(datasource, "fetch_values_predicate", None),
+        "changed_on": str(datasource.changed_on),
+        "rls": security_manager.get_rls_ids(datasource)
+        if is_feature_enabled("ROW_LEVEL_SECURITY") and datasource.is_rls_supported
+        else [],
+        "extra_cache_keys": datasource.get_values_extra_cache_keys(),
+    }
+    return f"distinct_values:{md5_sha_from_dict(cache_dict)}"
+
+
+def get_distinct_values(  # pylint: disable=too-many-arguments
+    datasource: BaseDatasource,
+    column_name: str,
+    limit: Optional[int] = None,
+    search: Optional[str] = None,
+    offset: int = 0,
+    force: bool = False,
+) -> List[Any]:
+    """
+    Return the distinct values of a column, served from the data cache when
+    possible.
+
+    :param datasource: The datasource to fetch the values from
+    :param column_name: The name of the column
+    :param limit: The maximum number of values to return, defaults to
+        `FILTER_SELECT_ROW_LIMIT`
+    :param search: Only return values starting with this prefix
+    :param offset: The number of values to skip, used for pagination
+    :param force: Whether to bypass the cache
+    :returns: The distinct values of the column
+    """
+    if limit is None:
+        limit = config["FILTER_SELECT_ROW_LIMIT"]
+    sample_percent = config["FILTER_SELECT_SAMPLE_PERCENT"]
+    cache_key = get_cache_key(
+        datasource, column_name, limit, search, offset, sample_percent
+    )
+    if cache_manager.data_cache and not force:
+        values = cache_manager.data_cache.get(cache_key)
+        if values is not None:
+            stats_logger.incr("distinct_values_loaded_from_cache")
+            return values
+
+    values = datasource.values_for_column(
+        column_name,
+        limit=limit,
+        search=search,
+        offset=offset,
+        sample_percent=sample_percent,
+    )
+    stats_logger.incr("distinct_values_loaded_from_source")
+    try:
+        cache_manager.data_cache.set(
+            cache_key, values, timeout=get_cache_timeout(datasource)
+        )
+    except Exception as ex:  # pylint: disable=broad-except
+        # cache.set call can fail if the backend is down or if
+        # the key is too large or whatever other reasons
+        logger.warning("Could not cache key %s", cache_key)
+        logger.exception(ex)
+    return values
@@ -0,0 +1,310 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Planning and execution of the post processing operations of a query object.
+
+The operations are validated before any of them runs, and consecutive
+operations are fused into single steps where that saves copying the frame:
+
+- column wise operations (`cum`, `diff` and `rolling`) that don't read each
+  other's outputs are computed on the source columns only, and their results
+  are added to the frame at once, in place when the frame isn't shared.
+- a `sort` followed by a `select` only sorts the selected columns, or takes
+  the selected columns in the order of the sorted keys when the keys aren't
+  selected.
+"""
+import inspect
+import logging
+import time
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Type
+
+import numpy as np
+from flask import current_app
+from flask_babel import gettext as _
+from pandas import DataFrame
+
+from superset.exceptions import QueryObjectValidationError
+from superset.stats_logger import BaseStatsLogger
+from superset.utils import pandas_postprocessing
+
+logger = logging.getLogger(__name__)
+
+POST_PROCESSING_OPERATIONS = (
+    "aggregate",
+    "boxplot",
+    "contribution",
+    "cum",
+    "diff",
+    "geodetic_parse",
+    "geohash_decode",
+    "geohash_encode",
+    "pivot",
+    "prophet",
+    "rolling",
+    "select",
+    "sort",
+)
+
+# operations that add columns computed from other columns, row by row
+COLUMN_WISE_OPERATIONS = tuple(pandas_postprocessing.COLUMN_WISE_FUNCTIONS)
+
+# operations that return a frame that doesn't share any data with their input
+# and may hence be modified in place
+NEW_FRAME_OPERATIONS = ("aggregate", "boxplot", "contribution", "pivot", "sort")
+
+Operation = Tuple[str, Dict[str, Any]]
+
+
+def _validate_columns(df: DataFrame, columns: Sequence[Any]) -> None:
+    if not all(column in df.columns for column in columns):
+        raise QueryObjectValidationError(
+            _("Referenced columns not available in DataFrame.")
+        )
+
+
+class PostProcessingStep:
+    """A step of a post processing plan, made of one or more operations"""
+
+    # the number of operations from which fusing them into this step pays off
+    min_operations = 1
+
+    def __init__(self, operations: List[Operation]) -> None:
+        self.operations = operations
+
+    @classmethod
+    def accepts(  # pylint: disable=unused-argument
+        cls, operations: List[Operation], operation: Operation
+    ) -> bool:
+        """Whether an operation can be fused into a step with `operations`"""
+        return False
+
+    @property
+    def name(self) -> str:
+        return "_".join(operation for operation, _options in self.operations)
+
+    def apply(self, df: DataFrame, owned: bool) -> Tuple[DataFrame, bool]:
+        """
+        Apply the step to a DataFrame.
+
+        :param df: The DataFrame to process
+        :param owned: Whether the DataFrame may be modified in place
+        :return: The processed DataFrame, and whether it may be modified in place
+        """
+        for operation, options in self.operations:
+            df = getattr(pandas_postprocessing, operation)(df, **options)
+            owned = operation in NEW_FRAME_OPERATIONS
+        return df, owned
+
+
+class ColumnWiseStep(PostProcessingStep):
+    """Column wise operations computed on the same frame"""
+
+    @classmethod
+    def accepts(cls, operations: List[Operation], operation: Operation) -> bool:
+        name, options = operation
+        if name not in COLUMN_WISE_OPERATIONS:
+            return False
+        # rows are dropped after a rolling operation with minimum periods
+        if any(options.get("min_periods") for _name, options in operations):
+            return False
+        # operations can't read columns written by the operations before them
+        targets = {
+            target
+            for _name, options in operations
+            for target in options["columns"].values()
+        }
+        return not targets.intersection(options["columns"])
+
+    def apply(self, df: DataFrame, owned: bool) -> Tuple[DataFrame, bool]:
+        results: Dict[str, Any] = {}
+        min_periods = None
+        for operation, options in self.operations:
+            columns = options["columns"]
+            _validate_columns(df, list(columns))
+            compute = pandas_postprocessing.COLUMN_WISE_FUNCTIONS[operation]
+            df_result = compute(df, **options)
+            # the results are added by position, skipping index alignment
+            for source, target in columns.items():
+                results[target] = df_result[source].to_numpy()
+            min_periods = options.get("min_periods")
+        if min_periods:
+            # drop the rows the rolling operation drops before adding the columns
+            df = df[min_periods:]
+            results = {
+                target: values[min_periods:] for target, values in results.items()
+            }
+            owned = False
+        if owned:
+            for target, values in results.items():
+                df[target] = values
+        else:
+            df = df.assign(**results)
+        return df, True
+
+
+class SortSelectStep(PostProcessingStep):
+    """A `sort` operation followed by a `select` operation"""
+
+    min_operations = 2
+
+    @classmethod
+    def accepts(cls, operations: List[Operation], operation: Operation) -> bool:
+        names = [name for name, _options in operations] + [operation[0]]
+        return names in (["sort"], ["sort", "select"])
+
+    def apply(self, df: DataFrame, owned: bool) -> Tuple[DataFrame, bool]:
+        if not df.columns.is_unique:
+            return super().apply(df, owned)
+        (_, sort_options), (_, select_options) = self.operations
+        sort_columns = sort_options["columns"]
+        _validate_columns(df, list(sort_columns))
+
+        # select from a single row of column positions to find out which
+        # columns end up where, and under which name
+        df_positions = DataFrame([np.arange(len(df.columns))], columns=df.columns)
+        df_positions = pandas_postprocessing.select(df_positions, **select_options)
+        positions = df_positions.iloc[0].tolist()
+        labels = df_positions.columns
+
+        sort_positions = [df.columns.get_loc(column) for column in sort_columns]
+        if labels.is_unique and all(
+            positions.count(position) == 1 for position in sort_positions
+        ):
+            # all the sort keys are selected, sort the selected columns only
+            selected = dict(zip(positions, labels))
+            df = pandas_postprocessing.select(df, **select_options)
+            df = pandas_postprocessing.sort(
+                df,
+                columns={
+                    selected[position]: ascending
+                    for position, ascending in zip(
+                        sort_positions, sort_columns.values()
+                    )
+                },
+            )
+            return df, True
+
+        # sorting only the keys yields the same order as sorting the whole frame
+        order = pandas_postprocessing.sort(
+            df[list(sort_columns)].reset_index(drop=True), columns=sort_columns
+        ).index.to_numpy()
+        df = df.iloc[order, positions]
+        df.columns = labels
+        return df, True
+
+
+FUSED_STEP_TYPES = (ColumnWiseStep, SortSelectStep)
+
+
+class PostProcessingPipeline:
+    """
+    A validated and optimized plan of post processing operations.
+
+    :param post_processing: The post processing operations of a query object
+    :raises QueryObjectValidationError: If any of the operations is invalid
+    """
+
+    def __init__(self, post_processing: List[Dict[str, Any]]) -> None:
+        operations = [self.validate(post_process) for post_process in post_processing]
+        self.steps = self.plan(operations)
+
+    @staticmethod
+    def validate(post_process: Dict[str, Any]) -> Operation:
+        operation = post_process.get("operation")
+        if not operation:
+            raise QueryObjectValidationError(
+                _("`operation` property of post processing object undefined")
+            )
+        if operation not in POST_PROCESSING_OPERATIONS:
+            raise QueryObjectValidationError(
+                _(
+                    "Unsupported post processing operation: %(operation)s",
+                    operation=operation,
+                )
+            )
+        options = post_process.get("options") or {}
+        func: Callable[..., DataFrame] = getattr(pandas_postprocessing, operation)
+        try:
+            inspect.signature(func).bind(None, **options)
+        except TypeError as ex:
+            raise QueryObjectValidationError(
+                _(
+                    "Invalid options for %(operation)s: %(error)s",
+                    operation=operation,
+                    error=str(ex),
+                )
+            )
+        if operation in COLUMN_WISE_OPERATIONS and not isinstance(
+            options.get("columns"), dict
+        ):
+            raise QueryObjectValidationError(
+                _("`columns` of %(operation)s must be a mapping", operation=operation)
+            )
+        return operation, options
+
+    @staticmethod
+    def plan(operations: List[Operation]) -> List[PostProcessingStep]:
+        steps: List[PostProcessingStep] = []
+        pending: List[Operation] = []
+        step_type: Type[PostProcessingStep] = PostProcessingStep
+
+        def add_steps() -> None:
+            if pending and len(pending) >= step_type.min_operations:
+                steps.append(step_type(pending))
+            else:
+                steps.extend(PostProcessingStep([operation]) for operation in pending)
+
+        for operation in operations:
+            if pending and step_type.accepts(pending, operation):
+                pending.append(operation)
+                continue
+            add_steps()
+            pending = [operation]
+            step_type = next(
+                (
+                    candidate
+                    for candidate in FUSED_STEP_TYPES
+                    if candidate.accepts([], operation)
+                ),
+                PostProcessingStep,
+            )
+        add_steps()
+        return steps
+
+    def execute(self, df: DataFrame, owned: bool = False) -> DataFrame:
+        """
+        Apply the post processing steps to a DataFrame.
+
+        :param df: The DataFrame to process
+        :param owned: Whether the DataFrame may be modified in place
+        :return: The processed DataFrame
+        """
+        stats_logger: BaseStatsLogger = current_app.config["STATS_LOGGER"]
+        for step in self.steps:
+            start = time.perf_counter()
+            df, owned = step.apply(df, owned)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            memory = int(df.memory_usage(deep=False).sum())
+            stats_logger.timing(f"post_processing.{step.name}.time", elapsed_ms)
+            stats_logger.gauge(f"post_processing.{step.name}.memory", memory)
+            logger.debug(
+                "Post processing step %s took %.2f ms, %d bytes",
+                step.name,
+                elapsed_ms,
+                memory,
+            )
+        return df
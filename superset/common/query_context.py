@@ -76,6 +76,16 @@ class QueryContext:
         self.result_type = result_type or utils.ChartDataResultType.FULL
         self.result_format = result_format or utils.ChartDataResultFormat.JSON
 
+    def get_query_dict(self, query_object: QueryObject) -> Dict[str, Any]:
+        query_obj = query_object.to_dict()
+        # SQL datasources translate the post processing operations the engine
+        # supports to SQL, and return the ones left to apply to the DataFrame
+        if self.datasource.type == "table" and is_feature_enabled(
+            "POST_PROCESSING_PUSHDOWN"
+        ):
+            query_obj["post_processing"] = query_object.post_processing
+        return query_obj
+
     def get_query_result(self, query_object: QueryObject) -> Dict[str, Any]:
         """Returns a pandas dataframe based on the query object"""
 
@@ -90,7 +100,7 @@ class QueryContext:
                 timestamp_format = dttm_col.python_date_format
 
         # The datasource here can be different backend but the interface is common
-        result = self.datasource.query(query_object.to_dict())
+        result = self.datasource.query(self.get_query_dict(query_object))
 
         df = result.df
         # Transform the timestamp we received from database to pandas supported
@@ -115,7 +125,9 @@ class QueryContext:
                 self.df_metrics_to_num(df, query_object)
 
             df.replace([np.inf, -np.inf], np.nan)
-            df = query_object.exec_post_processing(df)
+            df = query_object.exec_post_processing(
+                df, owned=True, post_processing=result.post_processing
+            )
 
         return {
             "query": result.query,
@@ -143,7 +155,7 @@ class QueryContext:
         """Returns a payload of metadata and data"""
         if self.result_type == utils.ChartDataResultType.QUERY:
             return {
-                "query": self.datasource.get_query_str(query_obj.to_dict()),
+                "query": self.datasource.get_query_str(self.get_query_dict(query_obj)),
                 "language": self.datasource.query_language,
             }
         if self.result_type == utils.ChartDataResultType.SAMPLES:
@@ -21,13 +21,12 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, List, NamedTuple, Optional, Union
 
 import simplejson as json
-from flask_babel import gettext as _
 from pandas import DataFrame
 
 from superset import app, is_feature_enabled
-from superset.exceptions import QueryObjectValidationError
+from superset.common.post_processing import PostProcessingPipeline
 from superset.typing import Metric
-from superset.utils import core as utils, pandas_postprocessing
+from superset.utils import core as utils
 from superset.views.utils import get_time_range_endpoints
 
 config = app.config
@@ -244,28 +243,23 @@ class QueryObject:
             obj, default=utils.json_int_dttm_ser, ignore_nan=True, sort_keys=sort_keys
         )
 
-    def exec_post_processing(self, df: DataFrame) -> DataFrame:
+    def exec_post_processing(
+        self,
+        df: DataFrame,
+        owned: bool = False,
+        post_processing: Optional[List[Dict[str, Any]]] = None,
+    ) -> DataFrame:
         """
         Perform post processing operations on DataFrame.
 
         :param df: DataFrame returned from database model.
+        :param owned: Whether the DataFrame may be modified in place
+        :param post_processing: The operations left to apply when the datasource
+               applied the others, defaults to all the operations
         :return: new DataFrame to which all post processing operations have been
                  applied
         :raises ChartDataValidationError: If the post processing operation in incorrect
         """
-        for post_process in self.post_processing:
-            operation = post_process.get("operation")
-            if not operation:
-                raise QueryObjectValidationError(
-                    _("`operation` property of post processing object undefined")
-                )
-            if not hasattr(pandas_postprocessing, operation):
-                raise QueryObjectValidationError(
-                    _(
-                        "Unsupported post processing operation: %(operation)s",
-                        type=operation,
-                    )
-                )
-            options = post_process.get("options", {})
-            df = getattr(pandas_postprocessing, operation)(df, **options)
-        return df
+        if post_processing is None:
+            post_processing = self.post_processing
+        return PostProcessingPipeline(post_processing).execute(df, owned=owned)
@@ -55,6 +55,8 @@ if TYPE_CHECKING:
 
 # Realtime stats logger, a StatsD implementation exists
 STATS_LOGGER = DummyStatsLogger()
+# Use `superset.utils.log.AsyncDBEventLogger()` to write event logs in batches
+# from a background thread instead of from the request thread
 EVENT_LOGGER = DBEventLogger()
 
 SUPERSET_LOG_VIEW = True
@@ -120,6 +122,12 @@ VIZ_ROW_LIMIT = 10000
 SAMPLES_ROW_LIMIT = 1000
 # max rows retrieved by filter select auto complete
 FILTER_SELECT_ROW_LIMIT = 10000
+# Timeout in seconds of the cached distinct values shown in filter widgets, falls
+# back to the datasource, database and default cache timeouts when None
+FILTER_SELECT_CACHE_TIMEOUT: Optional[int] = None
+# Percentage of rows sampled when fetching the distinct values of a column, on
+# engines that support TABLESAMPLE. Set to None to always scan the full table
+FILTER_SELECT_SAMPLE_PERCENT: Optional[float] = None
 SUPERSET_WORKERS = 2  # deprecated
 SUPERSET_CELERY_WORKERS = 32  # deprecated
 
@@ -338,6 +346,9 @@ DEFAULT_FEATURE_FLAGS: Dict[str, bool] = {
     # Enables Alerts and reports new implementation
     "ALERT_REPORTS": False,
     "SIP_34_QUERY_SEARCH_UI": False,
+    # Translate the post processing operations of chart data requests to SQL on
+    # the engines that support it, see `BaseEngineSpec.post_processing_pushdown`
+    "POST_PROCESSING_PUSHDOWN": False,
 }
 
 # Set the default view to card/grid view if thumbnail support is enabled.
@@ -373,6 +384,9 @@ THUMBNAIL_CACHE_CONFIG: CacheConfig = {
     "CACHE_TYPE": "null",
     "CACHE_NO_NULL_WARNING": True,
 }
+# Time in seconds a thumbnail job waits in the queue after a chart or dashboard
+# changes, so that a burst of edits renders a single thumbnail of the last one
+THUMBNAIL_DEBOUNCE_SECONDS = 10
 
 # Used for thumbnails and other api: Time in seconds before selenium
 # times out after trying to locate an element on the page and wait
@@ -405,6 +419,11 @@ CACHE_CONFIG: CacheConfig = {"CACHE_TYPE": "null"}
 # Cache for datasource metadata and query results
 DATA_CACHE_CONFIG: CacheConfig = {"CACHE_TYPE": "null"}
 
+# Time in seconds the first phase of two-phase queries, which finds the top series
+# of charts with a series limit, is cached in the data cache and shared by the
+# charts that run it with the same filters and time range. Set to 0 to disable
+PREQUERY_CACHE_TIMEOUT = 60 * 5
+
 # CORS Options
 ENABLE_CORS = False
 CORS_OPTIONS: Dict[Any, Any] = {}
@@ -419,7 +438,8 @@ SUPERSET_WEBSERVER_DOMAINS = None
 # Allowed format types for upload on Database view
 EXCEL_EXTENSIONS = {"xlsx", "xls"}
 CSV_EXTENSIONS = {"csv", "tsv", "txt"}
-ALLOWED_EXTENSIONS = {*EXCEL_EXTENSIONS, *CSV_EXTENSIONS}
+COLUMNAR_EXTENSIONS = {"parquet", "feather"}
+ALLOWED_EXTENSIONS = {*EXCEL_EXTENSIONS, *CSV_EXTENSIONS, *COLUMNAR_EXTENSIONS}
 
 # CSV Options: key/value pairs that will be passed as argument to DataFrame.to_csv
 # method.
@@ -465,6 +485,12 @@ VIZ_TYPE_DENYLIST: List[str] = []
 
 DRUID_DATA_SOURCE_DENYLIST: List[str] = []
 
+# Number of datasources whose segment metadata is fetched at once, and number of
+# datasources whose columns and metrics are merged per commit, when refreshing the
+# metadata of a druid cluster
+DRUID_METADATA_REFRESH_CONCURRENCY = 8
+DRUID_METADATA_REFRESH_BATCH_SIZE = 100
+
 # --------------------------------------------------
 # Modules, datasources and middleware to be registered
 # --------------------------------------------------
@@ -533,8 +559,29 @@ DISPLAY_MAX_ROW = 10000
 DEFAULT_SQLLAB_LIMIT = 1000
 
 # Maximum number of tables/views displayed in the dropdown window in SQL Lab.
+# The table search of SQL Lab indexes the names in each web server process.
+# Editing a database or forcing a refresh of its names reaches the other processes
+# through CACHE_CONFIG, so unless it is a cache shared by all web servers
+# (e.g. Redis) they can return stale names until the table cache timeout of the
+# database, or the default timeout of CACHE_CONFIG, expires.
 MAX_TABLE_NAMES = 3000
 
+# Number of databases, and of schemas of a database, whose table and view names
+# are refreshed at once by `superset update-datasources-cache`, and time in seconds
+# after which the refresh of a database is abandoned
+DATASOURCES_CACHE_REFRESH_CONCURRENCY = 4
+DATASOURCES_CACHE_REFRESH_TIMEOUT = 30 * 60
+
+# Publish changes to SQL Lab queries as per-user versions in the cache, so that
+# the /superset/queries_feed/ endpoint can answer polls from idle tabs without
+# querying the metadata database. Only enable it when CACHE_CONFIG points to a
+# cache shared by all web servers and Celery workers (e.g. Redis)
+SQLLAB_QUERIES_FEED = False
+# Maximum number of seconds a /superset/queries_feed/ request waits for changes
+# before returning (long polling). Each waiting request holds a web server
+# worker, so only raise it when running asynchronous workers
+SQLLAB_QUERIES_FEED_MAX_WAIT = 0
+
 # Adds a warning message on sqllab save query and schedule query modals.
 SQLLAB_SAVE_WARNING_MESSAGE = None
 SQLLAB_SCHEDULE_WARNING_MESSAGE = None
@@ -672,6 +719,15 @@ ALLOWED_USER_CSV_SCHEMA_FUNC: Callable[["Database", "models.User"], List[str]] =
 # Values that should be treated as nulls for the csv uploads.
 CSV_DEFAULT_NA_NAMES = list(STR_NA_VALUES)
 
+# Number of rows of an uploaded CSV file that are read and written to the
+# database at once. The file is read twice: first to infer the column types of
+# the new table from all its rows, then to write them.
+CSV_UPLOAD_CHUNK_SIZE = 100000
+
+# Number of rows of an uploaded CSV, Excel or columnar file that are inserted
+# into the database by each statement, see the `chunksize` of DataFrame.to_sql.
+UPLOAD_INSERT_CHUNK_SIZE = 1000
+
 # A dictionary of items that gets merged into the Jinja context for
 # SQL Lab. The existing context gets updated with this dictionary,
 # meaning values for existing keys get overwritten by the content of this
@@ -702,6 +758,21 @@ CONFIG_PATH_ENV_VAR = "SUPERSET_CONFIG_PATH"
 # example: FLASK_APP_MUTATOR = lambda x: x.before_request = f
 FLASK_APP_MUTATOR = None
 
+# Log the time taken by each step of the app start-up and by the slowest
+# STARTUP_PROFILE_MODULES modules it imported, to investigate slow boots of the
+# web servers and Celery workers. Profiling slows the start-up down a bit.
+# Only the imports done while the app is initialized are timed when enabled
+# here, set the SUPERSET_STARTUP_PROFILE environment variable instead to also
+# time the imports done by the superset package before the app is created.
+STARTUP_PROFILE = bool(os.environ.get("SUPERSET_STARTUP_PROFILE"))
+STARTUP_PROFILE_MODULES = 30
+
+# Celery workers register the Flask views and APIs like the web servers, as
+# the email reports, alerts and thumbnails need their routes to build the URLs
+# of the charts and dashboards. Workers not running those tasks can skip them
+# to start faster, see UPDATING.md.
+CELERY_WORKER_INIT_VIEWS = True
+
 # Set this to false if you don't want users to be able to request/grant
 # datasource access requests from/to other users.
 ENABLE_ACCESS_REQUEST = False
@@ -755,6 +826,11 @@ HIVE_POLL_INTERVAL = 5
 # See here: https://github.com/dropbox/PyHive/blob/8eb0aeab8ca300f3024655419b93dad926c1a351/pyhive/presto.py#L93  # pylint: disable=line-too-long
 PRESTO_POLL_INTERVAL = 1
 
+# Minimum interval in seconds between two writes of the progress of a running
+# Hive or Presto query to the metadata database. Stop requests are read from
+# the cache on every poll and from the metadata database on every write
+SQLLAB_PROGRESS_FLUSH_INTERVAL = 10
+
 # Allow for javascript controls components
 # this enables programmers to customize certain charts (like the
 # geospatial ones) by inputing javascript in controls. This exposes
@@ -798,6 +874,22 @@ ENABLE_SCHEDULED_EMAIL_REPORTS = False
 # if it meets the criteria
 ENABLE_ALERTS = False
 
+# Alerts that run the same SQL on the same database at the same time share a single
+# query, and at most this many distinct alert queries run at once per database
+ALERT_QUERY_CONCURRENCY = 4
+
+# Reports of the same chart or dashboard version taken as the same user within this
+# many seconds share a single screenshot, set to 0 to take one for every report
+REPORT_SCREENSHOT_CACHE_SECONDS = 60
+
+# Maximum number of notifications of a report that are sent at once
+REPORT_NOTIFICATION_CONCURRENCY = 4
+
+# A report or alert that is still working this many seconds after it started, e.g.
+# because its worker died or its task was lost, is executed again instead of being
+# refused
+REPORT_WORKING_TIMEOUT_SECONDS = 60 * 60
+
 # Slack API token for the superset reports
 SLACK_API_TOKEN = None
 SLACK_PROXY = None
@@ -834,6 +926,10 @@ EMAIL_REPORT_BCC_ADDRESS = None
 EMAIL_REPORTS_USER = "admin"
 EMAIL_REPORTS_SUBJECT_PREFIX = "[Report] "
 
+# File format of the data of chart reports sent as attachments, "csv" or "xlsx".
+# Excel attachments require openpyxl or XlsxWriter to be installed.
+EMAIL_REPORTS_DATA_FORMAT = "csv"
+
 # The webdriver to use for generating reports. Use one of the following
 # firefox
 #   Requires: geckodriver and firefox installations
@@ -853,6 +949,17 @@ WEBDRIVER_AUTH_FUNC = None
 # Any config options to be passed as-is to the webdriver
 WEBDRIVER_CONFIGURATION: Dict[Any, Any] = {}
 
+# Number of authenticated browser sessions each worker process keeps open to take
+# screenshots, so that consecutive thumbnails and reports don't start a browser
+# and log in again. Set to 0 to use a new browser for every screenshot.
+WEBDRIVER_POOL_SIZE = 1
+# Browser sessions are closed after taking this many screenshots...
+WEBDRIVER_POOL_MAX_USES = 50
+# ... or after being open for this many seconds
+WEBDRIVER_POOL_MAX_AGE = 60 * 60
+# Time in seconds to wait for a browser session when all of them are in use
+WEBDRIVER_POOL_TIMEOUT = 5 * 60
+
 # Additional args to be passed as arguments to the config object
 # Note: these options are Chrome-specific. For FF, these should
 # only include the "--headless" arg
@@ -384,11 +384,21 @@ class BaseDatasource(
         """
         raise NotImplementedError()
 
-    def values_for_column(self, column_name: str, limit: int = 10000) -> List[Any]:
+    def values_for_column(  # pylint: disable=too-many-arguments
+        self,
+        column_name: str,
+        limit: int = 10000,
+        search: Optional[str] = None,
+        offset: int = 0,
+        sample_percent: Optional[float] = None,
+    ) -> List[Any]:
         """Given a column, returns an iterable of distinct values
 
         This is used to populate the dropdown showing a list of
-        values in filters in the explore view"""
+        values in filters in the explore view. `search` restricts the values
+        to the ones starting with the given prefix, `offset` allows paginating
+        through them and `sample_percent` allows datasources that support it to
+        only scan a sample of the rows."""
         raise NotImplementedError()
 
     @staticmethod
@@ -488,6 +498,17 @@ class BaseDatasource(
         """
         return []
 
+    def get_values_extra_cache_keys(  # pylint: disable=no-self-use
+        self,
+    ) -> List[Hashable]:
+        """If a datasource needs to provide additional keys for calculation of
+        the cache keys of the values of its columns, those can be provided via
+        this method
+
+        :return: list of keys
+        """
+        return []
+
     def __hash__(self) -> int:
         return hash(self.uid)
 
@@ -23,7 +23,18 @@ from copy import deepcopy
 from datetime import datetime, timedelta
 from distutils.version import LooseVersion
 from multiprocessing.pool import ThreadPool
-from typing import Any, cast, Dict, Iterable, List, Optional, Set, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    cast,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import pandas as pd
 import sqlalchemy as sa
@@ -57,6 +68,7 @@ from superset.models.core import Database
 from superset.models.helpers import AuditMixinNullable, ImportExportMixin, QueryResult
 from superset.typing import FilterValues, Granularity, Metric, QueryObjectDict
 from superset.utils import core as utils
+from superset.utils.cache import cached_prequery
 
 try:
     import requests
@@ -196,11 +208,14 @@ class DruidCluster(Model, AuditMixinNullable, ImportExportMixin):
     def druid_version(self) -> str:
         return self.get_druid_version()
 
-    def refresh_datasources(
+    def refresh_datasources(  # pylint: disable=too-many-arguments
         self,
         datasource_name: Optional[str] = None,
         merge_flag: bool = True,
         refresh_all: bool = True,
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
     ) -> None:
         """Refresh metadata of all datasources in the cluster
         If ``datasource_name`` is specified, only that datasource is updated
@@ -214,15 +229,40 @@ class DruidCluster(Model, AuditMixinNullable, ImportExportMixin):
             ds_refresh.append(datasource_name)
         else:
             return
-        self.refresh(ds_refresh, merge_flag, refresh_all)
+        self.refresh(
+            ds_refresh,
+            merge_flag,
+            refresh_all,
+            concurrency=concurrency,
+            batch_size=batch_size,
+            progress=progress,
+        )
 
-    def refresh(
-        self, datasource_names: List[str], merge_flag: bool, refresh_all: bool
+    def refresh(  # pylint: disable=too-many-arguments
+        self,
+        datasource_names: List[str],
+        merge_flag: bool,
+        refresh_all: bool,
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
     ) -> None:
         """
         Fetches metadata for the specified datasources and
         merges to the Superset database
+
+        :param datasource_names: Names of the datasources to refresh
+        :param merge_flag: Whether to merge the segments of the datasources
+        :param refresh_all: Whether to refresh existing datasources too
+        :param concurrency: Number of datasources whose metadata is fetched at once,
+            defaults to DRUID_METADATA_REFRESH_CONCURRENCY
+        :param batch_size: Number of datasources merged per commit, defaults to
+            DRUID_METADATA_REFRESH_BATCH_SIZE
+        :param progress: Called with the number of merged and total datasources
+            after each commit
         """
+        concurrency = concurrency or conf["DRUID_METADATA_REFRESH_CONCURRENCY"]
+        batch_size = batch_size or conf["DRUID_METADATA_REFRESH_BATCH_SIZE"]
         session = db.session
         ds_list = (
             session.query(DruidDatasource)
@@ -247,40 +287,84 @@ class DruidCluster(Model, AuditMixinNullable, ImportExportMixin):
             datasource.merge_flag = merge_flag
         session.flush()
 
-        # Prepare multithreaded executation
-        pool = ThreadPool()
         ds_refresh = list(ds_map.values())
+        if not ds_refresh:
+            session.commit()
+            return
+
+        # Prepare multithreaded executation
+        pool = ThreadPool(min(len(ds_refresh), max(concurrency, 1)))
         metadata = pool.map(_fetch_metadata_for, ds_refresh)
         pool.close()
         pool.join()
 
-        for i in range(0, len(ds_refresh)):
-            datasource = ds_refresh[i]
-            cols = metadata[i]
-            if cols:
-                col_objs_list = (
-                    session.query(DruidColumn)
-                    .filter(DruidColumn.datasource_id == datasource.id)
-                    .filter(DruidColumn.column_name.in_(cols.keys()))
-                )
-                col_objs = {col.column_name: col for col in col_objs_list}
-                for col in cols:
-                    if col == "__time":  # skip the time column
-                        continue
-                    col_obj = col_objs.get(col)
-                    if not col_obj:
-                        col_obj = DruidColumn(
-                            datasource_id=datasource.id, column_name=col
-                        )
-                        with session.no_autoflush:
-                            session.add(col_obj)
-                    col_obj.type = cols[col]["type"]
-                    col_obj.datasource = datasource
-                    if col_obj.type == "STRING":
+        # the datasources are identified by id from here on, since committing
+        # expires the loaded objects
+        refreshed = [
+            (datasource.id, cols)
+            for datasource, cols in zip(ds_refresh, metadata)
+            if cols
+        ]
+        session.commit()
+        for i in range(0, len(refreshed), batch_size):
+            self._merge_metadata(session, refreshed[i : i + batch_size])
+            session.commit()
+            if progress:
+                progress(min(i + batch_size, len(refreshed)), len(refreshed))
+
+    @staticmethod
+    def _merge_metadata(
+        session: Session, metadata: List[Tuple[int, Dict[str, Any]]]
+    ) -> None:
+        """
+        Upsert the columns and metrics of datasources from their segment metadata,
+        loading the existing ones of all the datasources at once and only writing
+        the ones that changed
+
+        :param session: The session to merge into
+        :param metadata: The datasource ids and the columns of their latest segment
+        """
+        datasource_ids = [datasource_id for datasource_id, _cols in metadata]
+        col_objs: Dict[Tuple[int, str], DruidColumn] = {
+            (col.datasource_id, col.column_name): col
+            for col in session.query(DruidColumn).filter(
+                DruidColumn.datasource_id.in_(datasource_ids)
+            )
+        }
+        metric_objs: Dict[Tuple[int, str], DruidMetric] = {
+            (metric.datasource_id, metric.metric_name): metric
+            for metric in session.query(DruidMetric).filter(
+                DruidMetric.datasource_id.in_(datasource_ids)
+            )
+        }
+        for datasource_id, cols in metadata:
+            for col, col_metadata in cols.items():
+                if col == "__time":  # skip the time column
+                    continue
+                col_obj = col_objs.get((datasource_id, col))
+                if not col_obj:
+                    col_obj = DruidColumn(datasource_id=datasource_id, column_name=col)
+                    session.add(col_obj)
+                    col_objs[(datasource_id, col)] = col_obj
+                if col_obj.type != col_metadata["type"]:
+                    col_obj.type = col_metadata["type"]
+                if col_obj.type == "STRING":
+                    if not col_obj.groupby:
                         col_obj.groupby = True
+                    if not col_obj.filterable:
                         col_obj.filterable = True
-                datasource.refresh_metrics()
-        session.commit()
+
+        for (datasource_id, _col), col_obj in col_objs.items():
+            for metric in col_obj.get_metrics().values():
+                metric_obj = metric_objs.get((datasource_id, metric.metric_name))
+                if not metric_obj:
+                    metric.datasource_id = datasource_id
+                    session.add(metric)
+                    metric_objs[(datasource_id, metric.metric_name)] = metric
+                    continue
+                for attr in ["json", "metric_type"]:
+                    if getattr(metric_obj, attr) != getattr(metric, attr):
+                        setattr(metric_obj, attr, getattr(metric, attr))
 
     @hybrid_property
     def perm(self) -> str:
@@ -931,8 +1015,17 @@ class DruidDatasource(Model, BaseDatasource):
         )
         return aggs, post_aggs
 
-    def values_for_column(self, column_name: str, limit: int = 10000) -> List[Any]:
-        """Retrieve some values for the given column"""
+    def values_for_column(  # pylint: disable=too-many-arguments
+        self,
+        column_name: str,
+        limit: int = 10000,
+        search: Optional[str] = None,
+        offset: int = 0,
+        sample_percent: Optional[float] = None,
+    ) -> List[Any]:
+        """Retrieve some values for the given column
+
+        topN queries are already approximate, so `sample_percent` is ignored."""
         logger.info(
             "Getting values for columns [{}] limited to [{}]".format(column_name, limit)
         )
@@ -950,13 +1043,20 @@ class DruidDatasource(Model, BaseDatasource):
             aggregations=dict(count=count("count")),
             dimension=column_name,
             metric="count",
-            threshold=limit,
+            # topN has no offset, fetch the skipped values too
+            threshold=limit + offset,
         )
+        if search:
+            qry["filter"] = Filter(
+                type="regex", dimension=column_name, pattern=f"^{re.escape(search)}"
+            )
 
         client = self.cluster.get_pydruid_client()
         client.topn(**qry)
         df = client.export_pandas()
-        return df[column_name].to_list()
+        if df is None or df.empty:
+            return []
+        return df[column_name].to_list()[offset:]
 
     def get_query_str(
         self,
@@ -1117,6 +1217,28 @@ class DruidDatasource(Model, BaseDatasource):
         ):
             metric["column"]["type"] = "DOUBLE"  # type: ignore
 
+    def _run_pre_query(
+        self, client: "PyDruid", query_type: str, pre_qry: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], pd.DataFrame]:
+        """
+        Run the first phase of a two-phase query, or get its result from the cache
+
+        :return: The query that was sent to druid and its result
+        """
+
+        def run() -> Tuple[Dict[str, Any], pd.DataFrame]:
+            getattr(client, query_type)(**pre_qry)
+            df = client.export_pandas()
+            if df is None:
+                df = pd.DataFrame()
+            return client.query_builder.last_query.query_dict, df
+
+        # the built query has the filters of the chart as plain dicts
+        query_dict = client.query_builder.build_query(query_type, pre_qry).query_dict
+        return cached_prequery(
+            {"cluster_id": self.cluster_id, "query": query_dict}, run
+        )
+
     def run_query(  # druid
         self,
         metrics: List[Metric],
@@ -1260,20 +1382,19 @@ class DruidDatasource(Model, BaseDatasource):
             pre_qry["dimension"] = self._dimensions_to_values(qry["dimensions"])[0]
             del pre_qry["dimensions"]
 
-            client.topn(**pre_qry)
-            logger.info("Phase 1 Complete")
-            if phase == 2:
-                query_str += "// Two phase query\n// Phase 1\n"
-            query_str += json.dumps(
-                client.query_builder.last_query.query_dict, indent=2
-            )
-            query_str += "\n"
             if phase == 1:
+                client.topn(**pre_qry)
+                query_str += json.dumps(
+                    client.query_builder.last_query.query_dict, indent=2
+                )
+                query_str += "\n"
                 return query_str
+            pre_qry_dict, df = self._run_pre_query(client, "topn", pre_qry)
+            logger.info("Phase 1 Complete")
+            query_str += "// Two phase query\n// Phase 1\n"
+            query_str += json.dumps(pre_qry_dict, indent=2)
+            query_str += "\n"
             query_str += "// Phase 2 (built based on phase one's results)\n"
-            df = client.export_pandas()
-            if df is None:
-                df = pd.DataFrame()
             qry["filter"] = self._add_filter_from_pre_query_data(
                 df, [pre_qry["dimension"]], filters
             )
@@ -1331,19 +1452,19 @@ class DruidDatasource(Model, BaseDatasource):
                     ),
                     "columns": [{"dimension": order_by, "direction": order_direction}],
                 }
-                client.groupby(**pre_qry)
-                logger.info("Phase 1 Complete")
                 query_str += "// Two phase query\n// Phase 1\n"
-                query_str += json.dumps(
-                    client.query_builder.last_query.query_dict, indent=2
-                )
-                query_str += "\n"
                 if phase == 1:
+                    client.groupby(**pre_qry)
+                    query_str += json.dumps(
+                        client.query_builder.last_query.query_dict, indent=2
+                    )
+                    query_str += "\n"
                     return query_str
+                pre_qry_dict, df = self._run_pre_query(client, "groupby", pre_qry)
+                logger.info("Phase 1 Complete")
+                query_str += json.dumps(pre_qry_dict, indent=2)
+                query_str += "\n"
                 query_str += "// Phase 2 (built based on phase one's results)\n"
-                df = client.export_pandas()
-                if df is None:
-                    df = pd.DataFrame()
                 qry["filter"] = self._add_filter_from_pre_query_data(
                     df, pre_qry["dimensions"], filters
                 )
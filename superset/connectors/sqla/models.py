@@ -33,6 +33,7 @@ from sqlalchemy import (
     and_,
     asc,
     Boolean,
+    cast,
     Column,
     DateTime,
     desc,
@@ -49,11 +50,12 @@ from sqlalchemy.exc import CompileError
 from sqlalchemy.orm import backref, Query, relationship, RelationshipProperty, Session
 from sqlalchemy.schema import UniqueConstraint
 from sqlalchemy.sql import column, ColumnElement, literal_column, table, text
-from sqlalchemy.sql.expression import Label, Select, TextAsFrom
+from sqlalchemy.sql.expression import Label, Select, TextAsFrom, TextClause
 from sqlalchemy.types import TypeEngine
 
 from superset import app, db, is_feature_enabled, security_manager
 from superset.connectors.base.models import BaseColumn, BaseDatasource, BaseMetric
+from superset.connectors.sqla.pushdown import push_down_post_processing
 from superset.constants import NULL_STRING
 from superset.db_engine_specs.base import TimestampExpression
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
@@ -70,6 +72,7 @@ from superset.result_set import SupersetResultSet
 from superset.sql_parse import ParsedQuery
 from superset.typing import Metric, QueryObjectDict
 from superset.utils import core as utils
+from superset.utils.cache import cached_prequery
 
 config = app.config
 metadata = Model.metadata  # pylint: disable=no-member
@@ -79,12 +82,15 @@ logger = logging.getLogger(__name__)
 class SqlaQuery(NamedTuple):
     extra_cache_keys: List[Any]
     labels_expected: List[str]
+    # post processing operations that weren't pushed down to the query
+    post_processing: Optional[List[Dict[str, Any]]]
     prequeries: List[str]
     sqla_query: Select
 
 
 class QueryStringExtended(NamedTuple):
     labels_expected: List[str]
+    post_processing: Optional[List[Dict[str, Any]]]
     prequeries: List[str]
     sql: str
 
@@ -145,7 +151,14 @@ class AnnotationDatasource(BaseDatasource):
     def get_query_str(self, query_obj: QueryObjectDict) -> str:
         raise NotImplementedError()
 
-    def values_for_column(self, column_name: str, limit: int = 10000) -> List[Any]:
+    def values_for_column(  # pylint: disable=too-many-arguments
+        self,
+        column_name: str,
+        limit: int = 10000,
+        search: Optional[str] = None,
+        offset: int = 0,
+        sample_percent: Optional[float] = None,
+    ) -> List[Any]:
         raise NotImplementedError()
 
 
@@ -707,33 +720,45 @@ class SqlaTable(  # pylint: disable=too-many-public-methods,too-many-instance-at
         except (TypeError, json.JSONDecodeError):
             return {}
 
-    def values_for_column(self, column_name: str, limit: int = 10000) -> List[Any]:
+    def values_for_column(  # pylint: disable=too-many-arguments,too-many-locals
+        self,
+        column_name: str,
+        limit: int = 10000,
+        search: Optional[str] = None,
+        offset: int = 0,
+        sample_percent: Optional[float] = None,
+    ) -> List[Any]:
         """Runs query against sqla to retrieve some
         sample values for the given column.
         """
         cols = {col.column_name: col for col in self.columns}
         target_col = cols[column_name]
         tp = self.get_template_processor()
+        db_engine_spec = self.database.db_engine_spec
 
-        qry = (
-            select([target_col.get_sqla_col()])
-            .select_from(self.get_from_clause(tp))
-            .distinct()
-        )
+        from_clause = self.get_from_clause(tp)
+        if sample_percent:
+            from_clause = db_engine_spec.get_sampled_from_clause(
+                from_clause, sample_percent
+            )
+        sqla_col = target_col.get_sqla_col()
+        qry = select([sqla_col]).select_from(from_clause).distinct()
+        if search:
+            search_col = sqla_col if target_col.is_string else cast(sqla_col, String)
+            qry = qry.where(search_col.startswith(search, autoescape=True))
+        if search or offset:
+            # pagination needs a stable order
+            qry = qry.order_by(sqla_col)
+        if offset:
+            qry = qry.offset(offset)
         if limit:
             qry = qry.limit(limit)
 
         if self.fetch_values_predicate:
-            tp = self.get_template_processor()
-            try:
-                qry = qry.where(text(tp.process_template(self.fetch_values_predicate)))
-            except TemplateError as ex:
-                raise QueryObjectValidationError(
-                    _(
-                        "Error in jinja expression in fetch values predicate: %(msg)s",
-                        msg=ex.message,
-                    )
-                )
+            qry = qry.where(self.get_fetch_values_predicate(tp))
+
+        if is_feature_enabled("ROW_LEVEL_SECURITY") and self.is_rls_supported:
+            qry = qry.where(and_(*self._get_sqla_row_level_filters(tp)))
 
         engine = self.database.get_sqla_engine()
         sql = "{}".format(qry.compile(engine, compile_kwargs={"literal_binds": True}))
@@ -742,6 +767,39 @@ class SqlaTable(  # pylint: disable=too-many-public-methods,too-many-instance-at
         df = pd.read_sql_query(sql=sql, con=engine)
         return df[column_name].to_list()
 
+    def get_fetch_values_predicate(
+        self, template_processor: BaseTemplateProcessor
+    ) -> TextClause:
+        try:
+            return text(
+                template_processor.process_template(self.fetch_values_predicate)
+            )
+        except TemplateError as ex:
+            raise QueryObjectValidationError(
+                _(
+                    "Error in jinja expression in fetch values predicate: %(msg)s",
+                    msg=ex.message,
+                )
+            )
+
+    def get_values_extra_cache_keys(self) -> List[Hashable]:
+        """
+        The keys added via `ExtraCache` by the templates `values_for_column`
+        renders, which the cache key of the values of a column needs to consider.
+
+        :return: The extra cache keys
+        """
+        extra_cache_keys: List[Hashable] = []
+        if not self.has_extra_cache_key_calls({}):
+            return extra_cache_keys
+        tp = self.get_template_processor(extra_cache_keys=extra_cache_keys)
+        self.get_from_clause(tp)
+        if self.fetch_values_predicate:
+            self.get_fetch_values_predicate(tp)
+        if is_feature_enabled("ROW_LEVEL_SECURITY") and self.is_rls_supported:
+            self._get_sqla_row_level_filters(tp)
+        return extra_cache_keys
+
     def mutate_query_from_config(self, sql: str) -> str:
         """Apply config's SQL_QUERY_MUTATOR
 
@@ -762,7 +820,10 @@ class SqlaTable(  # pylint: disable=too-many-public-methods,too-many-instance-at
         sql = sqlparse.format(sql, reindent=True)
         sql = self.mutate_query_from_config(sql)
         return QueryStringExtended(
-            labels_expected=sqlaq.labels_expected, sql=sql, prequeries=sqlaq.prequeries
+            labels_expected=sqlaq.labels_expected,
+            post_processing=sqlaq.post_processing,
+            sql=sql,
+            prequeries=sqlaq.prequeries,
         )
 
     def get_query_str(self, query_obj: QueryObjectDict) -> str:
@@ -881,6 +942,7 @@ class SqlaTable(  # pylint: disable=too-many-public-methods,too-many-instance-at
         orderby: Optional[List[Tuple[ColumnElement, bool]]] = None,
         extras: Optional[Dict[str, Any]] = None,
         order_desc: bool = True,
+        post_processing: Optional[List[Dict[str, Any]]] = None,
     ) -> SqlaQuery:
         """Querying any sqla table from this common interface"""
         template_kwargs = {
@@ -1224,21 +1286,53 @@ class SqlaTable(  # pylint: disable=too-many-public-methods,too-many-instance-at
                 if not is_sip_38:
                     prequery_obj["groupby"] = groupby
 
-                result = self.query(prequery_obj)
-                prequeries.append(result.query)
+                prequery_str_ext = self.get_query_str_extended(prequery_obj)
+
+                def run_prequery() -> Tuple[pd.DataFrame, str, str]:
+                    result = self._run_query(prequery_str_ext, datetime.now())
+                    return result.df, result.query, result.status
+
+                def succeeded(result: Tuple[pd.DataFrame, str, str]) -> bool:
+                    return result[2] == utils.QueryStatus.SUCCESS
+
+                prequery_df, prequery, _status = cached_prequery(
+                    {"database_id": self.database_id, "sql": prequery_str_ext.sql},
+                    run_prequery,
+                    cacheable=succeeded,
+                )
+                prequeries.append(prequery)
                 dimensions = [
                     c
-                    for c in result.df.columns
+                    for c in prequery_df.columns
                     if c not in metrics and c in groupby_exprs_sans_timestamp
                 ]
                 top_groups = self._get_top_groups(
-                    result.df, dimensions, groupby_exprs_sans_timestamp
+                    prequery_df, dimensions, groupby_exprs_sans_timestamp
                 )
                 qry = qry.where(top_groups)
+
+        qry = qry.select_from(tbl)
+        if post_processing is not None:
+            # timestamps parsed with a python_date_format after the query don't
+            # sort or group in the database the way they do in the DataFrame
+            converted_labels = set()
+            if (
+                granularity
+                and is_timeseries
+                and dttm_col.python_date_format
+                and not db_engine_spec.is_db_column_type_match(
+                    dttm_col.type, utils.DbColumnType.TEMPORAL
+                )
+            ):
+                converted_labels.add(utils.DTTM_ALIAS)
+            qry, labels_expected, post_processing = push_down_post_processing(
+                qry, labels_expected, db_engine_spec, post_processing, converted_labels
+            )
         return SqlaQuery(
             extra_cache_keys=extra_cache_keys,
             labels_expected=labels_expected,
-            sqla_query=qry.select_from(tbl),
+            post_processing=post_processing,
+            sqla_query=qry,
             prequeries=prequeries,
         )
 
@@ -1281,6 +1375,12 @@ class SqlaTable(  # pylint: disable=too-many-public-methods,too-many-instance-at
     def query(self, query_obj: QueryObjectDict) -> QueryResult:
         qry_start_dttm = datetime.now()
         query_str_ext = self.get_query_str_extended(query_obj)
+        return self._run_query(query_str_ext, qry_start_dttm)
+
+    def _run_query(
+        self, query_str_ext: QueryStringExtended, qry_start_dttm: datetime
+    ) -> QueryResult:
+        """Run a query compiled by get_query_str_extended"""
         sql = query_str_ext.sql
         status = utils.QueryStatus.SUCCESS
         errors = None
@@ -1324,6 +1424,7 @@ class SqlaTable(  # pylint: disable=too-many-public-methods,too-many-instance-at
             query=sql,
             errors=errors,
             error_message=error_message,
+            post_processing=query_str_ext.post_processing,
         )
 
     def get_sqla_table_object(self) -> Table:
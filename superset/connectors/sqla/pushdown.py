@@ -0,0 +1,399 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Translation of post processing operations to SQL.
+
+The longest prefix of the post processing operations of a query object that
+the engine supports is applied by wrapping the query of the datasource in
+subqueries, so that fewer rows are fetched. The remaining operations are applied
+to the fetched DataFrame as usual.
+
+Operations that depend on the order of the rows (`cum`, `diff` and `rolling`)
+are only translated after an `aggregate` or a `sort` operation, which define
+that order. Columns whose values are converted after the query, like a
+timestamp column parsed with its `python_date_format`, compare differently in
+the database, so no operation sorting, grouping or aggregating them is
+translated. Rows that tie on the sort keys may end up in a different order than
+when sorting in pandas, and strings are compared using the collation of the
+database.
+
+Sums of integer columns are returned with the type the database gives them, which
+may be a decimal type (e.g. on PostgreSQL) where pandas returns integers, while
+means are computed on floating point values as in pandas.
+"""
+import logging
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+import sqlalchemy as sa
+from sqlalchemy.sql import ColumnElement, func, null
+from sqlalchemy.sql.expression import Select
+
+from superset.common.post_processing import PostProcessingPipeline
+from superset.db_engine_specs.base import BaseEngineSpec
+from superset.utils.core import DTTM_ALIAS
+
+logger = logging.getLogger(__name__)
+
+# SQL counterparts of the numpy functions used by the `aggregate` operation
+AGGREGATE_FUNCTIONS: Dict[str, Callable[[ColumnElement], ColumnElement]] = {
+    # pandas sums groups without any value to 0
+    "sum": lambda col: func.coalesce(func.sum(col), 0),
+    "nansum": lambda col: func.coalesce(func.sum(col), 0),
+    "mean": lambda col: func.avg(sa.cast(col, sa.Float)),
+    "nanmean": lambda col: func.avg(sa.cast(col, sa.Float)),
+    "min": func.min,
+    "nanmin": func.min,
+    "max": func.max,
+    "nanmax": func.max,
+    # `numpy.ma.count` counts missing values as well
+    "count": lambda col: func.count(),
+}
+
+# window functions used by the `rolling` operation
+WINDOW_FUNCTIONS: Dict[str, Callable[[ColumnElement], ColumnElement]] = {
+    "sum": func.sum,
+    "mean": lambda col: func.avg(sa.cast(col, sa.Float)),
+    "min": func.min,
+    "max": func.max,
+}
+
+# window functions used by the `cum` operation, pandas has no cumulative mean
+CUM_FUNCTIONS: Dict[str, Callable[[ColumnElement], ColumnElement]] = {
+    "sum": func.sum,
+    "min": func.min,
+    "max": func.max,
+}
+
+
+class SqlFrame:
+    """
+    A query returning a DataFrame, along with the labels of its columns and
+    the order of its rows.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        qry: Select,
+        labels: List[str],
+        db_engine_spec: Type[BaseEngineSpec],
+        order: Optional[List[Tuple[str, bool]]] = None,
+        converted: FrozenSet[str] = frozenset(),
+    ) -> None:
+        self.qry = qry
+        self.labels = labels
+        self.db_engine_spec = db_engine_spec
+        self.order = order or []
+        # the labels of the columns converted after the query
+        self.converted = converted
+
+    def columns(self) -> Dict[str, ColumnElement]:
+        """The columns of the query, selected from a subquery"""
+        return dict(zip(self.labels, self.qry.alias().c))
+
+    def order_by(self, columns: Dict[str, ColumnElement]) -> List[ColumnElement]:
+        # pandas puts missing values last in both directions
+        return [
+            (sa.asc if ascending else sa.desc)(columns[label]).nullslast()
+            for label, ascending in self.order
+        ]
+
+    def derive(
+        self,
+        columns: List[Tuple[str, ColumnElement]],
+        order: Optional[List[Tuple[str, bool]]] = None,
+    ) -> "SqlFrame":
+        qry = sa.select(
+            [
+                expr.label(self.db_engine_spec.make_label_compatible(label))
+                for label, expr in columns
+            ]
+        )
+        return SqlFrame(
+            qry,
+            [label for label, _expr in columns],
+            self.db_engine_spec,
+            self.order if order is None else order,
+            self.converted,
+        )
+
+    def append(
+        self, columns: Dict[str, ColumnElement], results: Dict[str, ColumnElement]
+    ) -> Optional["SqlFrame"]:
+        """
+        Add columns computed from the columns of the query the way
+        `_append_columns` does, replacing the columns that already exist.
+        """
+        # the timestamp column is converted after the query, and the rows are
+        # ordered by the original values of the sort keys
+        if DTTM_ALIAS in results or any(
+            label in results for label, _ascending in self.order
+        ):
+            return None
+        derived = [(label, results.pop(label, expr)) for label, expr in columns.items()]
+        return self.derive(derived + list(results.items()))
+
+    def ordered(self) -> Select:
+        columns = self.columns()
+        qry = sa.select(
+            [
+                expr.label(self.db_engine_spec.make_label_compatible(label))
+                for label, expr in columns.items()
+            ]
+        )
+        return qry.order_by(*self.order_by(columns))
+
+
+def _aggregate(
+    frame: SqlFrame, groupby: List[str], aggregates: Dict[str, Dict[str, Any]]
+) -> Optional[SqlFrame]:
+    # without groups pandas returns a single row, or none for an empty frame
+    if not groupby:
+        return None
+    columns = frame.columns()
+    if not set(groupby).issubset(columns) or frame.converted.intersection(groupby):
+        return None
+    results = []
+    for name, aggregate in (aggregates or {}).items():
+        column = aggregate.get("column", name)
+        function = AGGREGATE_FUNCTIONS.get(aggregate.get("operator", ""))
+        if (
+            column not in columns
+            or column in frame.converted
+            or not function
+            or aggregate.get("options")
+        ):
+            return None
+        results.append((name, function(columns[column])))
+    groups = [(label, columns[label]) for label in groupby]
+    if len({label for label, _expr in groups + results}) != len(groups + results):
+        return None
+    derived = frame.derive(groups + results, order=[(label, True) for label in groupby])
+    # pandas drops the groups with missing keys, and sorts the others
+    derived.qry = derived.qry.where(
+        sa.and_(*[expr.isnot(None) for _label, expr in groups])
+    ).group_by(*[expr for _label, expr in groups])
+    return derived
+
+
+def _sort(frame: SqlFrame, columns: Dict[str, bool]) -> Optional[SqlFrame]:
+    if (
+        not columns
+        or not set(columns).issubset(frame.labels)
+        or frame.converted.intersection(columns)
+    ):
+        return None
+    return SqlFrame(
+        frame.qry,
+        frame.labels,
+        frame.db_engine_spec,
+        list(columns.items()),
+        frame.converted,
+    )
+
+
+def _select(
+    frame: SqlFrame,
+    columns: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    rename: Optional[Dict[str, str]] = None,
+) -> Optional[SqlFrame]:
+    labels = columns or frame.labels
+    exclude = exclude or []
+    rename = rename or {}
+    if not set(labels).union(exclude, rename).issubset(frame.labels):
+        return None
+    labels = [label for label in labels if label not in exclude]
+    # the rows couldn't be ordered anymore, and the timestamp column is
+    # converted after the query
+    if (
+        DTTM_ALIAS in rename
+        or frame.converted.intersection(rename)
+        or any(label not in labels for label, _ascending in frame.order)
+    ):
+        return None
+    renamed = [rename.get(label, label) for label in labels]
+    if len(set(renamed)) != len(renamed):
+        return None
+    columns_ = frame.columns()
+    return frame.derive(
+        [(rename.get(label, label), columns_[label]) for label in labels],
+        order=[
+            (rename.get(label, label), ascending) for label, ascending in frame.order
+        ],
+    )
+
+
+def _cum(frame: SqlFrame, columns: Dict[str, str], operator: str) -> Optional[SqlFrame]:
+    function = CUM_FUNCTIONS.get(operator)
+    if (
+        not frame.order
+        or not function
+        or not set(columns).issubset(frame.labels)
+        or frame.converted.intersection(columns)
+    ):
+        return None
+    columns_ = frame.columns()
+    order_by = frame.order_by(columns_)
+    return frame.append(
+        columns_,
+        {
+            target: sa.case(
+                # pandas keeps missing values missing
+                [(columns_[source].is_(None), null())],
+                else_=function(columns_[source]).over(
+                    order_by=order_by, rows=(None, 0)
+                ),
+            )
+            for source, target in columns.items()
+        },
+    )
+
+
+def _diff(
+    frame: SqlFrame, columns: Dict[str, str], periods: int = 1
+) -> Optional[SqlFrame]:
+    if (
+        not frame.order
+        or not set(columns).issubset(frame.labels)
+        or frame.converted.intersection(columns)
+    ):
+        return None
+    columns_ = frame.columns()
+    order_by = frame.order_by(columns_)
+    results = {}
+    for source, target in columns.items():
+        col = columns_[source]
+        if periods >= 0:
+            shifted = func.lag(col, periods).over(order_by=order_by)
+        else:
+            shifted = func.lead(col, -periods).over(order_by=order_by)
+        results[target] = col - shifted
+    return frame.append(columns_, results)
+
+
+def _rolling(  # pylint: disable=too-many-arguments,too-many-boolean-expressions
+    frame: SqlFrame,
+    columns: Dict[str, str],
+    rolling_type: str,
+    window: int,
+    rolling_type_options: Optional[Dict[str, Any]] = None,
+    center: bool = False,
+    win_type: Optional[str] = None,
+    min_periods: Optional[int] = None,
+) -> Optional[SqlFrame]:
+    function = WINDOW_FUNCTIONS.get(rolling_type)
+    if (
+        not frame.order
+        or not function
+        or not isinstance(window, int)
+        or window < 1
+        or rolling_type_options
+        or center
+        or win_type
+        # pandas drops the first `min_periods` rows
+        or min_periods is not None
+        or not set(columns).issubset(frame.labels)
+        or frame.converted.intersection(columns)
+    ):
+        return None
+    columns_ = frame.columns()
+    order_by = frame.order_by(columns_)
+    rows = (-(window - 1), 0)
+    return frame.append(
+        columns_,
+        {
+            target: sa.case(
+                # pandas needs `window` values to compute a rolling value
+                [
+                    (
+                        func.count(columns_[source]).over(order_by=order_by, rows=rows)
+                        < window,
+                        null(),
+                    )
+                ],
+                else_=function(columns_[source]).over(order_by=order_by, rows=rows),
+            )
+            for source, target in columns.items()
+        },
+    )
+
+
+TRANSLATIONS: Dict[str, Callable[..., Optional[SqlFrame]]] = {
+    "aggregate": _aggregate,
+    "cum": _cum,
+    "diff": _diff,
+    "rolling": _rolling,
+    "select": _select,
+    "sort": _sort,
+}
+
+
+def push_down_post_processing(
+    qry: Select,
+    labels: List[str],
+    db_engine_spec: Type[BaseEngineSpec],
+    post_processing: List[Dict[str, Any]],
+    converted_labels: AbstractSet[str] = frozenset(),
+) -> Tuple[Select, List[str], List[Dict[str, Any]]]:
+    """
+    Wrap a query in the SQL translation of the longest prefix of post processing
+    operations supported by the engine.
+
+    :param qry: The query of the datasource
+    :param labels: The labels of the columns returned by the query
+    :param db_engine_spec: The engine spec of the database running the query
+    :param post_processing: The post processing operations of the query object
+    :param converted_labels: The labels of the columns whose values are converted
+             after the query
+    :return: The wrapped query, the labels of the columns it returns and the post
+             processing operations left to apply to the DataFrame
+    :raises QueryObjectValidationError: If any of the operations is invalid
+    """
+    operations = [
+        PostProcessingPipeline.validate(post_process)
+        for post_process in post_processing
+    ]
+    if len(set(labels)) != len(labels):
+        return qry, labels, post_processing
+    frame = SqlFrame(qry, labels, db_engine_spec, converted=frozenset(converted_labels))
+
+    pushed_down = 0
+    for operation, options in operations:
+        if operation not in db_engine_spec.post_processing_pushdown:
+            break
+        translated = TRANSLATIONS[operation](frame, **options)
+        if translated is None:
+            break
+        frame = translated
+        pushed_down += 1
+
+    if not pushed_down:
+        return qry, labels, post_processing
+    logger.debug(
+        "Pushed down %d of %d post processing operations", pushed_down, len(operations),
+    )
+    return frame.ordered(), frame.labels, post_processing[pushed_down:]
@@ -61,16 +61,17 @@ class BaseDAO:
         return query.filter_by(id=model_id).one_or_none()
 
     @classmethod
-    def find_by_ids(cls, model_ids: List[int]) -> List[Model]:
+    def find_by_ids(cls, model_ids: List[int], session: Session = None) -> List[Model]:
         """
         Find a List of models by a list of ids, if defined applies `base_filter`
         """
         id_col = getattr(cls.model_cls, "id", None)
         if id_col is None:
             return []
-        query = db.session.query(cls.model_cls).filter(id_col.in_(model_ids))
+        session = session or db.session
+        query = session.query(cls.model_cls).filter(id_col.in_(model_ids))
         if cls.base_filter:
-            data_model = SQLAInterface(cls.model_cls, db.session)
+            data_model = SQLAInterface(cls.model_cls, session)
             query = cls.base_filter(  # pylint: disable=not-callable
                 "id", data_model
             ).apply(query, None)
@@ -16,11 +16,11 @@
 # under the License.
 import logging
 from datetime import datetime
-from io import BytesIO
+from itertools import chain
 from typing import Any, Dict
 from zipfile import ZipFile
 
-from flask import g, make_response, redirect, request, Response, send_file, url_for
+from flask import g, redirect, request, Response, stream_with_context, url_for
 from flask_appbuilder.api import expose, protect, rison, safe
 from flask_appbuilder.models.sqla.interface import SQLAInterface
 from flask_babel import ngettext
@@ -30,6 +30,7 @@ from werkzeug.wsgi import FileWrapper
 
 from superset import is_feature_enabled, thumbnail_cache
 from superset.commands.exceptions import CommandInvalidError
+from superset.commands.export import stream_zip
 from superset.commands.importers.v1.utils import remove_root
 from superset.constants import RouteMethod
 from superset.dashboards.commands.bulk_delete import BulkDeleteDashboardCommand
@@ -66,7 +67,7 @@ from superset.dashboards.schemas import (
 )
 from superset.extensions import event_logger
 from superset.models.dashboard import Dashboard
-from superset.tasks.thumbnails import cache_dashboard_thumbnail
+from superset.tasks.thumbnails import schedule_dashboard_thumbnail
 from superset.utils.screenshots import DashboardScreenshot
 from superset.utils.urls import get_url_path
 from superset.views.base import generate_download_headers
@@ -140,7 +141,15 @@ class DashboardRestApi(BaseSupersetModelRestApi):
         "owners.first_name",
         "owners.last_name",
     ]
-    list_select_columns = list_columns + ["changed_on", "changed_by_fk"]
+    # the charts are loaded along with the dashboards for the digests of the
+    # thumbnail urls, instead of one query per dashboard
+    list_select_columns = list_columns + [
+        "changed_on",
+        "changed_by_fk",
+        "slices.params",
+        "slices.datasource_type",
+        "slices.datasource_id",
+    ]
     order_columns = [
         "changed_by.first_name",
         "changed_on_delta_humanized",
@@ -487,25 +496,18 @@ class DashboardRestApi(BaseSupersetModelRestApi):
         if is_feature_enabled("VERSIONED_EXPORT"):
             timestamp = datetime.now().strftime("%Y%m%dT%H%M%S")
             root = f"dashboard_export_{timestamp}"
-            filename = f"{root}.zip"
 
-            buf = BytesIO()
-            with ZipFile(buf, "w") as bundle:
-                try:
-                    for file_name, file_content in ExportDashboardsCommand(
-                        requested_ids
-                    ).run():
-                        with bundle.open(f"{root}/{file_name}", "w") as fp:
-                            fp.write(file_content.encode())
-                except DashboardNotFoundError:
-                    return self.response_404()
-            buf.seek(0)
+            contents = ExportDashboardsCommand(requested_ids).run()
+            try:
+                # the dashboards are validated before their first file is exported
+                first_file = next(contents)
+            except DashboardNotFoundError:
+                return self.response_404()
 
-            return send_file(
-                buf,
+            return Response(
+                stream_with_context(stream_zip(root, chain([first_file], contents))),
                 mimetype="application/zip",
-                as_attachment=True,
-                attachment_filename=filename,
+                headers=generate_download_headers("zip", root),
             )
 
         query = self.datamodel.session.query(Dashboard).filter(
@@ -515,8 +517,8 @@ class DashboardRestApi(BaseSupersetModelRestApi):
         ids = [item.id for item in query.all()]
         if not ids:
             return self.response_404()
-        export = Dashboard.export_dashboards(ids)
-        resp = make_response(export, 200)
+        export = Dashboard.iter_export_dashboards(ids)
+        resp = Response(stream_with_context(export))
         resp.headers["Content-Disposition"] = generate_download_headers("json")[
             "Content-Disposition"
         ]
@@ -586,7 +588,9 @@ class DashboardRestApi(BaseSupersetModelRestApi):
         )
         # If force, request a screenshot from the workers
         if kwargs["rison"].get("force", False):
-            cache_dashboard_thumbnail.delay(dashboard_url, dashboard.digest, force=True)
+            schedule_dashboard_thumbnail(
+                dashboard_url, dashboard.digest, force=True, countdown=0
+            )
             return self.response(202, message="OK Async")
         # fetch the dashboard screenshot using the current user and cache if set
         screenshot = DashboardScreenshot(
@@ -594,7 +598,7 @@ class DashboardRestApi(BaseSupersetModelRestApi):
         ).get_from_cache(cache=thumbnail_cache)
         # If the screenshot does not exist, request one from the workers
         if not screenshot:
-            cache_dashboard_thumbnail.delay(dashboard_url, dashboard.digest, force=True)
+            schedule_dashboard_thumbnail(dashboard_url, dashboard.digest, countdown=0)
             return self.response(202, message="OK Async")
         # If digests
         if dashboard.digest != digest:
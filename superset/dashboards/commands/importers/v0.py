@@ -19,13 +19,14 @@ import logging
 import time
 from copy import copy
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from flask_babel import lazy_gettext as _
 from sqlalchemy.orm import make_transient, Session
 
 from superset import ConnectorRegistry, db
 from superset.commands.base import BaseCommand
+from superset.connectors.base.models import BaseDatasource
 from superset.connectors.sqla.models import SqlaTable, SqlMetric, TableColumn
 from superset.datasets.commands.importers.v0 import import_dataset
 from superset.exceptions import DashboardImportException
@@ -39,6 +40,56 @@ from superset.utils.dashboard_filter_scopes_converter import (
 logger = logging.getLogger(__name__)
 
 
+class ImportLookups:
+    """
+    The charts and dashboards previously imported, by the id they have in the
+    exporting instance, and the datasources of the charts, so that they are loaded
+    once per import instead of once per dashboard and chart.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self._slices: Optional[Dict[int, Slice]] = None
+        self._dashboards: Optional[Dict[int, Dashboard]] = None
+        self._datasources: Dict[Tuple[str, ...], Optional[BaseDatasource]] = {}
+
+    @property
+    def slices(self) -> Dict[int, Slice]:
+        if self._slices is None:
+            self._slices = {}
+            query = self.session.query(Slice).filter(Slice.params.like("%remote_id%"))
+            for slc in query:
+                if "remote_id" in slc.params_dict:
+                    self._slices[slc.params_dict["remote_id"]] = slc
+        return self._slices
+
+    @property
+    def dashboards(self) -> Dict[int, Dashboard]:
+        if self._dashboards is None:
+            self._dashboards = {}
+            query = self.session.query(Dashboard).filter(
+                Dashboard.json_metadata.like("%remote_id%")
+            )
+            for dash in query:
+                if "remote_id" in dash.params_dict:
+                    self._dashboards[dash.params_dict["remote_id"]] = dash
+        return self._dashboards
+
+    def get_datasource(
+        self,
+        datasource_type: str,
+        datasource_name: str,
+        schema: str,
+        database_name: str,
+    ) -> Optional[BaseDatasource]:
+        key = (datasource_type, datasource_name, schema, database_name)
+        if key not in self._datasources:
+            self._datasources[key] = ConnectorRegistry.get_datasource_by_name(
+                self.session, datasource_type, datasource_name, schema, database_name
+            )
+        return self._datasources[key]
+
+
 def import_chart(
     slc_to_import: Slice,
     slc_to_override: Optional[Slice],
@@ -56,6 +107,20 @@ def import_chart(
     :rtype: int
     """
     session = db.session
+    slc = _import_chart(
+        slc_to_import, slc_to_override, ImportLookups(session), import_time
+    )
+    session.flush()
+    return slc.id
+
+
+def _import_chart(
+    slc_to_import: Slice,
+    slc_to_override: Optional[Slice],
+    lookups: ImportLookups,
+    import_time: Optional[int] = None,
+) -> Slice:
+    """Inserts or overrides slc in the session without flushing it"""
     make_transient(slc_to_import)
     slc_to_import.dashboards = []
     slc_to_import.alter_params(remote_id=slc_to_import.id, import_time=import_time)
@@ -63,8 +128,7 @@ def import_chart(
     slc_to_import = slc_to_import.copy()
     slc_to_import.reset_ownership()
     params = slc_to_import.params_dict
-    datasource = ConnectorRegistry.get_datasource_by_name(
-        session,
+    datasource = lookups.get_datasource(
         slc_to_import.datasource_type,
         params["datasource_name"],
         params["schema"],
@@ -73,18 +137,17 @@ def import_chart(
     slc_to_import.datasource_id = datasource.id  # type: ignore
     if slc_to_override:
         slc_to_override.override(slc_to_import)
-        session.flush()
-        return slc_to_override.id
-    session.add(slc_to_import)
+        return slc_to_override
+    lookups.session.add(slc_to_import)
     logger.info("Final slice: %s", str(slc_to_import.to_json()))
-    session.flush()
-    return slc_to_import.id
+    return slc_to_import
 
 
 def import_dashboard(
     # pylint: disable=too-many-locals,too-many-branches,too-many-statements
     dashboard_to_import: Dashboard,
     import_time: Optional[int] = None,
+    lookups: Optional[ImportLookups] = None,
 ) -> int:
     """Imports the dashboard from the object to the database.
 
@@ -94,6 +157,9 @@ def import_dashboard(
     dashboard will be wired to existing tables. This function can be used
     to import/export dashboards between multiple superset instances.
     Audit metadata isn't copied over.
+
+    When importing several dashboards, pass the same lookups to all of them so
+    that the existing charts and dashboards are only loaded once.
     """
 
     def alter_positions(
@@ -142,6 +208,7 @@ def import_dashboard(
 
     logger.info("Started import of the dashboard: %s", dashboard_to_import.to_json())
     session = db.session
+    lookups = lookups or ImportLookups(session)
     logger.info("Dashboard has %d slices", len(dashboard_to_import.slices))
     # copy slices object as Slice.import_slice will mutate the slice
     # and will remove the existing dashboard - slice association
@@ -156,19 +223,22 @@ def import_dashboard(
     new_expanded_slices = {}
     new_filter_scopes = {}
     i_params_dict = dashboard_to_import.params_dict
-    remote_id_slice_map = {
-        slc.params_dict["remote_id"]: slc
-        for slc in session.query(Slice).all()
-        if "remote_id" in slc.params_dict
-    }
+    new_slices = []
     for slc in slices:
         logger.info(
             "Importing slice %s from the dashboard: %s",
             slc.to_json(),
             dashboard_to_import.dashboard_title,
         )
-        remote_slc = remote_id_slice_map.get(slc.id)
-        new_slc_id = import_chart(slc, remote_slc, import_time=import_time)
+        new_slc = _import_chart(
+            slc, lookups.slices.get(slc.id), lookups, import_time=import_time
+        )
+        lookups.slices[slc.id] = new_slc
+        new_slices.append(new_slc)
+    # assign the ids of all the new slices at once
+    session.flush()
+    for slc, new_slc in zip(slices, new_slices):
+        new_slc_id = new_slc.id
         old_to_new_slc_id_dict[slc.id] = new_slc_id
         # update json metadata that deals with slice ids
         new_slc_id_str = str(new_slc_id)
@@ -208,13 +278,8 @@ def import_dashboard(
         )
 
     # override the dashboard
-    existing_dashboard = None
-    for dash in session.query(Dashboard).all():
-        if (
-            "remote_id" in dash.params_dict
-            and dash.params_dict["remote_id"] == dashboard_to_import.id
-        ):
-            existing_dashboard = dash
+    remote_id = dashboard_to_import.id
+    existing_dashboard = lookups.dashboards.get(remote_id)
 
     dashboard_to_import = dashboard_to_import.copy()
     dashboard_to_import.id = None
@@ -235,9 +300,8 @@ def import_dashboard(
             timed_refresh_immune_slices=new_timed_refresh_immune_slices
         )
 
-    new_slices = (
-        session.query(Slice).filter(Slice.id.in_(old_to_new_slc_id_dict.values())).all()
-    )
+    # a slice can appear more than once in the dashboard
+    new_slices = list({slc.id: slc for slc in new_slices}.values())
 
     if existing_dashboard:
         existing_dashboard.override(dashboard_to_import)
@@ -248,6 +312,7 @@ def import_dashboard(
     dashboard_to_import.slices = new_slices
     session.add(dashboard_to_import)
     session.flush()
+    lookups.dashboards[remote_id] = dashboard_to_import
     return dashboard_to_import.id  # type: ignore
 
 
@@ -301,12 +366,17 @@ def import_dashboards(
     data = json.loads(content, object_hook=decode_dashboards)
     if not data:
         raise DashboardImportException(_("No data in file"))
-    for table in data["datasources"]:
-        import_dataset(table, database_id, import_time=import_time)
-    session.commit()
-    for dashboard in data["dashboards"]:
-        import_dashboard(dashboard, import_time=import_time)
-    session.commit()
+    # import the datasources and dashboards in a single transaction
+    try:
+        for table in data["datasources"]:
+            import_dataset(table, database_id, import_time=import_time)
+        lookups = ImportLookups(session)
+        for dashboard in data["dashboards"]:
+            import_dashboard(dashboard, import_time=import_time, lookups=lookups)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
 
 
 class ImportDashboardsCommand(BaseCommand):
@@ -16,11 +16,11 @@
 # under the License.
 import logging
 from datetime import datetime
-from io import BytesIO
+from itertools import chain
 from typing import Any, Optional
 from zipfile import ZipFile
 
-from flask import g, request, Response, send_file
+from flask import g, request, Response, stream_with_context
 from flask_appbuilder.api import expose, protect, rison, safe
 from flask_appbuilder.models.sqla.interface import SQLAInterface
 from flask_babel import gettext as _
@@ -36,6 +36,7 @@ from sqlalchemy.exc import (
 
 from superset import event_logger
 from superset.commands.exceptions import CommandInvalidError
+from superset.commands.export import stream_zip
 from superset.commands.importers.v1.utils import remove_root
 from superset.constants import RouteMethod
 from superset.databases.commands.create import CreateDatabaseCommand
@@ -74,6 +75,7 @@ from superset.extensions import security_manager
 from superset.models.core import Database
 from superset.typing import FlaskResponse
 from superset.utils.core import error_msg_from_exception
+from superset.views.base import generate_download_headers
 from superset.views.base_api import BaseSupersetModelRestApi, statsd_metrics
 
 logger = logging.getLogger(__name__)
@@ -713,25 +715,18 @@ class DatabaseRestApi(BaseSupersetModelRestApi):
         requested_ids = kwargs["rison"]
         timestamp = datetime.now().strftime("%Y%m%dT%H%M%S")
         root = f"database_export_{timestamp}"
-        filename = f"{root}.zip"
 
-        buf = BytesIO()
-        with ZipFile(buf, "w") as bundle:
-            try:
-                for file_name, file_content in ExportDatabasesCommand(
-                    requested_ids
-                ).run():
-                    with bundle.open(f"{root}/{file_name}", "w") as fp:
-                        fp.write(file_content.encode())
-            except DatabaseNotFoundError:
-                return self.response_404()
-        buf.seek(0)
+        contents = ExportDatabasesCommand(requested_ids).run()
+        try:
+            # the databases are validated before their first file is exported
+            first_file = next(contents)
+        except DatabaseNotFoundError:
+            return self.response_404()
 
-        return send_file(
-            buf,
+        return Response(
+            stream_with_context(stream_zip(root, chain([first_file], contents))),
             mimetype="application/zip",
-            as_attachment=True,
-            attachment_filename=filename,
+            headers=generate_download_headers("zip", root),
         )
 
     @expose("/import/", methods=["POST"])
@@ -16,12 +16,12 @@
 # under the License.
 import logging
 from datetime import datetime
-from io import BytesIO
-from typing import Any
+from itertools import chain
+from typing import Any, Iterator
 from zipfile import ZipFile
 
 import yaml
-from flask import g, request, Response, send_file
+from flask import g, request, Response, stream_with_context
 from flask_appbuilder.api import expose, protect, rison, safe
 from flask_appbuilder.models.sqla.interface import SQLAInterface
 from flask_babel import ngettext
@@ -29,6 +29,7 @@ from marshmallow import ValidationError
 
 from superset import event_logger, is_feature_enabled
 from superset.commands.exceptions import CommandInvalidError
+from superset.commands.export import stream_zip
 from superset.commands.importers.v1.utils import remove_root
 from superset.connectors.sqla.models import SqlaTable
 from superset.constants import RouteMethod
@@ -397,25 +398,18 @@ class DatasetRestApi(BaseSupersetModelRestApi):
         if is_feature_enabled("VERSIONED_EXPORT"):
             timestamp = datetime.now().strftime("%Y%m%dT%H%M%S")
             root = f"dataset_export_{timestamp}"
-            filename = f"{root}.zip"
 
-            buf = BytesIO()
-            with ZipFile(buf, "w") as bundle:
-                try:
-                    for file_name, file_content in ExportDatasetsCommand(
-                        requested_ids
-                    ).run():
-                        with bundle.open(f"{root}/{file_name}", "w") as fp:
-                            fp.write(file_content.encode())
-                except DatasetNotFoundError:
-                    return self.response_404()
-            buf.seek(0)
+            contents = ExportDatasetsCommand(requested_ids).run()
+            try:
+                # the datasets are validated before their first file is exported
+                first_file = next(contents)
+            except DatasetNotFoundError:
+                return self.response_404()
 
-            return send_file(
-                buf,
+            return Response(
+                stream_with_context(stream_zip(root, chain([first_file], contents))),
                 mimetype="application/zip",
-                as_attachment=True,
-                attachment_filename=filename,
+                headers=generate_download_headers("zip", root),
             )
 
         query = self.datamodel.session.query(SqlaTable).filter(
@@ -427,9 +421,14 @@ class DatasetRestApi(BaseSupersetModelRestApi):
         if len(ids) != len(requested_ids):
             return self.response_404()
 
-        data = [t.export_to_dict() for t in items]
+        # a YAML list, one dataset at a time
+        data: Iterator[str] = (
+            yaml.safe_dump([table.export_to_dict()]) for table in items
+        )
+        if not items:
+            data = iter([yaml.safe_dump([])])
         return Response(
-            yaml.safe_dump(data),
+            stream_with_context(data),
             headers=generate_download_headers("yaml"),
             mimetype="application/text",
         )
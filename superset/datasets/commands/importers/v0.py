@@ -26,14 +26,9 @@ from sqlalchemy.orm.session import make_transient
 from superset import db
 from superset.commands.base import BaseCommand
 from superset.commands.importers.exceptions import IncorrectVersionError
-from superset.connectors.base.models import BaseColumn, BaseDatasource, BaseMetric
-from superset.connectors.druid.models import (
-    DruidCluster,
-    DruidColumn,
-    DruidDatasource,
-    DruidMetric,
-)
-from superset.connectors.sqla.models import SqlaTable, SqlMetric, TableColumn
+from superset.connectors.base.models import BaseDatasource
+from superset.connectors.druid.models import DruidCluster, DruidDatasource
+from superset.connectors.sqla.models import SqlaTable
 from superset.databases.commands.exceptions import DatabaseNotFoundError
 from superset.models.core import Database
 from superset.utils.dict_import_export import DATABASES_KEY, DRUID_CLUSTERS_KEY
@@ -111,66 +106,6 @@ def import_dataset(
     )
 
 
-def lookup_sqla_metric(session: Session, metric: SqlMetric) -> SqlMetric:
-    return (
-        session.query(SqlMetric)
-        .filter(
-            SqlMetric.table_id == metric.table_id,
-            SqlMetric.metric_name == metric.metric_name,
-        )
-        .first()
-    )
-
-
-def lookup_druid_metric(session: Session, metric: DruidMetric) -> DruidMetric:
-    return (
-        session.query(DruidMetric)
-        .filter(
-            DruidMetric.datasource_id == metric.datasource_id,
-            DruidMetric.metric_name == metric.metric_name,
-        )
-        .first()
-    )
-
-
-def import_metric(session: Session, metric: BaseMetric) -> BaseMetric:
-    if isinstance(metric, SqlMetric):
-        lookup_metric = lookup_sqla_metric
-    else:
-        lookup_metric = lookup_druid_metric
-    return import_simple_obj(session, metric, lookup_metric)
-
-
-def lookup_sqla_column(session: Session, column: TableColumn) -> TableColumn:
-    return (
-        session.query(TableColumn)
-        .filter(
-            TableColumn.table_id == column.table_id,
-            TableColumn.column_name == column.column_name,
-        )
-        .first()
-    )
-
-
-def lookup_druid_column(session: Session, column: DruidColumn) -> DruidColumn:
-    return (
-        session.query(DruidColumn)
-        .filter(
-            DruidColumn.datasource_id == column.datasource_id,
-            DruidColumn.column_name == column.column_name,
-        )
-        .first()
-    )
-
-
-def import_column(session: Session, column: BaseColumn) -> BaseColumn:
-    if isinstance(column, TableColumn):
-        lookup_column = lookup_sqla_column
-    else:
-        lookup_column = lookup_druid_column
-    return import_simple_obj(session, column, lookup_column)
-
-
 def import_datasource(  # pylint: disable=too-many-arguments
     session: Session,
     i_datasource: Model,
@@ -207,51 +142,36 @@ def import_datasource(  # pylint: disable=too-many-arguments
         session.add(datasource)
         session.flush()
 
-    for metric in i_datasource.metrics:
-        new_m = metric.copy()
-        new_m.table_id = datasource.id
-        logger.info(
-            "Importing metric %s from the datasource: %s",
-            new_m.to_json(),
-            i_datasource.full_name,
-        )
-        imported_m = import_metric(session, new_m)
-        if imported_m.metric_name not in [m.metric_name for m in datasource.metrics]:
-            datasource.metrics.append(imported_m)
-
-    for column in i_datasource.columns:
-        new_c = column.copy()
-        new_c.table_id = datasource.id
-        logger.info(
-            "Importing column %s from the datasource: %s",
-            new_c.to_json(),
-            i_datasource.full_name,
-        )
-        imported_c = import_column(session, new_c)
-        if imported_c.column_name not in [c.column_name for c in datasource.columns]:
-            datasource.columns.append(imported_c)
+    # match the metrics and columns with the ones of the datasource in memory
+    # instead of looking them up one by one
+    _import_children(datasource, "metrics", "metric_name", i_datasource.metrics)
+    _import_children(datasource, "columns", "column_name", i_datasource.columns)
     session.flush()
     return datasource.id
 
 
-def import_simple_obj(
-    session: Session, i_obj: Model, lookup_obj: Callable[[Session, Model], Model]
-) -> Model:
-    make_transient(i_obj)
-    i_obj.id = None
-    i_obj.table = None
-
-    # find if the column was already imported
-    existing_column = lookup_obj(session, i_obj)
-    i_obj.table = None
-    if existing_column:
-        existing_column.override(i_obj)
-        session.flush()
-        return existing_column
-
-    session.add(i_obj)
-    session.flush()
-    return i_obj
+def _import_children(
+    datasource: Model, relationship: str, name_field: str, i_children: List[Model],
+) -> None:
+    """Override the existing metrics or columns of a datasource and add the new ones"""
+    children = getattr(datasource, relationship)
+    existing = {getattr(child, name_field): child for child in children}
+    for child in i_children:
+        new_child = child.copy()
+        for foreign_key, key in new_child.parent_foreign_key_mappings().items():
+            setattr(new_child, foreign_key, getattr(datasource, key))
+        logger.info(
+            "Importing %s %s from the datasource: %s",
+            relationship,
+            new_child.to_json(),
+            datasource.full_name,
+        )
+        name = getattr(new_child, name_field)
+        if name in existing:
+            existing[name].override(new_child)
+        else:
+            children.append(new_child)
+            existing[name] = new_child
 
 
 def import_from_dict(
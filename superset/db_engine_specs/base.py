@@ -26,6 +26,9 @@ from typing import (
     Any,
     Callable,
     Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
     List,
     Match,
     NamedTuple,
@@ -37,10 +40,18 @@ from typing import (
 )
 
 import pandas as pd
+import sqlalchemy as sqla
 import sqlparse
 from flask import g
 from flask_babel import lazy_gettext as _
-from sqlalchemy import column, DateTime, select
+from pandas.api.types import (
+    is_dtype_equal,
+    is_float_dtype,
+    is_integer_dtype,
+    is_numeric_dtype,
+    is_object_dtype,
+)
+from sqlalchemy import column, DateTime, select, tablesample
 from sqlalchemy.engine.base import Engine
 from sqlalchemy.engine.interfaces import Compiled, Dialect
 from sqlalchemy.engine.reflection import Inspector
@@ -48,7 +59,14 @@ from sqlalchemy.engine.url import URL
 from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import quoted_name, text
-from sqlalchemy.sql.expression import ColumnClause, ColumnElement, Select, TextAsFrom
+from sqlalchemy.sql.expression import (
+    ColumnClause,
+    ColumnElement,
+    FromClause,
+    Select,
+    TableClause,
+    TextAsFrom,
+)
 from sqlalchemy.types import TypeEngine
 
 from superset import app, sql_parse
@@ -56,6 +74,8 @@ from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
 from superset.models.sql_lab import Query
 from superset.sql_parse import Table
 from superset.utils import core as utils
+from superset.utils.columnar import get_sqla_types, read_columnar
+from superset.utils.dates import now_as_float
 
 if TYPE_CHECKING:
     # prevent circular imports
@@ -125,6 +145,91 @@ def compile_timegrain_expression(
     return element.name.replace("{col}", compiler.process(element.col, **kwargs))
 
 
+def is_integral(values: pd.Series) -> bool:
+    """Whether the float values of a column are all integers, or missing"""
+    return bool((values.dropna() % 1 == 0).all())
+
+
+def infer_upload_dtypes(chunks: Iterable[pd.DataFrame]) -> Optional[pd.Series]:
+    """
+    Infer the column types of a file read in chunks the way pandas does when
+    reading it at once, by upcasting the types of the chunks: e.g. an integer
+    column with decimals in a later chunk is a float column, and a column with
+    strings in any chunk is an object column. Integer columns that are only
+    read as floats in some chunks because of missing values stay integers.
+
+    :param chunks: Pandas DataFrames containing the data of the file
+    :return: The column types, or None if there are no chunks
+    """
+    # a row of each chunk, which has the column types of the chunk
+    samples = []
+    integral: Dict[str, bool] = {}
+    for chunk in chunks:
+        samples.append(chunk.head(1))
+        for name in chunk.columns:
+            if is_float_dtype(chunk[name].dtype):
+                integral[name] = integral.get(name, True) and is_integral(chunk[name])
+    if not samples:
+        return None
+    dtypes = pd.concat(samples).dtypes
+    for name, dtype in dtypes.items():
+        if (
+            is_float_dtype(dtype)
+            and integral.get(name)
+            and any(is_integer_dtype(sample[name].dtype) for sample in samples)
+        ):
+            dtypes[name] = pd.Int64Dtype()
+    return dtypes
+
+
+def conform_dtypes(df: pd.DataFrame, dtypes: pd.Series) -> pd.DataFrame:
+    """
+    Conform a chunk of an uploaded file to the column types of the table, e.g.
+    integer columns that are read as floats because the chunk contains null
+    values, or integer columns of a float or object column. Other mismatches are
+    left to the database to convert or reject.
+
+    :param df: Chunk of the uploaded file
+    :param dtypes: Column types of the table
+    :return: The conformed chunk
+    """
+    for name, dtype in dtypes.items():
+        if name not in df.columns or is_dtype_equal(df[name].dtype, dtype):
+            continue
+        values = df[name]
+        if is_integer_dtype(dtype) and is_float_dtype(values.dtype):
+            if is_integral(values):
+                df[name] = values.astype("Int64")
+        elif is_object_dtype(dtype) or (
+            is_float_dtype(dtype) and is_numeric_dtype(values.dtype)
+        ):
+            df[name] = values.astype(dtype)
+    return df
+
+
+_TEXT_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def to_delimited_text(rows: Iterable[Tuple[Any, ...]]) -> str:
+    """
+    Serialize rows to the tab separated text format of the bulk loaders of
+    Postgres (`COPY`) and MySQL (`LOAD DATA`): nulls are written as `\\N` and
+    backslashes, tabs and line breaks in values are escaped.
+
+    :param rows: Rows of Python values, e.g. the `data_iter` of `DataFrame.to_sql()`
+    :return: The text to load, one line per row
+    """
+
+    def to_text(value: Any) -> str:
+        if value is None:
+            return "\\N"
+        if isinstance(value, bool):
+            return "1" if value else "0"
+        return str(value).translate(_TEXT_ESCAPES)
+
+    return "".join("\t".join(map(to_text, row)) + "\n" for row in rows)
+
+
 class LimitMethod:  # pylint: disable=too-few-public-methods
     """Enum the ways that limits can be applied"""
 
@@ -156,6 +261,11 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
     arraysize = 0
     max_column_name_length = 0
     try_remove_schema_from_table_name = True  # pylint: disable=invalid-name
+    # TABLESAMPLE method used to approximate the distinct values of a column
+    values_sampling_method: Optional[str] = None
+    # post processing operations that can be translated to SQL window functions
+    # and subqueries, see superset.connectors.sqla.pushdown
+    post_processing_pushdown: FrozenSet[str] = frozenset()
 
     # default matching patterns for identifying column types
     db_column_types: Dict[utils.DbColumnType, Tuple[Pattern[Any], ...]] = {
@@ -403,6 +513,25 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
         # TODO: Fix circular import caused by importing Database
         return {}
 
+    @classmethod
+    def get_sampled_from_clause(
+        cls, from_clause: FromClause, sample_percent: float
+    ) -> FromClause:
+        """
+        Wrap a physical table in a TABLESAMPLE clause so that only a share of
+        its rows is scanned, other from clauses are returned unchanged.
+
+        :param from_clause: The from clause to sample
+        :param sample_percent: The percentage of rows to sample
+        :return: The sampled from clause
+        """
+        if not cls.values_sampling_method or not isinstance(from_clause, TableClause):
+            return from_clause
+        sampling = getattr(sqla.func, cls.values_sampling_method.lower())(
+            sample_percent
+        )
+        return tablesample(from_clause, sampling)
+
     @classmethod
     def apply_limit_to_sql(cls, sql: str, limit: int, database: "Database") -> str:
         """
@@ -464,6 +593,25 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
         df = pd.concat(chunk for chunk in chunks)
         return df
 
+    @staticmethod
+    def csv_to_chunks(**kwargs: Any) -> Iterator[pd.DataFrame]:
+        """ Read csv into Pandas DataFrames of at most `chunksize` rows
+        :param kwargs: params to be passed to DataFrame.read_csv
+        :return: Iterator of Pandas DataFrames containing data from csv, a file
+                 without rows gives a single DataFrame with the columns of its
+                 header
+        """
+        kwargs["encoding"] = "utf-8"
+        kwargs["iterator"] = True
+        empty = True
+        for chunk in pd.read_csv(**kwargs):
+            empty = False
+            yield chunk
+        if empty:
+            del kwargs["iterator"]
+            kwargs.pop("chunksize", None)
+            yield pd.read_csv(**{**kwargs, "nrows": 0})
+
     @classmethod
     def df_to_sql(cls, df: pd.DataFrame, **kwargs: Any) -> None:
         """ Upload data from a Pandas DataFrame to a database. For
@@ -475,6 +623,19 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
         """
         df.to_sql(**kwargs)
 
+    @classmethod
+    def get_upload_method(cls, engine: Engine) -> Union[None, str, Callable[..., None]]:
+        """
+        Return the `method` passed to `DataFrame.to_sql()` when uploading files.
+        Can be overridden for engines with a native bulk loader.
+
+        :param engine: SqlAlchemy Engine instance
+        :return: None, "multi" or a callable, see `DataFrame.to_sql()`
+        """
+        if engine.dialect.supports_multivalues_insert:
+            return "multi"
+        return None
+
     @classmethod
     def create_table_from_csv(  # pylint: disable=too-many-arguments
         cls,
@@ -487,15 +648,85 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
         """
         Create table from contents of a csv. Note: this method does not create
         metadata for the table.
+
+        The file is read and written `chunksize` rows at a time in a single
+        transaction. The column types are inferred from a first read of the
+        whole file, the way pandas infers them when reading it at once.
+        """
+        dtypes = infer_upload_dtypes(
+            cls.csv_to_chunks(filepath_or_buffer=filename, **csv_to_df_kwargs)
+        )
+        chunks = cls.csv_to_chunks(filepath_or_buffer=filename, **csv_to_df_kwargs)
+        cls.df_chunks_to_sql(chunks, table, database, df_to_sql_kwargs, dtypes)
+
+    @classmethod
+    def create_table_from_columnar(  # pylint: disable=too-many-arguments
+        cls,
+        filename: str,
+        table: Table,
+        database: "Database",
+        columnar_to_df_kwargs: Dict[str, Any],
+        df_to_sql_kwargs: Dict[str, Any],
+    ) -> None:
+        """
+        Create table from contents of a Parquet or Feather file. Note: this method
+        does not create metadata for the table.
+
+        The file is written one row group or record batch at a time in a single
+        transaction. The column types are taken from the schema of the file.
+        """
+        schema, chunks = read_columnar(filename, **columnar_to_df_kwargs)
+        df_to_sql_kwargs = {"dtype": get_sqla_types(schema), **df_to_sql_kwargs}
+        cls.df_chunks_to_sql(chunks, table, database, df_to_sql_kwargs)
+
+    @classmethod
+    def df_chunks_to_sql(  # pylint: disable=too-many-arguments
+        cls,
+        chunks: Iterable[pd.DataFrame],
+        table: Table,
+        database: "Database",
+        df_to_sql_kwargs: Dict[str, Any],
+        dtypes: Optional[pd.Series] = None,
+    ) -> None:
+        """
+        Upload the chunks of a file to a database in a single transaction, see
+        `get_upload_method`. The table is created from the first chunk and
+        later chunks are appended to it.
+
+        :param chunks: Pandas DataFrames containing the data of the file
+        :param table: Table to upload the data to
+        :param database: Database instance
+        :param df_to_sql_kwargs: kwargs to be passed to df_to_sql() method
+        :param dtypes: The column types of the whole file, see
+            `infer_upload_dtypes`, by default those of the first chunk
         """
-        df = cls.csv_to_df(filepath_or_buffer=filename, **csv_to_df_kwargs)
         engine = cls.get_engine(database)
+        df_to_sql_kwargs = df_to_sql_kwargs.copy()
         if table.schema:
             # only add schema when it is preset and non empty
             df_to_sql_kwargs["schema"] = table.schema
-        if engine.dialect.supports_multivalues_insert:
-            df_to_sql_kwargs["method"] = "multi"
-        cls.df_to_sql(df=df, con=engine, **df_to_sql_kwargs)
+        method = cls.get_upload_method(engine)
+        if method:
+            df_to_sql_kwargs["method"] = method
+
+        start = now_as_float()
+        rows = 0
+        with engine.begin() as connection:
+            for position, df in enumerate(chunks):
+                if dtypes is None:
+                    dtypes = df.dtypes
+                else:
+                    df = conform_dtypes(df, dtypes)
+                if position:
+                    df_to_sql_kwargs["if_exists"] = "append"
+                cls.df_to_sql(df=df, con=connection, **df_to_sql_kwargs)
+                rows += len(df)
+                logger.info(
+                    "Uploaded %i rows to %s in %.2f ms",
+                    rows,
+                    table,
+                    now_as_float() - start,
+                )
 
     @classmethod
     def convert_dttm(cls, target_type: str, dttm: datetime) -> Optional[str]:
@@ -526,8 +757,9 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
         if table.schema:
             # only add schema when it is preset and non empty
             df_to_sql_kwargs["schema"] = table.schema
-        if engine.dialect.supports_multivalues_insert:
-            df_to_sql_kwargs["method"] = "multi"
+        method = cls.get_upload_method(engine)
+        if method:
+            df_to_sql_kwargs["method"] = method
         cls.df_to_sql(df=df, con=engine, **df_to_sql_kwargs)
 
     @classmethod
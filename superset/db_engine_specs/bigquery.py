@@ -24,7 +24,9 @@ from sqlalchemy import literal_column
 from sqlalchemy.sql.expression import ColumnClause
 
 from superset.db_engine_specs.base import BaseEngineSpec
+from superset.sql_parse import Table
 from superset.utils import core as utils
+from superset.utils.columnar import read_columnar, to_df
 
 if TYPE_CHECKING:
     from superset.models.core import Database  # pragma: no cover
@@ -38,6 +40,9 @@ class BigQueryEngineSpec(BaseEngineSpec):
     engine = "bigquery"
     engine_name = "Google BigQuery"
     max_column_name_length = 128
+    post_processing_pushdown = frozenset(
+        ("aggregate", "cum", "diff", "rolling", "select", "sort")
+    )
 
     """
     https://www.python.org/dev/peps/pep-0249/#arraysize
@@ -192,6 +197,56 @@ class BigQueryEngineSpec(BaseEngineSpec):
     def epoch_ms_to_dttm(cls) -> str:
         return "TIMESTAMP_MILLIS({col})"
 
+    @classmethod
+    def create_table_from_csv(  # pylint: disable=too-many-arguments
+        cls,
+        filename: str,
+        table: Table,
+        database: "Database",
+        csv_to_df_kwargs: Dict[str, Any],
+        df_to_sql_kwargs: Dict[str, Any],
+    ) -> None:
+        """
+        Create table from contents of a csv. The whole file is read and loaded
+        with a single load job, so that a failed upload leaves nothing behind:
+        BigQuery doesn't support the transaction the file is otherwise uploaded
+        in chunk by chunk.
+        """
+        df = cls.csv_to_df(filepath_or_buffer=filename, **csv_to_df_kwargs)
+        cls._load_df(df, table, database, df_to_sql_kwargs)
+
+    @classmethod
+    def create_table_from_columnar(  # pylint: disable=too-many-arguments
+        cls,
+        filename: str,
+        table: Table,
+        database: "Database",
+        columnar_to_df_kwargs: Dict[str, Any],
+        df_to_sql_kwargs: Dict[str, Any],
+    ) -> None:
+        """
+        Create table from contents of a Parquet or Feather file. Like csv files,
+        the whole file is read and loaded with a single load job.
+        """
+        schema, chunks = read_columnar(filename, **columnar_to_df_kwargs)
+        df = pd.concat(list(chunks) or [to_df(schema.empty_table())])
+        cls._load_df(df, table, database, df_to_sql_kwargs)
+
+    @classmethod
+    def _load_df(
+        cls,
+        df: pd.DataFrame,
+        table: Table,
+        database: "Database",
+        df_to_sql_kwargs: Dict[str, Any],
+    ) -> None:
+        engine = cls.get_engine(database)
+        df_to_sql_kwargs = df_to_sql_kwargs.copy()
+        if table.schema:
+            # only add schema when it is preset and non empty
+            df_to_sql_kwargs["schema"] = table.schema
+        cls.df_to_sql(df=df, con=engine, **df_to_sql_kwargs)
+
     @classmethod
     def df_to_sql(cls, df: pd.DataFrame, **kwargs: Any) -> None:
         """
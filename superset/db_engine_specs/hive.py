@@ -39,6 +39,7 @@ from superset.extensions import cache_manager
 from superset.models.sql_lab import Query
 from superset.sql_parse import Table
 from superset.utils import core as utils
+from superset.utils.query_progress import QueryProgressTracker
 
 if TYPE_CHECKING:
     # prevent circular imports
@@ -80,6 +81,7 @@ class HiveEngineSpec(PrestoEngineSpec):
     engine = "hive"
     engine_name = "Apache Hive"
     max_column_name_length = 767
+    values_sampling_method = None
     # pylint: disable=line-too-long
     _time_grain_expressions = {
         None: "{col}",
@@ -258,6 +260,21 @@ class HiveEngineSpec(PrestoEngineSpec):
         engine = cls.get_engine(database)
         engine.execute(text(sql), **params)
 
+    @classmethod
+    def create_table_from_columnar(  # pylint: disable=too-many-arguments
+        cls,
+        filename: str,
+        table: Table,
+        database: "Database",
+        columnar_to_df_kwargs: Dict[str, Any],
+        df_to_sql_kwargs: Dict[str, Any],
+    ) -> None:
+        """
+        Hive tables are created from csv files uploaded to S3, columnar files are
+        not supported.
+        """
+        raise SupersetException("Columnar uploads are not supported by Hive")
+
     @classmethod
     def convert_dttm(cls, target_type: str, dttm: datetime) -> Optional[str]:
         tt = target_type.upper()
@@ -338,52 +355,56 @@ class HiveEngineSpec(PrestoEngineSpec):
         tracking_url = None
         job_id = None
         query_id = query.id
+        tracker = QueryProgressTracker(query, session)
         while polled.operationState in unfinished_states:
-            query = session.query(type(query)).filter_by(id=query_id).one()
-            if query.status == QueryStatus.STOPPED:
+            # fetching the logs is spent in the driver, outside of the tick
+            log = cursor.fetch_logs() or ""
+            with tracker.tick():
+                if tracker.should_stop():
+                    cursor.cancel()
+                    break
+
+                if log:
+                    log_lines = log.splitlines()
+                    progress = cls.progress(log_lines)
+                    logger.info(
+                        "Query %s: Progress total: %s", str(query_id), str(progress)
+                    )
+                    tracker.update(progress=progress)
+                    if not tracking_url:
+                        tracking_url = cls.get_tracking_url(log_lines)
+                        if tracking_url:
+                            job_id = tracking_url.split("/")[-2]
+                            logger.info(
+                                "Query %s: Found the tracking url: %s",
+                                str(query_id),
+                                tracking_url,
+                            )
+                            tracking_url = tracking_url_trans(tracking_url)
+                            logger.info(
+                                "Query %s: Transformation applied: %s",
+                                str(query_id),
+                                tracking_url,
+                            )
+                            tracker.update(tracking_url=tracking_url)
+                            logger.info(
+                                "Query %s: Job id: %s", str(query_id), str(job_id)
+                            )
+                    if job_id and len(log_lines) > last_log_line:
+                        # Wait for job id before logging things out
+                        # this allows for prefixing all log lines and becoming
+                        # searchable in something like Kibana
+                        for l in log_lines[last_log_line:]:
+                            logger.info(
+                                "Query %s: [%s] %s", str(query_id), str(job_id), l
+                            )
+                        last_log_line = len(log_lines)
+            if tracker.stopped:
                 cursor.cancel()
                 break
-
-            log = cursor.fetch_logs() or ""
-            if log:
-                log_lines = log.splitlines()
-                progress = cls.progress(log_lines)
-                logger.info(
-                    "Query %s: Progress total: %s", str(query_id), str(progress)
-                )
-                needs_commit = False
-                if progress > query.progress:
-                    query.progress = progress
-                    needs_commit = True
-                if not tracking_url:
-                    tracking_url = cls.get_tracking_url(log_lines)
-                    if tracking_url:
-                        job_id = tracking_url.split("/")[-2]
-                        logger.info(
-                            "Query %s: Found the tracking url: %s",
-                            str(query_id),
-                            tracking_url,
-                        )
-                        tracking_url = tracking_url_trans(tracking_url)
-                        logger.info(
-                            "Query %s: Transformation applied: %s",
-                            str(query_id),
-                            tracking_url,
-                        )
-                        query.tracking_url = tracking_url
-                        logger.info("Query %s: Job id: %s", str(query_id), str(job_id))
-                        needs_commit = True
-                if job_id and len(log_lines) > last_log_line:
-                    # Wait for job id before logging things out
-                    # this allows for prefixing all log lines and becoming
-                    # searchable in something like Kibana
-                    for l in log_lines[last_log_line:]:
-                        logger.info("Query %s: [%s] %s", str(query_id), str(job_id), l)
-                    last_log_line = len(log_lines)
-                if needs_commit:
-                    session.commit()
             time.sleep(hive_poll_interval)
             polled = cursor.poll()
+        tracker.finish()
 
     @classmethod
     def get_columns(
@@ -14,15 +14,84 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import logging
+import tempfile
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 from urllib import parse
 
+from pandas.io.sql import SQLTable
+from sqlalchemy.engine.base import Connection, Engine
 from sqlalchemy.engine.url import URL
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.sql import text
 
-from superset.db_engine_specs.base import BaseEngineSpec
+from superset.db_engine_specs.base import BaseEngineSpec, to_delimited_text
+from superset.exceptions import SupersetException
 from superset.utils import core as utils
 
+logger = logging.getLogger(__name__)
+
+
+class LoadDataLocalInfile:  # pylint: disable=too-few-public-methods
+    """
+    Insert rows with `LOAD DATA LOCAL INFILE`, see the `method` argument of
+    `DataFrame.to_sql()`. This requires `local_infile` to be enabled on the
+    server and in the client, e.g. with `{"connect_args": {"local_infile": 1}}`
+    in the engine parameters of the database, and falls back to regular inserts
+    otherwise.
+
+    `LOCAL` implies `IGNORE`: values the columns can't hold are converted with
+    a warning instead of failing the statement. The upload fails when the load
+    has warnings, the way inserts fail in strict mode.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = True
+
+    def __call__(
+        self,
+        table: SQLTable,
+        conn: Connection,
+        keys: List[str],
+        data_iter: Iterator[Tuple[Any, ...]],
+    ) -> None:
+        rows = list(data_iter)
+        if self.enabled:
+            try:
+                self.load_data(table, conn, keys, rows)
+                return
+            except DBAPIError as ex:
+                logger.warning(
+                    "Could not load data into %s, using inserts instead: %s",
+                    table.name,
+                    ex,
+                )
+                self.enabled = False
+        conn.execute(table.table.insert(), [dict(zip(keys, row)) for row in rows])
+
+    @staticmethod
+    def load_data(
+        table: SQLTable, conn: Connection, keys: List[str], rows: List[Tuple[Any, ...]]
+    ) -> None:
+        preparer = conn.dialect.identifier_preparer
+        # identifiers may contain colons, which text() reads as bind parameters
+        name = preparer.format_table(table.table).replace(":", "\\:")
+        columns = ", ".join(preparer.quote(key) for key in keys).replace(":", "\\:")
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".tsv") as file:
+            file.write(to_delimited_text(rows))
+            file.flush()
+            conn.execute(
+                text(
+                    f"LOAD DATA LOCAL INFILE :filename INTO TABLE {name} "
+                    f"CHARACTER SET utf8mb4 ({columns})"
+                ),
+                filename=file.name,
+            )
+        if conn.execute(text("SHOW COUNT(*) WARNINGS")).scalar():
+            _level, _code, message = conn.execute(text("SHOW WARNINGS LIMIT 1")).first()
+            raise SupersetException(f"Could not load data into {table.name}: {message}")
+
 
 class MySQLEngineSpec(BaseEngineSpec):
     engine = "mysql"
@@ -50,6 +119,10 @@ class MySQLEngineSpec(BaseEngineSpec):
 
     type_code_map: Dict[int, str] = {}  # loaded from get_datatype only if needed
 
+    @classmethod
+    def get_upload_method(cls, engine: Engine) -> Union[None, str, Callable[..., None]]:
+        return LoadDataLocalInfile()
+
     @classmethod
     def convert_dttm(cls, target_type: str, dttm: datetime) -> Optional[str]:
         tt = target_type.upper()
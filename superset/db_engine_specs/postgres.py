@@ -14,13 +14,17 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import io
+from contextlib import closing
 from datetime import datetime
-from typing import Any, List, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Callable, Iterator, List, Optional, Tuple, TYPE_CHECKING, Union
 
+from pandas.io.sql import SQLTable
 from pytz import _FixedOffset  # type: ignore
 from sqlalchemy.dialects.postgresql.base import PGInspector
+from sqlalchemy.engine.base import Connection, Engine
 
-from superset.db_engine_specs.base import BaseEngineSpec
+from superset.db_engine_specs.base import BaseEngineSpec, to_delimited_text
 from superset.utils import core as utils
 
 if TYPE_CHECKING:
@@ -33,6 +37,25 @@ class FixedOffsetTimezone(_FixedOffset):
     pass
 
 
+def copy_from_stdin(
+    table: SQLTable,
+    conn: Connection,
+    keys: List[str],
+    data_iter: Iterator[Tuple[Any, ...]],
+) -> None:
+    """
+    Insert rows with `COPY FROM STDIN`, see the `method` argument of
+    `DataFrame.to_sql()`. Requires the psycopg2 driver.
+    """
+    preparer = conn.dialect.identifier_preparer
+    statement = "COPY {} ({}) FROM STDIN".format(
+        preparer.format_table(table.table),
+        ", ".join(preparer.quote(key) for key in keys),
+    )
+    with closing(conn.connection.cursor()) as cursor:
+        cursor.copy_expert(statement, io.StringIO(to_delimited_text(data_iter)))
+
+
 class PostgresBaseEngineSpec(BaseEngineSpec):
     """ Abstract class for Postgres 'like' databases """
 
@@ -70,6 +93,16 @@ class PostgresEngineSpec(PostgresBaseEngineSpec):
     engine_aliases = ("postgres",)
     max_column_name_length = 63
     try_remove_schema_from_table_name = False
+    values_sampling_method: Optional[str] = "SYSTEM"
+    post_processing_pushdown = frozenset(
+        ("aggregate", "cum", "diff", "rolling", "select", "sort")
+    )
+
+    @classmethod
+    def get_upload_method(cls, engine: Engine) -> Union[None, str, Callable[..., None]]:
+        if engine.dialect.driver == "psycopg2":
+            return copy_from_stdin
+        return super().get_upload_method(engine)
 
     @classmethod
     def get_table_names(
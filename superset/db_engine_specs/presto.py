@@ -19,13 +19,14 @@ import logging
 import re
 import textwrap
 import time
-from collections import defaultdict, deque
+from collections import deque
 from contextlib import closing
 from datetime import datetime
 from distutils.version import StrictVersion
-from typing import Any, cast, Dict, List, Optional, Tuple, TYPE_CHECKING, Union
+from typing import Any, cast, Dict, List, Optional, Tuple, TYPE_CHECKING
 from urllib import parse
 
+import numpy as np
 import pandas as pd
 import simplejson as json
 from flask_babel import gettext as __, lazy_gettext as _
@@ -52,6 +53,7 @@ from superset.models.sql_types.presto_sql_types import (
 from superset.result_set import destringify
 from superset.sql_parse import ParsedQuery
 from superset.utils import core as utils
+from superset.utils.query_progress import QueryProgressTracker
 
 if TYPE_CHECKING:
     # prevent circular imports
@@ -111,9 +113,106 @@ def get_children(column: Dict[str, str]) -> List[Dict[str, str]]:
     raise Exception(f"Unknown type {type_}!")
 
 
+class _ExpandedData:
+    """
+    The data of a result set being expanded by `PrestoEngineSpec.expand_data`,
+    stored by column so that unnesting an array inserts all its rows at once.
+    """
+
+    # value of the rows added to the data set for the columns they don't expand
+    missing = object()
+
+    def __init__(self, columns: List[Dict[str, Any]], data: List[Dict[Any, Any]]):
+        self.size = len(data)
+        self.columns: Dict[str, np.ndarray] = {}
+        for column in columns:
+            self.columns[column["name"]] = self._array(
+                [row.get(column["name"], self.missing) for row in data]
+            )
+        self.blocks: np.ndarray = np.arange(self.size)
+        self.block_sizes: np.ndarray = np.ones(self.size, dtype=int)
+
+    def _array(self, values: Optional[List[Any]] = None) -> np.ndarray:
+        array = np.empty(self.size, dtype=object)
+        if values is None:
+            array.fill(self.missing)
+        else:
+            array[:] = values
+        return array
+
+    def get(self, name: str) -> np.ndarray:
+        if name not in self.columns:
+            self.columns[name] = self._array()
+        return self.columns[name]
+
+    @staticmethod
+    def get_value(column: np.ndarray, row: int) -> Any:
+        value = column[row]
+        if isinstance(value, str):
+            column[row] = value = destringify(value)
+        return value
+
+    def start_level(self) -> None:
+        """Start a new level of arrays, with a block for every row"""
+        self.blocks = np.arange(self.size)
+        self.block_sizes = np.ones(self.size, dtype=int)
+
+    def unnest(self, name: str) -> None:
+        """Unnest an array column into the rows of the blocks of its level"""
+        column = self.get(name)
+        arrays = [
+            None if column[row] is self.missing else self.get_value(column, row)
+            for row in self.blocks
+        ]
+        lengths = np.array([len(array) if array else 0 for array in arrays])
+        block_sizes = np.maximum(self.block_sizes, lengths)
+        if (block_sizes > self.block_sizes).any():
+            # move the rows of every block to their new position
+            blocks = np.zeros(len(block_sizes), dtype=int)
+            np.cumsum(block_sizes[:-1], out=blocks[1:])
+            offsets = np.arange(self.size) - np.repeat(self.blocks, self.block_sizes)
+            rows = np.repeat(blocks, self.block_sizes) + offsets
+            self.size = int(block_sizes.sum())
+            for key, values in self.columns.items():
+                self.columns[key] = self._array()
+                self.columns[key][rows] = values
+            column = self.columns[name]
+            self.blocks = blocks
+            self.block_sizes = block_sizes
+
+        for block, array in zip(self.blocks, arrays):
+            if array:
+                for i, value in enumerate(array):
+                    column[block + i] = value
+
+    def expand(self, name: str, children: List[str]) -> None:
+        """Expand a row column into the columns of its fields"""
+        column = self.get(name)
+        child_columns = [self.get(child) for child in children]
+        for row in range(self.size):
+            if column[row] is self.missing or not column[row]:
+                continue
+            values = self.get_value(column, row)
+            for value, child_column in zip(values, child_columns):
+                child_column[row] = value
+
+    def to_records(self, names: List[str]) -> List[Dict[str, Any]]:
+        columns = [
+            ["" if value is self.missing else value for value in self.get(name)]
+            for name in names
+        ]
+        if not columns:
+            return [{} for _ in range(self.size)]
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
+
 class PrestoEngineSpec(BaseEngineSpec):
     engine = "presto"
     engine_name = "Presto"
+    values_sampling_method: Optional[str] = "SYSTEM"
+    post_processing_pushdown = frozenset(
+        ("aggregate", "cum", "diff", "rolling", "select", "sort")
+    )
 
     _time_grain_expressions = {
         None: "{col}",
@@ -643,58 +742,29 @@ class PrestoEngineSpec(BaseEngineSpec):
         # expanding ROW types into new columns
         to_process = deque((column, 0) for column in columns)
         all_columns: List[Dict[str, Any]] = []
+        all_column_names = set()
         expanded_columns = []
         current_array_level = None
+        expanded_data = _ExpandedData(columns, data)
         while to_process:
             column, level = to_process.popleft()
-            if column["name"] not in [column["name"] for column in all_columns]:
+            name = column["name"]
+            if name not in all_column_names:
                 all_columns.append(column)
+                all_column_names.add(name)
 
-            # When unnesting arrays we need to keep track of how many extra rows
-            # were added, for each original row. This is necessary when we expand
-            # multiple arrays, so that the arrays after the first reuse the rows
-            # added by the first. every time we change a level in the nested arrays
-            # we reinitialize this.
+            # When unnesting arrays, the rows of every level are split in blocks
+            # made of a row of the previous level and the rows added for it, so
+            # that the arrays after the first reuse the rows added by the first.
             if level != current_array_level:
-                unnested_rows: Dict[int, int] = defaultdict(int)
+                expanded_data.start_level()
                 current_array_level = level
 
-            name = column["name"]
-            values: Optional[Union[str, List[Any]]]
-
             if column["type"].startswith("ARRAY("):
                 # keep processing array children; we append to the right so that
                 # multiple nested arrays are processed breadth-first
                 to_process.append((get_children(column)[0], level + 1))
-
-                # unnest array objects data into new rows
-                i = 0
-                while i < len(data):
-                    row = data[i]
-                    values = row.get(name)
-                    if isinstance(values, str):
-                        row[name] = values = destringify(values)
-                    if values:
-                        # how many extra rows we need to unnest the data?
-                        extra_rows = len(values) - 1
-
-                        # how many rows were already added for this row?
-                        current_unnested_rows = unnested_rows[i]
-
-                        # add any necessary rows
-                        missing = extra_rows - current_unnested_rows
-                        for _ in range(missing):
-                            data.insert(i + current_unnested_rows + 1, {})
-                            unnested_rows[i] += 1
-
-                        # unnest array into rows
-                        for j, value in enumerate(values):
-                            data[i + j][name] = value
-
-                        # skip newly unnested rows
-                        i += unnested_rows[i]
-
-                    i += 1
+                expanded_data.unnest(name)
 
             if column["type"].startswith("ROW("):
                 # expand columns; we append them to the left so they are added
@@ -702,18 +772,9 @@ class PrestoEngineSpec(BaseEngineSpec):
                 expanded = get_children(column)
                 to_process.extendleft((column, level) for column in expanded[::-1])
                 expanded_columns.extend(expanded)
+                expanded_data.expand(name, [column["name"] for column in expanded])
 
-                # expand row objects into new columns
-                for row in data:
-                    values = row.get(name) or []
-                    if isinstance(values, str):
-                        row[name] = values = cast(List[Any], destringify(values))
-                    for value, col in zip(values, expanded):
-                        row[col["name"]] = value
-
-        data = [
-            {k["name"]: row.get(k["name"], "") for k in all_columns} for row in data
-        ]
+        data = expanded_data.to_records([column["name"] for column in all_columns])
 
         return all_columns, data, expanded_columns
 
@@ -791,36 +852,38 @@ class PrestoEngineSpec(BaseEngineSpec):
         # if the query is done
         # https://github.com/dropbox/PyHive/blob/
         # b34bdbf51378b3979eaf5eca9e956f06ddc36ca0/pyhive/presto.py#L178
+        tracker = QueryProgressTracker(query, session)
         while polled:
-            # Update the object and wait for the kill signal.
-            stats = polled.get("stats", {})
+            with tracker.tick():
+                # Wait for the kill signal and buffer the progress updates.
+                if tracker.should_stop():
+                    cursor.cancel()
+                    break
 
-            query = session.query(type(query)).filter_by(id=query_id).one()
-            if query.status in [QueryStatus.STOPPED, QueryStatus.TIMED_OUT]:
+                stats = polled.get("stats", {})
+                if stats:
+                    state = stats.get("state")
+
+                    # if already finished, then stop polling
+                    if state == "FINISHED":
+                        break
+
+                    completed_splits = float(stats.get("completedSplits"))
+                    total_splits = float(stats.get("totalSplits"))
+                    if total_splits and completed_splits:
+                        progress = 100 * (completed_splits / total_splits)
+                        logger.info(
+                            "Query {} progress: {} / {} "  # pylint: disable=logging-format-interpolation
+                            "splits".format(query_id, completed_splits, total_splits)
+                        )
+                        tracker.update(progress=progress)
+            if tracker.stopped:
                 cursor.cancel()
                 break
-
-            if stats:
-                state = stats.get("state")
-
-                # if already finished, then stop polling
-                if state == "FINISHED":
-                    break
-
-                completed_splits = float(stats.get("completedSplits"))
-                total_splits = float(stats.get("totalSplits"))
-                if total_splits and completed_splits:
-                    progress = 100 * (completed_splits / total_splits)
-                    logger.info(
-                        "Query {} progress: {} / {} "  # pylint: disable=logging-format-interpolation
-                        "splits".format(query_id, completed_splits, total_splits)
-                    )
-                    if progress > query.progress:
-                        query.progress = progress
-                    session.commit()
             time.sleep(poll_interval)
             logger.info("Query %i: Polling the cursor for progress", query_id)
             polled = cursor.poll()
+        tracker.finish()
 
     @classmethod
     def _extract_error_message(cls, ex: Exception) -> str:
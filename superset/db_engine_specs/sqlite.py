@@ -15,8 +15,9 @@
 # specific language governing permissions and limitations
 # under the License.
 from datetime import datetime
-from typing import List, Optional, TYPE_CHECKING
+from typing import Callable, List, Optional, TYPE_CHECKING, Union
 
+from sqlalchemy.engine.base import Engine
 from sqlalchemy.engine.reflection import Inspector
 
 from superset.db_engine_specs.base import BaseEngineSpec
@@ -44,6 +45,12 @@ class SqliteEngineSpec(BaseEngineSpec):
         "1969-12-28T00:00:00Z/P1W": "DATE({col}, 'weekday 0', '-7 days')",
     }
 
+    @classmethod
+    def get_upload_method(cls, engine: Engine) -> Union[None, str, Callable[..., None]]:
+        # uploads run in a single transaction, where executemany is faster than
+        # multi-row inserts, which are limited by the number of bound parameters
+        return None
+
     @classmethod
     def epoch_to_dttm(cls) -> str:
         return "datetime({col}, 'unixepoch')"
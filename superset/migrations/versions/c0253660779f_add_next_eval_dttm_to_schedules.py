@@ -0,0 +1,46 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Add next_eval_dttm to schedules
+
+Revision ID: c0253660779f
+Revises: a8173232b786
+Create Date: 2026-10-19 00:06:34.125362
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "c0253660779f"
+down_revision = "a8173232b786"
+
+import sqlalchemy as sa
+from alembic import op
+
+
+def upgrade():
+    for table in ("report_schedule", "alerts"):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column("next_eval_dttm", sa.DateTime()))
+            batch_op.create_index(
+                op.f(f"ix_{table}_next_eval_dttm"), ["next_eval_dttm"], unique=False
+            )
+
+
+def downgrade():
+    for table in ("report_schedule", "alerts"):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_index(op.f(f"ix_{table}_next_eval_dttm"))
+            batch_op.drop_column("next_eval_dttm")
@@ -20,6 +20,7 @@ import textwrap
 from datetime import datetime
 from typing import Any, Optional
 
+import sqlalchemy as sqla
 from flask_appbuilder import Model
 from sqlalchemy import (
     Boolean,
@@ -36,7 +37,7 @@ from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import backref, relationship, RelationshipProperty
 
 from superset import db, security_manager
-from superset.models.helpers import AuditMixinNullable
+from superset.models.helpers import AuditMixinNullable, reset_next_eval_dttm
 
 metadata = Model.metadata  # pylint: disable=no-member
 
@@ -79,6 +80,9 @@ class Alert(Model, AuditMixinNullable):
 
     last_eval_dttm = Column(DateTime, default=datetime.utcnow)
     last_state = Column(String(10))
+    # The next time the crontab fires that is not scheduled yet, indexed so that
+    # the scheduler only loads the alerts that are due
+    next_eval_dttm = Column(DateTime, index=True)
 
     # Observation related columns
     sql = Column(Text, nullable=False)
@@ -138,6 +142,9 @@ class Alert(Model, AuditMixinNullable):
         return ""
 
 
+sqla.event.listen(Alert, "before_update", reset_next_eval_dttm)
+
+
 class AlertLog(Model):
     """Keeps track of alert-related operations"""
 
@@ -43,12 +43,12 @@ from sqlalchemy import (
     Table,
     Text,
 )
-from sqlalchemy.engine import Dialect, Engine, url
+from sqlalchemy.engine import Connection, Dialect, Engine, url
 from sqlalchemy.engine.reflection import Inspector
 from sqlalchemy.engine.url import make_url, URL
 from sqlalchemy.exc import ArgumentError
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapper, relationship
 from sqlalchemy.pool import NullPool
 from sqlalchemy.schema import UniqueConstraint
 from sqlalchemy.sql import expression, Select
@@ -61,6 +61,7 @@ from superset.models.helpers import AuditMixinNullable, ImportExportMixin
 from superset.models.tags import FavStarUpdater
 from superset.result_set import SupersetResultSet
 from superset.utils import cache as cache_util, core as utils
+from superset.utils.table_search import table_name_index_cache
 
 config = app.config
 custom_password_store = config["SQLALCHEMY_CUSTOM_PASSWORD_STORE"]
@@ -73,6 +74,20 @@ PASSWORD_MASK = "X" * 10
 DB_CONNECTION_MUTATOR = config["DB_CONNECTION_MUTATOR"]
 
 
+def datasource_names_cache_key(
+    database_id: int, schema: Optional[str], datasource_type: str
+) -> str:
+    """
+    The data cache key of the names of the tables or views of a schema, or of all
+    the schemas of a database when ``schema`` is None.
+
+    :param database_id: The id of the database
+    :param schema: The schema the names belong to
+    :param datasource_type: Either "table" or "view"
+    """
+    return f"db:{database_id}:schema:{schema}:{datasource_type}_list"
+
+
 class Url(Model, AuditMixinNullable):
     """Used for the short url feature"""
 
@@ -453,7 +468,9 @@ class Database(
         return sqla.inspect(engine)
 
     @cache_util.memoized_func(
-        key=lambda self, *args, **kwargs: f"db:{self.id}:schema:None:table_list",
+        key=lambda self, *args, **kwargs: datasource_names_cache_key(
+            self.id, None, "table"
+        ),
         cache=cache_manager.data_cache,
     )
     def get_all_table_names_in_database(
@@ -468,7 +485,9 @@ class Database(
         return self.db_engine_spec.get_all_datasource_names(self, "table")
 
     @cache_util.memoized_func(
-        key=lambda self, *args, **kwargs: f"db:{self.id}:schema:None:view_list",
+        key=lambda self, *args, **kwargs: datasource_names_cache_key(
+            self.id, None, "view"
+        ),
         cache=cache_manager.data_cache,
     )
     def get_all_view_names_in_database(
@@ -483,7 +502,9 @@ class Database(
         return self.db_engine_spec.get_all_datasource_names(self, "view")
 
     @cache_util.memoized_func(
-        key=lambda self, schema, *args, **kwargs: f"db:{self.id}:schema:{schema}:table_list",  # type: ignore
+        key=lambda self, schema, *args, **kwargs: datasource_names_cache_key(  # type: ignore
+            self.id, schema, "table"
+        ),
         cache=cache_manager.data_cache,
     )
     def get_all_table_names_in_schema(
@@ -515,7 +536,9 @@ class Database(
             logger.warning(ex)
 
     @cache_util.memoized_func(
-        key=lambda self, schema, *args, **kwargs: f"db:{self.id}:schema:{schema}:view_list",  # type: ignore
+        key=lambda self, schema, *args, **kwargs: datasource_names_cache_key(  # type: ignore
+            self.id, schema, "view"
+        ),
         cache=cache_manager.data_cache,
     )
     def get_all_view_names_in_schema(
@@ -697,6 +720,17 @@ sqla.event.listen(Database, "after_insert", security_manager.set_perm)
 sqla.event.listen(Database, "after_update", security_manager.set_perm)
 
 
+def invalidate_table_name_indexes(
+    _mapper: Mapper, _connection: Connection, target: Database
+) -> None:
+    """Drop the SQL Lab table search indexes of an edited or deleted database"""
+    table_name_index_cache.invalidate(target.id)
+
+
+sqla.event.listen(Database, "after_update", invalidate_table_name_indexes)
+sqla.event.listen(Database, "after_delete", invalidate_table_name_indexes)
+
+
 class Log(Model):  # pylint: disable=too-few-public-methods
 
     """ORM object used to log Superset actions to the database"""
@@ -17,7 +17,7 @@
 import json
 import logging
 from functools import partial
-from typing import Any, Callable, Dict, List, Set, Union
+from typing import Any, Dict, Iterator, List, Set, Union
 
 import sqlalchemy as sqla
 from flask_appbuilder import Model
@@ -50,7 +50,10 @@ from superset.models.helpers import AuditMixinNullable, ImportExportMixin
 from superset.models.slice import Slice
 from superset.models.tags import DashboardUpdater
 from superset.models.user_attributes import UserAttribute
-from superset.tasks.thumbnails import cache_dashboard_thumbnail
+from superset.tasks.thumbnails import (
+    schedule_dashboard_thumbnail,
+    track_dashboard_change,
+)
 from superset.utils import core as utils
 from superset.utils.decorators import debounce
 from superset.utils.urls import get_url_path
@@ -176,9 +179,13 @@ class Dashboard(  # pylint: disable=too-many-instance-attributes
     @property
     def digest(self) -> str:
         """
-        Returns a MD5 HEX digest that makes this dashboard unique
+        Returns a MD5 HEX digest of everything that affects how the dashboard
+        renders: its layout, css, metadata and the digests of its charts
         """
-        unique_string = f"{self.position_json}.{self.css}.{self.json_metadata}"
+        slice_digests = ",".join(sorted(slc.digest for slc in self.slices))
+        unique_string = (
+            f"{self.position_json}.{self.css}.{self.json_metadata}.{slice_digests}"
+        )
         return utils.md5_hex(unique_string)
 
     @property
@@ -256,7 +263,7 @@ class Dashboard(  # pylint: disable=too-many-instance-attributes
 
     def update_thumbnail(self) -> None:
         url = get_url_path("Superset.dashboard", dashboard_id_or_slug=self.id)
-        cache_dashboard_thumbnail.delay(url, self.digest, force=True)
+        schedule_dashboard_thumbnail(url, self.digest)
 
     @debounce(0.1)
     def clear_cache(self) -> None:
@@ -288,12 +295,20 @@ class Dashboard(  # pylint: disable=too-many-instance-attributes
             cls(id=dashboard_id).clear_cache()
 
     @classmethod
-    def export_dashboards(  # pylint: disable=too-many-locals
+    def export_dashboards(cls, dashboard_ids: List[int]) -> str:
+        return "".join(cls.iter_export_dashboards(dashboard_ids))
+
+    @classmethod
+    def iter_export_dashboards(  # pylint: disable=too-many-locals
         cls, dashboard_ids: List[int]
-    ) -> str:
-        copied_dashboards = []
+    ) -> Iterator[str]:
+        """
+        Export dashboards and their datasources to JSON, one dashboard or datasource
+        at a time, so that the export can be streamed.
+        """
         datasource_ids = set()
-        for dashboard_id in dashboard_ids:
+        yield '{"dashboards": ['
+        for i, dashboard_id in enumerate(dashboard_ids):
             # make sure that dashboard_id is an integer
             dashboard_id = int(dashboard_id)
             dashboard = (
@@ -321,10 +336,12 @@ class Dashboard(  # pylint: disable=too-many-instance-attributes
                 slices = copied_dashboard.__dict__.setdefault("slices", [])
                 slices.append(copied_slc)
             copied_dashboard.alter_params(remote_id=dashboard_id)
-            copied_dashboards.append(copied_dashboard)
+            yield (", " if i else "") + json.dumps(
+                copied_dashboard, cls=utils.DashboardEncoder, indent=4
+            )
 
-        eager_datasources = []
-        for datasource_id, datasource_type in datasource_ids:
+        yield '], "datasources": ['
+        for i, (datasource_id, datasource_type) in enumerate(datasource_ids):
             eager_datasource = ConnectorRegistry.get_eager_datasource(
                 db.session, datasource_type, datasource_id
             )
@@ -338,16 +355,11 @@ class Dashboard(  # pylint: disable=too-many-instance-attributes
                 field_val = getattr(eager_datasource, field_name).copy()
                 # set children without creating ORM relations
                 copied_datasource.__dict__[field_name] = field_val
-            eager_datasources.append(copied_datasource)
-
-        return json.dumps(
-            {"dashboards": copied_dashboards, "datasources": eager_datasources},
-            cls=utils.DashboardEncoder,
-            indent=4,
-        )
-
+            yield (", " if i else "") + json.dumps(
+                copied_datasource, cls=utils.DashboardEncoder, indent=4
+            )
+        yield "]}"
 
-OnDashboardChange = Callable[[Mapper, Connection, Dashboard], Any]
 
 # events for updating tags
 if is_feature_enabled("TAGGING_SYSTEM"):
@@ -356,9 +368,8 @@ if is_feature_enabled("TAGGING_SYSTEM"):
     sqla.event.listen(Dashboard, "after_delete", DashboardUpdater.after_delete)
 
 if is_feature_enabled("THUMBNAILS_SQLA_LISTENERS"):
-    update_thumbnail: OnDashboardChange = lambda _, __, dash: dash.update_thumbnail()
-    sqla.event.listen(Dashboard, "after_insert", update_thumbnail)
-    sqla.event.listen(Dashboard, "after_update", update_thumbnail)
+    sqla.event.listen(Dashboard, "after_insert", track_dashboard_change)
+    sqla.event.listen(Dashboard, "after_update", track_dashboard_change)
 
 if is_feature_enabled("DASHBOARD_CACHE"):
 
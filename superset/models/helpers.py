@@ -33,6 +33,7 @@ from flask_appbuilder.models.decorators import renders
 from flask_appbuilder.models.mixins import AuditMixin
 from flask_appbuilder.security.sqla.models import User
 from sqlalchemy import and_, or_, UniqueConstraint
+from sqlalchemy.engine.base import Connection
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import Mapper, Session
 from sqlalchemy.orm.exc import MultipleResultsFound
@@ -150,16 +151,19 @@ class ImportExportMixin:
         parent: Optional[Any] = None,
         recursive: bool = True,
         sync: Optional[List[str]] = None,
+        existing: Optional[List[Any]] = None,
     ) -> Any:
-        """Import obj from a dictionary"""
+        """Import obj from a dictionary
+
+        :param existing: The objects the imported one can match, when they were
+            already loaded, for instance all the children of the parent; when
+            None the database is queried
+        """
         if sync is None:
             sync = []
         parent_refs = cls.parent_foreign_key_mappings()
         export_fields = set(cls.export_fields) | set(parent_refs.keys()) | {"uuid"}
         new_children = {c: dict_rep[c] for c in cls.export_children if c in dict_rep}
-        unique_constrains = cls._unique_constrains()
-
-        filters = []  # Using these filters to check if obj already exists
 
         # Remove fields that should not get imported
         for k in list(dict_rep):
@@ -178,34 +182,10 @@ class ImportExportMixin:
             for k, v in parent_refs.items():
                 dict_rep[k] = getattr(parent, v)
 
-        # Add filter for parent obj
-        filters.extend([getattr(cls, k) == dict_rep.get(k) for k in parent_refs.keys()])
-
-        # Add filter for unique constraints
-        ucs = [
-            and_(
-                *[
-                    getattr(cls, k) == dict_rep.get(k)
-                    for k in cs
-                    if dict_rep.get(k) is not None
-                ]
-            )
-            for cs in unique_constrains
-        ]
-        filters.append(or_(*ucs))
-
-        # Check if object already exists in DB, break if more than one is found
-        try:
-            obj_query = session.query(cls).filter(and_(*filters))
-            obj = obj_query.one_or_none()
-        except MultipleResultsFound as ex:
-            logger.error(
-                "Error importing %s \n %s \n %s",
-                cls.__name__,
-                str(obj_query),
-                yaml.safe_dump(dict_rep),
-            )
-            raise ex
+        if existing is not None:
+            obj = cls._match_existing(existing, dict_rep, parent_refs)
+        else:
+            obj = cls._query_existing(session, dict_rep, parent_refs)
 
         if not obj:
             is_new_obj = True
@@ -215,6 +195,8 @@ class ImportExportMixin:
             if cls.export_parent and parent:
                 setattr(obj, cls.export_parent, parent)
             session.add(obj)
+            if existing is not None:
+                existing.append(obj)
         else:
             is_new_obj = False
             logger.info("Updating %s %s", obj.__tablename__, str(obj))
@@ -226,30 +208,115 @@ class ImportExportMixin:
         if recursive:
             for child in cls.export_children:
                 child_class = cls.__mapper__.relationships[child].argument.class_
+                # Load the existing children at once instead of looking up each
+                # imported child, a new object has none
+                children: List[Any] = []
+                if not is_new_obj:
+                    back_refs = child_class.parent_foreign_key_mappings()
+                    children_filters = [
+                        getattr(child_class, k) == getattr(obj, back_refs.get(k))
+                        for k in back_refs.keys()
+                    ]
+                    children = (
+                        session.query(child_class).filter(and_(*children_filters)).all()
+                    )
                 added = []
                 for c_obj in new_children.get(child, []):
                     added.append(
                         child_class.import_from_dict(
-                            session=session, dict_rep=c_obj, parent=obj, sync=sync
+                            session=session,
+                            dict_rep=c_obj,
+                            parent=obj,
+                            sync=sync,
+                            existing=children,
                         )
                     )
                 # If children should get synced, delete the ones that did not
                 # get updated.
                 if child in sync and not is_new_obj:
-                    back_refs = child_class.parent_foreign_key_mappings()
-                    delete_filters = [
-                        getattr(child_class, k) == getattr(obj, back_refs.get(k))
-                        for k in back_refs.keys()
-                    ]
-                    to_delete = set(
-                        session.query(child_class).filter(and_(*delete_filters))
-                    ).difference(set(added))
+                    to_delete = set(children).difference(set(added))
                     for o in to_delete:
                         logger.info("Deleting %s %s", child, str(obj))
                         session.delete(o)
 
         return obj
 
+    @classmethod
+    def _query_existing(
+        cls, session: Session, dict_rep: Dict[Any, Any], parent_refs: Dict[str, str],
+    ) -> Any:
+        """
+        Find the object matching a dictionary in the database: same parent and
+        same values for the non null fields of any unique constraint
+        """
+        # Add filter for parent obj
+        filters = [getattr(cls, k) == dict_rep.get(k) for k in parent_refs.keys()]
+
+        # Add filter for unique constraints
+        ucs = [
+            and_(
+                *[
+                    getattr(cls, k) == dict_rep.get(k)
+                    for k in cs
+                    if dict_rep.get(k) is not None
+                ]
+            )
+            for cs in cls._unique_constrains()
+        ]
+        filters.append(or_(*ucs))
+
+        # Check if object already exists in DB, break if more than one is found
+        try:
+            obj_query = session.query(cls).filter(and_(*filters))
+            return obj_query.one_or_none()
+        except MultipleResultsFound as ex:
+            logger.error(
+                "Error importing %s \n %s \n %s",
+                cls.__name__,
+                str(obj_query),
+                yaml.safe_dump(dict_rep),
+            )
+            raise ex
+
+    @classmethod
+    def _match_existing(
+        cls, existing: List[Any], dict_rep: Dict[Any, Any], parent_refs: Dict[str, str],
+    ) -> Any:
+        """
+        Find the object matching a dictionary among already loaded ones, the way
+        import_from_dict filters the database: same parent and same values for
+        the non null fields of any unique constraint
+        """
+
+        def value(val: Any) -> Any:
+            return str(val) if isinstance(val, uuid.UUID) else val
+
+        def matches(obj: Any, keys: Set[str]) -> bool:
+            return all(value(getattr(obj, k)) == value(dict_rep.get(k)) for k in keys)
+
+        unique_constrains = [
+            {k for k in cs if dict_rep.get(k) is not None}
+            for cs in cls._unique_constrains()
+        ]
+        unique_constrains = [cs for cs in unique_constrains if cs]
+        found = [
+            obj
+            for obj in existing
+            if matches(obj, set(parent_refs))
+            and (
+                not unique_constrains
+                or any(matches(obj, cs) for cs in unique_constrains)
+            )
+        ]
+        if len(found) > 1:
+            logger.error(
+                "Error importing %s \n %s", cls.__name__, yaml.safe_dump(dict_rep)
+            )
+            raise MultipleResultsFound(
+                "Multiple {0} match the imported one".format(cls.__name__)
+            )
+        return found[0] if found else None
+
     def export_to_dict(
         self,
         recursive: bool = True,
@@ -423,6 +490,15 @@ class AuditMixinNullable(AuditMixin):
         return Markup(f'<span class="no-wrap">{self.changed_on_humanized}</span>')
 
 
+def reset_next_eval_dttm(_mapper: Mapper, _connection: Connection, target: Any) -> None:
+    """
+    Clear the next evaluation time of a schedule whose crontab changed, so that
+    the scheduler computes it again
+    """
+    if sa.inspect(target).attrs.crontab.history.has_changes():
+        target.next_eval_dttm = None
+
+
 class QueryResult:  # pylint: disable=too-few-public-methods
 
     """Object returned by the query interface"""
@@ -435,6 +511,7 @@ class QueryResult:  # pylint: disable=too-few-public-methods
         status: str = QueryStatus.SUCCESS,
         error_message: Optional[str] = None,
         errors: Optional[List[Dict[str, Any]]] = None,
+        post_processing: Optional[List[Dict[str, Any]]] = None,
     ) -> None:
         self.df = df
         self.query = query
@@ -442,6 +519,9 @@ class QueryResult:  # pylint: disable=too-few-public-methods
         self.status = status
         self.error_message = error_message
         self.errors = errors or []
+        # the post processing operations left to apply to df, when the
+        # datasource applied the others while querying
+        self.post_processing = post_processing
 
 
 class ExtraJSONMixin:
@@ -17,6 +17,7 @@
 """A collection of ORM sqlalchemy models for Superset"""
 import enum
 
+import sqlalchemy as sqla
 from flask_appbuilder import Model
 from sqlalchemy import (
     Boolean,
@@ -35,7 +36,7 @@ from sqlalchemy.schema import UniqueConstraint
 from superset.extensions import security_manager
 from superset.models.core import Database
 from superset.models.dashboard import Dashboard
-from superset.models.helpers import AuditMixinNullable
+from superset.models.helpers import AuditMixinNullable, reset_next_eval_dttm
 from superset.models.slice import Slice
 
 metadata = Model.metadata  # pylint: disable=no-member
@@ -112,6 +113,9 @@ class ReportSchedule(Model, AuditMixinNullable):
 
     # (Alerts) Stamped last observations
     last_eval_dttm = Column(DateTime)
+    # The next time the crontab fires that is not scheduled yet, indexed so that
+    # the scheduler only loads the report schedules that are due
+    next_eval_dttm = Column(DateTime, index=True)
     last_state = Column(String(50))
     last_value = Column(Float)
     last_value_row_json = Column(Text)
@@ -180,3 +184,6 @@ class ReportExecutionLog(Model):  # pylint: disable=too-few-public-methods
         backref=backref("logs", cascade="all,delete,delete-orphan"),
         foreign_keys=[report_schedule_id],
     )
+
+
+sqla.event.listen(ReportSchedule, "before_update", reset_next_eval_dttm)
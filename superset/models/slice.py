@@ -25,14 +25,19 @@ from flask_appbuilder.models.decorators import renders
 from markupsafe import escape, Markup
 from sqlalchemy import Column, ForeignKey, Integer, String, Table, Text
 from sqlalchemy.engine.base import Connection
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, Session
 from sqlalchemy.orm.mapper import Mapper
 
 from superset import ConnectorRegistry, db, is_feature_enabled, security_manager
 from superset.legacy import update_time_range
 from superset.models.helpers import AuditMixinNullable, ImportExportMixin
 from superset.models.tags import ChartUpdater
-from superset.tasks.thumbnails import cache_chart_thumbnail
+from superset.tasks.thumbnails import (
+    discard_thumbnail_changes,
+    publish_thumbnail_changes,
+    schedule_chart_thumbnail,
+    track_chart_change,
+)
 from superset.utils import core as utils
 from superset.utils.urls import get_url_path
 
@@ -204,9 +209,14 @@ class Slice(
     @property
     def digest(self) -> str:
         """
-        Returns a MD5 HEX digest that makes this dashboard unique
+        Returns a MD5 HEX digest of everything that affects how the chart renders:
+        its form data and the last change of its datasource definition. Changes
+        of the data itself are not tracked.
         """
-        return utils.md5_hex(self.params)
+        # the table relationship is loaded along with the chart, unlike datasource
+        datasource = self.table if self.datasource_type == "table" else self.datasource
+        datasource_changed_on = datasource.changed_on if datasource else None
+        return utils.md5_hex(f"{self.params}.{datasource_changed_on}")
 
     @property
     def thumbnail_url(self) -> str:
@@ -216,6 +226,10 @@ class Slice(
         """
         return f"/api/v1/chart/{self.id}/thumbnail/{self.digest}/"
 
+    def update_thumbnail(self) -> None:
+        url = get_url_path("Superset.slice", slice_id=self.id, standalone="true")
+        schedule_chart_thumbnail(url, self.digest)
+
     @property
     def json_data(self) -> str:
         return json.dumps(self.data)
@@ -299,19 +313,13 @@ def set_related_perm(_mapper: Mapper, _connection: Connection, target: Slice) ->
     src_class = target.cls_model
     id_ = target.datasource_id
     if id_:
-        ds = db.session.query(src_class).filter_by(id=int(id_)).first()
+        # by primary key, so that a datasource in the session isn't queried again
+        ds = db.session.query(src_class).get(int(id_))
         if ds:
             target.perm = ds.perm
             target.schema_perm = ds.schema_perm
 
 
-def event_after_chart_changed(
-    _mapper: Mapper, _connection: Connection, target: Slice
-) -> None:
-    url = get_url_path("Superset.slice", slice_id=target.id, standalone="true")
-    cache_chart_thumbnail.delay(url, target.digest, force=True)
-
-
 sqla.event.listen(Slice, "before_insert", set_related_perm)
 sqla.event.listen(Slice, "before_update", set_related_perm)
 
@@ -323,5 +331,8 @@ if is_feature_enabled("TAGGING_SYSTEM"):
 
 # events for updating tags
 if is_feature_enabled("THUMBNAILS_SQLA_LISTENERS"):
-    sqla.event.listen(Slice, "after_insert", event_after_chart_changed)
-    sqla.event.listen(Slice, "after_update", event_after_chart_changed)
+    sqla.event.listen(Slice, "after_insert", track_chart_change)
+    sqla.event.listen(Slice, "after_update", track_chart_change)
+    # the thumbnails of the dashboards are updated by the same hooks
+    sqla.event.listen(Session, "after_commit", publish_thumbnail_changes)
+    sqla.event.listen(Session, "after_rollback", discard_thumbnail_changes)
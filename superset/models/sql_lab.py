@@ -36,7 +36,7 @@ from sqlalchemy import (
     Text,
 )
 from sqlalchemy.engine.url import URL
-from sqlalchemy.orm import backref, relationship
+from sqlalchemy.orm import backref, relationship, Session
 
 from superset import security_manager
 from superset.models.helpers import (
@@ -47,6 +47,11 @@ from superset.models.helpers import (
 from superset.models.tags import QueryUpdater
 from superset.sql_parse import CtasMethod, ParsedQuery, Table
 from superset.utils.core import QueryStatus, user_label
+from superset.utils.query_feed import (
+    discard_query_changes,
+    publish_query_changes,
+    track_query_change,
+)
 
 
 class Query(Model, ExtraJSONMixin):
@@ -333,3 +338,9 @@ class TableSchema(Model, AuditMixinNullable, ExtraJSONMixin):
 sqla.event.listen(SavedQuery, "after_insert", QueryUpdater.after_insert)
 sqla.event.listen(SavedQuery, "after_update", QueryUpdater.after_update)
 sqla.event.listen(SavedQuery, "after_delete", QueryUpdater.after_delete)
+
+# events for publishing query changes to the SQL Lab change feed
+sqla.event.listen(Query, "after_insert", track_query_change)
+sqla.event.listen(Query, "after_update", track_query_change)
+sqla.event.listen(Session, "after_commit", publish_query_changes)
+sqla.event.listen(Session, "after_rollback", discard_query_changes)
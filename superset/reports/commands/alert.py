@@ -16,10 +16,15 @@
 # under the License.
 import json
 import logging
+from collections import defaultdict
+from multiprocessing.pool import ThreadPool
 from operator import eq, ge, gt, le, lt, ne
-from typing import Optional
+from threading import BoundedSemaphore
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING, Union
 
 import numpy as np
+import pandas as pd
+from flask import current_app
 from flask_babel import lazy_gettext as _
 
 from superset import jinja_context
@@ -30,6 +35,10 @@ from superset.reports.commands.exceptions import (
     AlertQueryMultipleColumnsError,
     AlertQueryMultipleRowsError,
 )
+from superset.utils.dates import now_as_float
+
+if TYPE_CHECKING:
+    from superset.models.core import Database
 
 logger = logging.getLogger(__name__)
 
@@ -37,9 +46,93 @@ logger = logging.getLogger(__name__)
 OPERATOR_FUNCTIONS = {">=": ge, ">": gt, "<=": le, "<": lt, "==": eq, "!=": ne}
 
 
+class AlertQueryResults:
+    """
+    Results of alert queries by database and rendered SQL, so that the alerts of
+    a scheduler tick that share a query run it once.
+    """
+
+    def __init__(self) -> None:
+        self._results: Dict[Tuple[int, str], Union[pd.DataFrame, Exception]] = {}
+
+    @staticmethod
+    def render_sql(database: "Database", sql: str) -> str:
+        sql_template = jinja_context.get_template_processor(database=database)
+        return sql_template.process_template(sql)
+
+    @staticmethod
+    def _execute(database: "Database", sql: str) -> Union[pd.DataFrame, Exception]:
+        stats_logger = current_app.config["STATS_LOGGER"]
+        start = now_as_float()
+        try:
+            df = database.get_df(sql)
+        except Exception as ex:  # pylint: disable=broad-except
+            # raised again for every alert that shares the query
+            stats_logger.incr("alert_query.error")
+            return ex
+        stats_logger.timing("alert_query.time", now_as_float() - start)
+        return df
+
+    def prefetch(self, alerts: Iterable[Tuple["Database", str]]) -> None:
+        """
+        Run the distinct queries of the alerts, running at most
+        ALERT_QUERY_CONCURRENCY of them at once per database
+
+        :param alerts: The database and SQL of each alert
+        """
+        app = current_app._get_current_object()  # pylint: disable=protected-access
+        stats_logger = app.config["STATS_LOGGER"]
+        concurrency = max(app.config["ALERT_QUERY_CONCURRENCY"], 1)
+
+        groups: Dict[Tuple[int, str], List["Database"]] = defaultdict(list)
+        for database, sql in alerts:
+            try:
+                key = (database.id, self.render_sql(database, sql))
+            except Exception:  # pylint: disable=broad-except
+                # the alert fails on its own when it gets its result
+                logger.exception("Failed at rendering the alert query")
+                continue
+            if key not in self._results:
+                groups[key].append(database)
+        if not groups:
+            return
+        for databases in groups.values():
+            stats_logger.gauge("alert_query.group_size", len(databases))
+
+        slots = {key[0]: BoundedSemaphore(concurrency) for key in groups}
+
+        def execute(key: Tuple[int, str]) -> Union[pd.DataFrame, Exception]:
+            with app.app_context(), slots[key[0]]:
+                return self._execute(groups[key][0], key[1])
+
+        queries = list(groups)
+        pool = ThreadPool(min(len(queries), concurrency * len(slots)))
+        results = pool.map(execute, queries)
+        pool.close()
+        pool.join()
+        self._results.update(zip(queries, results))
+
+    def get_df(self, database: "Database", sql: str) -> pd.DataFrame:
+        """
+        Get the result of the query of an alert, running it unless it already ran
+        """
+        key = (database.id, self.render_sql(database, sql))
+        if key not in self._results:
+            self._results[key] = self._execute(database, key[1])
+        result = self._results[key]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
 class AlertCommand(BaseCommand):
-    def __init__(self, report_schedule: ReportSchedule):
+    def __init__(
+        self,
+        report_schedule: ReportSchedule,
+        query_results: Optional[AlertQueryResults] = None,
+    ):
         self._report_schedule = report_schedule
+        self._query_results = query_results or AlertQueryResults()
         self._result: Optional[float] = None
 
     def run(self) -> bool:
@@ -86,11 +179,9 @@ class AlertCommand(BaseCommand):
         """
         Validate the query result as a Pandas DataFrame
         """
-        sql_template = jinja_context.get_template_processor(
-            database=self._report_schedule.database
+        df = self._query_results.get_df(
+            self._report_schedule.database, self._report_schedule.sql
         )
-        rendered_sql = sql_template.process_template(self._report_schedule.sql)
-        df = self._report_schedule.database.get_df(rendered_sql)
 
         if df.empty:
             return
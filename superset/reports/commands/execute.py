@@ -15,9 +15,12 @@
 # specific language governing permissions and limitations
 # under the License.
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from multiprocessing.pool import ThreadPool
+from typing import List, Optional, Tuple, TYPE_CHECKING
 
+from flask import current_app
 from sqlalchemy.orm import Session
 
 from superset import app, thumbnail_cache
@@ -30,7 +33,7 @@ from superset.models.reports import (
     ReportSchedule,
     ReportScheduleType,
 )
-from superset.reports.commands.alert import AlertCommand
+from superset.reports.commands.alert import AlertCommand, AlertQueryResults
 from superset.reports.commands.exceptions import (
     ReportScheduleAlertGracePeriodError,
     ReportScheduleExecuteUnexpectedError,
@@ -41,9 +44,14 @@ from superset.reports.commands.exceptions import (
 )
 from superset.reports.dao import ReportScheduleDAO
 from superset.reports.notifications import create_notification
-from superset.reports.notifications.base import NotificationContent, ScreenshotData
+from superset.reports.notifications.base import (
+    BaseNotification,
+    NotificationContent,
+    ScreenshotData,
+)
 from superset.reports.notifications.exceptions import NotificationError
 from superset.utils.celery import session_scope
+from superset.utils.hashing import md5_sha_from_dict
 from superset.utils.screenshots import (
     BaseScreenshot,
     ChartScreenshot,
@@ -51,8 +59,16 @@ from superset.utils.screenshots import (
 )
 from superset.utils.urls import get_url_path
 
+if TYPE_CHECKING:
+    from flask_appbuilder.security.sqla.models import User
+
 logger = logging.getLogger(__name__)
 
+# how long a report waits for the screenshot taken by another report, and how
+# often it checks whether it was taken
+SCREENSHOT_LOCK_TIMEOUT = 300
+SCREENSHOT_LOCK_POLL_SECONDS = 1
+
 
 class AsyncExecuteReportScheduleCommand(BaseCommand):
     """
@@ -61,10 +77,21 @@ class AsyncExecuteReportScheduleCommand(BaseCommand):
     - On Alerts uses related Command AlertCommand and sends configured notifications
     """
 
-    def __init__(self, model_id: int, scheduled_dttm: datetime):
+    def __init__(
+        self,
+        model_id: int,
+        scheduled_dttm: datetime,
+        query_results: Optional[AlertQueryResults] = None,
+        send: bool = True,
+    ):
         self._model_id = model_id
         self._model: Optional[ReportSchedule] = None
         self._scheduled_dttm = scheduled_dttm
+        self._query_results = query_results
+        self._send_notifications = send
+        # start of the execution of a triggered alert whose notifications are
+        # left to AsyncSendReportScheduleCommand
+        self.triggered_dttm: Optional[datetime] = None
 
     def set_state_and_log(
         self,
@@ -140,6 +167,56 @@ class AsyncExecuteReportScheduleCommand(BaseCommand):
             dashboard_id_or_slug=report_schedule.dashboard_id,
         )
 
+    @staticmethod
+    def _compute_screenshot(
+        screenshot: BaseScreenshot, user: Optional["User"]
+    ) -> Optional[bytes]:
+        """
+        Take a screenshot, or share the one taken by another report of the same
+        chart or dashboard version in the last REPORT_SCREENSHOT_CACHE_SECONDS.
+        Concurrent workers wait for the one holding the lock to take it.
+        """
+        cache_timeout = app.config["REPORT_SCREENSHOT_CACHE_SECONDS"]
+        if not cache_timeout or not thumbnail_cache:
+            return screenshot.compute_and_cache(
+                user=user, cache=thumbnail_cache, force=True
+            )
+        cache_key = md5_sha_from_dict(
+            {
+                "type": "report",
+                "url": screenshot.url,
+                "digest": screenshot.digest,
+                "window_size": screenshot.window_size,
+                "user": user.username if user else None,
+            }
+        )
+        lock_key = f"{cache_key}_lock"
+        deadline = time.monotonic() + SCREENSHOT_LOCK_TIMEOUT
+        locked = False
+        while True:
+            image_data = thumbnail_cache.get(cache_key)
+            if image_data:
+                logger.info("Sharing the report screenshot of %s", screenshot.url)
+                return image_data
+            if thumbnail_cache.add(lock_key, True, timeout=SCREENSHOT_LOCK_TIMEOUT):
+                locked = True
+                break
+            if time.monotonic() > deadline:
+                logger.warning("Timed out waiting for the screenshot of another report")
+                break
+            time.sleep(SCREENSHOT_LOCK_POLL_SECONDS)
+        try:
+            image_data = screenshot.compute_and_cache(
+                user=user, cache=thumbnail_cache, force=True
+            )
+            if image_data:
+                thumbnail_cache.set(cache_key, image_data, timeout=cache_timeout)
+            return image_data
+        finally:
+            # the lock of a report that timed out waiting is still held by another
+            if locked:
+                thumbnail_cache.delete(lock_key)
+
     def _get_screenshot(self, report_schedule: ReportSchedule) -> ScreenshotData:
         """
         Get a chart or dashboard screenshot
@@ -153,9 +230,7 @@ class AsyncExecuteReportScheduleCommand(BaseCommand):
             screenshot = DashboardScreenshot(url, report_schedule.dashboard.digest)
         image_url = self._get_url(report_schedule, user_friendly=True)
         user = security_manager.find_user(app.config["THUMBNAIL_SELENIUM_USER"])
-        image_data = screenshot.compute_and_cache(
-            user=user, cache=thumbnail_cache, force=True,
-        )
+        image_data = self._compute_screenshot(screenshot, user)
         if not image_data:
             raise ReportScheduleScreenshotFailedError()
         return ScreenshotData(url=image_url, image=image_data)
@@ -176,19 +251,34 @@ class AsyncExecuteReportScheduleCommand(BaseCommand):
 
     def _send(self, report_schedule: ReportSchedule) -> None:
         """
-        Creates the notification content and sends them to all recipients
+        Creates the notification content and sends them to all recipients, at most
+        REPORT_NOTIFICATION_CONCURRENCY of them at once
 
         :raises: ReportScheduleNotificationError
         """
-        notification_errors = []
         notification_content = self._get_notification_content(report_schedule)
-        for recipient in report_schedule.recipients:
-            notification = create_notification(recipient, notification_content)
-            try:
-                notification.send()
-            except NotificationError as ex:
-                # collect notification errors but keep processing them
-                notification_errors.append(str(ex))
+        notifications = [
+            create_notification(recipient, notification_content)
+            for recipient in report_schedule.recipients
+        ]
+        if not notifications:
+            return
+        real_app = current_app._get_current_object()  # pylint: disable=protected-access
+
+        def send(notification: BaseNotification) -> Optional[str]:
+            with real_app.app_context():
+                try:
+                    notification.send()
+                except NotificationError as ex:
+                    # collect notification errors but keep processing them
+                    return str(ex)
+            return None
+
+        concurrency = max(app.config["REPORT_NOTIFICATION_CONCURRENCY"], 1)
+        with ThreadPool(min(len(notifications), concurrency)) as pool:
+            notification_errors = [
+                error for error in pool.map(send, notifications) if error is not None
+            ]
         if notification_errors:
             raise ReportScheduleNotificationError(";".join(notification_errors))
 
@@ -202,9 +292,12 @@ class AsyncExecuteReportScheduleCommand(BaseCommand):
                 self.set_state_and_log(session, start_dttm, ReportLogState.WORKING)
                 # If it's an alert check if the alert is triggered
                 if self._model.type == ReportScheduleType.ALERT:
-                    if not AlertCommand(self._model).run():
+                    if not AlertCommand(self._model, self._query_results).run():
                         self.set_state_and_log(session, start_dttm, ReportLogState.NOOP)
                         return
+                    if not self._send_notifications:
+                        self.triggered_dttm = start_dttm
+                        return
 
                 self._send(self._model)
 
@@ -239,18 +332,129 @@ class AsyncExecuteReportScheduleCommand(BaseCommand):
         self._model = ReportScheduleDAO.find_by_id(self._model_id, session=session)
         if not self._model:
             raise ReportScheduleNotFoundError()
-        # Avoid overlap processing
-        if self._model.last_state == ReportLogState.WORKING:
-            raise ReportSchedulePreviousWorkingError()
+        self.validate_schedule(self._model, session)
+
+    @staticmethod
+    def validate_schedule(
+        report_schedule: ReportSchedule, session: Optional[Session] = None
+    ) -> None:
+        """
+        Check that a report schedule can run now
+
+        :raises: ReportSchedulePreviousWorkingError
+        :raises: ReportScheduleAlertGracePeriodError
+        """
+        # Avoid overlap processing, unless the previous execution was lost
+        if report_schedule.last_state == ReportLogState.WORKING:
+            working_timeout = timedelta(
+                seconds=app.config["REPORT_WORKING_TIMEOUT_SECONDS"]
+            )
+            if (
+                not report_schedule.last_eval_dttm
+                or datetime.utcnow() - working_timeout < report_schedule.last_eval_dttm
+            ):
+                raise ReportSchedulePreviousWorkingError()
+            logger.warning(
+                "Report schedule %s reached its working timeout", report_schedule.id
+            )
         # Check grace period
-        if self._model.type == ReportScheduleType.ALERT:
+        if report_schedule.type == ReportScheduleType.ALERT:
             last_success = ReportScheduleDAO.find_last_success_log(session)
             if (
                 last_success
-                and self._model.last_state
+                and report_schedule.last_state
                 in (ReportLogState.SUCCESS, ReportLogState.NOOP)
-                and self._model.grace_period
-                and datetime.utcnow() - timedelta(seconds=self._model.grace_period)
+                and report_schedule.grace_period
+                and datetime.utcnow() - timedelta(seconds=report_schedule.grace_period)
                 < last_success.end_dttm
             ):
                 raise ReportScheduleAlertGracePeriodError()
+
+
+class AsyncSendReportScheduleCommand(AsyncExecuteReportScheduleCommand):
+    """
+    Send the notifications of an alert triggered by AsyncExecuteAlertsCommand,
+    and log the end of its execution
+    """
+
+    def __init__(self, model_id: int, scheduled_dttm: datetime, start_dttm: datetime):
+        super().__init__(model_id, scheduled_dttm)
+        self._start_dttm = start_dttm
+
+    def run(self) -> None:
+        with session_scope(nullpool=True) as session:
+            self._model = ReportScheduleDAO.find_by_id(self._model_id, session=session)
+            if not self._model:
+                raise ReportScheduleNotFoundError()
+            state = ReportLogState.ERROR
+            error_message = None
+            try:
+                self._send(self._model)
+                state = ReportLogState.SUCCESS
+            except Exception as ex:
+                error_message = str(ex)
+                session.rollback()
+                raise
+            finally:
+                # the alert was left working by AsyncExecuteAlertsCommand, and
+                # would refuse to run again if it stayed so after any error
+                self.set_state_and_log(
+                    session, self._start_dttm, state, error_message=error_message
+                )
+                session.commit()
+
+
+class AsyncExecuteAlertsCommand(BaseCommand):
+    """
+    Evaluate the alerts of a scheduler tick that query the same database, running
+    each distinct alert query once and sharing its result between the alerts.
+    The notifications of the triggered alerts are left to
+    AsyncSendReportScheduleCommand, so that they can be sent by separate tasks.
+    """
+
+    def __init__(self, model_ids: List[int], scheduled_dttm: datetime):
+        self._model_ids = model_ids
+        self._models: List[ReportSchedule] = []
+        self._scheduled_dttm = scheduled_dttm
+
+    def run(self) -> List[Tuple[int, datetime]]:
+        """
+        :return: The ids of the triggered alerts, with the start of their execution
+        """
+        query_results = AlertQueryResults()
+        with session_scope(nullpool=True) as session:
+            self.validate(session=session)
+            query_results.prefetch(
+                (model.database, model.sql) for model in self._models
+            )
+
+        triggered = []
+        for model_id in self._model_ids:
+            command = AsyncExecuteReportScheduleCommand(
+                model_id, self._scheduled_dttm, query_results, send=False
+            )
+            try:
+                command.run()
+            except CommandException as ex:
+                logger.error("An exception occurred while executing the alert: %s", ex)
+            except Exception:  # pylint: disable=broad-except
+                # keep executing the other alerts of the group
+                logger.exception("An unexpected error occurred executing an alert")
+            if command.triggered_dttm:
+                triggered.append((model_id, command.triggered_dttm))
+        return triggered
+
+    def validate(  # pylint: disable=arguments-differ
+        self, session: Session = None
+    ) -> None:
+        # only the queries of the alerts that can run now are prefetched, the
+        # others fail their validation again when they are executed
+        self._models = []
+        for model in ReportScheduleDAO.find_by_ids(self._model_ids, session=session):
+            if model.type != ReportScheduleType.ALERT or not model.database:
+                continue
+            try:
+                AsyncExecuteReportScheduleCommand.validate_schedule(model, session)
+            except CommandException:
+                continue
+            self._models.append(model)
@@ -19,6 +19,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from flask_appbuilder import Model
+from sqlalchemy import or_
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
@@ -202,6 +203,27 @@ class ReportScheduleDAO(BaseDAO):
             session.query(ReportSchedule).filter(ReportSchedule.active.is_(True)).all()
         )
 
+    @staticmethod
+    def find_due(
+        stop_at: datetime, session: Optional[Session] = None
+    ) -> List[ReportSchedule]:
+        """
+        Find the active reports that are due before stop_at, or that have not been
+        scheduled since their crontab changed
+        """
+        session = session or db.session
+        return (
+            session.query(ReportSchedule)
+            .filter(
+                ReportSchedule.active.is_(True),
+                or_(
+                    ReportSchedule.next_eval_dttm.is_(None),
+                    ReportSchedule.next_eval_dttm < stop_at,
+                ),
+            )
+            .all()
+        )
+
     @staticmethod
     def find_last_success_log(
         session: Optional[Session] = None,
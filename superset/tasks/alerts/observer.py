@@ -22,15 +22,17 @@ from typing import Optional
 import pandas as pd
 from sqlalchemy.orm import Session
 
-from superset import jinja_context
 from superset.models.alerts import Alert, SQLObservation
+from superset.reports.commands.alert import AlertQueryResults
 
 logger = logging.getLogger("tasks.email_reports")
 
 
 # Session needs to be passed along in the celery workers and db.session cannot be used.
 # For more info see: https://github.com/apache/incubator-superset/issues/10530
-def observe(alert_id: int, session: Session) -> Optional[str]:
+def observe(
+    alert_id: int, session: Session, query_results: Optional[AlertQueryResults] = None
+) -> Optional[str]:
     """Collect observations for the alert.
     Returns an error message if the observer value was not valid
     """
@@ -39,9 +41,8 @@ def observe(alert_id: int, session: Session) -> Optional[str]:
 
     value = None
 
-    tp = jinja_context.get_template_processor(database=alert.database)
-    rendered_sql = tp.process_template(alert.sql)
-    df = alert.database.get_df(rendered_sql)
+    query_results = query_results or AlertQueryResults()
+    df = query_results.get_df(alert.database, alert.sql)
 
     error_msg = validate_observer_result(df, alert.id, alert.label)
 
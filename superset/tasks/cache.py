@@ -18,25 +18,34 @@
 
 import json
 import logging
-from typing import Any, Dict, List, Optional, Union
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+from typing import Any, Dict, List, Optional, Tuple, Union
 from urllib import request
 from urllib.error import URLError
 
 from celery.utils.log import get_task_logger
-from sqlalchemy import and_, func
-
-from superset import app, db
-from superset.extensions import celery_app
-from superset.models.core import Log
-from superset.models.dashboard import Dashboard
+from flask import current_app, g
+from sqlalchemy import and_, func, select
+
+from superset import app, db, security_manager
+from superset.common.distinct_values import get_distinct_values
+from superset.db_engine_specs.base import BaseEngineSpec
+from superset.extensions import cache_manager, celery_app
+from superset.models.core import Database, datasource_names_cache_key, Log
+from superset.models.dashboard import Dashboard, dashboard_slices
 from superset.models.slice import Slice
 from superset.models.tags import Tag, TaggedObject
-from superset.utils.core import parse_human_datetime
+from superset.utils.core import DatasourceName, parse_human_datetime
+from superset.utils.dates import now_as_float
 from superset.views.utils import build_extra_filters
 
 logger = get_task_logger(__name__)
 logger.setLevel(logging.INFO)
 
+# how long the table and view names refreshed by update-datasources-cache are cached
+DATASOURCES_CACHE_TIMEOUT = 24 * 60 * 60
+
 
 def get_form_data(
     chart_id: int, dashboard: Optional[Dashboard] = None
@@ -295,3 +304,234 @@ def cache_warmup(
             results["errors"].append(url)
 
     return results
+
+
+@celery_app.task(name="cache-warmup-filter-values")
+def cache_warmup_filter_values(
+    dashboard_ids: Optional[List[int]] = None,
+) -> Dict[str, List[str]]:
+    """
+    Warm up the distinct values of the columns used in filter box charts.
+
+    Filter widgets fetch these values through `/superset/filter/`, precomputing
+    them keeps the first dashboard load from scanning the underlying tables. Can
+    be restricted to the filter boxes of some dashboards:
+
+        CELERYBEAT_SCHEDULE = {
+            'cache-warmup-filter-values-hourly': {
+                'task': 'cache-warmup-filter-values',
+                'schedule': crontab(minute=1, hour='*'),  # @hourly
+                'kwargs': {'dashboard_ids': [1, 2]},
+            },
+        }
+
+    """
+    session = db.create_scoped_session()
+    query = session.query(Slice).filter(Slice.viz_type == "filter_box")
+    if dashboard_ids:
+        query = query.filter(
+            Slice.id.in_(
+                select([dashboard_slices.c.slice_id]).where(
+                    dashboard_slices.c.dashboard_id.in_(dashboard_ids)
+                )
+            )
+        )
+
+    results: Dict[str, List[str]] = {"success": [], "errors": []}
+    with app.test_request_context():
+        g.user = security_manager.find_user(app.config["THUMBNAIL_SELENIUM_USER"])
+        for chart in query.all():
+            datasource = chart.datasource
+            if not datasource:
+                continue
+            for filter_config in chart.form_data.get("filter_configs") or []:
+                column = filter_config.get("column")
+                if not column:
+                    continue
+                key = f"{datasource.uid}:{column}"
+                try:
+                    logger.info("Fetching values of %s", key)
+                    get_distinct_values(datasource, column, force=True)
+                    results["success"].append(key)
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception("Error warming up filter values!")
+                    results["errors"].append(key)
+
+    return results
+
+
+def _refresh_schema_datasources(
+    database_id: int, schema: str, cache_timeout: int
+) -> Tuple[List[DatasourceName], List[DatasourceName]]:
+    database = db.session.query(Database).get(database_id)
+    tables = database.get_all_table_names_in_schema(
+        schema=schema, force=True, cache=True, cache_timeout=cache_timeout
+    )
+    views = database.get_all_view_names_in_schema(
+        schema=schema, force=True, cache=True, cache_timeout=cache_timeout
+    )
+    return tables or [], views or []
+
+
+def _refresh_schemas_datasources(
+    database_id: int, schemas: List[str], cache_timeout: int, schema_concurrency: int
+) -> Tuple[List[DatasourceName], List[DatasourceName]]:
+    """
+    List the schemas at most ``schema_concurrency`` at once, and cache the names of
+    the tables and views of the whole database they add up to.
+    """
+    flask_app = current_app._get_current_object()  # pylint: disable=protected-access
+
+    def refresh_schema(
+        schema: str,
+    ) -> Tuple[List[DatasourceName], List[DatasourceName]]:
+        with flask_app.app_context():
+            return _refresh_schema_datasources(database_id, schema, cache_timeout)
+
+    pool = ThreadPool(min(len(schemas), schema_concurrency))
+    results = pool.map(refresh_schema, schemas)
+    pool.close()
+    pool.join()
+    tables = [table for schema_tables, _views in results for table in schema_tables]
+    views = [view for _tables, schema_views in results for view in schema_views]
+    # what Database.get_all_table_names_in_database and
+    # Database.get_all_view_names_in_database cache
+    cache_manager.data_cache.set_many(
+        {
+            datasource_names_cache_key(database_id, None, "table"): tables,
+            datasource_names_cache_key(database_id, None, "view"): views,
+        },
+        timeout=cache_timeout,
+    )
+    return tables, views
+
+
+def refresh_datasources_cache(
+    database_id: int,
+    cache_timeout: int = DATASOURCES_CACHE_TIMEOUT,
+    schema_concurrency: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Refresh the cached names of the tables and views of a database, listed by SQL
+    Lab. The schemas are listed at most DATASOURCES_CACHE_REFRESH_CONCURRENCY at
+    once, unless the engine lists all the tables of a database in a single query.
+
+    :param database_id: The id of the database
+    :param cache_timeout: Time in seconds the names are cached
+    :param schema_concurrency: Number of schemas listed at once
+    :return: The duration of the refresh and the number of schemas, tables and views
+    """
+    flask_app = current_app._get_current_object()  # pylint: disable=protected-access
+    stats_logger = flask_app.config["STATS_LOGGER"]
+    schema_concurrency = max(
+        schema_concurrency or flask_app.config["DATASOURCES_CACHE_REFRESH_CONCURRENCY"],
+        1,
+    )
+    start_time = now_as_float()
+    database = db.session.query(Database).get(database_id)
+    db_engine_spec = database.db_engine_spec
+    schemas: List[str] = []
+    if (
+        db_engine_spec.get_all_datasource_names.__func__  # type: ignore
+        is BaseEngineSpec.get_all_datasource_names.__func__  # type: ignore
+    ):
+        schemas = database.get_all_schema_names(
+            force=True,
+            cache=database.schema_cache_enabled,
+            cache_timeout=database.schema_cache_timeout,
+        )
+
+    if schemas:
+        tables, views = _refresh_schemas_datasources(
+            database_id, schemas, cache_timeout, schema_concurrency
+        )
+    else:
+        tables = database.get_all_table_names_in_database(
+            force=True, cache=True, cache_timeout=cache_timeout
+        )
+        views = database.get_all_view_names_in_database(
+            force=True, cache=True, cache_timeout=cache_timeout
+        )
+
+    duration = now_as_float() - start_time
+    stats_logger.timing("update_datasources_cache.time", duration)
+    stats_logger.gauge("update_datasources_cache.tables", len(tables))
+    stats_logger.gauge("update_datasources_cache.views", len(views))
+    result = {
+        "database": database.database_name,
+        "duration": duration / 1000,
+        "schemas": len(schemas),
+        "tables": len(tables),
+        "views": len(views),
+    }
+    logger.info("Refreshed the datasources cache: %s", result)
+    return result
+
+
+def refresh_datasources_caches(
+    database_ids: List[int],
+    concurrency: Optional[int] = None,
+    timeout: Optional[int] = None,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Refresh the cached table and view names of databases concurrently, so that a
+    slow database doesn't hold back the others.
+
+    :param database_ids: The ids of the databases
+    :param concurrency: Number of databases refreshed at once, defaults to
+        DATASOURCES_CACHE_REFRESH_CONCURRENCY
+    :param timeout: Time in seconds after which the refresh of a database is
+        abandoned, defaults to DATASOURCES_CACHE_REFRESH_TIMEOUT
+    :return: The result of the refresh of each database, or its error
+    """
+    if not database_ids:
+        return {}
+    flask_app = current_app._get_current_object()  # pylint: disable=protected-access
+    concurrency = (
+        concurrency or flask_app.config["DATASOURCES_CACHE_REFRESH_CONCURRENCY"]
+    )
+    timeout = timeout or flask_app.config["DATASOURCES_CACHE_REFRESH_TIMEOUT"]
+
+    def run(database_id: int) -> Dict[str, Any]:
+        with flask_app.app_context():
+            return refresh_datasources_cache(database_id)
+
+    def refresh(database_id: int) -> Dict[str, Any]:
+        # the refresh runs in a thread of its own so that it can be abandoned,
+        # database drivers can't be interrupted
+        runner = ThreadPool(1)
+        async_result = runner.apply_async(run, (database_id,))
+        runner.close()
+        try:
+            return async_result.get(timeout)
+        except multiprocessing.TimeoutError:
+            logger.error("Timed out refreshing the datasources of %s", database_id)
+            return {"error": f"Timed out after {timeout} seconds"}
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.exception("Error refreshing the datasources of %s", database_id)
+            return {"error": str(ex)}
+
+    pool = ThreadPool(min(len(database_ids), max(concurrency, 1)))
+    results = pool.map(refresh, database_ids)
+    pool.close()
+    pool.join()
+    return dict(zip(database_ids, results))
+
+
+@celery_app.task(name="update-datasources-cache")
+def update_datasources_cache(database_id: int) -> Dict[str, Any]:
+    """
+    Refresh the cached names of the tables and views of a database. Databases can
+    be refreshed on a schedule by the workers with:
+
+        CELERYBEAT_SCHEDULE = {
+            'update-datasources-cache-daily': {
+                'task': 'update-datasources-cache',
+                'schedule': crontab(minute=0, hour=3),
+                'kwargs': {'database_id': 1},
+                'options': {'soft_time_limit': 30 * 60},
+            },
+        }
+
+    """
+    return refresh_datasources_cache(database_id)
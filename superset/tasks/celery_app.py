@@ -20,12 +20,17 @@ This is the main entrypoint used by Celery workers. As such,
 it needs to call create_app() in order to initialize things properly
 """
 
+from typing import Any
+
+from celery.signals import worker_process_shutdown
+
 # Superset framework imports
 from superset import create_app
 from superset.extensions import celery_app
+from superset.utils.webdriver import close_webdriver_pools
 
 # Init the Flask app / configure everything
-create_app()
+create_app(celery_worker=True)
 
 # Need to import late, as the celery_app will have been setup by "create_app()"
 # pylint: disable=wrong-import-position, unused-import
@@ -33,3 +38,9 @@ from . import cache, schedules, scheduler  # isort:skip
 
 # Export the celery app globally for Celery (as run on the cmd line) to find
 app = celery_app
+
+
+@worker_process_shutdown.connect
+def close_browser_sessions(**kwargs: Any) -> None:  # pylint: disable=unused-argument
+    # pool workers exit without running the atexit handlers
+    close_webdriver_pools()
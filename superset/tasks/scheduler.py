@@ -15,14 +15,20 @@
 # specific language governing permissions and limitations
 # under the License.
 import logging
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Iterator
+from typing import Dict, List, Tuple
 
 import croniter
 
 from superset.commands.exceptions import CommandException
 from superset.extensions import celery_app
-from superset.reports.commands.execute import AsyncExecuteReportScheduleCommand
+from superset.models.reports import ReportScheduleType
+from superset.reports.commands.execute import (
+    AsyncExecuteAlertsCommand,
+    AsyncExecuteReportScheduleCommand,
+    AsyncSendReportScheduleCommand,
+)
 from superset.reports.commands.log_prune import AsyncPruneReportScheduleLogCommand
 from superset.reports.dao import ReportScheduleDAO
 from superset.utils.celery import session_scope
@@ -30,15 +36,20 @@ from superset.utils.celery import session_scope
 logger = logging.getLogger(__name__)
 
 
-def cron_schedule_window(cron: str, window_size: int = 10) -> Iterator[datetime]:
-    utc_now = datetime.utcnow()
-    start_at = utc_now - timedelta(seconds=1)
-    stop_at = utc_now + timedelta(seconds=window_size)
+def cron_schedule_window(
+    cron: str, start_at: datetime, stop_at: datetime
+) -> Tuple[List[datetime], datetime]:
+    """
+    Get the times a crontab fires after start_at and before stop_at, along with
+    the first time it fires from stop_at on
+    """
     crons = croniter.croniter(cron, start_at)
-    for schedule in crons.all_next(datetime):
+    schedules: List[datetime] = []
+    while True:
+        schedule = crons.get_next(datetime)
         if schedule >= stop_at:
-            break
-        yield schedule
+            return schedules, schedule
+        schedules.append(schedule)
 
 
 @celery_app.task(name="reports.scheduler")
@@ -46,11 +57,34 @@ def scheduler() -> None:
     """
     Celery beat main scheduler for reports
     """
+    utc_now = datetime.utcnow()
+    start_at = utc_now - timedelta(seconds=1)
+    stop_at = utc_now + timedelta(seconds=10)
     with session_scope(nullpool=True) as session:
-        active_schedules = ReportScheduleDAO.find_active(session)
-        for active_schedule in active_schedules:
-            for schedule in cron_schedule_window(active_schedule.crontab):
-                execute.apply_async((active_schedule.id, schedule,), eta=schedule)
+        # alerts due at the same time on the same database are executed together,
+        # so that the ones that share a query run it once
+        alerts: Dict[Tuple[datetime, int], List[int]] = defaultdict(list)
+        due_schedules = ReportScheduleDAO.find_due(stop_at, session)
+        for due_schedule in due_schedules:
+            # times that were due while the scheduler was not running are skipped
+            schedule_start_at = start_at
+            if due_schedule.next_eval_dttm:
+                schedule_start_at = max(
+                    start_at, due_schedule.next_eval_dttm - timedelta(seconds=1)
+                )
+            schedules, due_schedule.next_eval_dttm = cron_schedule_window(
+                due_schedule.crontab, schedule_start_at, stop_at
+            )
+            for schedule in schedules:
+                if (
+                    due_schedule.type == ReportScheduleType.ALERT
+                    and due_schedule.database_id
+                ):
+                    alerts[(schedule, due_schedule.database_id)].append(due_schedule.id)
+                else:
+                    execute.apply_async((due_schedule.id, schedule,), eta=schedule)
+        for (schedule, _), report_schedule_ids in alerts.items():
+            execute_alerts.apply_async((report_schedule_ids, schedule,), eta=schedule)
 
 
 @celery_app.task(name="reports.execute")
@@ -61,6 +95,27 @@ def execute(report_schedule_id: int, scheduled_dttm: datetime) -> None:
         logger.error("An exception occurred while executing the report: %s", ex)
 
 
+@celery_app.task(name="reports.execute_alerts")
+def execute_alerts(report_schedule_ids: List[int], scheduled_dttm: datetime) -> None:
+    triggered = AsyncExecuteAlertsCommand(report_schedule_ids, scheduled_dttm).run()
+    for report_schedule_id, start_dttm in triggered:
+        send_alert.delay(report_schedule_id, scheduled_dttm, start_dttm)
+
+
+@celery_app.task(name="reports.send_alert")
+def send_alert(
+    report_schedule_id: int, scheduled_dttm: datetime, start_dttm: datetime
+) -> None:
+    try:
+        AsyncSendReportScheduleCommand(
+            report_schedule_id, scheduled_dttm, start_dttm
+        ).run()
+    except CommandException as ex:
+        logger.error("An exception occurred while sending the alert: %s", ex)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("An unexpected error occurred while sending the alert")
+
+
 @celery_app.task(name="reports.prune_log")
 def prune_log() -> None:
     try:
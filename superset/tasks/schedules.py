@@ -19,39 +19,40 @@
 
 import logging
 import time
-import urllib.request
-from collections import namedtuple
+import urllib.parse
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from email.utils import make_msgid, parseaddr
+from io import BytesIO
 from typing import (
     Any,
     Callable,
     Dict,
     Iterator,
+    List,
     NamedTuple,
     Optional,
     Tuple,
     TYPE_CHECKING,
-    Union,
 )
-from urllib.error import URLError
 
 import croniter
-import simplejson as json
+import pandas as pd
 from celery.app.task import Task
+from celery.utils.time import get_exponential_backoff_interval
 from dateutil.tz import tzlocal
-from flask import current_app, render_template, url_for
+from flask import current_app, g, render_template, url_for
 from flask_babel import gettext as __
 from retry.api import retry_call
 from selenium.common.exceptions import WebDriverException
-from selenium.webdriver import chrome, firefox
 from selenium.webdriver.remote.webdriver import WebDriver
-from sqlalchemy import func
+from sqlalchemy import func, or_
 from sqlalchemy.exc import NoSuchColumnError, ResourceClosedError
 from sqlalchemy.orm import Session
 
 from superset import app, security_manager, thumbnail_cache
-from superset.extensions import celery_app, machine_auth_provider_factory
+from superset.extensions import celery_app
 from superset.models.alerts import Alert, AlertLog
 from superset.models.dashboard import Dashboard
 from superset.models.schedules import (
@@ -61,13 +62,17 @@ from superset.models.schedules import (
     SliceEmailReportFormat,
 )
 from superset.models.slice import Slice
+from superset.reports.commands.alert import AlertQueryResults
 from superset.tasks.alerts.observer import observe
 from superset.tasks.alerts.validator import get_validator_function
 from superset.tasks.slack_util import deliver_slack_msg
 from superset.utils.celery import session_scope
 from superset.utils.core import get_email_address_list, send_email_smtp
-from superset.utils.screenshots import ChartScreenshot, WebDriverProxy
+from superset.utils.dates import now_as_float
+from superset.utils.screenshots import ChartScreenshot
 from superset.utils.urls import get_url_path
+from superset.utils.webdriver import get_webdriver_pool, WindowSize
+from superset.views.utils import get_viz
 
 # pylint: disable=too-few-public-methods
 
@@ -200,10 +205,12 @@ def _get_url_path(view: str, user_friendly: bool = False, **kwargs: Any) -> str:
         return urllib.parse.urljoin(str(base_url), url_for(view, **kwargs))
 
 
-def create_webdriver(session: Session) -> WebDriver:
-    return WebDriverProxy(driver_type=config["WEBDRIVER_TYPE"]).auth(
-        get_reports_user(session)
-    )
+@contextmanager
+def borrow_webdriver(session: Session, window: WindowSize) -> Iterator[WebDriver]:
+    """Borrow a browser session authenticated as the reports user"""
+    pool = get_webdriver_pool(config["WEBDRIVER_TYPE"])
+    with pool.borrow(get_reports_user(session), window) as driver:
+        yield driver
 
 
 def get_reports_user(session: Session) -> "User":
@@ -217,25 +224,6 @@ def get_reports_user(session: Session) -> "User":
     )
 
 
-def destroy_webdriver(
-    driver: Union[chrome.webdriver.WebDriver, firefox.webdriver.WebDriver]
-) -> None:
-    """
-    Destroy a driver
-    """
-
-    # This is some very flaky code in selenium. Hence the retries
-    # and catch-all exceptions
-    try:
-        retry_call(driver.close, tries=2)
-    except Exception:  # pylint: disable=broad-except
-        pass
-    try:
-        driver.quit()
-    except Exception:  # pylint: disable=broad-except
-        pass
-
-
 def deliver_dashboard(  # pylint: disable=too-many-locals
     dashboard_id: int,
     recipients: Optional[str],
@@ -257,28 +245,30 @@ def deliver_dashboard(  # pylint: disable=too-many-locals
             "Superset.dashboard", user_friendly=True, dashboard_id_or_slug=dashboard.id
         )
 
-        # Create a driver, fetch the page, wait for the page to render
-        driver = create_webdriver(session)
+        # Borrow a driver, fetch the page, wait for the page to render
         window = config["WEBDRIVER_WINDOW"]["dashboard"]
-        driver.set_window_size(*window)
-        driver.get(dashboard_url)
-        time.sleep(EMAIL_PAGE_RENDER_WAIT)
+        with borrow_webdriver(session, window) as driver:
+            start = now_as_float()
+            driver.get(dashboard_url)
+            time.sleep(EMAIL_PAGE_RENDER_WAIT)
+
+            # Set up a function to retry once for the element.
+            # This is buggy in certain selenium versions with firefox driver
+            get_element = getattr(driver, "find_element_by_class_name")
+            element = retry_call(
+                get_element,
+                fargs=["grid-container"],
+                tries=2,
+                delay=EMAIL_PAGE_RENDER_WAIT,
+            )
 
-        # Set up a function to retry once for the element.
-        # This is buggy in certain selenium versions with firefox driver
-        get_element = getattr(driver, "find_element_by_class_name")
-        element = retry_call(
-            get_element, fargs=["grid-container"], tries=2, delay=EMAIL_PAGE_RENDER_WAIT
-        )
-
-        try:
-            screenshot = element.screenshot_as_png
-        except WebDriverException:
-            # Some webdrivers do not support screenshots for elements.
-            # In such cases, take a screenshot of the entire page.
-            screenshot = driver.screenshot()  # pylint: disable=no-member
-        finally:
-            destroy_webdriver(driver)
+            try:
+                screenshot = element.screenshot_as_png
+            except WebDriverException:
+                # Some webdrivers do not support screenshots for elements.
+                # In such cases, take a screenshot of the entire page.
+                screenshot = driver.screenshot()  # pylint: disable=no-member
+            stats_logger.timing("webdriver.capture", now_as_float() - start)
 
         # Generate the email body and attachments
         report_content = _generate_report_content(
@@ -312,51 +302,63 @@ def deliver_dashboard(  # pylint: disable=too-many-locals
             )
 
 
+def _get_slice_df(slc: Slice, session: Session) -> pd.DataFrame:
+    """Run the query of a chart in process, with the permissions of the reports user"""
+    with app.test_request_context():
+        g.user = get_reports_user(session)
+        viz_obj = get_viz(
+            form_data=slc.form_data,
+            datasource_type=slc.datasource_type,
+            datasource_id=slc.datasource_id,
+        )
+        viz_obj.raise_for_access()
+        df = viz_obj.get_df()
+    if not isinstance(df.index, pd.RangeIndex):
+        df = df.reset_index()
+    return df
+
+
+def _df_to_file(df: pd.DataFrame, file_format: str) -> bytes:
+    if file_format == "xlsx":
+        buf = BytesIO()
+        df.to_excel(buf, index=False)
+        return buf.getvalue()
+    csv_export = config["CSV_EXPORT"]
+    return df.to_csv(index=False, **csv_export).encode(
+        csv_export.get("encoding", "utf-8")
+    )
+
+
 def _get_slice_data(
     slc: Slice, delivery_type: EmailDeliveryType, session: Session
 ) -> ReportContent:
-    slice_url = _get_url_path(
-        "Superset.explore_json", csv="true", form_data=json.dumps({"slice_id": slc.id})
-    )
-
     # URL to include in the email
     slice_url_user_friendly = _get_url_path(
         "Superset.slice", slice_id=slc.id, user_friendly=True
     )
 
-    # Login on behalf of the "reports" user in order to get cookies to deal with auth
-    auth_cookies = machine_auth_provider_factory.instance.get_auth_cookies(
-        get_reports_user(session)
-    )
-    # Build something like "session=cool_sess.val;other-cookie=awesome_other_cookie"
-    cookie_str = ";".join([f"{key}={val}" for key, val in auth_cookies.items()])
-
-    opener = urllib.request.build_opener()
-    opener.addheaders.append(("Cookie", cookie_str))
-    response = opener.open(slice_url)
-    if response.getcode() != 200:
-        raise URLError(response.getcode())
-
-    # TODO: Move to the csv module
-    content = response.read()
-    rows = [r.split(b",") for r in content.splitlines()]
+    df = _get_slice_df(slc, session)
+    file_format = config["EMAIL_REPORTS_DATA_FORMAT"]
+    content = _df_to_file(df, file_format)
 
     if delivery_type == EmailDeliveryType.inline:
         data = None
 
-        # Parse the csv file and generate HTML
-        columns = rows.pop(0)
+        rows = [
+            ["" if pd.isna(value) else value for value in row]
+            for row in df.itertuples(index=False)
+        ]
         with app.app_context():  # type: ignore
             body = render_template(
                 "superset/reports/slice_data.html",
-                columns=columns,
+                columns=[str(column) for column in df.columns],
                 rows=rows,
                 name=slc.slice_name,
                 link=slice_url_user_friendly,
             )
 
     elif delivery_type == EmailDeliveryType.attachment:
-        data = {__("%(name)s.csv", name=slc.slice_name): content}
+        data = {f"{slc.slice_name}.{file_format}": content}
         body = __(
             '<b><a href="%(url)s">Explore in Superset</a></b><p></p>',
             name=slc.slice_name,
@@ -397,36 +399,34 @@ def _get_slice_screenshot(slice_id: int, session: Session) -> ScreenshotData:
 def _get_slice_visualization(
     slc: Slice, delivery_type: EmailDeliveryType, session: Session
 ) -> ReportContent:
-    # Create a driver, fetch the page, wait for the page to render
-    driver = create_webdriver(session)
-    window = config["WEBDRIVER_WINDOW"]["slice"]
-    driver.set_window_size(*window)
-
     slice_url = _get_url_path("Superset.slice", slice_id=slc.id)
     slice_url_user_friendly = _get_url_path(
         "Superset.slice", slice_id=slc.id, user_friendly=True
     )
 
-    driver.get(slice_url)
-    time.sleep(EMAIL_PAGE_RENDER_WAIT)
+    # Borrow a driver, fetch the page, wait for the page to render
+    window = config["WEBDRIVER_WINDOW"]["slice"]
+    with borrow_webdriver(session, window) as driver:
+        start = now_as_float()
+        driver.get(slice_url)
+        time.sleep(EMAIL_PAGE_RENDER_WAIT)
 
-    # Set up a function to retry once for the element.
-    # This is buggy in certain selenium versions with firefox driver
-    element = retry_call(
-        driver.find_element_by_class_name,
-        fargs=["chart-container"],
-        tries=2,
-        delay=EMAIL_PAGE_RENDER_WAIT,
-    )
+        # Set up a function to retry once for the element.
+        # This is buggy in certain selenium versions with firefox driver
+        element = retry_call(
+            driver.find_element_by_class_name,
+            fargs=["chart-container"],
+            tries=2,
+            delay=EMAIL_PAGE_RENDER_WAIT,
+        )
 
-    try:
-        screenshot = element.screenshot_as_png
-    except WebDriverException:
-        # Some webdrivers do not support screenshots for elements.
-        # In such cases, take a screenshot of the entire page.
-        screenshot = driver.screenshot()  # pylint: disable=no-member
-    finally:
-        destroy_webdriver(driver)
+        try:
+            screenshot = element.screenshot_as_png
+        except WebDriverException:
+            # Some webdrivers do not support screenshots for elements.
+            # In such cases, take a screenshot of the entire page.
+            screenshot = driver.screenshot()  # pylint: disable=no-member
+        stats_logger.timing("webdriver.capture", now_as_float() - start)
 
     # Generate the email body and attachments
     return _generate_report_content(
@@ -564,6 +564,51 @@ def schedule_alert_query(
             raise RuntimeError("Unknown report type")
 
 
+@celery_app.task(
+    name="alerts.run_queries",
+    bind=True,
+    soft_time_limit=config["EMAIL_ASYNC_TIME_LIMIT_SEC"],
+    autoretry_for=(NoSuchColumnError, ResourceClosedError,),
+    retry_kwargs={"max_retries": 5},
+    retry_backoff=True,
+)
+def schedule_alert_queries(task: Task, alert_ids: List[int]) -> None:
+    """
+    Evaluate alerts that are due at the same time on the same database, running
+    each distinct alert query once
+    """
+    query_results = AlertQueryResults()
+    failed_alert_ids: List[int] = []
+    error: Optional[Exception] = None
+    with session_scope(nullpool=True) as session:
+        alerts = (
+            session.query(Alert)
+            .filter(Alert.id.in_(alert_ids), Alert.active.is_(True))
+            .all()
+        )
+        query_results.prefetch((alert.database, alert.sql) for alert in alerts)
+        for alert_id, label in [(alert.id, alert.label) for alert in alerts]:
+            try:
+                evaluate_alert(alert_id, label, session, query_results=query_results)
+            except (NoSuchColumnError, ResourceClosedError) as ex:
+                logger.exception("Failed at evaluating alert: %s (%s)", label, alert_id)
+                session.rollback()
+                failed_alert_ids.append(alert_id)
+                error = ex
+
+    if failed_alert_ids:
+        # the other alerts may have been delivered already, so only the failed
+        # ones are evaluated again
+        raise task.retry(
+            args=(failed_alert_ids,),
+            exc=error,
+            max_retries=5,
+            countdown=get_exponential_backoff_interval(
+                factor=1, retries=task.request.retries, maximum=600, full_jitter=True
+            ),
+        )
+
+
 class AlertState:
     ERROR = "error"
     TRIGGER = "trigger"
@@ -678,12 +723,13 @@ def deliver_slack_alert(alert_content: AlertContent, slack_channel: str) -> None
     )
 
 
-def evaluate_alert(
+def evaluate_alert(  # pylint: disable=too-many-arguments
     alert_id: int,
     label: str,
     session: Session,
     recipients: Optional[str] = None,
     slack_channel: Optional[str] = None,
+    query_results: Optional[AlertQueryResults] = None,
 ) -> None:
     """Processes an alert to see if it should be triggered"""
 
@@ -694,7 +740,7 @@ def evaluate_alert(
 
     try:
         logger.info("Querying observers for alert <%s:%s>", alert_id, label)
-        error_msg = observe(alert_id, session)
+        error_msg = observe(alert_id, session, query_results)
         if error_msg:
             state = AlertState.ERROR
             logging.error(error_msg)
@@ -785,6 +831,16 @@ def schedule_window(
         return None
 
     schedules = session.query(model_cls).filter(model_cls.active.is_(True))
+    if hasattr(model_cls, "next_eval_dttm"):
+        # only load the schedules that fire within the window
+        schedules = schedules.filter(
+            or_(
+                model_cls.next_eval_dttm.is_(None),  # type: ignore
+                model_cls.next_eval_dttm < stop_at,  # type: ignore
+            )
+        )
+    # alerts due at the same time on the same database are evaluated together
+    alerts: Dict[Tuple[datetime, int], List[int]] = defaultdict(list)
 
     for schedule in schedules:
         logging.info("Processing schedule %s", schedule)
@@ -798,12 +854,31 @@ def schedule_window(
         ):
             schedule_start_at = schedule.last_eval_dttm + timedelta(seconds=1)
 
+        if hasattr(schedule, "next_eval_dttm"):
+            # times before next_eval_dttm were scheduled by an earlier window
+            if schedule.next_eval_dttm and schedule.next_eval_dttm > schedule_start_at:
+                schedule_start_at = schedule.next_eval_dttm
+            schedule.next_eval_dttm = croniter.croniter(
+                schedule.crontab, stop_at - timedelta(seconds=1)
+            ).get_next(datetime)
+
         # Schedule the job for the specified time window
         for eta in next_schedules(
             schedule.crontab, schedule_start_at, stop_at, resolution=resolution
         ):
             logging.info("Scheduled eta %s", eta)
-            get_scheduler_action(report_type).apply_async(args, eta=eta)  # type: ignore
+            if report_type == ScheduleType.alert:
+                alerts[(eta, schedule.database_id)].append(schedule.id)
+            else:
+                get_scheduler_action(report_type).apply_async(  # type: ignore
+                    args, eta=eta
+                )
+
+    for (eta, _), alert_ids in alerts.items():
+        if len(alert_ids) == 1:
+            schedule_alert_query.apply_async((report_type, alert_ids[0]), eta=eta)
+        else:
+            schedule_alert_queries.apply_async((alert_ids,), eta=eta)
 
     return None
 
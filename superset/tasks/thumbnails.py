@@ -18,19 +18,155 @@
 """Utility functions used across Superset"""
 
 import logging
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
+from celery.app.task import Task
 from flask import current_app
+from sqlalchemy import or_
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapper, object_session, Session
 
-from superset import app, security_manager, thumbnail_cache
+from superset import app, db, security_manager, thumbnail_cache
 from superset.extensions import celery_app
-from superset.utils.screenshots import ChartScreenshot, DashboardScreenshot
+from superset.utils.screenshots import (
+    BaseScreenshot,
+    ChartScreenshot,
+    DashboardScreenshot,
+)
 from superset.utils.webdriver import WindowSize
 
 logger = logging.getLogger(__name__)
 
+# the soft time limit of the thumbnail tasks, after which a queued job no longer
+# prevents scheduling another one for the same thumbnail
+THUMBNAIL_TASK_TIME_LIMIT = 300
 
-@celery_app.task(name="cache_chart_thumbnail", soft_time_limit=300)
+# ids of the charts and dashboards changed in a transaction, whose thumbnails
+# are updated once it's committed
+CHANGED_CHARTS_KEY = "thumbnails_changed_charts"
+CHANGED_DASHBOARDS_KEY = "thumbnails_changed_dashboards"
+
+
+def _job_key(cache_key: str) -> str:
+    return f"thumbnail_job_{cache_key}"
+
+
+def _latest_digest_key(url: str) -> str:
+    return f"thumbnail_latest_digest_{url}"
+
+
+def _is_superseded(url: str, digest: str) -> bool:
+    """Whether the thumbnail of url changed again since the job was queued"""
+    latest_digest = thumbnail_cache.get(_latest_digest_key(url))
+    return latest_digest is not None and latest_digest != digest
+
+
+def _schedule_thumbnail(  # pylint: disable=too-many-arguments
+    task: Task,
+    screenshot: BaseScreenshot,
+    force: bool,
+    countdown: Optional[int],
+    window_size: Optional[WindowSize] = None,
+    thumb_size: Optional[WindowSize] = None,
+    **kwargs: Any,
+) -> bool:
+    if not thumbnail_cache:
+        logger.warning("No cache set, refusing to compute")
+        return False
+    if countdown is None:
+        countdown = current_app.config["THUMBNAIL_DEBOUNCE_SECONDS"]
+    # jobs queued for earlier digests of the same url are skipped by the workers
+    thumbnail_cache.set(
+        _latest_digest_key(screenshot.url),
+        screenshot.digest,
+        timeout=countdown + THUMBNAIL_TASK_TIME_LIMIT,
+    )
+    if not force and screenshot.get_from_cache(
+        thumbnail_cache, window_size, thumb_size
+    ):
+        logger.info("Thumbnail already cached: %s", screenshot.url)
+        return False
+    cache_key = screenshot.cache_key(window_size, thumb_size)
+    if not thumbnail_cache.add(
+        _job_key(cache_key), True, timeout=countdown + THUMBNAIL_TASK_TIME_LIMIT
+    ):
+        logger.info("Thumbnail already queued: %s", screenshot.url)
+        return False
+    task_kwargs: Dict[str, Any] = {
+        "url": screenshot.url,
+        "digest": screenshot.digest,
+        "force": force,
+        "thumb_size": thumb_size,
+        **kwargs,
+    }
+    if window_size:
+        task_kwargs["window_size"] = window_size
+    task.apply_async(kwargs=task_kwargs, countdown=countdown)
+    return True
+
+
+def schedule_chart_thumbnail(  # pylint: disable=too-many-arguments
+    url: str,
+    digest: str,
+    force: bool = False,
+    countdown: Optional[int] = None,
+    window_size: Optional[WindowSize] = None,
+    thumb_size: Optional[WindowSize] = None,
+) -> bool:
+    """
+    Queue the computation of a chart thumbnail, unless it's already cached or
+    queued for the same digest.
+
+    :param url: The url of the chart
+    :param digest: The digest of the chart
+    :param force: Compute the thumbnail even if it's already cached
+    :param countdown: Seconds to wait before computing, defaults to
+        THUMBNAIL_DEBOUNCE_SECONDS
+    :param window_size: The window size of the screenshot
+    :param thumb_size: The thumbnail size
+    :return: Whether a job was queued
+    """
+    return _schedule_thumbnail(
+        cache_chart_thumbnail,
+        ChartScreenshot(url, digest),
+        force,
+        countdown,
+        window_size=window_size,
+        thumb_size=thumb_size,
+    )
+
+
+def schedule_dashboard_thumbnail(
+    url: str,
+    digest: str,
+    force: bool = False,
+    countdown: Optional[int] = None,
+    thumb_size: Optional[WindowSize] = None,
+) -> bool:
+    """
+    Queue the computation of a dashboard thumbnail, unless it's already cached or
+    queued for the same digest.
+
+    :param url: The url of the dashboard
+    :param digest: The digest of the dashboard
+    :param force: Compute the thumbnail even if it's already cached
+    :param countdown: Seconds to wait before computing, defaults to
+        THUMBNAIL_DEBOUNCE_SECONDS
+    :param thumb_size: The thumbnail size
+    :return: Whether a job was queued
+    """
+    return _schedule_thumbnail(
+        cache_dashboard_thumbnail,
+        DashboardScreenshot(url, digest),
+        force,
+        countdown,
+        thumb_size=thumb_size,
+    )
+
+
+@celery_app.task(
+    name="cache_chart_thumbnail", soft_time_limit=THUMBNAIL_TASK_TIME_LIMIT
+)
 def cache_chart_thumbnail(
     url: str,
     digest: str,
@@ -42,20 +178,32 @@ def cache_chart_thumbnail(
         if not thumbnail_cache:
             logger.warning("No cache set, refusing to compute")
             return None
-        logger.info("Caching chart: %s", url)
         screenshot = ChartScreenshot(url, digest)
-        user = security_manager.find_user(current_app.config["THUMBNAIL_SELENIUM_USER"])
-        screenshot.compute_and_cache(
-            user=user,
-            cache=thumbnail_cache,
-            force=force,
-            window_size=window_size,
-            thumb_size=thumb_size,
-        )
+        try:
+            if _is_superseded(url, digest):
+                logger.info("Skipping outdated chart: %s", url)
+                return None
+            logger.info("Caching chart: %s", url)
+            user = security_manager.find_user(
+                current_app.config["THUMBNAIL_SELENIUM_USER"]
+            )
+            screenshot.compute_and_cache(
+                user=user,
+                cache=thumbnail_cache,
+                force=force,
+                window_size=window_size,
+                thumb_size=thumb_size,
+            )
+        finally:
+            thumbnail_cache.delete(
+                _job_key(screenshot.cache_key(window_size, thumb_size))
+            )
         return None
 
 
-@celery_app.task(name="cache_dashboard_thumbnail", soft_time_limit=300)
+@celery_app.task(
+    name="cache_dashboard_thumbnail", soft_time_limit=THUMBNAIL_TASK_TIME_LIMIT
+)
 def cache_dashboard_thumbnail(
     url: str, digest: str, force: bool = False, thumb_size: Optional[WindowSize] = None
 ) -> None:
@@ -63,9 +211,72 @@ def cache_dashboard_thumbnail(
         if not thumbnail_cache:
             logging.warning("No cache set, refusing to compute")
             return
-        logger.info("Caching dashboard: %s", url)
         screenshot = DashboardScreenshot(url, digest)
-        user = security_manager.find_user(current_app.config["THUMBNAIL_SELENIUM_USER"])
-        screenshot.compute_and_cache(
-            user=user, cache=thumbnail_cache, force=force, thumb_size=thumb_size,
+        try:
+            if _is_superseded(url, digest):
+                logger.info("Skipping outdated dashboard: %s", url)
+                return
+            logger.info("Caching dashboard: %s", url)
+            user = security_manager.find_user(
+                current_app.config["THUMBNAIL_SELENIUM_USER"]
+            )
+            screenshot.compute_and_cache(
+                user=user, cache=thumbnail_cache, force=force, thumb_size=thumb_size,
+            )
+        finally:
+            thumbnail_cache.delete(
+                _job_key(screenshot.cache_key(thumb_size=thumb_size))
+            )
+
+
+def _track_change(target: Any, key: str) -> None:
+    session = object_session(target)
+    if session is not None and target.id:
+        session.info.setdefault(key, set()).add(target.id)
+
+
+def track_chart_change(_mapper: Mapper, _connection: Connection, target: Any) -> None:
+    _track_change(target, CHANGED_CHARTS_KEY)
+
+
+def track_dashboard_change(
+    _mapper: Mapper, _connection: Connection, target: Any
+) -> None:
+    _track_change(target, CHANGED_DASHBOARDS_KEY)
+
+
+def publish_thumbnail_changes(session: Session) -> None:
+    """
+    Update the thumbnails of the charts and dashboards changed in the transaction.
+    The session can't be queried anymore once committed, so the digests are
+    computed by a worker.
+    """
+    chart_ids = session.info.pop(CHANGED_CHARTS_KEY, set())
+    dashboard_ids = session.info.pop(CHANGED_DASHBOARDS_KEY, set())
+    if chart_ids or dashboard_ids:
+        update_thumbnails.delay(sorted(chart_ids), sorted(dashboard_ids))
+
+
+def discard_thumbnail_changes(session: Session, *_args: Any) -> None:
+    session.info.pop(CHANGED_CHARTS_KEY, None)
+    session.info.pop(CHANGED_DASHBOARDS_KEY, None)
+
+
+@celery_app.task(name="update_thumbnails", soft_time_limit=THUMBNAIL_TASK_TIME_LIMIT)
+def update_thumbnails(chart_ids: List[int], dashboard_ids: List[int]) -> None:
+    # pylint: disable=import-outside-toplevel
+    from superset.models.dashboard import Dashboard
+    from superset.models.slice import Slice
+
+    with app.app_context():  # type: ignore
+        for chart in db.session.query(Slice).filter(Slice.id.in_(chart_ids)):
+            chart.update_thumbnail()
+        # the charts are part of the rendering of their dashboards
+        dashboards = db.session.query(Dashboard).filter(
+            or_(
+                Dashboard.id.in_(dashboard_ids),
+                Dashboard.slices.any(Slice.id.in_(chart_ids)),
+            )
         )
+        for dashboard in dashboards:
+            dashboard.update_thumbnail()
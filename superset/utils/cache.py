@@ -14,16 +14,18 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import json
 import logging
 from datetime import datetime, timedelta
 from functools import wraps
-from typing import Any, Callable, Optional, Union
+from typing import Any, Callable, Dict, Optional, TypeVar, Union
 
 from flask import current_app as app, request
 from flask_caching import Cache
 from werkzeug.wrappers.etag import ETagResponseMixin
 
 from superset.extensions import cache_manager
+from superset.utils.hashing import md5_sha_from_str
 
 # If a user sets `max_age` to 0, for long the browser should cache the
 # resource? Flask-Caching will cache forever, but for the HTTP header we need
@@ -32,6 +34,8 @@ ONE_YEAR = 365 * 24 * 60 * 60  # 1 year in seconds
 
 logger = logging.getLogger(__name__)
 
+PrequeryResult = TypeVar("PrequeryResult")
+
 
 def view_cache_key(*args: Any, **kwargs: Any) -> str:  # pylint: disable=unused-argument
     args_hash = hash(frozenset(request.args.items()))
@@ -75,6 +79,49 @@ def memoized_func(
     return wrap
 
 
+def cached_prequery(
+    key: Dict[str, Any],
+    compute: Callable[[], PrequeryResult],
+    cacheable: Callable[[PrequeryResult], bool] = lambda _: True,
+) -> PrequeryResult:
+    """
+    Get the result of the first phase of a two-phase query from the data cache, or
+    compute it and cache it for PREQUERY_CACHE_TIMEOUT seconds.
+
+    Charts that only differ in the way they present the top series share the same
+    first phase, so its result is cached on its own.
+
+    :param key: The query of the first phase and everything its result depends on
+    :param compute: Runs the first phase
+    :param cacheable: Whether a result can be cached
+    :return: The result of the first phase
+    """
+    timeout = app.config["PREQUERY_CACHE_TIMEOUT"]
+    if not timeout:
+        return compute()
+    stats_logger = app.config["STATS_LOGGER"]
+    cache_key = "prequery_" + md5_sha_from_str(
+        json.dumps(key, sort_keys=True, default=str)
+    )
+    try:
+        value = cache_manager.data_cache.get(cache_key)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Exception possibly due to cache backend.")
+        value = None
+    if value is not None:
+        stats_logger.incr("prequery_cache_hit")
+        return value
+
+    stats_logger.incr("prequery_cache_miss")
+    value = compute()
+    if cacheable(value):
+        try:
+            cache_manager.data_cache.set(cache_key, value, timeout=timeout)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Exception possibly due to cache backend.")
+    return value
+
+
 def etag_cache(
     check_perms: Callable[..., Any],
     cache: Cache = cache_manager.cache,
@@ -0,0 +1,163 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Reading of columnar files (Parquet and Feather) for uploads.
+
+Files are read one Parquet row group or Feather record batch at a time, and the
+column types of the uploaded table are taken from the Arrow schema of the file
+instead of being inferred from the values.
+"""
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather
+import pyarrow.parquet as pq
+from sqlalchemy import types
+from sqlalchemy.types import TypeEngine
+
+# nullable pandas types, so that integer and boolean columns with nulls are not
+# converted to floats and objects
+PANDAS_TYPES = {
+    pa.bool_(): pd.BooleanDtype(),
+    pa.int8(): pd.Int8Dtype(),
+    pa.int16(): pd.Int16Dtype(),
+    pa.int32(): pd.Int32Dtype(),
+    pa.int64(): pd.Int64Dtype(),
+    pa.uint8(): pd.UInt8Dtype(),
+    pa.uint16(): pd.UInt16Dtype(),
+    pa.uint32(): pd.UInt32Dtype(),
+    pa.uint64(): pd.UInt64Dtype(),
+}
+
+
+def get_sqla_type(  # pylint: disable=too-many-branches,too-many-return-statements
+    arrow_type: pa.DataType,
+) -> Optional[TypeEngine]:
+    """
+    Map an Arrow type to the SQLAlchemy type of the uploaded column, or None to
+    let pandas infer it.
+    """
+    if pa.types.is_boolean(arrow_type):
+        return types.Boolean()
+    if pa.types.is_int8(arrow_type) or pa.types.is_int16(arrow_type):
+        return types.SmallInteger()
+    if pa.types.is_uint8(arrow_type):
+        return types.SmallInteger()
+    if pa.types.is_int32(arrow_type) or pa.types.is_uint16(arrow_type):
+        return types.Integer()
+    if pa.types.is_integer(arrow_type):
+        return types.BigInteger()
+    if pa.types.is_float16(arrow_type) or pa.types.is_float32(arrow_type):
+        return types.Float(precision=23)
+    if pa.types.is_float64(arrow_type):
+        return types.Float(precision=53)
+    if pa.types.is_decimal(arrow_type):
+        return types.Numeric(precision=arrow_type.precision, scale=arrow_type.scale)
+    if pa.types.is_timestamp(arrow_type):
+        return types.DateTime(timezone=arrow_type.tz is not None)
+    if pa.types.is_date(arrow_type):
+        return types.Date()
+    if pa.types.is_time(arrow_type):
+        return types.Time()
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return types.Text()
+    if pa.types.is_binary(arrow_type) or pa.types.is_large_binary(arrow_type):
+        return types.LargeBinary()
+    return None
+
+
+def get_sqla_types(schema: pa.Schema) -> Dict[str, TypeEngine]:
+    sqla_types = {field.name: get_sqla_type(field.type) for field in schema}
+    return {name: type_ for name, type_ in sqla_types.items() if type_ is not None}
+
+
+def to_df(data: Union[pa.Table, pa.RecordBatch]) -> pd.DataFrame:
+    return data.to_pandas(types_mapper=PANDAS_TYPES.get)
+
+
+def _continue_range_index(chunks: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """Number the rows of the chunks of files written with a default index"""
+    rows = 0
+    for df in chunks:
+        if isinstance(df.index, pd.RangeIndex):
+            df.index += rows
+        rows += len(df)
+        yield df
+
+
+def read_columnar(
+    filename: str, columns: Optional[List[str]] = None
+) -> Tuple[pa.Schema, Iterator[pd.DataFrame]]:
+    """
+    Read a Parquet or Feather file one row group or record batch at a time.
+
+    :param filename: Path of the file
+    :param columns: Names of the columns to read, all of them if empty
+    :return: The Arrow schema of the columns and an iterator of DataFrames
+    """
+    columns = columns or None
+    try:
+        parquet_file = pq.ParquetFile(filename)
+    except pa.ArrowInvalid:
+        return _read_feather(filename, columns)
+
+    schema = parquet_file.schema_arrow
+    if columns:
+        # pylint: disable=no-member
+        schema = pa.schema([schema.field(name) for name in columns])
+
+    def read() -> Iterator[pd.DataFrame]:
+        for i in range(parquet_file.num_row_groups):
+            yield to_df(
+                parquet_file.read_row_group(
+                    i, columns=columns, use_pandas_metadata=True
+                )
+            )
+
+    return schema, _continue_range_index(read())
+
+
+def _read_feather(
+    filename: str, columns: Optional[List[str]]
+) -> Tuple[pa.Schema, Iterator[pd.DataFrame]]:
+    try:
+        reader = pa.ipc.open_file(filename)
+    except pa.ArrowInvalid:
+        # version 1 Feather files are not Arrow IPC files and are read at once
+        table = pyarrow.feather.read_table(filename, columns=columns)
+        return table.schema, iter([to_df(table)])
+
+    schema = reader.schema
+    if columns:
+        # pylint: disable=no-member
+        schema = pa.schema([schema.field(name) for name in columns])
+
+    def read() -> Iterator[pd.DataFrame]:
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if columns:
+                batch = pa.RecordBatch.from_arrays(
+                    [
+                        batch.column(batch.schema.get_field_index(name))
+                        for name in columns
+                    ],
+                    schema=schema,
+                )
+            yield to_df(batch)
+
+    return schema, _continue_range_index(read())
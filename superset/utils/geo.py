@@ -0,0 +1,253 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Vectorized parsing of geospatial columns.
+
+The functions in this module are equivalent to applying ``geohash.decode``,
+``geohash.encode`` and ``geopy.point.Point`` to every row of a column, but
+process whole columns with NumPy and only fall back to the per-row functions
+for inputs the vectorized code paths don't cover.
+"""
+import re
+from typing import Any, Iterable, Tuple
+
+import geohash as geohash_lib
+import numpy as np
+import pandas as pd
+from geopy.point import Point
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+# python-geohash rounds the coordinates of longer geohashes differently, so
+# those are handled row by row
+MAX_VECTORIZED_GEOHASH_LENGTH = 19
+
+_GEOHASH_CHARS = np.frombuffer(GEOHASH_ALPHABET.encode(), dtype=np.uint8)
+_GEOHASH_VALUES = np.full(256, -1, dtype=np.int8)
+_GEOHASH_VALUES[_GEOHASH_CHARS] = np.arange(32)
+_GEOHASH_VALUES[
+    np.frombuffer(GEOHASH_ALPHABET.upper().encode(), dtype=np.uint8)
+] = np.arange(32)
+# the padding of fixed width byte strings
+_GEOHASH_VALUES[0] = 32
+
+
+def _select_bits(value: np.ndarray, bits: Tuple[int, ...]) -> np.ndarray:
+    selected = np.zeros_like(value)
+    for bit in bits:
+        selected = (selected << 1) | ((value >> bit) & 1)
+    return selected
+
+
+# the bits of a character that belong to each coordinate, from the most to the
+# least significant one
+_EVEN_LONGITUDE_BITS = _select_bits(np.arange(32), (4, 2, 0))
+_EVEN_LATITUDE_BITS = _select_bits(np.arange(32), (3, 1))
+_ODD_LONGITUDE_BITS = _select_bits(np.arange(32), (3, 1))
+_ODD_LATITUDE_BITS = _select_bits(np.arange(32), (4, 2, 0))
+
+# plain "latitude, longitude" or "latitude longitude" decimal pairs, matched
+# line by line. Any other line matches the catch-all alternative, so that
+# there is exactly one match per line.
+_NUMBER_PATTERN = r"[-+]?[0-9]+(?:\.[0-9]+)?"
+_SEPARATOR_PATTERN = r"[ \t]*,[ \t]*|[ \t]+"
+_LAT_LON_LINES = re.compile(
+    rf"^(?:[ \t]*({_NUMBER_PATTERN})(?:{_SEPARATOR_PATTERN})({_NUMBER_PATTERN})[ \t]*"
+    r"|.*)$",
+    re.MULTILINE,
+)
+
+
+def _to_series(values: Iterable[Any]) -> pd.Series:
+    if isinstance(values, pd.Series):
+        return values.reset_index(drop=True)
+    return pd.Series(list(values) if not isinstance(values, np.ndarray) else values)
+
+
+def geohash_decode(codes: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode geohashes into the latitudes and longitudes of the centers of their
+    cells, with the same results as ``geohash.decode``.
+
+    :param codes: The geohashes to decode
+    :returns: Arrays with the latitudes and longitudes
+    :raises ValueError: If any of the geohashes is invalid
+    """
+    series = _to_series(codes)
+    if series.empty:
+        return np.zeros(0), np.zeros(0)
+    if pd.api.types.infer_dtype(series, skipna=False) != "string":
+        raise ValueError("geohash codes must be strings")
+    try:
+        chars = series.to_numpy(dtype="S")
+    except UnicodeEncodeError:
+        raise ValueError("geohash codes must only contain ASCII characters")
+    lengths = np.char.str_len(chars)
+    latitudes = np.zeros(len(series))
+    longitudes = np.zeros(len(series))
+
+    vectorized = lengths <= MAX_VECTORIZED_GEOHASH_LENGTH
+    if not vectorized.all():
+        for idx in np.flatnonzero(~vectorized):
+            # pylint: disable=unbalanced-tuple-unpacking
+            latitudes[idx], longitudes[idx] = geohash_lib.decode(series[idx])
+        chars = chars[vectorized].astype(f"S{MAX_VECTORIZED_GEOHASH_LENGTH}")
+        lengths = lengths[vectorized]
+    width = max(chars.dtype.itemsize, 1)
+    # one row per character position, so that the rows are contiguous
+    values = _GEOHASH_VALUES[chars.view(np.uint8).reshape(-1, width).T]
+    # the padding of shorter codes maps to 32, which is invalid within the codes
+    if (values < 0).any() or (
+        (values == 32) & (np.arange(width)[:, None] < lengths)
+    ).any():
+        raise ValueError(f"geohash codes must only contain [{GEOHASH_ALPHABET}]")
+    values &= 31
+
+    # interleave the bits of each character like python-geohash does: even
+    # characters hold 3 longitude and 2 latitude bits, odd characters the
+    # reverse. Codes are padded to the same width with zero bits, which are
+    # shifted out afterwards.
+    lat = np.zeros(len(lengths), dtype=np.int64)
+    lon = np.zeros(len(lengths), dtype=np.int64)
+    for pos in range(width):
+        if pos % 2 == 0:
+            lon = (lon << 3) | _EVEN_LONGITUDE_BITS[values[pos]]
+            lat = (lat << 2) | _EVEN_LATITUDE_BITS[values[pos]]
+        else:
+            lon = (lon << 2) | _ODD_LONGITUDE_BITS[values[pos]]
+            lat = (lat << 3) | _ODD_LATITUDE_BITS[values[pos]]
+    lat_bits = lengths * 5 // 2
+    lon_bits = lengths * 5 - lat_bits
+    lat >>= width * 5 // 2 - lat_bits
+    lon >>= width * 5 - width * 5 // 2 - lon_bits
+
+    # the center of the cell, computed in the same order as python-geohash
+    latitudes[vectorized] = (
+        180.0
+        * (((lat << 1) + 1) - (np.int64(1) << lat_bits)).astype(np.float64)
+        / np.ldexp(1.0, lat_bits + 1)
+    )
+    longitudes[vectorized] = (
+        360.0
+        * (((lon << 1) + 1) - (np.int64(1) << lon_bits)).astype(np.float64)
+        / np.ldexp(1.0, lon_bits + 1)
+    )
+    return latitudes, longitudes
+
+
+def geohash_encode(  # pylint: disable=too-many-locals
+    latitudes: Iterable[float], longitudes: Iterable[float], precision: int = 12
+) -> np.ndarray:
+    """
+    Encode latitudes and longitudes into geohashes, with the same results as
+    ``geohash.encode``.
+
+    :param latitudes: The latitudes, in the [-90, 90) range
+    :param longitudes: The longitudes, wrapped into the [-180, 180) range
+    :param precision: The length of the geohashes
+    :returns: An object array with the geohashes
+    :raises ValueError: If any of the coordinates is invalid
+    """
+    lat = np.asarray(latitudes, dtype=np.float64)
+    lon = np.asarray(longitudes, dtype=np.float64)
+    if precision < 1:
+        raise ValueError("precision must be positive")
+    if lat.shape != lon.shape:
+        raise ValueError("latitudes and longitudes must have the same length")
+    if not ((lat >= -90.0) & (lat < 90.0)).all():
+        raise ValueError("invalid latitude")
+    if not np.isfinite(lon).all():
+        raise ValueError("invalid longitude")
+    if precision > MAX_VECTORIZED_GEOHASH_LENGTH:
+        return np.array(
+            [geohash_lib.encode(a, o, precision) for a, o in zip(lat, lon)],
+            dtype=object,
+        )
+    # wrap the longitudes by whole turns like python-geohash, which rounds
+    # differently than a modulo
+    for _ in range(8):
+        below, above = lon < -180.0, lon >= 180.0
+        if not (below.any() or above.any()):
+            break
+        lon = np.where(below, lon + 360.0, np.where(above, lon - 360.0, lon))
+    else:
+        out_of_range = (lon < -180.0) | (lon >= 180.0)
+        lon = np.where(out_of_range, np.mod(lon + 180.0, 360.0) - 180.0, lon)
+
+    lat_bits = precision * 5 // 2
+    lon_bits = precision * 5 - lat_bits
+    # scaling by powers of two is exact, so these are the leading bits of the
+    # binary expansion of (lat / 90 + 1) / 2 and (lon / 180 + 1) / 2
+    lat_int = np.floor(np.ldexp(lat / 90.0, lat_bits - 1)).astype(np.int64) + (
+        1 << (lat_bits - 1)
+    )
+    lon_int = np.floor(np.ldexp(lon / 180.0, lon_bits - 1)).astype(np.int64) + (
+        1 << (lon_bits - 1)
+    )
+
+    chars = np.empty((lat.size, precision), dtype=np.uint8)
+    for pos in range(precision):
+        value = np.zeros(lat.size, dtype=np.int64)
+        for bit in range(5 * pos, 5 * pos + 5):
+            if bit % 2 == 0:
+                source, shift = lon_int, lon_bits - 1 - bit // 2
+            else:
+                source, shift = lat_int, lat_bits - 1 - bit // 2
+            value = (value << 1) | ((source >> shift) & 1)
+        chars[:, pos] = _GEOHASH_CHARS[value]
+    return chars.view(f"S{precision}").ravel().astype(str).astype(object)
+
+
+def parse_points(values: Iterable[Any]) -> pd.DataFrame:
+    """
+    Parse geodetic points into their latitudes, longitudes and altitudes, with
+    the same results as ``geopy.point.Point``.
+
+    Plain decimal "latitude, longitude" pairs are parsed in bulk, any other
+    value is handed over to geopy.
+
+    :param values: The points to parse
+    :returns: A DataFrame with `latitude`, `longitude` and `altitude` columns
+    :raises ValueError: If any of the points is invalid
+    """
+    series = _to_series(values)
+    latitudes = np.zeros(len(series))
+    longitudes = np.zeros(len(series))
+    altitudes = np.zeros(len(series))
+    matched = np.zeros(len(series), dtype=bool)
+
+    strings = series.where(series.map(type) == str, "")
+    # matching the lines of all the values at once is much faster than
+    # matching each of them, unless the values contain line breaks
+    pairs = np.array(_LAT_LON_LINES.findall("\n".join(strings)), dtype=str)
+    if len(pairs) == len(series) and not series.empty:
+        matched = pairs[:, 0] != ""
+        latitudes[matched] = pairs[matched, 0].astype(np.float64)
+        longitudes[matched] = pairs[matched, 1].astype(np.float64)
+        # out of range coordinates are normalized or rejected by geopy
+        matched &= (np.abs(latitudes) <= 90.0) & (np.abs(longitudes) <= 180.0)
+        # adding zero turns -0.0 into 0.0, which geopy does as well
+        latitudes += 0.0
+        longitudes += 0.0
+
+    for idx in np.flatnonzero(~matched):
+        point = Point(series[idx])
+        latitudes[idx] = point.latitude
+        longitudes[idx] = point.longitude
+        altitudes[idx] = point.altitude
+    return pd.DataFrame(
+        {"latitude": latitudes, "longitude": longitudes, "altitude": altitudes}
+    )
@@ -0,0 +1,133 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Aggregation and nesting of hierarchical data for the hierarchy visualizations.
+
+Rather than selecting the children of every node from a dataframe, the rows are
+grouped once by all the levels of the hierarchy, the coarser levels are rolled
+up from the finer ones, and every node is then attached to its parent by its
+position at the previous level, so that building a tree is linear in its size.
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+def aggregate_levels(
+    df: pd.DataFrame, groups: List[str], aggregate: str = "sum"
+) -> Dict[int, Union[pd.Series, pd.DataFrame]]:
+    """
+    Aggregate the numeric columns of a dataframe at every level of a hierarchy:
+    level ``i`` is grouped by the first ``i`` groups, level 0 being the total.
+
+    :param df: the rows to aggregate
+    :param groups: the columns of the hierarchy, from the top level down
+    :param aggregate: either ``sum`` or ``mean``
+    :return: the aggregates by level
+    """
+    if aggregate not in ("sum", "mean"):
+        raise ValueError(f"Unsupported aggregate {aggregate}")
+    total = df.mean() if aggregate == "mean" else df.sum(numeric_only=True)
+    if not groups:
+        return {0: total}
+
+    # rows with missing groups are dropped at the levels they belong to only
+    grouped = df.groupby(groups, dropna=False)
+    sums = grouped.sum(numeric_only=True)
+    counts = grouped.count()[sums.columns] if aggregate == "mean" else None
+
+    def roll_up(level: int) -> pd.DataFrame:
+        by = list(range(level))
+        result = sums.groupby(level=by).sum()
+        if counts is not None:
+            result /= counts.groupby(level=by).sum()
+        result = result[_is_complete(result.index)]
+        if isinstance(result.index, pd.MultiIndex):
+            result.index = result.index.remove_unused_levels()
+        return result
+
+    levels: Dict[int, Union[pd.Series, pd.DataFrame]] = {0: total}
+    for level in range(1, len(groups) + 1):
+        levels[level] = roll_up(level)
+    return levels
+
+
+def _is_complete(index: pd.Index) -> np.ndarray:
+    return index.to_frame(index=False).notna().all(axis=1).to_numpy()
+
+
+def get_parents(levels: Sequence[pd.Index]) -> List[np.ndarray]:
+    """
+    Find the position of the parent of every node of a hierarchy given the
+    paths of its nodes, level by level.
+
+    The paths of the nodes at level ``i`` have ``i + 1`` elements, the parent of
+    a node being the node at the previous level whose path is the path of the
+    node without its last element.
+
+    :param levels: the paths of the nodes at every level, unique except for the
+        last level
+    :return: the positions of the parents at the previous level by level, -1
+        for the nodes without a parent and the nodes of the top level
+    """
+    parents = [np.full(len(levels[0]), -1)] if levels else []
+    for level in range(1, len(levels)):
+        paths = levels[level].droplevel(-1)
+        parents.append(levels[level - 1].get_indexer(paths))
+    return parents
+
+
+def build_tree(
+    levels: Sequence[pd.Index],
+    make_node: Callable[[int, int], Dict[str, Any]],
+    parents: Optional[List[np.ndarray]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Nest the nodes of a hierarchy, listing the children of every node in the
+    order of their level. Nodes without a parent are dropped.
+
+    :param levels: the paths of the nodes at every level, see `get_parents`
+    :param make_node: creates the node at a level and position, with a
+        ``children`` list unless the node is a leaf
+    :param parents: the result of `get_parents`, for trees built repeatedly
+    :return: the nodes of the top level
+    """
+    if parents is None:
+        parents = get_parents(levels)
+    roots: List[Dict[str, Any]] = []
+    previous: List[Dict[str, Any]] = []
+    for level, positions in enumerate(parents):
+        nodes = [make_node(level, position) for position in range(len(positions))]
+        if level:
+            for node, position in zip(nodes, positions):
+                if position >= 0:
+                    previous[position]["children"].append(node)
+        else:
+            roots = nodes
+        previous = nodes
+    return roots
+
+
+def prefixes(index: pd.MultiIndex, nlevels: int) -> pd.Index:
+    """
+    The distinct sorted paths made of the first levels of a MultiIndex, paths
+    with missing values excluded.
+    """
+    keys = index.droplevel(list(range(nlevels, index.nlevels)))
+    keys = keys[_is_complete(keys)]
+    return keys.unique().sort_values()
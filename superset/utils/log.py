@@ -14,17 +14,22 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import atexit
 import functools
 import inspect
 import json
 import logging
+import os
+import queue
+import random
 import textwrap
+import threading
 import time
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
-from typing import Any, Callable, cast, Iterator, Optional, Type
+from typing import Any, Callable, cast, Dict, Iterator, List, Optional, Type
 
-from flask import current_app, g, request
+from flask import current_app, Flask, g, request
 from sqlalchemy.exc import SQLAlchemyError
 
 from superset.stats_logger import BaseStatsLogger
@@ -219,32 +224,250 @@ class DBEventLogger(AbstractEventLogger):
     ) -> None:
         from superset.models.core import Log
 
+        logs = [
+            Log(**mapping)
+            for mapping in self.get_log_mappings(
+                user_id,
+                action,
+                dashboard_id,
+                duration_ms,
+                slice_id,
+                path,
+                path_no_int,
+                ref,
+                referrer,
+                *args,
+                **kwargs,
+            )
+        ]
+        try:
+            sesh = current_app.appbuilder.get_session
+            sesh.bulk_save_objects(logs)
+            sesh.commit()
+        except SQLAlchemyError as ex:
+            logging.error("DBEventLogger failed to log event(s)")
+            logging.exception(ex)
+
+    @staticmethod
+    def get_log_mappings(  # pylint: disable=too-many-arguments
+        user_id: Optional[int],
+        action: str,
+        dashboard_id: Optional[int],
+        duration_ms: Optional[int],
+        slice_id: Optional[int],
+        path: Optional[str],
+        path_no_int: Optional[str],
+        ref: Optional[str],
+        referrer: Optional[str],
+        *_args: Any,
+        **kwargs: Any,
+    ) -> List[Dict[str, Any]]:
+        """Build the column values of the `Log` rows of an event"""
         records = kwargs.get("records", list())
 
-        logs = list()
+        mappings = list()
         for record in records:
             json_string: Optional[str]
             try:
                 json_string = json.dumps(record)
             except Exception:  # pylint: disable=broad-except
                 json_string = None
-            log = Log(
-                action=action,
-                json=json_string,
-                dashboard_id=dashboard_id,
-                slice_id=slice_id,
-                duration_ms=duration_ms,
-                referrer=referrer,
-                user_id=user_id,
-                path=path,
-                path_no_int=path_no_int,
-                ref=ref,
+            mappings.append(
+                dict(
+                    action=action,
+                    json=json_string,
+                    dashboard_id=dashboard_id,
+                    slice_id=slice_id,
+                    duration_ms=duration_ms,
+                    referrer=referrer,
+                    user_id=user_id,
+                    path=path,
+                    path_no_int=path_no_int,
+                    ref=ref,
+                )
+            )
+        return mappings
+
+
+class AsyncDBEventLogger(DBEventLogger):  # pylint: disable=too-many-instance-attributes
+    """
+    Event logger that commits logs to Superset DB from a background thread.
+
+    Events are put in a bounded in-process buffer and written in batches, so
+    logging doesn't add metadata database latency to requests. When the buffer
+    is full, events are dropped and counted rather than blocking the request.
+    Buffered events are flushed when the process exits.
+
+    Can be configured in `superset_config.py`:
+
+        EVENT_LOGGER = AsyncDBEventLogger(
+            max_buffer_size=10000,
+            batch_size=500,
+            flush_interval=5,
+            sample_rates={"explore_json": 0.1},
+        )
+
+    :param max_buffer_size: The maximum number of log rows waiting to be written
+    :param batch_size: The maximum number of log rows written in one transaction
+    :param flush_interval: The maximum number of seconds a log row waits in the
+        buffer before being written
+    :param sample_rates: The share of events logged per action, between 0 and 1.
+        Actions that aren't listed are always logged
+    """
+
+    def __init__(
+        self,
+        max_buffer_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 5,
+        sample_rates: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.max_buffer_size = max_buffer_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sample_rates = sample_rates or {}
+        # the counters are updated by request threads and the background thread
+        self.dropped = 0
+        self.written = 0
+        # guards the counters, and the creation of the buffer and thread
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._buffer: "queue.Queue[Dict[str, Any]]" = queue.Queue(max_buffer_size)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._app: Optional[Flask] = None
+
+    def is_sampled(self, action: str) -> bool:
+        rate = self.sample_rates.get(action, 1)
+        return rate >= 1 or random.random() < rate
+
+    def log(  # pylint: disable=too-many-arguments
+        self,
+        user_id: Optional[int],
+        action: str,
+        dashboard_id: Optional[int],
+        duration_ms: Optional[int],
+        slice_id: Optional[int],
+        path: Optional[str],
+        path_no_int: Optional[str],
+        ref: Optional[str],
+        referrer: Optional[str],
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        if not self.is_sampled(action):
+            return
+        self._ensure_started()
+        for mapping in self.get_log_mappings(
+            user_id,
+            action,
+            dashboard_id,
+            duration_ms,
+            slice_id,
+            path,
+            path_no_int,
+            ref,
+            referrer,
+            *args,
+            **kwargs,
+        ):
+            try:
+                self._buffer.put_nowait(mapping)
+            except queue.Full:
+                with self._lock:
+                    self.dropped += 1
+                self.stats_logger.incr("event_logger.dropped")
+
+    def _ensure_started(self) -> None:
+        # the buffer and thread don't survive a fork, e.g. of preloaded gunicorn
+        # workers, so they are (re)created in the process logging the event
+        if self._pid == os.getpid() and self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread and self._thread.is_alive():
+                return
+            if self._pid != os.getpid():
+                self._buffer = queue.Queue(self.max_buffer_size)
+                self._stop = threading.Event()
+                atexit.register(self.shutdown)
+            self._pid = os.getpid()
+            # pylint: disable=protected-access
+            self._app = current_app._get_current_object()
+            self._thread = threading.Thread(
+                target=self._run, name="AsyncDBEventLogger", daemon=True
             )
-            logs.append(log)
+            self._thread.start()
+
+    def _run(self) -> None:
+        assert self._app
+        with self._app.app_context():
+            while True:
+                batch = self._next_batch()
+                if batch:
+                    self._write(batch)
+                elif self._stop.is_set():
+                    break
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        """
+        Wait for an event, then collect more events until the batch is full or
+        `flush_interval` seconds have passed. Once stopping, only collect the
+        events already buffered.
+        """
+        batch: List[Dict[str, Any]] = []
+        deadline: Optional[float] = None
+        while len(batch) < self.batch_size:
+            if self._stop.is_set():
+                timeout = 0.0
+            elif deadline is None:
+                # wake up regularly to check whether the logger is stopping
+                timeout = 1.0
+            else:
+                timeout = deadline - time.monotonic()
+            try:
+                if timeout > 0:
+                    batch.append(self._buffer.get(timeout=timeout))
+                else:
+                    batch.append(self._buffer.get_nowait())
+            except queue.Empty:
+                if deadline is None and not self._stop.is_set():
+                    continue
+                break
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+        return batch
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        from superset.models.core import Log
+
+        sesh = current_app.appbuilder.get_session
         try:
-            sesh = current_app.appbuilder.get_session
-            sesh.bulk_save_objects(logs)
+            sesh.bulk_insert_mappings(Log, batch)
             sesh.commit()
+            with self._lock:
+                self.written += len(batch)
+            self.stats_logger.gauge("event_logger.batch_size", len(batch))
         except SQLAlchemyError as ex:
-            logging.error("DBEventLogger failed to log event(s)")
+            sesh.rollback()
+            with self._lock:
+                self.dropped += len(batch)
+            self.stats_logger.incr("event_logger.failed_batches")
+            logging.error("AsyncDBEventLogger failed to log %i event(s)", len(batch))
             logging.exception(ex)
+        finally:
+            for _ in batch:
+                self._buffer.task_done()
+            self.stats_logger.gauge("event_logger.buffer_size", self._buffer.qsize())
+
+    def flush(self, timeout: float = 30) -> None:
+        """Wait until the buffered events are written"""
+        deadline = time.monotonic() + timeout
+        while self._buffer.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    def shutdown(self, timeout: float = 10) -> None:
+        """Stop the background thread after writing the buffered events"""
+        if self._pid != os.getpid() or not self._thread:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
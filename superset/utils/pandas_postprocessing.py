@@ -15,21 +15,21 @@
 # specific language governing permissions and limitations
 # under the License.
 import logging
-from functools import partial
+from functools import partial, wraps
 from typing import Any, Callable, cast, Dict, List, Optional, Set, Tuple, Union
 
-import geohash as geohash_lib
 import numpy as np
 from flask_babel import gettext as _
-from geopy.point import Point
 from pandas import DataFrame, NamedAgg, Series, Timestamp
 
 from superset.exceptions import QueryObjectValidationError
+from superset.utils import geo
 from superset.utils.core import (
     DTTM_ALIAS,
     PostProcessingBoxplotWhiskerType,
     PostProcessingContributionOrientation,
 )
+from superset.utils.pivot import pivot_table
 
 NUMPY_FUNCTIONS = {
     "average": np.average,
@@ -126,6 +126,7 @@ def _flatten_column_after_pivot(
 
 def validate_column_args(*argnames: str) -> Callable[..., Any]:
     def wrapper(func: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(func)
         def wrapped(df: DataFrame, **options: Any) -> Any:
             columns = df.columns.tolist()
             for name in argnames:
@@ -258,8 +259,9 @@ def pivot(  # pylint: disable=too-many-arguments
     #  Remove once/if support is added.
     aggfunc = {na.column: na.aggfunc for na in aggregate_funcs.values()}
 
-    df = df.pivot_table(
-        values=aggfunc.keys(),
+    df = pivot_table(
+        df,
+        values=list(aggfunc.keys()),
         index=index,
         columns=columns,
         aggfunc=aggfunc,
@@ -350,6 +352,32 @@ def rolling(  # pylint: disable=too-many-arguments
     :return: DataFrame with the rolling columns
     :raises ChartDataValidationError: If the request in incorrect
     """
+    df_rolling = _rolling(
+        df,
+        columns,
+        rolling_type,
+        window,
+        rolling_type_options=rolling_type_options,
+        center=center,
+        win_type=win_type,
+        min_periods=min_periods,
+    )
+    df = _append_columns(df, df_rolling, columns)
+    if min_periods:
+        df = df[min_periods:]
+    return df
+
+
+def _rolling(  # pylint: disable=too-many-arguments
+    df: DataFrame,
+    columns: Dict[str, str],
+    rolling_type: str,
+    window: int,
+    rolling_type_options: Optional[Dict[str, Any]] = None,
+    center: bool = False,
+    win_type: Optional[str] = None,
+    min_periods: Optional[int] = None,
+) -> DataFrame:
     rolling_type_options = rolling_type_options or {}
     df_rolling = df[columns.keys()]
     kwargs: Dict[str, Union[str, int]] = {}
@@ -381,10 +409,7 @@ def rolling(  # pylint: disable=too-many-arguments
                 options=rolling_type_options,
             )
         )
-    df = _append_columns(df, df_rolling, columns)
-    if min_periods:
-        df = df[min_periods:]
-    return df
+    return df_rolling
 
 
 @validate_column_args("columns", "drop", "rename")
@@ -435,9 +460,11 @@ def diff(df: DataFrame, columns: Dict[str, str], periods: int = 1,) -> DataFrame
     :return: DataFrame with diffed columns
     :raises ChartDataValidationError: If the request in incorrect
     """
-    df_diff = df[columns.keys()]
-    df_diff = df_diff.diff(periods=periods)
-    return _append_columns(df, df_diff, columns)
+    return _append_columns(df, _diff(df, columns, periods), columns)
+
+
+def _diff(df: DataFrame, columns: Dict[str, str], periods: int = 1) -> DataFrame:
+    return df[columns.keys()].diff(periods=periods)
 
 
 @validate_column_args("columns")
@@ -454,6 +481,10 @@ def cum(df: DataFrame, columns: Dict[str, str], operator: str) -> DataFrame:
     :param operator: cumulative operator, e.g. `sum`, `prod`, `min`, `max`
     :return: DataFrame with cumulated columns
     """
+    return _append_columns(df, _cum(df, columns, operator), columns)
+
+
+def _cum(df: DataFrame, columns: Dict[str, str], operator: str) -> DataFrame:
     df_cum = df[columns.keys()]
     operation = "cum" + operator
     if operation not in ALLOWLIST_CUMULATIVE_FUNCTIONS or not hasattr(
@@ -462,7 +493,7 @@ def cum(df: DataFrame, columns: Dict[str, str], operator: str) -> DataFrame:
         raise QueryObjectValidationError(
             _("Invalid cumulative operator: %(operator)s", operator=operator)
         )
-    return _append_columns(df, getattr(df_cum, operation)(), columns)
+    return getattr(df_cum, operation)()
 
 
 def geohash_decode(
@@ -478,10 +509,8 @@ def geohash_decode(
     :return: DataFrame with decoded longitudes and latitudes
     """
     try:
-        lonlat_df = DataFrame()
-        lonlat_df["latitude"], lonlat_df["longitude"] = zip(
-            *df[geohash].apply(geohash_lib.decode)
-        )
+        lonlat_df = DataFrame(index=df.index)
+        lonlat_df["latitude"], lonlat_df["longitude"] = geo.geohash_decode(df[geohash])
         return _append_columns(
             df, lonlat_df, {"latitude": latitude, "longitude": longitude}
         )
@@ -502,14 +531,11 @@ def geohash_encode(
     :return: DataFrame with decoded longitudes and latitudes
     """
     try:
-        encode_df = df[[latitude, longitude]]
-        encode_df.columns = ["latitude", "longitude"]
-        encode_df["geohash"] = encode_df.apply(
-            lambda row: geohash_lib.encode(row["latitude"], row["longitude"]), axis=1,
-        )
+        encode_df = DataFrame(index=df.index)
+        encode_df["geohash"] = geo.geohash_encode(df[latitude], df[longitude])
         return _append_columns(df, encode_df, {"geohash": geohash})
     except ValueError:
-        QueryObjectValidationError(_("Invalid longitude/latitude"))
+        raise QueryObjectValidationError(_("Invalid longitude/latitude"))
 
 
 def geodetic_parse(
@@ -530,22 +556,9 @@ def geodetic_parse(
     :param altitude: Name of new column to be created containing altitude.
     :return: DataFrame with decoded longitudes and latitudes
     """
-
-    def _parse_location(location: str) -> Tuple[float, float, float]:
-        """
-        Parse a string containing a geodetic point and return latitude, longitude
-        and altitude
-        """
-        point = Point(location)
-        return point[0], point[1], point[2]
-
     try:
-        geodetic_df = DataFrame()
-        (
-            geodetic_df["latitude"],
-            geodetic_df["longitude"],
-            geodetic_df["altitude"],
-        ) = zip(*df[geodetic].apply(_parse_location))
+        geodetic_df = geo.parse_points(df[geodetic])
+        geodetic_df.index = df.index
         columns = {"latitude": latitude, "longitude": longitude}
         if altitude:
             columns["altitude"] = altitude
@@ -808,3 +821,12 @@ def boxplot(
         for metric in metrics
     }
     return aggregate(df, groupby=groupby, aggregates=aggregates)
+
+
+# functions computing the columns of the column wise operations, indexed like
+# the source DataFrame, without adding them to it
+COLUMN_WISE_FUNCTIONS: Dict[str, Callable[..., DataFrame]] = {
+    "cum": _cum,
+    "diff": _diff,
+    "rolling": _rolling,
+}
@@ -0,0 +1,176 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Pivot tables computed with compiled groupby aggregations.
+
+``DataFrame.pivot_table`` calls aggregation functions it doesn't recognize,
+such as lambdas and partials, once per group in Python. The functions in this
+module translate the aggregation functions used by the pivot table chart and
+the `pivot` post processing operation to the equivalent groupby methods
+before pivoting, so that pandas runs them in compiled code.
+"""
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+AggFunc = Union[str, Callable[[pd.Series], Any]]
+
+# functions with a groupby method returning the same values for each group
+GROUPBY_METHODS: Dict[Any, str] = {
+    np.sum: "sum",
+    np.nansum: "sum",
+    np.mean: "mean",
+    np.nanmean: "mean",
+    np.min: "min",
+    np.nanmin: "min",
+    np.max: "max",
+    np.nanmax: "max",
+    np.median: "median",
+    np.nanmedian: "median",
+}
+
+
+def sql_sum(series: pd.Series) -> Any:
+    """Sum the values of a series like SQL does, returning NaN if all are missing"""
+    return series.sum(min_count=1)
+
+
+def get_groupby_method(aggfunc: AggFunc) -> Optional[str]:
+    if isinstance(aggfunc, str):
+        return aggfunc
+    if isinstance(aggfunc, partial) and not aggfunc.args and not aggfunc.keywords:
+        aggfunc = aggfunc.func
+    if aggfunc is sql_sum:
+        return "sum"
+    try:
+        return GROUPBY_METHODS.get(aggfunc)
+    except TypeError:  # unhashable callable
+        return None
+
+
+def pivot_table(  # pylint: disable=too-many-arguments,too-many-branches,too-many-locals
+    df: pd.DataFrame,
+    values: List[str],
+    index: List[str],
+    columns: Optional[List[str]] = None,
+    aggfunc: Optional[Dict[str, AggFunc]] = None,
+    fill_value: Optional[Any] = None,
+    dropna: Optional[bool] = True,
+    margins: Optional[bool] = False,
+    margins_name: Optional[str] = "All",
+) -> pd.DataFrame:
+    """
+    Equivalent of ``DataFrame.pivot_table`` with an aggregation function per
+    value column, which aggregates the values with groupby methods wherever
+    possible.
+
+    `sql_sum` is computed as a sum, after which the cells of the groups without
+    any value are set to NaN. As that can't be done for the margins, `sql_sum`
+    is called on every group when margins are requested for a frame with
+    missing values.
+    """
+    aggfunc = aggfunc or {}
+    columns = columns or []
+    # the margins are computed from the rows without any missing value, which
+    # may leave margins without rows
+    exact_sums = not (margins and df[index + columns + values].isna().to_numpy().any())
+    methods: Dict[str, AggFunc] = {}
+    masked: List[str] = []
+    for value in values:
+        func = aggfunc.get(value, "mean")
+        method = get_groupby_method(func)
+        if func is sql_sum and not exact_sums:
+            method = None
+        elif func is sql_sum and df[value].isna().any():
+            if fill_value is not None:
+                method = None
+            else:
+                masked.append(value)
+        methods[value] = method or func
+
+    # extrema of objects are computed in Python by pandas, but are the same as
+    # the extrema of the codes of the sorted distinct values
+    encoded: Dict[str, np.ndarray] = {}
+    data = df
+    if fill_value is None:
+        for value in values:
+            if methods[value] in ("min", "max") and df[value].dtype == object:
+                try:
+                    codes, uniques = pd.factorize(df[value], sort=True)
+                except TypeError:  # values that can't be compared
+                    continue
+                if not encoded:
+                    data = df.copy()
+                encoded[value] = np.asarray(uniques, dtype=object)
+                data[value] = np.where(codes < 0, np.nan, codes)
+
+    kwargs: Dict[str, Any] = {
+        "index": index,
+        "columns": columns,
+        "dropna": dropna,
+        "margins": margins,
+        "margins_name": margins_name,
+    }
+    table = data.pivot_table(
+        values=values, aggfunc=methods, fill_value=fill_value, **kwargs
+    )
+    if table.empty:
+        # pandas doesn't handle the empty pivot tables consistently
+        aggfunc = {value: aggfunc.get(value, "mean") for value in values}
+        return df.pivot_table(
+            values=values, aggfunc=aggfunc, fill_value=fill_value, **kwargs
+        )
+    for column in table.columns:
+        uniques = encoded.get(column[0] if isinstance(column, tuple) else column)
+        if uniques is not None:
+            table[column] = _decode(table[column], uniques)
+    if not masked:
+        return table
+
+    counts = data.pivot_table(values=masked, aggfunc="count", **kwargs)
+    for value in masked:
+        table[value] = table[value].mask(counts[value] == 0)
+    if dropna:
+        # pandas drops the groups without any value before pivoting
+        table = table.dropna(how="all").dropna(how="all", axis=1)
+    return table
+
+
+def _decode(codes: pd.Series, uniques: np.ndarray) -> pd.Series:
+    if codes.isna().all():
+        return codes
+    decoded = np.full(len(codes), np.nan, dtype=object)
+    present = codes.notna().to_numpy()
+    decoded[present] = uniques[codes[present].to_numpy(dtype=int)]
+    return pd.Series(decoded, index=codes.index, name=codes.name)
+
+
+def map_distinct(series: pd.Series, func: Callable[[Any], Any]) -> pd.Series:
+    """
+    Apply a function to the distinct values of a series only, which is
+    equivalent to `Series.apply` for functions without side effects.
+    """
+    codes, uniques = pd.factorize(series)
+    mapped = np.empty(len(series), dtype=object)
+    present = codes >= 0
+    distinct = np.array([func(value) for value in uniques], dtype=object)
+    mapped[present] = distinct[codes[present]]
+    # missing values, such as None and NaN, are passed to the function as is
+    mapped[~present] = [func(value) for value in series.to_numpy()[~present]]
+    return pd.Series(mapped, index=series.index, name=series.name)
@@ -0,0 +1,95 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Change feed of SQL Lab queries.
+
+Every committed change to a user's queries bumps a per-user version counter in
+the cache, so that polling SQL Lab tabs can tell whether anything changed
+without querying the metadata database.
+"""
+import logging
+import time
+from typing import Any, Optional
+
+from flask import current_app
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapper, object_session, Session
+
+from superset.extensions import cache_manager
+
+logger = logging.getLogger(__name__)
+
+CHANGED_USERS_KEY = "sqllab_changed_query_users"
+
+
+def is_feed_enabled() -> bool:
+    try:
+        return bool(current_app.config["SQLLAB_QUERIES_FEED"])
+    except RuntimeError:
+        # outside of an application context
+        return False
+
+
+def _version_key(user_id: int) -> str:
+    return f"sqllab_queries_version_{user_id}"
+
+
+def get_version(user_id: int) -> Optional[int]:
+    """
+    Return the current version of the queries of a user, or None if it is not
+    known, in which case callers need to fall back to the metadata database.
+    """
+    if not is_feed_enabled():
+        return None
+    try:
+        version = cache_manager.cache.get(_version_key(user_id))
+        return int(version) if version is not None else None
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Could not read the queries version of user %s", user_id)
+        return None
+
+
+def bump_version(user_id: int) -> None:
+    key = _version_key(user_id)
+    # start new counters from the current time so that a counter evicted from
+    # the cache never goes back to a version a client has already seen
+    cache_manager.cache.add(key, int(time.time() * 1000), timeout=0)
+    # Flask-Caching doesn't expose inc, the backend increments atomically when
+    # it can (e.g. Redis)
+    cache_manager.cache.cache.inc(key)
+
+
+def track_query_change(_mapper: Mapper, _connection: Connection, target: Any) -> None:
+    session = object_session(target)
+    if session is not None and target.user_id:
+        session.info.setdefault(CHANGED_USERS_KEY, set()).add(target.user_id)
+
+
+def publish_query_changes(session: Session) -> None:
+    """Bump the version of the users whose queries changed in the transaction"""
+    user_ids = session.info.pop(CHANGED_USERS_KEY, None)
+    if not user_ids or not is_feed_enabled():
+        return
+    for user_id in user_ids:
+        try:
+            bump_version(user_id)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Could not publish the query changes of %s", user_id)
+
+
+def discard_query_changes(session: Session, *_args: Any) -> None:
+    session.info.pop(CHANGED_USERS_KEY, None)
@@ -0,0 +1,156 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Progress tracking of long running SQL Lab queries.
+
+Engine specs polling a cursor report progress through a
+``QueryProgressTracker``, which coalesces the writes to the metadata database
+and checks for stop requests in the cache instead of re-reading the query row
+on every poll.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from flask import current_app
+from sqlalchemy.orm import Session
+
+from superset.extensions import cache_manager
+from superset.models.sql_lab import Query
+from superset.utils.core import QueryStatus
+from superset.utils.dates import now_as_float
+
+logger = logging.getLogger(__name__)
+
+STOPPED_STATES = (QueryStatus.STOPPED, QueryStatus.TIMED_OUT)
+
+
+def _stop_flag_key(query_id: int) -> str:
+    return f"sqllab_query_stop_{query_id}"
+
+
+def request_stop(query_id: int) -> None:
+    """Flag a running query as stopped for the workers polling it."""
+    try:
+        cache_manager.cache.set(
+            _stop_flag_key(query_id),
+            True,
+            timeout=current_app.config["SQLLAB_ASYNC_TIME_LIMIT_SEC"],
+        )
+    except Exception:  # pylint: disable=broad-except
+        # the query row remains the source of truth, see QueryProgressTracker
+        logger.exception("Could not set the stop flag of query %s", query_id)
+
+
+def is_stop_requested(query_id: int) -> bool:
+    try:
+        return bool(cache_manager.cache.get(_stop_flag_key(query_id)))
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Could not read the stop flag of query %s", query_id)
+        return False
+
+
+class QueryProgressTracker:  # pylint: disable=too-many-instance-attributes
+    """
+    Buffers the progress and tracking URL of a running query and writes them
+    to the metadata database at most once every
+    ``SQLLAB_PROGRESS_FLUSH_INTERVAL`` seconds.
+
+    Stop requests are read from the cache on every poll. Since the cache may
+    not be shared between processes, the query row is also re-read whenever the
+    buffered values are flushed.
+    """
+
+    def __init__(self, query: Query, session: Session) -> None:
+        self.query = query
+        self.query_id = query.id
+        self.session = session
+        self.flush_interval = current_app.config["SQLLAB_PROGRESS_FLUSH_INTERVAL"]
+        self.stats_logger = current_app.config["STATS_LOGGER"]
+        self.stopped = False
+        self.ticks = 0
+        self.flushes = 0
+        self.overhead = 0.0
+        self._pending: Dict[str, Any] = {}
+        self._progress = query.progress or 0
+        # flush the first update right away so users get early feedback
+        self._last_flush: Optional[float] = None
+
+    def update(
+        self, progress: Optional[float] = None, tracking_url: Optional[str] = None
+    ) -> None:
+        if progress is not None and progress > self._progress:
+            self._progress = progress
+            self._pending["progress"] = progress
+        if tracking_url is not None:
+            self._pending["tracking_url"] = tracking_url
+
+    def should_stop(self) -> bool:
+        if not self.stopped and is_stop_requested(self.query_id):
+            self.stopped = True
+        return self.stopped
+
+    def flush(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and (
+            self._last_flush is not None
+            and now - self._last_flush < self.flush_interval
+        ):
+            return
+        self._last_flush = now
+        self.session.refresh(self.query)
+        if self.query.status in STOPPED_STATES:
+            self.stopped = True
+            return
+        if self._pending:
+            for attr, value in self._pending.items():
+                setattr(self.query, attr, value)
+            self._pending = {}
+            self.flushes += 1
+            self.session.commit()
+
+    @contextmanager
+    def tick(self) -> Iterator[None]:
+        """
+        Wrap the handling of a single poll, so that the time spent on it is
+        reported as polling overhead. Polling the cursor, fetching its logs and
+        sleeping between polls are done outside of the tick.
+        """
+        start = now_as_float()
+        try:
+            yield
+            if not self.stopped:
+                self.flush()
+        finally:
+            self.ticks += 1
+            self.overhead += now_as_float() - start
+
+    def finish(self) -> None:
+        """Write any buffered update and report the polling metrics."""
+        if not self.stopped and self._pending:
+            self.flush(force=True)
+        self.stats_logger.timing("sqllab.query.progress_poll_overhead", self.overhead)
+        self.stats_logger.gauge("sqllab.query.progress_poll_ticks", self.ticks)
+        self.stats_logger.gauge("sqllab.query.progress_flushes", self.flushes)
+        logger.debug(
+            "Query %d: %d polls, %d progress writes, %.2f ms overhead",
+            self.query_id,
+            self.ticks,
+            self.flushes,
+            self.overhead,
+        )
@@ -16,7 +16,7 @@
 # under the License.
 import logging
 from io import BytesIO
-from typing import Optional, TYPE_CHECKING, Union
+from typing import cast, Dict, List, Optional, TYPE_CHECKING, Union
 
 from flask import current_app
 
@@ -41,6 +41,9 @@ class BaseScreenshot:
     element: str = ""
     window_size: WindowSize = (800, 600)
     thumb_size: WindowSize = (400, 300)
+    # sizes that are cached from every screenshot along with the requested one, so
+    # that they never need to be resized again when requested
+    thumb_sizes: List[WindowSize] = []
 
     def __init__(self, url: str, digest: str):
         self.digest: str = digest
@@ -138,8 +141,9 @@ class BaseScreenshot:
         :return: Image payload
         """
         cache_key = self.cache_key(window_size, thumb_size)
-        window_size = window_size or self.window_size
-        thumb_size = thumb_size or self.thumb_size
+        # sizes may come as lists from JSON task arguments
+        window_size = cast(WindowSize, tuple(window_size or self.window_size))
+        thumb_size = cast(WindowSize, tuple(thumb_size or self.thumb_size))
         if not force and cache and cache.get(cache_key):
             logger.info("Thumb already cached, skipping...")
             return None
@@ -153,18 +157,30 @@ class BaseScreenshot:
         except Exception as ex:  # pylint: disable=broad-except
             logger.error("Failed at generating thumbnail %s", ex)
 
-        if payload and window_size != thumb_size:
-            try:
-                payload = self.resize_image(payload, thumb_size=thumb_size)
-            except Exception as ex:  # pylint: disable=broad-except
-                logger.error("Failed at resizing thumbnail %s", ex)
-                payload = None
+        if not payload:
+            return None
 
-        if payload:
+        thumb_sizes = [thumb_size] + [
+            size for size in self.thumb_sizes if size != thumb_size
+        ]
+        try:
+            images = self.resize_images(
+                payload,
+                thumb_sizes=[size for size in thumb_sizes if size != window_size],
+            )
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.error("Failed at resizing thumbnail %s", ex)
+            return None
+        if window_size in thumb_sizes:
+            images[window_size] = payload
+
+        if cache:
             logger.info("Caching thumbnail: %s", cache_key)
-            cache.set(cache_key, payload)
+            cache.set_many(
+                {self.cache_key(window_size, size): images[size] for size in images}
+            )
             logger.info("Done caching thumbnail")
-        return payload
+        return images[thumb_size]
 
     @classmethod
     def resize_image(
@@ -175,6 +191,27 @@ class BaseScreenshot:
         crop: bool = True,
     ) -> bytes:
         thumb_size = thumb_size or cls.thumb_size
+        return cls.resize_images(img_bytes, [thumb_size], output, crop)[thumb_size]
+
+    @classmethod
+    def resize_images(
+        cls,
+        img_bytes: bytes,
+        thumb_sizes: List[WindowSize],
+        output: str = "png",
+        crop: bool = True,
+    ) -> Dict[WindowSize, bytes]:
+        """
+        Crop a screenshot once and resize it to each of the thumbnail sizes
+
+        :param img_bytes: The screenshot payload
+        :param thumb_sizes: The sizes of the thumbnails
+        :param output: The image format of the thumbnails
+        :param crop: Crop the screenshot to the aspect ratio of the window
+        :return: The thumbnail payloads by size
+        """
+        if not thumb_sizes:
+            return {}
         img = Image.open(BytesIO(img_bytes))
         logger.debug("Selenium image size: %s", str(img.size))
         if crop and img.size[1] != cls.window_size[1]:
@@ -182,14 +219,15 @@ class BaseScreenshot:
             desired_width = int(img.size[0] * desired_ratio)
             logger.debug("Cropping to: %s*%s", str(img.size[0]), str(desired_width))
             img = img.crop((0, 0, img.size[0], desired_width))
-        logger.debug("Resizing to %s", str(thumb_size))
-        img = img.resize(thumb_size, Image.ANTIALIAS)
-        new_img = BytesIO()
         if output != "png":
             img = img.convert("RGB")
-        img.save(new_img, output)
-        new_img.seek(0)
-        return new_img.read()
+        images = {}
+        for thumb_size in thumb_sizes:
+            logger.debug("Resizing to %s", str(thumb_size))
+            new_img = BytesIO()
+            img.resize(thumb_size, Image.ANTIALIAS).save(new_img, output)
+            images[thumb_size] = new_img.getvalue()
+        return images
 
 
 class ChartScreenshot(BaseScreenshot):
@@ -197,6 +235,7 @@ class ChartScreenshot(BaseScreenshot):
     element: str = "chart-container"
     window_size: WindowSize = (800, 600)
     thumb_size: WindowSize = (800, 600)
+    thumb_sizes: List[WindowSize] = [(400, 300)]
 
 
 class DashboardScreenshot(BaseScreenshot):
@@ -204,3 +243,4 @@ class DashboardScreenshot(BaseScreenshot):
     element: str = "grid-container"
     window_size: WindowSize = (1600, int(1600 * 0.75))
     thumb_size: WindowSize = (800, int(800 * 0.75))
+    thumb_sizes: List[WindowSize] = [(400, 300)]
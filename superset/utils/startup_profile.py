@@ -0,0 +1,145 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import builtins
+import importlib.util
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfiler:
+    """
+    Times the steps of the application start-up and the modules they import.
+
+    The time of a module is the time spent importing it, minus the time spent
+    importing the modules it imports itself. Only the import statements are
+    timed: the submodules imported by ``from package import module`` are
+    counted in the time of the module importing them. The profiler patches
+    ``builtins.__import__`` while it runs, so it is meant to be enabled while
+    investigating a slow start-up rather than in production.
+
+    The ``startup_profiler`` of this module is started by the ``superset``
+    package when the ``SUPERSET_STARTUP_PROFILE`` environment variable is set,
+    so that the imports done before the app is created are timed too, and it is
+    stopped once the app is initialized.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.steps: List[Tuple[str, float]] = []
+        self.modules: Dict[str, float] = {}
+        # the time spent in the imports nested in each import being timed
+        self._nested: List[float] = []
+        self._original_import: Optional[Callable[..., Any]] = None
+
+    def start(self) -> None:
+        """Time the imports until `stop` is called"""
+        if not self.enabled or self._original_import:
+            return
+
+        original_import = self._original_import = builtins.__import__
+
+        def timed_import(  # pylint: disable=too-many-arguments,redefined-builtin
+            name: str,
+            globals: Optional[Mapping[str, Any]] = None,
+            locals: Optional[Mapping[str, Any]] = None,
+            fromlist: Sequence[str] = (),
+            level: int = 0,
+        ) -> Any:
+            loaded = len(sys.modules)
+            self._nested.append(0.0)
+            start = time.perf_counter()
+            try:
+                return original_import(name, globals, locals, fromlist, level)
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = self._nested.pop()
+                # imports of modules that are already loaded are too cheap to
+                # report, their time is left to the module importing them
+                if len(sys.modules) > loaded:
+                    if self._nested:
+                        self._nested[-1] += elapsed
+                    if level:
+                        package = (globals or {}).get("__package__") or ""
+                        name = importlib.util.resolve_name("." * level + name, package)
+                    self.modules[name] = self.modules.get(name, 0) + elapsed - nested
+
+        builtins.__import__ = timed_import
+
+    def stop(self) -> None:
+        """Stop timing the imports"""
+        if self._original_import:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    @contextmanager
+    def profile(self) -> Iterator[None]:
+        """Time the imports done in the context, unless they are already timed"""
+        started = not self._original_import
+        self.start()
+        try:
+            yield
+        finally:
+            if started:
+                self.stop()
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """Time a step of the start-up"""
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((name, time.perf_counter() - start))
+
+    def report(self, limit: int) -> str:
+        """The time of each step, and of the ``limit`` slowest modules"""
+        lines = ["Start-up steps:"]
+        lines.extend(f"{elapsed:10.3f}s  {name}" for name, elapsed in self.steps)
+        lines.append(
+            f"{len(self.modules)} modules imported in "
+            f"{sum(self.modules.values()):.3f}s, the slowest ones:"
+        )
+        slowest = sorted(self.modules.items(), key=lambda item: item[1], reverse=True)
+        lines.extend(f"{elapsed:10.3f}s  {name}" for name, elapsed in slowest[:limit])
+        return "\n".join(lines)
+
+    def log_report(self, limit: int) -> None:
+        if self.enabled:
+            logger.info(self.report(limit))
+
+
+startup_profiler = StartupProfiler(bool(os.environ.get("SUPERSET_STARTUP_PROFILE")))
@@ -0,0 +1,227 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+In-memory substring index over table and view names, used by the SQL Lab
+table typeahead so that each keystroke doesn't rescan the whole catalog.
+"""
+import logging
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, Set, Tuple
+
+from superset.extensions import cache_manager
+from superset.utils.core import DatasourceName
+
+logger = logging.getLogger(__name__)
+
+# n-grams of every size in this range are indexed, queries of the minimum size
+# are answered straight from the postings while longer ones are verified
+MIN_NGRAM_SIZE = 2
+MAX_NGRAM_SIZE = 3
+
+
+def _ngrams(label: str, size: int) -> Set[str]:
+    return {label[i : i + size] for i in range(len(label) - size + 1)}
+
+
+class TableNameIndex:
+    """
+    N-gram index over datasource labels.
+
+    Names are stored in label order, so matches come back sorted by label and
+    the first ``limit`` matches can be returned without a sort. Single
+    character queries fall back to a scan of the labels.
+    """
+
+    def __init__(
+        self, names: List[DatasourceName], get_label: Callable[[DatasourceName], str],
+    ) -> None:
+        pairs = sorted(((get_label(name), name) for name in names), key=lambda p: p[0])
+        self.labels: List[str] = [label for label, _ in pairs]
+        self.names: List[DatasourceName] = [name for _, name in pairs]
+        self._postings: Dict[str, "array[int]"] = {}
+        for idx, label in enumerate(self.labels):
+            for size in range(MIN_NGRAM_SIZE, MAX_NGRAM_SIZE + 1):
+                for gram in _ngrams(label, size):
+                    postings = self._postings.get(gram)
+                    if postings is None:
+                        postings = self._postings[gram] = array("I")
+                    postings.append(idx)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _candidates(self, substr: str) -> Iterator[int]:
+        if len(substr) < MIN_NGRAM_SIZE:
+            return iter(range(len(self.labels)))
+        if len(substr) <= MAX_NGRAM_SIZE:
+            return iter(self._postings.get(substr, ()))
+        postings = []
+        for gram in _ngrams(substr, MAX_NGRAM_SIZE):
+            gram_postings = self._postings.get(gram)
+            if gram_postings is None:
+                return iter(())
+            postings.append(gram_postings)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for gram_postings in postings[1:]:
+            candidates.intersection_update(gram_postings)
+            if not candidates:
+                break
+        return iter(sorted(candidates))
+
+    def search(
+        self, substr: Optional[str], limit: Optional[int] = None
+    ) -> List[DatasourceName]:
+        """
+        Return the names whose label contains ``substr``, sorted by label.
+
+        :param substr: The substring to look for, all names are returned if empty
+        :param limit: The maximum number of names to return
+        :returns: The matching names
+        """
+        if not substr:
+            return self.names[:limit]
+        matches = []
+        for idx in self._candidates(substr):
+            # n-gram candidates are a superset of the matches, verify each one
+            if substr in self.labels[idx]:
+                matches.append(self.names[idx])
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
+
+    def count(self, substr: Optional[str]) -> int:
+        """Return the number of names whose label contains ``substr``"""
+        if not substr:
+            return len(self.names)
+        return sum(1 for idx in self._candidates(substr) if substr in self.labels[idx])
+
+
+# the expiry time of a cached index, the version of its database, and the index
+IndexEntry = Tuple[float, Optional[int], TableNameIndex]
+
+
+def _version_key(database_id: int) -> str:
+    return f"table_name_index_version_{database_id}"
+
+
+def get_version(database_id: Optional[int]) -> Optional[int]:
+    """
+    Return the version of the table name indexes of a database shared by all the
+    processes through the cache, or None if it is not known.
+    """
+    if database_id is None:
+        return None
+    try:
+        version = cache_manager.cache.get(_version_key(database_id))
+        return int(version) if version is not None else None
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Could not read the table names version of %s", database_id)
+        return None
+
+
+def bump_version(database_id: int) -> None:
+    """Make every process rebuild the table name indexes of a database"""
+    key = _version_key(database_id)
+    try:
+        # start new counters from the current time so that a counter evicted
+        # from the cache never goes back to a version an index was built with
+        cache_manager.cache.add(key, int(time.time() * 1000), timeout=0)
+        cache_manager.cache.cache.inc(key)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Could not bump the table names version of %s", database_id)
+
+
+def _database_id(key: Hashable) -> Optional[int]:
+    return key[0] if isinstance(key, tuple) else None
+
+
+class TableNameIndexCache:
+    """
+    Process local LRU of ``TableNameIndex`` objects keyed by database, schema
+    and datasource type. Entries expire after the table list cache timeout so
+    the index never outlives the list it was built from.
+
+    Each entry also records the version of its database in the cache, which
+    invalidations and forced refreshes bump, so that they reach the indexes of
+    the other processes too. When the cache isn't shared by all the web servers,
+    those only see the change once their entries expire.
+    """
+
+    def __init__(self, max_entries: int = 64) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, IndexEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        key: Hashable,
+        loader: Callable[[], TableNameIndex],
+        timeout: Optional[int] = None,
+        force: bool = False,
+    ) -> TableNameIndex:
+        """
+        Return the index stored under ``key``, building it with ``loader`` if
+        it is missing, expired or ``force`` is set.
+        """
+        now = time.time()
+        database_id = _database_id(key)
+        version = get_version(database_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if (
+                entry is not None
+                and not force
+                and entry[0] > now
+                and entry[1] == version
+            ):
+                self._entries.move_to_end(key)
+                return entry[2]
+
+        if force and database_id is not None:
+            bump_version(database_id)
+            version = get_version(database_id)
+        index = loader()
+        expires = now + timeout if timeout else float("inf")
+        with self._lock:
+            self._entries[key] = (expires, version, index)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def invalidate(self, database_id: Optional[int] = None) -> None:
+        """
+        Drop the cached indexes of a database, in every process, or all the
+        indexes of this process.
+        """
+        if database_id is not None:
+            bump_version(database_id)
+        with self._lock:
+            if database_id is None:
+                self._entries.clear()
+                return
+            for key in [
+                key for key in self._entries if _database_id(key) == database_id
+            ]:
+                del self._entries[key]
+
+
+table_name_index_cache = TableNameIndexCache()
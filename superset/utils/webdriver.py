@@ -15,9 +15,13 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import atexit
 import logging
+import os
+import threading
 import time
-from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
 
 from flask import current_app
 from retry.api import retry_call
@@ -29,6 +33,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
 from superset.extensions import machine_auth_provider_factory
+from superset.utils.dates import now_as_float
 
 WindowSize = Tuple[int, int]
 logger = logging.getLogger(__name__)
@@ -95,36 +100,185 @@ class WebDriverProxy:
             pass
 
     def get_screenshot(
-        self,
-        url: str,
-        element_name: str,
-        user: "User",
-        retries: int = SELENIUM_RETRIES,
+        self, url: str, element_name: str, user: "User",
     ) -> Optional[bytes]:
-        driver = self.auth(user)
-        driver.set_window_size(*self._window)
-        driver.get(url)
-        img: Optional[bytes] = None
-        logger.debug("Sleeping for %i seconds", SELENIUM_HEADSTART)
-        time.sleep(SELENIUM_HEADSTART)
-        try:
-            logger.debug("Wait for the presence of %s", element_name)
-            element = WebDriverWait(driver, self._screenshot_locate_wait).until(
-                EC.presence_of_element_located((By.CLASS_NAME, element_name))
-            )
-            logger.debug("Wait for .loading to be done")
-            WebDriverWait(driver, self._screenshot_load_wait).until_not(
-                EC.presence_of_all_elements_located((By.CLASS_NAME, "loading"))
+        with get_webdriver_pool(self._driver_type).borrow(user, self._window) as driver:
+            start = now_as_float()
+            driver.get(url)
+            img: Optional[bytes] = None
+            logger.debug("Sleeping for %i seconds", SELENIUM_HEADSTART)
+            time.sleep(SELENIUM_HEADSTART)
+            try:
+                logger.debug("Wait for the presence of %s", element_name)
+                element = WebDriverWait(driver, self._screenshot_locate_wait).until(
+                    EC.presence_of_element_located((By.CLASS_NAME, element_name))
+                )
+                logger.debug("Wait for .loading to be done")
+                WebDriverWait(driver, self._screenshot_load_wait).until_not(
+                    EC.presence_of_all_elements_located((By.CLASS_NAME, "loading"))
+                )
+                logger.info("Taking a PNG screenshot or url %s", url)
+                img = element.screenshot_as_png
+            except TimeoutException:
+                logger.error("Selenium timed out requesting url %s", url)
+            except WebDriverException as ex:
+                logger.error(ex)
+                # Some webdrivers do not support screenshots for elements.
+                # In such cases, take a screenshot of the entire page.
+                img = driver.screenshot()  # pylint: disable=no-member
+            current_app.config["STATS_LOGGER"].timing(
+                "webdriver.capture", now_as_float() - start
             )
-            logger.info("Taking a PNG screenshot or url %s", url)
-            img = element.screenshot_as_png
-        except TimeoutException:
-            logger.error("Selenium timed out requesting url %s", url)
-        except WebDriverException as ex:
-            logger.error(ex)
-            # Some webdrivers do not support screenshots for elements.
-            # In such cases, take a screenshot of the entire page.
-            img = driver.screenshot()  # pylint: disable=no-member
-        finally:
-            self.destroy(driver, retries)
         return img
+
+
+class PooledWebDriver:  # pylint: disable=too-few-public-methods
+    def __init__(self, driver: WebDriver) -> None:
+        self.driver = driver
+        self.created = time.monotonic()
+        self.uses = 0
+        # id of the user whose cookies the browser has, None if it has none or
+        # the cookies of a request
+        self.user_id: Optional[int] = None
+
+
+class WebDriverPool:  # pylint: disable=too-many-instance-attributes
+    """
+    Authenticated browser sessions of a worker process, lent to the screenshots
+    of thumbnails and reports so that they don't start a browser and log in
+    every time.
+
+    At most ``WEBDRIVER_POOL_SIZE`` sessions are open at once. Idle sessions are
+    checked before being lent again and closed after
+    ``WEBDRIVER_POOL_MAX_USES`` screenshots or ``WEBDRIVER_POOL_MAX_AGE``
+    seconds. Sessions keep the cookies of the last user they were authenticated
+    as, and are preferably lent to the same user again.
+    """
+
+    def __init__(self, driver_type: str) -> None:
+        config = current_app.config
+        self.driver_type = driver_type
+        self.size = config["WEBDRIVER_POOL_SIZE"]
+        self.max_uses = config["WEBDRIVER_POOL_MAX_USES"]
+        self.max_age = config["WEBDRIVER_POOL_MAX_AGE"]
+        self.timeout = config["WEBDRIVER_POOL_TIMEOUT"]
+        self.stats_logger = config["STATS_LOGGER"]
+        self.pid = os.getpid()
+        self._idle: List[PooledWebDriver] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size) if self.size else None
+
+    @contextmanager
+    def borrow(self, user: Optional["User"], window: WindowSize) -> Iterator[WebDriver]:
+        """
+        Lend a browser session authenticated as a user, or with the cookies of
+        the current request if no user is given. The session is closed instead
+        of being returned to the pool if the block raises.
+        """
+        start = now_as_float()
+        if self._slots and not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError("Timed out waiting for a browser session")
+        try:
+            self.stats_logger.timing("webdriver_pool.wait", now_as_float() - start)
+            pooled = self._checkout(user, window)
+            healthy = False
+            try:
+                pooled.driver.set_window_size(*window)
+                yield pooled.driver
+                healthy = True
+            finally:
+                self._checkin(pooled, healthy)
+        finally:
+            if self._slots:
+                self._slots.release()
+
+    def close(self) -> None:
+        """Close the idle browser sessions"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            WebDriverProxy.destroy(pooled.driver)
+
+    def _checkout(self, user: Optional["User"], window: WindowSize) -> PooledWebDriver:
+        user_id = user.id if user else None
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                pooled = next(
+                    (p for p in self._idle if user_id and p.user_id == user_id),
+                    self._idle[-1],
+                )
+                self._idle.remove(pooled)
+            if self._is_alive(pooled):
+                self.stats_logger.incr("webdriver_pool.reuse")
+                if not user_id or pooled.user_id != user_id:
+                    self._authenticate(pooled, user)
+                return pooled
+            WebDriverProxy.destroy(pooled.driver)
+
+        self.stats_logger.incr("webdriver_pool.create")
+        pooled = PooledWebDriver(WebDriverProxy(self.driver_type, window).create())
+        self._authenticate(pooled, user)
+        return pooled
+
+    def _is_alive(self, pooled: PooledWebDriver) -> bool:
+        if time.monotonic() - pooled.created >= self.max_age:
+            return False
+        try:
+            # any command fails if the browser crashed or the session expired
+            pooled.driver.current_url  # pylint: disable=pointless-statement
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Discarding an unresponsive browser session")
+            return False
+        return True
+
+    @staticmethod
+    def _authenticate(pooled: PooledWebDriver, user: Optional["User"]) -> None:
+        try:
+            if pooled.uses:
+                pooled.driver.delete_all_cookies()
+            machine_auth_provider_factory.instance.authenticate_webdriver(
+                pooled.driver, user
+            )
+        except Exception:
+            WebDriverProxy.destroy(pooled.driver)
+            raise
+        pooled.user_id = user.id if user else None
+
+    def _checkin(self, pooled: PooledWebDriver, healthy: bool) -> None:
+        pooled.uses += 1
+        if (
+            healthy
+            and self.size
+            and pooled.uses < self.max_uses
+            and time.monotonic() - pooled.created < self.max_age
+        ):
+            with self._lock:
+                self._idle.append(pooled)
+            return
+        if healthy and self.size:
+            self.stats_logger.incr("webdriver_pool.recycle")
+        WebDriverProxy.destroy(pooled.driver)
+
+
+_pools: Dict[str, WebDriverPool] = {}
+
+
+def get_webdriver_pool(driver_type: str) -> WebDriverPool:
+    """The browser session pool of the current process"""
+    pool = _pools.get(driver_type)
+    # sessions are not shared with the processes forked after they were opened
+    if pool is None or pool.pid != os.getpid():
+        pool = _pools[driver_type] = WebDriverPool(driver_type)
+    return pool
+
+
+def close_webdriver_pools() -> None:
+    for pool in _pools.values():
+        if pool.pid == os.getpid():
+            pool.close()
+    _pools.clear()
+
+
+atexit.register(close_webdriver_pools)
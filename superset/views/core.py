@@ -17,8 +17,10 @@
 # pylint: disable=comparison-with-callable
 import logging
 import re
+import time
 from contextlib import closing
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Any, Callable, cast, Dict, List, Optional, Union
 from urllib import parse
 
@@ -54,6 +56,7 @@ from superset import (
     viz,
 )
 from superset.charts.dao import ChartDAO
+from superset.common.distinct_values import get_distinct_values
 from superset.connectors.connector_registry import ConnectorRegistry
 from superset.connectors.sqla.models import (
     AnnotationDatasource,
@@ -72,6 +75,7 @@ from superset.exceptions import (
     SupersetSecurityException,
     SupersetTimeoutException,
 )
+from superset.extensions import cache_manager
 from superset.jinja_context import get_template_processor
 from superset.models.core import Database, FavStar, Log
 from superset.models.dashboard import Dashboard
@@ -87,9 +91,11 @@ from superset.security.analytics_db_safety import (
 from superset.sql_parse import CtasMethod, ParsedQuery, Table
 from superset.sql_validators import get_validator_by_name
 from superset.typing import FlaskResponse
-from superset.utils import core as utils
+from superset.utils import core as utils, query_feed
 from superset.utils.cache import etag_cache
 from superset.utils.dates import now_as_float
+from superset.utils.query_progress import request_stop
+from superset.utils.table_search import table_name_index_cache, TableNameIndex
 from superset.views.base import (
     api,
     BaseSupersetView,
@@ -749,8 +755,11 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
         :param column: Column name to retrieve values for
         :returns: The Flask response
         :raises SupersetSecurityException: If the user cannot access the resource
+
+        The optional ``search``, ``offset``, ``limit`` and ``force`` request
+        arguments allow searching values by prefix, paginating through them and
+        bypassing the cache.
         """
-        # TODO: Cache endpoint by user, datasource and column
         datasource = ConnectorRegistry.get_datasource(
             datasource_type, datasource_id, db.session,
         )
@@ -758,8 +767,17 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
             return json_error_response(DATASOURCE_MISSING_ERR)
 
         datasource.raise_for_access()
+        row_limit = config["FILTER_SELECT_ROW_LIMIT"]
+        limit = min(request.args.get("limit", row_limit, type=int), row_limit)
         payload = json.dumps(
-            datasource.values_for_column(column, config["FILTER_SELECT_ROW_LIMIT"]),
+            get_distinct_values(
+                datasource,
+                column,
+                limit=limit,
+                search=request.args.get("search") or None,
+                offset=request.args.get("offset", 0, type=int),
+                force=request.args.get("force") == "true",
+            ),
             default=utils.json_int_dttm_ser,
             ignore_nan=True,
         )
@@ -913,7 +931,7 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
     @event_logger.log_this
     @expose("/tables/<int:db_id>/<schema>/<substr>/")
     @expose("/tables/<int:db_id>/<schema>/<substr>/<force_refresh>/")
-    def tables(  # pylint: disable=too-many-locals,no-self-use
+    def tables(  # pylint: disable=too-many-locals,too-many-statements,no-self-use
         self, db_id: int, schema: str, substr: str, force_refresh: str = "false"
     ) -> FlaskResponse:
         """Endpoint to fetch the list of tables for given database"""
@@ -930,62 +948,95 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
         schema_parsed = utils.parse_js_uri_path_item(schema, eval_undefined=True)
         substr_parsed = utils.parse_js_uri_path_item(substr, eval_undefined=True)
 
+        def get_datasource_label(ds_name: utils.DatasourceName) -> str:
+            return (
+                ds_name.table if schema_parsed else f"{ds_name.schema}.{ds_name.table}"
+            )
+
         if schema_parsed:
-            tables = (
-                database.get_all_table_names_in_schema(
-                    schema=schema_parsed,
-                    force=force_refresh_parsed,
-                    cache=database.table_cache_enabled,
-                    cache_timeout=database.table_cache_timeout,
-                )
-                or []
-            )
-            views = (
-                database.get_all_view_names_in_schema(
-                    schema=schema_parsed,
-                    force=force_refresh_parsed,
-                    cache=database.table_cache_enabled,
-                    cache_timeout=database.table_cache_timeout,
-                )
-                or []
+            cache_timeout = database.table_cache_timeout
+            if cache_timeout is None:
+                # the lists are cached with the default timeout of the cache
+                cache_timeout = cache_manager.cache.cache.default_timeout
+            list_kwargs = dict(
+                schema=schema_parsed,
+                force=force_refresh_parsed,
+                cache=database.table_cache_enabled,
+                cache_timeout=cache_timeout,
+            )
+            get_table_names = partial(
+                database.get_all_table_names_in_schema, **list_kwargs
+            )
+            get_view_names = partial(
+                database.get_all_view_names_in_schema, **list_kwargs
             )
         else:
-            tables = database.get_all_table_names_in_database(
-                cache=True, force=False, cache_timeout=24 * 60 * 60
-            )
-            views = database.get_all_view_names_in_database(
-                cache=True, force=False, cache_timeout=24 * 60 * 60
-            )
+            cache_timeout = 24 * 60 * 60
+            list_kwargs = dict(cache=True, force=False, cache_timeout=cache_timeout)
+            get_table_names = partial(
+                database.get_all_table_names_in_database, **list_kwargs
+            )
+            get_view_names = partial(
+                database.get_all_view_names_in_database, **list_kwargs
+            )
+
+        def get_index(
+            datasource_type: str, get_names: Callable[[], List[utils.DatasourceName]]
+        ) -> TableNameIndex:
+            # the index is only reused when the underlying list is cached too,
+            # otherwise every request is expected to hit the database
+            if schema_parsed and not database.table_cache_enabled:
+                return TableNameIndex(get_names() or [], get_datasource_label)
+            return table_name_index_cache.get(
+                (database.id, schema_parsed, datasource_type),
+                lambda: TableNameIndex(get_names() or [], get_datasource_label),
+                timeout=cache_timeout,
+                force=force_refresh_parsed,
+            )
+
+        table_index = get_index("table", get_table_names)
+        view_index = get_index("view", get_view_names)
+
+        # the search can stop at MAX_TABLE_NAMES matches only when none of them
+        # are filtered out afterwards, otherwise it has to return all of them
+        filter_default_schemas = not schema_parsed and database.default_schemas
+        limit = None
+        if (
+            substr_parsed
+            and config["MAX_TABLE_NAMES"]
+            and not filter_default_schemas
+            and security_manager.can_access_database(database)
+        ):
+            limit = config["MAX_TABLE_NAMES"]
+
         tables = security_manager.get_datasources_accessible_by_user(
-            database, tables, schema_parsed
+            database, table_index.search(substr_parsed, limit), schema_parsed
         )
         views = security_manager.get_datasources_accessible_by_user(
-            database, views, schema_parsed
+            database, view_index.search(substr_parsed, limit), schema_parsed
         )
 
-        def get_datasource_label(ds_name: utils.DatasourceName) -> str:
-            return (
-                ds_name.table if schema_parsed else f"{ds_name.schema}.{ds_name.table}"
-            )
-
-        if substr_parsed:
-            tables = [tn for tn in tables if substr_parsed in get_datasource_label(tn)]
-            views = [vn for vn in views if substr_parsed in get_datasource_label(vn)]
-
-        if not schema_parsed and database.default_schemas:
+        if filter_default_schemas:
             user_schema = g.user.email.split("@")[0]
             valid_schemas = set(database.default_schemas + [user_schema])
 
             tables = [tn for tn in tables if tn.schema in valid_schemas]
             views = [vn for vn in views if vn.schema in valid_schemas]
 
-        max_items = config["MAX_TABLE_NAMES"] or len(tables)
-        total_items = len(tables) + len(views)
-        max_tables = len(tables)
-        max_views = len(views)
+        if limit:
+            table_count = table_index.count(substr_parsed)
+            view_count = view_index.count(substr_parsed)
+        else:
+            table_count = len(tables)
+            view_count = len(views)
+
+        max_items = config["MAX_TABLE_NAMES"] or table_count
+        total_items = table_count + view_count
+        max_tables = table_count
+        max_views = view_count
         if total_items and substr_parsed:
-            max_tables = max_items * len(tables) // total_items
-            max_views = max_items * len(views) // total_items
+            max_tables = max_items * table_count // total_items
+            max_views = max_items * view_count // total_items
 
         dataset_tables = {table.name: table for table in database.tables}
 
@@ -1015,7 +1066,7 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
             ]
         )
         table_options.sort(key=lambda value: value["label"])
-        payload = {"tableLength": len(tables) + len(views), "options": table_options}
+        payload = {"tableLength": total_items, "options": table_options}
         return json_success(json.dumps(payload))
 
     @api
@@ -2134,6 +2185,7 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
             return self.json_response("OK")
         query.status = QueryStatus.STOPPED
         db.session.commit()
+        request_stop(query.id)
 
         return self.json_response("OK")
 
@@ -2557,6 +2609,13 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
                 "Please login to access the queries.", status=403
             )
 
+        dict_queries = Superset._get_queries_changed_since(last_updated_ms)
+        return json_success(json.dumps(dict_queries, default=utils.json_int_dttm_ser))
+
+    @staticmethod
+    def _get_queries_changed_since(
+        last_updated_ms: Union[float, int]
+    ) -> Dict[str, Dict[str, Any]]:
         # UTC date time, same that is stored in the DB.
         last_updated_dt = datetime.utcfromtimestamp(last_updated_ms / 1000)
 
@@ -2567,8 +2626,49 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
             )
             .all()
         )
-        dict_queries = {q.client_id: q.to_dict() for q in sql_queries}
-        return json_success(json.dumps(dict_queries, default=utils.json_int_dttm_ser))
+        return {q.client_id: q.to_dict() for q in sql_queries}
+
+    @has_access_api
+    @expose("/queries_feed/")
+    def queries_feed(self) -> FlaskResponse:  # pylint: disable=no-self-use
+        """
+        Get the queries of the current user changed since the last poll.
+
+        Takes the ``last_updated_ms`` request argument with the same meaning as
+        in ``/queries/``, and the ``version`` returned by the previous call.
+        When the queries haven't changed since that version, an empty result is
+        returned without querying the queries table. The optional ``wait``
+        argument makes the request wait up to that many seconds (capped by
+        ``SQLLAB_QUERIES_FEED_MAX_WAIT``) for a change before returning.
+        """
+        stats_logger.incr("queries_feed")
+        user_id = g.user.get_id()
+        if not user_id:
+            return json_error_response(
+                "Please login to access the queries.", status=403
+            )
+
+        last_updated_ms = request.args.get("last_updated_ms", 0, type=float)
+        client_version = request.args.get("version", type=int)
+        wait = min(
+            request.args.get("wait", 0, type=float),
+            config["SQLLAB_QUERIES_FEED_MAX_WAIT"],
+        )
+        deadline = now_as_float() + wait * 1000
+
+        version = query_feed.get_version(user_id)
+        while version is not None and version == client_version:
+            if now_as_float() >= deadline:
+                stats_logger.incr("queries_feed_unchanged")
+                return json_success(json.dumps({"version": version, "queries": {}}))
+            time.sleep(0.5)
+            version = query_feed.get_version(user_id)
+
+        payload = {
+            "version": version,
+            "queries": self._get_queries_changed_since(last_updated_ms),
+        }
+        return json_success(json.dumps(payload, default=utils.json_int_dttm_ser))
 
     @has_access
     @event_logger.log_this
@@ -17,7 +17,7 @@
 import re
 from typing import List, Union
 
-from flask import g, redirect, request, Response
+from flask import g, redirect, request, Response, stream_with_context
 from flask_appbuilder import expose
 from flask_appbuilder.actions import action
 from flask_appbuilder.models.sqla.interface import SQLAInterface
@@ -76,7 +76,7 @@ class DashboardModelView(
         if request.args.get("action") == "go":
             ids = request.args.getlist("id")
             return Response(
-                DashboardModel.export_dashboards(ids),
+                stream_with_context(DashboardModel.iter_export_dashboards(ids)),
                 headers=generate_download_headers("json"),
                 mimetype="application/text",
             )
@@ -37,7 +37,7 @@ from superset.typing import FlaskResponse
 from superset.utils import core as utils
 from superset.views.base import DeleteMixin, SupersetModelView, YamlExportMixin
 
-from .forms import CsvToDatabaseForm, ExcelToDatabaseForm
+from .forms import ColumnarToDatabaseForm, CsvToDatabaseForm, ExcelToDatabaseForm
 from .mixins import DatabaseMixin
 from .validators import schema_allows_csv_upload, sqlalchemy_uri_validator
 
@@ -77,6 +77,51 @@ def upload_stream_write(form_file_field: "FileStorage", path: str) -> None:
             file_description.write(chunk)
 
 
+def register_uploaded_table(database: models.Database, table: Table) -> SqlaTable:
+    """
+    Add the table a file was uploaded to as a dataset, or refresh the columns
+    of the dataset if it already exists. The session is left to commit.
+
+    :param database: The database the file was uploaded to
+    :param table: The table the file was uploaded to
+    :return: The dataset of the table
+    """
+    # Connect table to the database that should be used for exploration.
+    # E.g. if hive was used to upload a file, presto will be a better option
+    # to explore the table.
+    explore_database = database
+    explore_database_id = database.explore_database_id
+    if explore_database_id:
+        explore_database = (
+            db.session.query(models.Database)
+            .filter_by(id=explore_database_id)
+            .one_or_none()
+            or database
+        )
+
+    sqla_table = (
+        db.session.query(SqlaTable)
+        .filter_by(
+            table_name=table.table,
+            schema=table.schema,
+            database_id=explore_database.id,
+        )
+        .one_or_none()
+    )
+
+    if sqla_table:
+        sqla_table.fetch_metadata()
+    if not sqla_table:
+        sqla_table = SqlaTable(table_name=table.table)
+        sqla_table.database = explore_database
+        sqla_table.database_id = database.id
+        sqla_table.user_id = g.user.id
+        sqla_table.schema = table.schema
+        sqla_table.fetch_metadata()
+        db.session.add(sqla_table)
+    return sqla_table
+
+
 class DatabaseView(
     DatabaseMixin, SupersetModelView, DeleteMixin, YamlExportMixin
 ):  # pylint: disable=too-many-ancestors
@@ -137,8 +182,8 @@ class CsvToDatabaseView(SimpleFormView):
         if "." in csv_table.table and csv_table.schema:
             message = _(
                 "You cannot specify a namespace both in the name of the table: "
-                '"%(csv_table.table)s" and in the schema field: '
-                '"%(csv_table.schema)s". Please remove one',
+                '"%(table)s" and in the schema field: '
+                '"%(schema)s". Please remove one',
                 table=csv_table.table,
                 schema=csv_table.schema,
             )
@@ -173,7 +218,7 @@ class CsvToDatabaseView(SimpleFormView):
                 "skip_blank_lines": form.skip_blank_lines.data,
                 "parse_dates": form.parse_dates.data,
                 "infer_datetime_format": form.infer_datetime_format.data,
-                "chunksize": 1000,
+                "chunksize": config["CSV_UPLOAD_CHUNK_SIZE"],
             }
             if form.null_values.data:
                 csv_to_df_kwargs["na_values"] = form.null_values.data
@@ -186,7 +231,7 @@ class CsvToDatabaseView(SimpleFormView):
                 "if_exists": form.if_exists.data,
                 "index": form.index.data,
                 "index_label": form.index_label.data,
-                "chunksize": 1000,
+                "chunksize": config["UPLOAD_INSERT_CHUNK_SIZE"],
             }
             database.db_engine_spec.create_table_from_csv(
                 uploaded_tmp_file_path,
@@ -196,39 +241,7 @@ class CsvToDatabaseView(SimpleFormView):
                 df_to_sql_kwargs,
             )
 
-            # Connect table to the database that should be used for exploration.
-            # E.g. if hive was used to upload a csv, presto will be a better option
-            # to explore the table.
-            expore_database = database
-            explore_database_id = database.explore_database_id
-            if explore_database_id:
-                expore_database = (
-                    db.session.query(models.Database)
-                    .filter_by(id=explore_database_id)
-                    .one_or_none()
-                    or database
-                )
-
-            sqla_table = (
-                db.session.query(SqlaTable)
-                .filter_by(
-                    table_name=csv_table.table,
-                    schema=csv_table.schema,
-                    database_id=expore_database.id,
-                )
-                .one_or_none()
-            )
-
-            if sqla_table:
-                sqla_table.fetch_metadata()
-            if not sqla_table:
-                sqla_table = SqlaTable(table_name=csv_table.table)
-                sqla_table.database = expore_database
-                sqla_table.database_id = database.id
-                sqla_table.user_id = g.user.id
-                sqla_table.schema = csv_table.schema
-                sqla_table.fetch_metadata()
-                db.session.add(sqla_table)
+            sqla_table = register_uploaded_table(database, csv_table)
             db.session.commit()
         except Exception as ex:  # pylint: disable=broad-except
             db.session.rollback()
@@ -294,8 +307,8 @@ class ExcelToDatabaseView(SimpleFormView):
         if "." in excel_table.table and excel_table.schema:
             message = _(
                 "You cannot specify a namespace both in the name of the table: "
-                '"%(excel_table.table)s" and in the schema field: '
-                '"%(excel_table.schema)s". Please remove one',
+                '"%(table)s" and in the schema field: '
+                '"%(schema)s". Please remove one',
                 table=excel_table.table,
                 schema=excel_table.schema,
             )
@@ -338,7 +351,7 @@ class ExcelToDatabaseView(SimpleFormView):
                 "if_exists": form.if_exists.data,
                 "index": form.index.data,
                 "index_label": form.index_label.data,
-                "chunksize": 1000,
+                "chunksize": config["UPLOAD_INSERT_CHUNK_SIZE"],
             }
             database.db_engine_spec.create_table_from_excel(
                 uploaded_tmp_file_path,
@@ -348,39 +361,7 @@ class ExcelToDatabaseView(SimpleFormView):
                 df_to_sql_kwargs,
             )
 
-            # Connect table to the database that should be used for exploration.
-            # E.g. if hive was used to upload a excel, presto will be a better option
-            # to explore the table.
-            expore_database = database
-            explore_database_id = database.explore_database_id
-            if explore_database_id:
-                expore_database = (
-                    db.session.query(models.Database)
-                    .filter_by(id=explore_database_id)
-                    .one_or_none()
-                    or database
-                )
-
-            sqla_table = (
-                db.session.query(SqlaTable)
-                .filter_by(
-                    table_name=excel_table.table,
-                    schema=excel_table.schema,
-                    database_id=expore_database.id,
-                )
-                .one_or_none()
-            )
-
-            if sqla_table:
-                sqla_table.fetch_metadata()
-            if not sqla_table:
-                sqla_table = SqlaTable(table_name=excel_table.table)
-                sqla_table.database = expore_database
-                sqla_table.database_id = database.id
-                sqla_table.user_id = g.user.id
-                sqla_table.schema = excel_table.schema
-                sqla_table.fetch_metadata()
-                db.session.add(sqla_table)
+            sqla_table = register_uploaded_table(database, excel_table)
             db.session.commit()
         except Exception as ex:  # pylint: disable=broad-except
             db.session.rollback()
@@ -414,3 +395,105 @@ class ExcelToDatabaseView(SimpleFormView):
         flash(message, "info")
         stats_logger.incr("successful_excel_upload")
         return redirect("/tablemodelview/list/")
+
+
+class ColumnarToDatabaseView(SimpleFormView):
+    form = ColumnarToDatabaseForm
+    form_template = "superset/form_view/columnar_to_database_view/edit.html"
+    form_title = _("Columnar to Database configuration")
+    add_columns = ["database", "schema", "table_name"]
+
+    def form_get(self, form: ColumnarToDatabaseForm) -> None:
+        form.if_exists.data = "fail"
+
+    def form_post(self, form: ColumnarToDatabaseForm) -> Response:
+        database = form.con.data
+        columnar_table = Table(table=form.name.data, schema=form.schema.data)
+
+        if not schema_allows_csv_upload(database, columnar_table.schema):
+            message = _(
+                'Database "%(database_name)s" schema "%(schema_name)s" '
+                "is not allowed for columnar uploads. "
+                "Please contact your Superset Admin.",
+                database_name=database.database_name,
+                schema_name=columnar_table.schema,
+            )
+            flash(message, "danger")
+            return redirect("/columnartodatabaseview/form")
+
+        if "." in columnar_table.table and columnar_table.schema:
+            message = _(
+                "You cannot specify a namespace both in the name of the table: "
+                '"%(table)s" and in the schema field: '
+                '"%(schema)s". Please remove one',
+                table=columnar_table.table,
+                schema=columnar_table.schema,
+            )
+            flash(message, "danger")
+            return redirect("/columnartodatabaseview/form")
+
+        uploaded_tmp_file_path = tempfile.NamedTemporaryFile(
+            dir=app.config["UPLOAD_FOLDER"],
+            suffix=os.path.splitext(form.columnar_file.data.filename)[1].lower(),
+            delete=False,
+        ).name
+
+        try:
+            utils.ensure_path_exists(config["UPLOAD_FOLDER"])
+            upload_stream_write(form.columnar_file.data, uploaded_tmp_file_path)
+
+            con = form.data.get("con")
+            database = (
+                db.session.query(models.Database).filter_by(id=con.data.get("id")).one()
+            )
+
+            columnar_to_df_kwargs = {"columns": form.usecols.data}
+            df_to_sql_kwargs = {
+                "name": columnar_table.table,
+                "if_exists": form.if_exists.data,
+                "index": form.index.data,
+                "index_label": form.index_label.data,
+                "chunksize": config["UPLOAD_INSERT_CHUNK_SIZE"],
+            }
+            database.db_engine_spec.create_table_from_columnar(
+                uploaded_tmp_file_path,
+                columnar_table,
+                database,
+                columnar_to_df_kwargs,
+                df_to_sql_kwargs,
+            )
+
+            sqla_table = register_uploaded_table(database, columnar_table)
+            db.session.commit()
+        except Exception as ex:  # pylint: disable=broad-except
+            db.session.rollback()
+            try:
+                os.remove(uploaded_tmp_file_path)
+            except OSError:
+                pass
+            message = _(
+                'Unable to upload columnar file "%(filename)s" to table '
+                '"%(table_name)s" in database "%(db_name)s". '
+                "Error message: %(error_msg)s",
+                filename=form.columnar_file.data.filename,
+                table_name=form.name.data,
+                db_name=database.database_name,
+                error_msg=str(ex),
+            )
+
+            flash(message, "danger")
+            stats_logger.incr("failed_columnar_upload")
+            return redirect("/columnartodatabaseview/form")
+
+        os.remove(uploaded_tmp_file_path)
+        # Go back to welcome page / splash screen
+        message = _(
+            'Columnar file "%(columnar_filename)s" uploaded to table "%(table_name)s" '
+            'in database "%(db_name)s"',
+            columnar_filename=form.columnar_file.data.filename,
+            table_name=str(columnar_table),
+            db_name=sqla_table.database.database_name,
+        )
+        flash(message, "info")
+        stats_logger.incr("successful_columnar_upload")
+        return redirect("/tablemodelview/list/")
@@ -65,7 +65,7 @@ from superset.extensions import cache_manager, security_manager
 from superset.models.cache import CacheKey
 from superset.models.helpers import QueryResult
 from superset.typing import QueryObjectDict, VizData, VizPayload
-from superset.utils import core as utils
+from superset.utils import core as utils, geo, hierarchy, pivot
 from superset.utils.core import (
     DTTM_ALIAS,
     JS_MAX_INTEGER,
@@ -877,7 +877,7 @@ class PivotTableViz(BaseViz):
         if pd.api.types.is_numeric_dtype(df[metric]):
             # Ensure that Pandas's sum function mimics that of SQL.
             if aggfunc == "sum":
-                return lambda x: x.sum(min_count=1)
+                return pivot.sql_sum
         # only min and max work properly for non-numerics
         return aggfunc if aggfunc in ("min", "max") else "max"
 
@@ -924,13 +924,14 @@ class PivotTableViz(BaseViz):
         for column_name in groupby + columns:
             column = self.datasource.get_column(column_name)
             if column and column.is_temporal:
-                ts = df[column_name].apply(self._format_datetime)
+                ts = pivot.map_distinct(df[column_name], self._format_datetime)
                 df[column_name] = ts
 
         if self.form_data.get("transpose_pivot"):
             groupby, columns = columns, groupby
 
-        df = df.pivot_table(
+        df = pivot.pivot_table(
+            df,
             index=groupby,
             columns=columns,
             values=metrics,
@@ -966,15 +967,22 @@ class TreemapViz(BaseViz):
     is_timeseries = False
 
     def _nest(self, metric: str, df: pd.DataFrame) -> List[Dict[str, Any]]:
-        nlevels = df.index.nlevels
-        if nlevels == 1:
-            result = [{"name": n, "value": v} for n, v in zip(df.index, df[metric])]
-        else:
-            result = [
-                {"name": l, "children": self._nest(metric, df.loc[l])}
-                for l in df.index.levels[0]
-            ]
-        return result
+        index = df.index
+        if index.nlevels == 1:
+            return [{"name": n, "value": v} for n, v in zip(index, df[metric])]
+        levels = [
+            hierarchy.prefixes(index, nlevels) for nlevels in range(1, index.nlevels)
+        ] + [index]
+        names = [level.get_level_values(-1).tolist() for level in levels]
+        values = df[metric].tolist()
+
+        def make_node(level: int, position: int) -> Dict[str, Any]:
+            name = names[level][position]
+            if level == len(levels) - 1:
+                return {"name": name, "value": values[position]}
+            return {"name": name, "children": []}
+
+        return hierarchy.build_tree(levels, make_node)
 
     def get_data(self, df: pd.DataFrame) -> VizData:
         if df.empty:
@@ -2309,6 +2317,22 @@ class BaseDeckGLViz(BaseViz):
         except Exception:
             raise SpatialException(_("Invalid spatial point encountered: %s" % s))
 
+    @staticmethod
+    def parse_coordinates_column(
+        values: pd.Series,
+    ) -> List[Optional[Tuple[float, float]]]:
+        """Vectorized equivalent of applying `parse_coordinates` to a column"""
+        present = np.fromiter(map(bool, values), dtype=bool, count=len(values))
+        try:
+            points = geo.parse_points(values[present])
+        except Exception:
+            # find the offending value for the error message
+            for value in values[present]:
+                BaseDeckGLViz.parse_coordinates(value)
+            raise
+        coords = zip(points["latitude"].tolist(), points["longitude"].tolist())
+        return [next(coords) if is_present else None for is_present in present]
+
     @staticmethod
     def reverse_geohash_decode(geohash_code: str) -> Tuple[str, str]:
         lat, lng = geohash.decode(geohash_code)
@@ -2332,10 +2356,11 @@ class BaseDeckGLViz(BaseViz):
             )
         elif spatial.get("type") == "delimited":
             lon_lat_col = spatial.get("lonlatCol")
-            df[key] = df[lon_lat_col].apply(self.parse_coordinates)
+            df[key] = self.parse_coordinates_column(df[lon_lat_col])
             del df[lon_lat_col]
         elif spatial.get("type") == "geohash":
-            df[key] = df[spatial.get("geohashCol")].map(self.reverse_geohash_decode)
+            lat, lng = geo.geohash_decode(df[spatial.get("geohashCol")])
+            df[key] = list(zip(lng.tolist(), lat.tolist()))
             del df[spatial.get("geohashCol")]
 
         if spatial.get("reverseCheckbox"):
@@ -2823,15 +2848,9 @@ class PartitionViz(NVD3TimeSeriesViz):
         """
         Compute the partition at each `level` from the dataframe.
         """
-        levels = {}
-        for i in range(0, len(groups) + 1):
-            agg_df = df.groupby(groups[:i]) if i else df
-            levels[i] = (
-                agg_df.mean()
-                if time_op == "agg_mean"
-                else agg_df.sum(numeric_only=True)
-            )
-        return levels
+        return hierarchy.aggregate_levels(
+            df, groups, "mean" if time_op == "agg_mean" else "sum"
+        )
 
     def levels_for_diff(
         self, time_op: str, groups: List[str], df: pd.DataFrame
@@ -2880,82 +2899,72 @@ class PartitionViz(NVD3TimeSeriesViz):
         self.form_data["groupby"] = groups
         return procs
 
-    def nest_values(
-        self,
-        levels: Dict[int, pd.DataFrame],
-        level: int = 0,
-        metric: Optional[str] = None,
-        dims: Optional[List[str]] = None,
-    ) -> List[Dict[str, Any]]:
+    def nest_values(self, levels: Dict[int, pd.DataFrame]) -> List[Dict[str, Any]]:
         """
         Nest values at each level on the back-end with
         access and setting, instead of summing from the bottom.
         """
-        if dims is None:
-            dims = []
-        if not level:
-            return [
-                {
-                    "name": m,
-                    "val": levels[0][m],
-                    "children": self.nest_values(levels, 1, m),
-                }
-                for m in levels[0].index
+        indexes = [levels[level].index for level in range(1, len(levels))]
+        parents = hierarchy.get_parents(indexes)
+        names = [index.tolist() for index in indexes]
+
+        def nest_metric(metric: str) -> List[Dict[str, Any]]:
+            values = [
+                levels[level][metric].to_numpy() for level in range(1, len(levels))
             ]
-        if level == 1:
-            metric_level = levels[1][metric]
-            return [
-                {
-                    "name": i,
-                    "val": metric_level[i],
-                    "children": self.nest_values(levels, 2, metric, [i]),
+
+            def make_node(level: int, position: int) -> Dict[str, Any]:
+                return {
+                    "name": names[level][position],
+                    "val": values[level][position],
+                    "children": [],
                 }
-                for i in metric_level.index
-            ]
-        if level >= len(levels):
-            return []
-        dim_level = levels[level][metric][[dims[0]]]
+
+            return hierarchy.build_tree(indexes, make_node, parents)
+
         return [
-            {
-                "name": i,
-                "val": dim_level[i],
-                "children": self.nest_values(levels, level + 1, metric, dims + [i]),
-            }
-            for i in dim_level.index
+            {"name": m, "val": levels[0][m], "children": nest_metric(m)}
+            for m in levels[0].index
         ]
 
-    def nest_procs(
-        self,
-        procs: Dict[int, pd.DataFrame],
-        level: int = -1,
-        dims: Optional[Tuple[str, ...]] = None,
-        time: Any = None,
-    ) -> List[Dict[str, Any]]:
-        if dims is None:
-            dims = ()
-        if level == -1:
-            return [
-                {"name": m, "children": self.nest_procs(procs, 0, (m,))}
-                for m in procs[0].columns
+    def nest_procs(self, procs: Dict[int, pd.DataFrame]) -> List[Dict[str, Any]]:
+        # columns are kept apart so that their values keep their type
+        values = [
+            [frame.iloc[:, column].tolist() for column in range(frame.shape[1])]
+            for frame in procs.values()
+        ]
+
+        def nest_metric(metric: int) -> List[Dict[str, Any]]:
+            # the series of a level are the columns of its frame, keyed by the
+            # metric followed by the groups
+            name = procs[0].columns[metric]
+            columns = [np.array([metric])] + [
+                np.flatnonzero(procs[level].columns.get_level_values(0) == name)
+                for level in range(1, len(procs))
             ]
-        if not level:
-            return [
-                {
-                    "name": t,
-                    "val": procs[0][dims[0]][t],
-                    "children": self.nest_procs(procs, 1, dims, t),
-                }
-                for t in procs[0].index
+            levels = [
+                procs[level].columns[columns[level]] for level in range(len(procs))
             ]
-        if level >= len(procs):
-            return []
+            parents = hierarchy.get_parents(levels)
+            names = [index.get_level_values(-1).tolist() for index in levels]
+
+            def nest_time(time: int, t: Any) -> Dict[str, Any]:
+                def make_node(level: int, position: int) -> Dict[str, Any]:
+                    column = columns[level][position]
+                    return {
+                        "name": names[level][position] if level else t,
+                        "val": values[level][column][time],
+                        "children": [],
+                    }
+
+                (node,) = hierarchy.build_tree(levels, make_node, parents)
+                return node
+
+            return [nest_time(time, t) for time, t in enumerate(procs[0].index)]
+
         return [
-            {
-                "name": i,
-                "val": procs[level][dims][i][time],
-                "children": self.nest_procs(procs, level + 1, dims + (i,), time),
-            }
-            for i in procs[level][dims].columns
+            {"name": m, "children": nest_metric(metric)}
+            for metric, m in enumerate(procs[0].columns)
         ]
 
     def get_data(self, df: pd.DataFrame) -> VizData:
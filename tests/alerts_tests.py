@@ -17,15 +17,20 @@
 """Unit tests for alerting in Superset"""
 import json
 import logging
+from datetime import datetime, timedelta
 from typing import Optional
 from unittest.mock import patch
 
 import pytest
+from celery.exceptions import Retry
+from sqlalchemy.exc import NoSuchColumnError
 from sqlalchemy.orm import Session
 
 from superset import db
 from superset.exceptions import SupersetException
 from superset.models.alerts import Alert, AlertLog, SQLObservation
+from superset.models.core import Database
+from superset.models.schedules import ScheduleType
 from superset.models.slice import Slice
 from superset.tasks.alerts.observer import observe
 from superset.tasks.alerts.validator import (
@@ -38,6 +43,8 @@ from superset.tasks.schedules import (
     AlertState,
     deliver_alert,
     evaluate_alert,
+    schedule_alert_queries,
+    schedule_window,
     validate_observations,
 )
 from superset.utils import core as utils
@@ -172,6 +179,73 @@ def test_evaluate_alert(mock_deliver_alert, setup_database):
     assert alert3.logs[-1].state == AlertState.TRIGGER
 
 
+@patch("superset.tasks.schedules.deliver_alert")
+def test_schedule_alert_queries(mock_deliver_alert, setup_database):
+    db_session = setup_database
+    alert1 = create_alert(db_session, "SELECT 55", "not null", "{}")
+    alert2 = create_alert(
+        db_session, "SELECT 55", "operator", '{"op": ">", "threshold": 60}'
+    )
+
+    with patch.object(
+        Database, "get_df", autospec=True, side_effect=Database.get_df
+    ) as get_df_mock:
+        schedule_alert_queries.run([alert1.id, alert2.id])
+    get_df_mock.assert_called_once()
+
+    db_session.expire_all()
+    assert alert1.logs[-1].state == AlertState.TRIGGER
+    assert alert2.logs[-1].state == AlertState.PASS
+    assert alert1.observations[-1].value == alert2.observations[-1].value == 55.0
+    assert mock_deliver_alert.call_count == 1
+
+
+@patch("superset.tasks.schedules.deliver_alert")
+def test_schedule_alert_queries_retry_failed(mock_deliver_alert, setup_database):
+    db_session = setup_database
+    alert1 = create_alert(db_session, "SELECT 55", "not null", "{}")
+    alert2 = create_alert(db_session, "SELECT 55", "not null", "{}")
+
+    def deliver_alert(alert_id, *_args):
+        if alert_id == alert2.id:
+            raise NoSuchColumnError()
+
+    mock_deliver_alert.side_effect = deliver_alert
+
+    with patch.object(
+        schedule_alert_queries, "retry", return_value=Retry()
+    ) as retry_mock, pytest.raises(Retry):
+        schedule_alert_queries.run([alert1.id, alert2.id])
+    # the delivered alert is not evaluated again
+    assert retry_mock.call_args[1]["args"] == ([alert2.id],)
+
+
+@patch("superset.tasks.schedules.schedule_alert_query.apply_async")
+@patch("superset.tasks.schedules.schedule_alert_queries.apply_async")
+def test_schedule_window_groups_alerts(
+    mock_schedule_queries, mock_schedule_query, setup_database
+):
+    db_session = setup_database
+    create_alert(db_session, "SELECT 1")
+    create_alert(db_session, "SELECT 2")
+    alert_ids = [alert.id for alert in db_session.query(Alert).filter_by(active=True)]
+
+    start_at = datetime.utcnow().replace(second=0, microsecond=0) + timedelta(minutes=1)
+    stop_at = start_at + timedelta(seconds=1)
+    schedule_window(ScheduleType.alert, start_at, stop_at, 0, db_session)
+
+    mock_schedule_query.assert_not_called()
+    mock_schedule_queries.assert_called_once_with((alert_ids,), eta=start_at)
+
+    # the alerts are not scheduled again until they fire next
+    mock_schedule_queries.reset_mock()
+    schedule_window(ScheduleType.alert, start_at, stop_at, 0, db_session)
+    mock_schedule_queries.assert_not_called()
+    assert db_session.query(Alert).get(alert_ids[0]).next_eval_dttm == (
+        start_at + timedelta(minutes=1)
+    )
+
+
 @pytest.mark.parametrize(
     "description, validator_type, config",
     [
@@ -43,8 +43,10 @@ CSV_UPLOAD_DATABASE = "csv_explore_db"
 CSV_FILENAME1 = "testCSV1.csv"
 CSV_FILENAME2 = "testCSV2.csv"
 EXCEL_FILENAME = "testExcel.xlsx"
+PARQUET_FILENAME = "testParquet.parquet"
 
 EXCEL_UPLOAD_TABLE = "excel_upload"
+PARQUET_UPLOAD_TABLE = "parquet_upload"
 CSV_UPLOAD_TABLE = "csv_upload"
 CSV_UPLOAD_TABLE_W_SCHEMA = "csv_upload_w_schema"
 CSV_UPLOAD_TABLE_W_EXPLORE = "csv_upload_w_explore"
@@ -69,6 +71,7 @@ def setup_csv_upload():
         upload_db = get_upload_db()
         engine = upload_db.get_sqla_engine()
         engine.execute(f"DROP TABLE IF EXISTS {EXCEL_UPLOAD_TABLE}")
+        engine.execute(f"DROP TABLE IF EXISTS {PARQUET_UPLOAD_TABLE}")
         engine.execute(f"DROP TABLE IF EXISTS {CSV_UPLOAD_TABLE}")
         engine.execute(f"DROP TABLE IF EXISTS {CSV_UPLOAD_TABLE_W_SCHEMA}")
         engine.execute(f"DROP TABLE IF EXISTS {CSV_UPLOAD_TABLE_W_EXPLORE}")
@@ -97,6 +100,15 @@ def create_excel_files():
     os.remove(EXCEL_FILENAME)
 
 
+@pytest.fixture()
+def create_parquet_files():
+    df = pd.DataFrame({"a": ["john", "paul", "george"], "b": [1, None, 3]})
+    df["b"] = df["b"].astype("Int64")
+    df.to_parquet(PARQUET_FILENAME, row_group_size=2)
+    yield
+    os.remove(PARQUET_FILENAME)
+
+
 def get_upload_db():
     return db.session.query(Database).filter_by(database_name=CSV_UPLOAD_DATABASE).one()
 
@@ -134,6 +146,21 @@ def upload_excel(
     return get_resp(test_client, "/exceltodatabaseview/form", data=form_data)
 
 
+def upload_columnar(
+    filename: str, table_name: str, extra: Optional[Dict[str, str]] = None
+):
+    form_data = {
+        "columnar_file": open(filename, "rb"),
+        "name": table_name,
+        "con": get_upload_db().id,
+        "if_exists": "fail",
+        "index_label": "test_label",
+    }
+    if extra:
+        form_data.update(extra)
+    return get_resp(test_client, "/columnartodatabaseview/form", data=form_data)
+
+
 def mock_upload_to_s3(f: str, p: str, t: Table) -> str:
     """ HDFS is used instead of S3 for the unit tests.
 
@@ -337,3 +364,46 @@ def test_import_excel(setup_csv_upload, create_excel_files):
         .fetchall()
     )
     assert data == [(0, "john", 1), (1, "paul", 2)]
+
+
+@mock.patch("superset.db_engine_specs.hive.upload_to_s3", mock_upload_to_s3)
+def test_import_parquet(setup_csv_upload, create_parquet_files):
+    if utils.backend() == "hive":
+        pytest.skip("Hive doesn't support columnar uploads.")
+
+    success_msg = (
+        f'Columnar file "{PARQUET_FILENAME}" uploaded to table "{PARQUET_UPLOAD_TABLE}"'
+    )
+
+    # initial upload with fail mode
+    resp = upload_columnar(PARQUET_FILENAME, PARQUET_UPLOAD_TABLE)
+    assert success_msg in resp
+
+    # upload again with fail mode; should fail
+    fail_msg = (
+        f'Unable to upload columnar file "{PARQUET_FILENAME}" '
+        f'to table "{PARQUET_UPLOAD_TABLE}"'
+    )
+    resp = upload_columnar(PARQUET_FILENAME, PARQUET_UPLOAD_TABLE)
+    assert fail_msg in resp
+
+    # upload again with append mode
+    resp = upload_columnar(
+        PARQUET_FILENAME, PARQUET_UPLOAD_TABLE, extra={"if_exists": "append"}
+    )
+    assert success_msg in resp
+
+    # upload the selected columns with the index in replace mode
+    resp = upload_columnar(
+        PARQUET_FILENAME,
+        PARQUET_UPLOAD_TABLE,
+        extra={"if_exists": "replace", "usecols": "b", "index": "true"},
+    )
+    assert success_msg in resp
+
+    # the row groups are numbered consecutively and nulls are kept in integer columns
+    engine = get_upload_db().get_sqla_engine()
+    data = engine.execute(f"SELECT * from {PARQUET_UPLOAD_TABLE}").fetchall()
+    assert data == [(0, 1), (1, None), (2, 3)]
+    table = SupersetTestCase.get_table_by_name(PARQUET_UPLOAD_TABLE)
+    assert table.get_column("b").type == "BIGINT"
@@ -455,6 +455,28 @@ class TestDashboardApi(SupersetTestCase, ApiOwnersTestCaseMixin):
         db.session.delete(dashboard)
         db.session.commit()
 
+    def test_get_dashboards_thumbnail_url(self):
+        """
+        Dashboard API: Test get dashboards thumbnail url covers the charts
+        """
+        admin = self.get_user("admin")
+        slices = db.session.query(Slice).limit(2).all()
+        dashboard = self.insert_dashboard("title", "slug1", [admin.id], slices=slices)
+
+        self.login(username="admin")
+        arguments = {
+            "filters": [{"col": "dashboard_title", "opr": "eq", "value": "title"}]
+        }
+        uri = f"api/v1/dashboard/?q={prison.dumps(arguments)}"
+        rv = self.client.get(uri)
+        self.assertEqual(rv.status_code, 200)
+        data = json.loads(rv.data.decode("utf-8"))
+        self.assertEqual(data["result"][0]["thumbnail_url"], dashboard.thumbnail_url)
+
+        # rollback changes
+        db.session.delete(dashboard)
+        db.session.commit()
+
     def test_delete_dashboard(self):
         """
         Dashboard API: Test delete
@@ -17,11 +17,22 @@
 from tests.test_app import app  # isort:skip
 
 import datetime
+import tempfile
 from unittest import mock
 
+import pandas as pd
+from sqlalchemy import create_engine, inspect
+
 from superset.db_engine_specs import engines
-from superset.db_engine_specs.base import BaseEngineSpec, builtin_time_grains
+from superset.db_engine_specs.base import (
+    BaseEngineSpec,
+    builtin_time_grains,
+    conform_dtypes,
+    infer_upload_dtypes,
+    to_delimited_text,
+)
 from superset.db_engine_specs.sqlite import SqliteEngineSpec
+from superset.sql_parse import Table
 from superset.utils.core import get_example_database
 from tests.db_engine_specs.base_tests import TestDbEngineSpec
 
@@ -239,3 +250,118 @@ class TestDbEngineSpecs(TestDbEngineSpec):
         ]
         result = BaseEngineSpec.pyodbc_rows_to_tuples(data)
         self.assertListEqual(result, data)
+
+    def test_get_sampled_from_clause(self):
+        from sqlalchemy import table
+        from sqlalchemy.sql.expression import TableSample
+
+        from superset.db_engine_specs.postgres import PostgresEngineSpec
+
+        tbl = table("birth_names")
+        self.assertIs(BaseEngineSpec.get_sampled_from_clause(tbl, 10), tbl)
+        sampled = PostgresEngineSpec.get_sampled_from_clause(tbl, 10)
+        self.assertIsInstance(sampled, TableSample)
+        subquery = tbl.select().alias("virtual_table")
+        self.assertIs(
+            PostgresEngineSpec.get_sampled_from_clause(subquery, 10), subquery
+        )
+
+    def test_to_delimited_text(self):
+        rows = [
+            (1, 1.5, "a\tb\\c\nd", None),
+            (True, False, datetime.datetime(2020, 1, 2, 3, 4, 5), ""),
+        ]
+        self.assertEqual(
+            to_delimited_text(iter(rows)),
+            "1\t1.5\ta\\tb\\\\c\\nd\t\\N\n1\t0\t2020-01-02 03:04:05\t\n",
+        )
+
+    def test_create_table_from_csv_in_chunks(self):
+        engine = create_engine("sqlite://")
+        database = mock.Mock()
+        database.get_sqla_engine.return_value = engine
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as file:
+            file.write("a,b\n1,x\n2,y\n,z\n4,\n")
+            file.flush()
+            SqliteEngineSpec.create_table_from_csv(
+                file.name,
+                Table("csv_chunks"),
+                database,
+                {"sep": ",", "chunksize": 2},
+                {"name": "csv_chunks", "if_exists": "fail", "index": False},
+            )
+        data = engine.execute("SELECT a, b FROM csv_chunks").fetchall()
+        self.assertEqual(data, [(1, "x"), (2, "y"), (None, "z"), (4, None)])
+        columns = inspect(engine).get_columns("csv_chunks")
+        self.assertEqual(str(columns[0]["type"]), "BIGINT")
+
+    def test_create_table_from_csv_widens_types(self):
+        engine = create_engine("sqlite://")
+        database = mock.Mock()
+        database.get_sqla_engine.return_value = engine
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as file:
+            # the later rows are wider than the first chunk
+            file.write("a,b,c\n1,,1\n2,,2\n3.5,x,\n4,y,4\n")
+            file.flush()
+            SqliteEngineSpec.create_table_from_csv(
+                file.name,
+                Table("csv_widened"),
+                database,
+                {"sep": ",", "chunksize": 2},
+                {"name": "csv_widened", "if_exists": "fail", "index": False},
+            )
+        data = engine.execute("SELECT a, b, c FROM csv_widened").fetchall()
+        self.assertEqual(
+            data, [(1.0, None, 1), (2.0, None, 2), (3.5, "x", None), (4.0, "y", 4)]
+        )
+        types = [str(col["type"]) for col in inspect(engine).get_columns("csv_widened")]
+        self.assertEqual(types, ["FLOAT", "TEXT", "BIGINT"])
+
+    def test_create_table_from_csv_header_only(self):
+        engine = create_engine("sqlite://")
+        database = mock.Mock()
+        database.get_sqla_engine.return_value = engine
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as file:
+            file.write("a,b\n")
+            file.flush()
+            read_csv = pd.read_csv
+            # some versions of pandas give no chunk for a file without rows
+            with mock.patch(
+                "pandas.read_csv",
+                side_effect=lambda **kwargs: (
+                    iter([]) if kwargs.get("iterator") else read_csv(**kwargs)
+                ),
+            ):
+                SqliteEngineSpec.create_table_from_csv(
+                    file.name,
+                    Table("csv_header"),
+                    database,
+                    {"sep": ",", "chunksize": 2},
+                    {"name": "csv_header", "if_exists": "fail", "index": False},
+                )
+        columns = inspect(engine).get_columns("csv_header")
+        self.assertEqual([col["name"] for col in columns], ["a", "b"])
+
+    def test_infer_upload_dtypes(self):
+        chunks = [
+            pd.DataFrame({"a": [1, 2], "b": [None, None], "c": [1, 2]}),
+            pd.DataFrame({"a": [1.5, None], "b": ["x", None], "c": [None, 3.0]}),
+        ]
+        dtypes = infer_upload_dtypes(chunks)
+        self.assertEqual(dtypes["a"], "float64")
+        self.assertEqual(dtypes["b"], "object")
+        self.assertEqual(str(dtypes["c"]), "Int64")
+        self.assertIsNone(infer_upload_dtypes([]))
+
+    def test_conform_dtypes(self):
+        dtypes = pd.DataFrame({"a": [1], "b": [1], "c": ["x"], "d": [1.5]}).dtypes
+        df = conform_dtypes(
+            pd.DataFrame(
+                {"a": [1.0, None], "b": [1.5, None], "c": [1.0, 2.0], "d": [1, 2]}
+            ),
+            dtypes,
+        )
+        self.assertEqual(str(df["a"].dtype), "Int64")
+        self.assertEqual(df["b"].dtype, "float64")
+        self.assertEqual(df["c"].dtype, "object")
+        self.assertEqual(df["d"].dtype, "float64")
@@ -15,6 +15,7 @@
 # specific language governing permissions and limitations
 # under the License.
 import sys
+import tempfile
 import unittest.mock as mock
 
 from pandas import DataFrame
@@ -22,6 +23,7 @@ from sqlalchemy import column
 
 from superset.db_engine_specs.base import BaseEngineSpec
 from superset.db_engine_specs.bigquery import BigQueryEngineSpec
+from superset.sql_parse import Table
 from tests.db_engine_specs.base_tests import TestDbEngineSpec
 
 
@@ -201,3 +203,47 @@ class TestBigQueryDbEngineSpec(TestDbEngineSpec):
             credentials="account_info",
             if_exists="extra_key",
         )
+
+    def test_create_table_from_csv(self):
+        """
+        DB Eng Specs (bigquery): Test csv files are loaded with a single job
+        """
+        df = DataFrame({"a": [1, 2]})
+        database = mock.Mock()
+        with mock.patch.object(
+            BigQueryEngineSpec, "csv_to_df", return_value=df
+        ), mock.patch.object(BigQueryEngineSpec, "df_to_sql") as df_to_sql:
+            BigQueryEngineSpec.create_table_from_csv(
+                "file.csv",
+                Table(table="name", schema="schema"),
+                database,
+                {"chunksize": 1},
+                {"name": "name", "if_exists": "fail"},
+            )
+        df_to_sql.assert_called_once_with(
+            df=df,
+            con=database.get_sqla_engine.return_value,
+            name="name",
+            schema="schema",
+            if_exists="fail",
+        )
+
+    def test_create_table_from_columnar(self):
+        """
+        DB Eng Specs (bigquery): Test columnar files are loaded with a single job
+        """
+        df = DataFrame({"a": [1, 2, 3]})
+        database = mock.Mock()
+        with tempfile.NamedTemporaryFile(suffix=".parquet") as file:
+            df.to_parquet(file.name, row_group_size=2)
+            with mock.patch.object(BigQueryEngineSpec, "df_to_sql") as df_to_sql:
+                BigQueryEngineSpec.create_table_from_columnar(
+                    file.name,
+                    Table(table="name", schema="schema"),
+                    database,
+                    {},
+                    {"name": "name", "if_exists": "fail"},
+                )
+        df_to_sql.assert_called_once()
+        self.assertEqual(df_to_sql.call_args[1]["df"]["a"].tolist(), [1, 2, 3])
+        self.assertEqual(df_to_sql.call_args[1]["schema"], "schema")
@@ -168,6 +168,14 @@ def test_create_table_from_csv_append() -> None:
         )
 
 
+def test_create_table_from_columnar() -> None:
+
+    with pytest.raises(SupersetException):
+        HiveEngineSpec.create_table_from_columnar(
+            "foo.parquet", Table("foobar"), mock.MagicMock(), {}, {}
+        )
+
+
 def test_get_create_table_stmt() -> None:
     table = Table("employee")
     schema_def = """eid int, name String, salary String, destination String"""
@@ -15,11 +15,15 @@
 # specific language governing permissions and limitations
 # under the License.
 import unittest
+from unittest import mock
 
+from sqlalchemy import Column, Integer, MetaData, Table
 from sqlalchemy.dialects import mysql
 from sqlalchemy.dialects.mysql import DATE, NVARCHAR, TEXT, VARCHAR
+from sqlalchemy.exc import DBAPIError
 
 from superset.db_engine_specs.mysql import MySQLEngineSpec
+from superset.exceptions import SupersetException
 from superset.utils.core import DbColumnType
 from tests.db_engine_specs.base_tests import TestDbEngineSpec
 
@@ -101,3 +105,40 @@ class TestMySQLEngineSpecsDbEngineSpec(TestDbEngineSpec):
             assert MySQLEngineSpec.is_db_column_type_match(
                 type_str, DbColumnType.TEMPORAL
             ) is (col_type == DbColumnType.TEMPORAL)
+
+    def test_load_data_local_infile(self):
+        """Uploads fall back to inserts when LOAD DATA LOCAL is disabled"""
+        table = mock.Mock()
+        table.table = Table("tbl", MetaData(), Column("a", Integer))
+        conn = mock.Mock()
+        conn.dialect = mysql.dialect()
+        conn.execute.side_effect = [DBAPIError("LOAD DATA", None, Exception()), None]
+        method = MySQLEngineSpec.get_upload_method(mock.Mock())
+        method(table, conn, ["a"], iter([(1,), (None,)]))
+        self.assertFalse(method.enabled)
+        self.assertIn(
+            "LOAD DATA LOCAL INFILE", str(conn.execute.call_args_list[0][0][0])
+        )
+        self.assertEqual(conn.execute.call_args[0][1], [{"a": 1}, {"a": None}])
+
+        conn.execute.reset_mock(side_effect=True)
+        method(table, conn, ["a"], iter([(3,)]))
+        conn.execute.assert_called_once()
+
+    def test_load_data_local_infile_warnings(self):
+        """Uploads fail when LOAD DATA LOCAL converts values with warnings"""
+        table = mock.Mock()
+        table.name = "tbl"
+        table.table = Table("tbl", MetaData(), Column("a", Integer))
+        conn = mock.Mock()
+        conn.dialect = mysql.dialect()
+        conn.execute.return_value.scalar.return_value = 1
+        conn.execute.return_value.first.return_value = (
+            "Warning",
+            1366,
+            "Incorrect integer value: 'x' for column 'a' at row 1",
+        )
+        method = MySQLEngineSpec.get_upload_method(mock.Mock())
+        with self.assertRaisesRegex(SupersetException, "Incorrect integer value"):
+            method(table, conn, ["a"], iter([("x",)]))
+        self.assertTrue(method.enabled)
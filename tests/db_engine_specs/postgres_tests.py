@@ -16,11 +16,11 @@
 # under the License.
 from unittest import mock
 
-from sqlalchemy import column, literal_column
+from sqlalchemy import column, literal_column, MetaData, Table
 from sqlalchemy.dialects import postgresql
 
 from superset.db_engine_specs import engines
-from superset.db_engine_specs.postgres import PostgresEngineSpec
+from superset.db_engine_specs.postgres import copy_from_stdin, PostgresEngineSpec
 from tests.db_engine_specs.base_tests import TestDbEngineSpec
 
 
@@ -124,3 +124,22 @@ class TestPostgresDbEngineSpec(TestDbEngineSpec):
         DB Eng Specs (postgres): Test "postgres" in engine spec
         """
         self.assertIn("postgres", engines)
+
+    def test_copy_from_stdin(self):
+        """
+        DB Eng Specs (postgres): Test bulk loading uploads with COPY
+        """
+        engine = mock.Mock()
+        engine.dialect.driver = "psycopg2"
+        self.assertIs(PostgresEngineSpec.get_upload_method(engine), copy_from_stdin)
+
+        table = mock.Mock()
+        table.table = Table("tbl", MetaData(), schema="Schema")
+        conn = mock.Mock()
+        conn.dialect = postgresql.dialect()
+        cursor = conn.connection.cursor.return_value
+        copy_from_stdin(table, conn, ["a", "B"], iter([(1, "x"), (None, "y")]))
+        statement, buffer = cursor.copy_expert.call_args[0]
+        self.assertEqual(statement, 'COPY "Schema".tbl (a, "B") FROM STDIN')
+        self.assertEqual(buffer.getvalue(), "1\tx\n\\N\ty\n")
+        cursor.close.assert_called_once()
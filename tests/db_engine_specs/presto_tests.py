@@ -492,6 +492,64 @@ class TestPrestoDbEngineSpec(TestDbEngineSpec):
         self.assertEqual(actual_data, expected_data)
         self.assertEqual(actual_expanded_cols, expected_expanded_cols)
 
+    @mock.patch.dict(
+        "superset.extensions.feature_flag_manager._feature_flags",
+        {"PRESTO_EXPAND_DATA": True},
+        clear=True,
+    )
+    def test_presto_expand_data_with_multiple_array_columns(self):
+        cols = [
+            {"name": "id", "type": "BIGINT"},
+            {"name": "a", "type": "ARRAY(BIGINT)"},
+            {"name": "b", "type": "ARRAY(ARRAY(BIGINT))"},
+        ]
+        data = [
+            {"id": 1, "a": "[1, 2]", "b": "[[1], [2, 3], []]"},
+            {"id": 2, "a": [3, 4], "b": None},
+            {"id": 3, "a": [], "b": [[4, 5]]},
+        ]
+        actual_cols, actual_data, actual_expanded_cols = PrestoEngineSpec.expand_data(
+            cols, data
+        )
+        self.assertEqual(actual_cols, cols)
+        self.assertEqual(
+            actual_data,
+            [
+                {"id": 1, "a": 1, "b": 1},
+                {"id": "", "a": 2, "b": 2},
+                {"id": "", "a": "", "b": 3},
+                {"id": "", "a": "", "b": []},
+                {"id": 2, "a": 3, "b": None},
+                {"id": "", "a": 4, "b": ""},
+                {"id": 3, "a": [], "b": 4},
+                {"id": "", "a": "", "b": 5},
+            ],
+        )
+        self.assertEqual(actual_expanded_cols, [])
+
+    @mock.patch.dict(
+        "superset.extensions.feature_flag_manager._feature_flags",
+        {"PRESTO_EXPAND_DATA": True},
+        clear=True,
+    )
+    def test_presto_expand_data_keeps_array_elements_aligned(self):
+        cols = [
+            {"name": "a", "type": "ARRAY(BIGINT)"},
+            {"name": "b", "type": "ARRAY(BIGINT)"},
+        ]
+        data = [{"a": [1, 2], "b": [1, 2, 3]}, {"a": [3, 4], "b": [5, 6]}]
+        _, actual_data, _ = PrestoEngineSpec.expand_data(cols, data)
+        self.assertEqual(
+            actual_data,
+            [
+                {"a": 1, "b": 1},
+                {"a": 2, "b": 2},
+                {"a": "", "b": 3},
+                {"a": 3, "b": 5},
+                {"a": 4, "b": 6},
+            ],
+        )
+
     def test_get_sqla_column_type(self):
         sqla_type = PrestoEngineSpec.get_sqla_column_type("varchar(255)")
         assert isinstance(sqla_type, types.VARCHAR)
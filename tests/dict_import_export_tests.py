@@ -288,6 +288,31 @@ class TestDictImportExport(SupersetTestCase):
             imported_copy_table.export_to_dict(), imported_table.export_to_dict()
         )
 
+    def test_import_table_override_rename_column(self):
+        col_uuid = uuid4()
+        table, dict_table = self.create_table(
+            "rename_col", id=ID_PREFIX + 5, cols_names=["col1"], cols_uuids=[col_uuid]
+        )
+        imported_table = SqlaTable.import_from_dict(db.session, dict_table)
+        db.session.commit()
+        column_id = imported_table.columns[0].id
+        table_over, dict_table_over = self.create_table(
+            "rename_col",
+            id=ID_PREFIX + 5,
+            cols_names=["renamed_col1", "col2"],
+            cols_uuids=[str(col_uuid), None],
+        )
+        imported_over_table = SqlaTable.import_from_dict(
+            session=db.session, dict_rep=dict_table_over, sync=["columns"]
+        )
+        db.session.commit()
+
+        imported_over = self.get_table_by_id(imported_over_table.id)
+        self.assertEqual(imported_table.id, imported_over.id)
+        columns = {col.column_name: col for col in imported_over.columns}
+        self.assertEqual(set(columns), {"renamed_col1", "col2"})
+        self.assertEqual(columns["renamed_col1"].id, column_id)
+
     def test_export_datasource_ui_cli(self):
         # TODO(bkyryliuk): find fake db is leaking from
         self.delete_fake_db()
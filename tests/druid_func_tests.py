@@ -17,12 +17,16 @@
 # isort:skip_file
 import json
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
+
+import pandas as pd
+from cachelib import SimpleCache
 
 import tests.test_app
 import superset.connectors.druid.models as models
 from superset.connectors.druid.models import DruidColumn, DruidDatasource, DruidMetric
 from superset.exceptions import SupersetException
+from superset.extensions import cache_manager
 
 from .base_tests import SupersetTestCase
 
@@ -33,6 +37,7 @@ try:
         RegisteredLookupExtraction,
         TimeFormatExtraction,
     )
+    from pydruid.utils.filters import Filter
     import pydruid.utils.postaggregator as postaggs
 except ImportError:
     pass
@@ -588,6 +593,54 @@ class TestDruidFunc(SupersetTestCase):
         self.assertEqual("matcho", client.topn.call_args_list[0][1]["dimension"])
         self.assertEqual(spec, client.topn.call_args_list[1][1]["dimension"])
 
+    @unittest.skipUnless(
+        SupersetTestCase.is_module_installed("pydruid"), "pydruid not installed"
+    )
+    def test_run_query_cached_pre_query(self):
+        from_dttm = Mock()
+        to_dttm = Mock()
+        from_dttm.replace = Mock(return_value=from_dttm)
+        to_dttm.replace = Mock(return_value=to_dttm)
+        from_dttm.isoformat = Mock(return_value="from")
+        to_dttm.isoformat = Mock(return_value="to")
+        from_dttm.tzname = Mock(return_value="timezone")
+        ds = DruidDatasource(datasource_name="datasource")
+        ds.metrics = [DruidMetric(metric_name="metric1")]
+        ds.columns = [DruidColumn(column_name="col1")]
+        ds.get_having_filters = Mock(return_value=[])
+        clients = []
+        with patch.object(cache_manager, "_data_cache", SimpleCache()):
+            for _ in range(2):
+                client = Mock()
+                client.query_builder.build_query.return_value.query_dict = {"pre": 0}
+                client.query_builder.last_query.query_dict = {"mock": 0}
+                client.export_pandas.return_value = pd.DataFrame({"col1": ["a"]})
+                query_str = ds.run_query(
+                    ["metric1"],
+                    None,
+                    from_dttm,
+                    to_dttm,
+                    groupby=["col1"],
+                    timeseries_limit=100,
+                    client=client,
+                    order_desc=True,
+                    filter=[],
+                )
+                clients.append(client)
+        # the second query got the top series of the first phase from the cache
+        self.assertEqual(2, len(clients[0].topn.call_args_list))
+        self.assertEqual(1, len(clients[1].topn.call_args_list))
+        self.assertIn('"mock": 0', query_str.split("// Phase 2")[0])
+        called_args = clients[1].topn.call_args_list[0][1]
+        self.assertEqual("col1", called_args["dimension"])
+        self.assertEqual(
+            Filter.build_filter(called_args["filter"]),
+            {
+                "type": "or",
+                "fields": [{"type": "selector", "dimension": "col1", "value": "a"}],
+            },
+        )
+
     @unittest.skipUnless(
         SupersetTestCase.is_module_installed("pydruid"), "pydruid not installed"
     )
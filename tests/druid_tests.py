@@ -420,6 +420,42 @@ class TestDruid(SupersetTestCase):
                 json.loads(metric.json)["type"], "double{}".format(agg.capitalize())
             )
 
+    @unittest.skipUnless(
+        SupersetTestCase.is_module_installed("pydruid"), "pydruid not installed"
+    )
+    @patch("superset.connectors.druid.models.PyDruid")
+    def test_refresh_metadata_batches(self, PyDruid):
+        self.login(username="admin")
+        cluster = self.get_cluster(PyDruid)
+        datasource_names = ["test_datasource", "test_datasource2", "test_datasource3"]
+        cluster.get_datasources = PickableMock(return_value=datasource_names)
+        progress = Mock()
+        cluster.refresh_datasources(concurrency=2, batch_size=2, progress=progress)
+
+        self.assertEqual(
+            [call[0] for call in progress.call_args_list], [(2, 3), (3, 3)]
+        )
+        self.assertEqual(
+            sorted(datasource.name for datasource in cluster.datasources),
+            datasource_names,
+        )
+        for datasource in cluster.datasources:
+            self.assertEqual(
+                sorted(col.column_name for col in datasource.columns),
+                ["dim1", "dim2", "metric1"],
+            )
+            self.assertEqual(
+                [metric.metric_name for metric in datasource.metrics], ["count"]
+            )
+
+        # refreshing unchanged metadata does not update the columns
+        changed_on = {col.id: col.changed_on for col in cluster.datasources[0].columns}
+        cluster.refresh_datasources(batch_size=2)
+        self.assertEqual(
+            {col.id: col.changed_on for col in cluster.datasources[0].columns},
+            changed_on,
+        )
+
     @unittest.skipUnless(
         SupersetTestCase.is_module_installed("pydruid"), "pydruid not installed"
     )
@@ -22,6 +22,7 @@ from unittest.mock import patch
 
 from superset.utils.log import (
     AbstractEventLogger,
+    AsyncDBEventLogger,
     DBEventLogger,
     get_event_logger_from_cfg_value,
 )
@@ -81,3 +82,37 @@ class TestEventLogger(unittest.TestCase):
             # should contain only manual payload
             self.assertEqual(mock_log.call_args[1]["records"], [{"foo": "bar"}])
             assert mock_log.call_args[1]["duration_ms"] >= 100
+
+    def test_async_logger_batches_events(self):
+        logger = AsyncDBEventLogger(batch_size=2, flush_interval=0.1)
+        batches = []
+
+        with patch.object(
+            AsyncDBEventLogger,
+            "_write",
+            lambda self, batch: batches.append(batch) or None,
+        ), app.test_request_context():
+            for i in range(3):
+                logger.log(
+                    1, "test", None, 10, None, "/", "/", None, None, records=[{"i": i}]
+                )
+            deadline = time.time() + 5
+            while sum(len(batch) for batch in batches) < 3 and time.time() < deadline:
+                time.sleep(0.05)
+            logger.shutdown()
+
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+        self.assertEqual(batches[0][0]["json"], '{"i": 0}')
+
+    def test_async_logger_drops_and_samples_events(self):
+        logger = AsyncDBEventLogger(max_buffer_size=1, sample_rates={"sampled": 0})
+
+        with patch.object(
+            AsyncDBEventLogger, "_ensure_started"
+        ), app.test_request_context():
+            records = [{"i": 0}, {"i": 1}]
+            logger.log(1, "test", None, 10, None, "/", "/", None, None, records=records)
+            logger.log(1, "sampled", None, 10, None, "/", "/", None, None, records=[{}])
+
+        self.assertEqual(logger._buffer.qsize(), 1)
+        self.assertEqual(logger.dropped, 1)
@@ -0,0 +1,110 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from unittest.mock import patch
+
+import pandas as pd
+
+from superset.utils import hierarchy
+from tests.base_tests import SupersetTestCase
+
+
+class TestHierarchy(SupersetTestCase):
+    df = pd.DataFrame(
+        {
+            "continent": ["EU", "EU", "EU", "NA", None],
+            "country": ["FR", "FR", "UK", "US", "AQ"],
+            "city": ["Paris", "Lyon", "London", None, "McMurdo"],
+            "population": [2, 1, 9, 1, 1],
+        }
+    )
+
+    def test_aggregate_levels(self):
+        groups = ["continent", "country", "city"]
+        levels = hierarchy.aggregate_levels(self.df, groups)
+        self.assertEqual(levels[0]["population"], 14)
+        self.assertEqual(levels[1]["population"].to_dict(), {"EU": 12, "NA": 1})
+        self.assertEqual(
+            levels[2]["population"].to_dict(),
+            {("EU", "FR"): 3, ("EU", "UK"): 9, ("NA", "US"): 1},
+        )
+        self.assertEqual(len(levels[3]), 3)
+        for level in range(len(groups) + 1):
+            expected = (
+                self.df.groupby(groups[:level]).mean() if level else self.df.mean()
+            )
+            self.assertEqual(
+                hierarchy.aggregate_levels(self.df, groups, "mean")[level].to_dict(),
+                expected.to_dict(),
+            )
+
+    def test_build_tree(self):
+        levels = hierarchy.aggregate_levels(self.df, ["continent", "country"])
+        indexes = [levels[1].index, levels[2].index]
+        tree = hierarchy.build_tree(
+            indexes,
+            lambda level, position: {"name": indexes[level][position], "children": [],},
+        )
+        self.assertEqual(
+            tree,
+            [
+                {
+                    "name": "EU",
+                    "children": [
+                        {"name": ("EU", "FR"), "children": []},
+                        {"name": ("EU", "UK"), "children": []},
+                    ],
+                },
+                {"name": "NA", "children": [{"name": ("NA", "US"), "children": []}]},
+            ],
+        )
+
+    def test_build_tree_is_linear(self):
+        index = pd.MultiIndex.from_product(
+            [range(10), range(20), range(30)], names=["a", "b", "c"]
+        )
+        levels = [
+            hierarchy.prefixes(index, 1),
+            hierarchy.prefixes(index, 2),
+            index,
+        ]
+        calls = []
+
+        def make_node(level, position):
+            calls.append(level)
+            return {"children": []}
+
+        with patch.object(
+            pd.MultiIndex,
+            "get_indexer",
+            side_effect=pd.MultiIndex.get_indexer,
+            autospec=True,
+        ) as get_indexer:
+            tree = hierarchy.build_tree(levels, make_node)
+        # every node is created once, and the parents are found level by level
+        self.assertEqual(len(calls), 10 + 10 * 20 + 10 * 20 * 30)
+        self.assertEqual(get_indexer.call_count, 1)
+        self.assertEqual(len(tree), 10)
+        self.assertEqual(len(tree[9]["children"]), 20)
+        self.assertEqual(len(tree[9]["children"][19]["children"]), 30)
+
+    def test_prefixes(self):
+        index = self.df.set_index(["continent", "country", "city"]).index
+        self.assertEqual(hierarchy.prefixes(index, 1).tolist(), ["EU", "NA"])
+        self.assertEqual(
+            hierarchy.prefixes(index, 2).tolist(),
+            [("EU", "FR"), ("EU", "UK"), ("NA", "US")],
+        )
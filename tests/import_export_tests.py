@@ -32,7 +32,11 @@ from superset.connectors.druid.models import (
     DruidCluster,
 )
 from superset.connectors.sqla.models import SqlaTable, SqlMetric, TableColumn
-from superset.dashboards.commands.importers.v0 import import_chart, import_dashboard
+from superset.dashboards.commands.importers.v0 import (
+    import_chart,
+    import_dashboard,
+    ImportLookups,
+)
 from superset.datasets.commands.importers.v0 import import_dataset
 from superset.models.dashboard import Dashboard
 from superset.models.slice import Slice
@@ -482,6 +486,25 @@ class TestImportExport(SupersetTestCase):
             json.loads(imported_dash.json_metadata),
         )
 
+    def test_import_dashboards_shared_slice(self):
+        lookups = ImportLookups(db.session)
+        slc = self.create_slice("shared_slc", id=10012)
+        dash_1 = self.create_dashboard("shared_slc_dash_1", slcs=[slc], id=10005)
+        imported_dash_id_1 = import_dashboard(dash_1, import_time=1993, lookups=lookups)
+
+        # the same slice in another dashboard of the same export
+        slc = self.create_slice("shared_slc", id=10012)
+        dash_2 = self.create_dashboard("shared_slc_dash_2", slcs=[slc], id=10006)
+        imported_dash_id_2 = import_dashboard(dash_2, import_time=1993, lookups=lookups)
+
+        imported_dash_1 = self.get_dash(imported_dash_id_1)
+        imported_dash_2 = self.get_dash(imported_dash_id_2)
+        self.assertEqual(len(imported_dash_1.slices), 1)
+        self.assertEqual(
+            [slc.id for slc in imported_dash_1.slices],
+            [slc.id for slc in imported_dash_2.slices],
+        )
+
     def test_import_new_dashboard_slice_reset_ownership(self):
         admin_user = security_manager.find_user(username="admin")
         self.assertTrue(admin_user)
@@ -15,12 +15,16 @@
 # specific language governing permissions and limitations
 # under the License.
 
+from io import BytesIO
 from unittest.mock import patch
+from zipfile import BadZipFile, ZipFile
 
+import pytest
 import yaml
 from freezegun import freeze_time
 
 from superset import security_manager
+from superset.commands.export import stream_zip
 from superset.databases.commands.export import ExportDatabasesCommand
 from superset.utils.core import get_example_database
 from tests.base_tests import SupersetTestCase
@@ -46,3 +50,36 @@ class TestExportModelsCommand(SupersetTestCase):
                 "timestamp": "2020-01-01T00:00:00+00:00",
             }
         )
+
+    def test_stream_zip(self):
+        """Make sure the archive is yielded as the files are written."""
+        contents = iter(
+            [("metadata.yaml", "version: 1.0.0\n"), ("databases/a.yaml", "")]
+        )
+        chunks = stream_zip("export", contents)
+
+        # the first file is written before the second one is read
+        assert next(chunks)
+        assert next(contents) == ("databases/a.yaml", "")
+
+        contents = [("metadata.yaml", "version: 1.0.0\n"), ("databases/a.yaml", "")]
+        with ZipFile(BytesIO(b"".join(stream_zip("export", iter(contents))))) as bundle:
+            assert bundle.namelist() == [
+                "export/metadata.yaml",
+                "export/databases/a.yaml",
+            ]
+            assert bundle.read("export/metadata.yaml") == b"version: 1.0.0\n"
+
+    def test_stream_zip_error(self):
+        """Make sure an error while exporting doesn't yield a readable archive."""
+
+        def contents():
+            yield "metadata.yaml", "version: 1.0.0\n"
+            raise ValueError("Export failed")
+
+        chunks = stream_zip("export", contents())
+        archive = next(chunks)
+        with pytest.raises(ValueError):
+            next(chunks)
+        with pytest.raises(BadZipFile):
+            ZipFile(BytesIO(archive))
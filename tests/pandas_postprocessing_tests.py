@@ -470,6 +470,17 @@ class TestPostProcessing(SupersetTestCase):
             series_to_list(post_df["geohash"]), series_to_list(lonlat_df["geohash"]),
         )
 
+    def test_geohash_encode_invalid(self):
+        df = DataFrame({"latitude": [40.7, 91.0], "longitude": [-74.0, 0.0]})
+        self.assertRaises(
+            QueryObjectValidationError,
+            proc.geohash_encode,
+            df=df,
+            latitude="latitude",
+            longitude="longitude",
+            geohash="geohash",
+        )
+
     def test_geodetic_parse(self):
         # parse geodetic string with altitude into lon/lat/altitude
         post_df = proc.geodetic_parse(
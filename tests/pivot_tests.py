@@ -0,0 +1,106 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+from superset.utils import pivot
+from tests.base_tests import SupersetTestCase
+
+df = pd.DataFrame(
+    {
+        "country": ["UK", "UK", "US", "US", "US", "FR"],
+        "gender": ["boy", "girl", "boy", "girl", "girl", "boy"],
+        "num": [1.0, np.nan, 3.0, np.nan, np.nan, 6.0],
+        "count": [1, 2, 3, 4, 5, 6],
+        "name": ["a", "b", None, "d", "c", "f"],
+    }
+)
+
+
+def legacy_sum(series: pd.Series) -> float:
+    return series.sum(min_count=1)
+
+
+class TestPivot(SupersetTestCase):
+    def test_get_groupby_method(self):
+        self.assertEqual(pivot.get_groupby_method("max"), "max")
+        self.assertEqual(pivot.get_groupby_method(pivot.sql_sum), "sum")
+        self.assertEqual(pivot.get_groupby_method(np.nanmean), "mean")
+        self.assertIsNone(pivot.get_groupby_method(legacy_sum))
+
+    def test_pivot_table(self):
+        for margins in (False, True):
+            for columns in ([], ["gender"]):
+                kwargs = dict(
+                    index=["country"],
+                    columns=columns,
+                    values=["num", "count"],
+                    margins=margins,
+                )
+                expected = df.pivot_table(
+                    aggfunc={"num": legacy_sum, "count": np.sum}, **kwargs
+                )
+                result = pivot.pivot_table(
+                    df, aggfunc={"num": pivot.sql_sum, "count": np.sum}, **kwargs
+                )
+                assert_frame_equal(result, expected)
+
+    def test_pivot_table_sql_sum(self):
+        result = pivot.pivot_table(
+            df,
+            index=["country"],
+            columns=["gender"],
+            values=["num"],
+            aggfunc={"num": pivot.sql_sum},
+        )
+        # columns without any value are dropped
+        self.assertEqual(result.columns.tolist(), [("num", "boy")])
+        self.assertEqual(result[("num", "boy")].tolist(), [6, 1, 3])
+
+        result = pivot.pivot_table(
+            df,
+            index=["country"],
+            columns=["gender"],
+            values=["num"],
+            aggfunc={"num": pivot.sql_sum},
+            dropna=False,
+        )
+        self.assertTrue(result[("num", "girl")].isna().all())
+
+        result = pivot.pivot_table(
+            df,
+            index=["country"],
+            values=["num"],
+            aggfunc={"num": pivot.sql_sum},
+            fill_value=0,
+        )
+        self.assertEqual(result["num"].tolist(), [6, 1, 3])
+
+    def test_pivot_table_object_extrema(self):
+        kwargs = dict(index=["gender"], columns=["country"], values=["name"])
+        for aggfunc in ("min", "max"):
+            result = pivot.pivot_table(df, aggfunc={"name": aggfunc}, **kwargs)
+            expected = df.pivot_table(aggfunc={"name": aggfunc}, **kwargs)
+            assert_frame_equal(result, expected)
+        self.assertEqual(result.loc["girl", ("name", "US")], "d")
+
+    def test_map_distinct(self):
+        series = pd.Series(["b", None, "a", "b"], name="letter")
+        assert_series_equal(
+            pivot.map_distinct(series, repr), series.apply(repr).astype(object)
+        )
@@ -0,0 +1,163 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+
+import tests.test_app
+from superset.common.post_processing import PostProcessingPipeline
+from superset.exceptions import QueryObjectValidationError
+from superset.utils import pandas_postprocessing as proc
+from tests.base_tests import SupersetTestCase
+from tests.fixtures.dataframes import categories_df, timeseries_df
+
+PIPELINES: List[List[Dict[str, Any]]] = [
+    [
+        {"operation": "cum", "options": {"columns": {"y": "y_cum"}, "operator": "sum"}},
+        {"operation": "diff", "options": {"columns": {"y": "y_diff"}}},
+        {
+            "operation": "rolling",
+            "options": {
+                "columns": {"y": "y_rolling"},
+                "rolling_type": "sum",
+                "window": 2,
+                "min_periods": 1,
+            },
+        },
+        {"operation": "select", "options": {"exclude": ["label"]}},
+        {"operation": "sort", "options": {"columns": {"y_diff": False}}},
+    ],
+    [
+        {"operation": "cum", "options": {"columns": {"y": "y"}, "operator": "sum"}},
+        {"operation": "diff", "options": {"columns": {"y": "y"}, "periods": 2}},
+        {"operation": "sort", "options": {"columns": {"label": True}},},
+        {
+            "operation": "select",
+            "options": {"columns": ["y", "label"], "rename": {"label": "name"}},
+        },
+    ],
+]
+
+
+def apply_sequentially(
+    df: DataFrame, post_processing: List[Dict[str, Any]]
+) -> DataFrame:
+    for post_process in post_processing:
+        df = getattr(proc, post_process["operation"])(df, **post_process["options"])
+    return df
+
+
+class TestPostProcessingPipeline(SupersetTestCase):
+    def test_plan(self):
+        pipeline = PostProcessingPipeline(PIPELINES[0])
+        self.assertEqual(
+            [step.name for step in pipeline.steps],
+            ["cum_diff_rolling", "select", "sort"],
+        )
+        # diff reads the output of cum, so they can't be computed together
+        pipeline = PostProcessingPipeline(PIPELINES[1])
+        self.assertEqual(
+            [step.name for step in pipeline.steps], ["cum", "diff", "sort_select"]
+        )
+        pipeline = PostProcessingPipeline(
+            [
+                {"operation": "select", "options": {"columns": ["y"]}},
+                {"operation": "contribution", "options": {"orientation": "column"}},
+            ]
+        )
+        self.assertEqual(
+            [step.name for step in pipeline.steps], ["select", "contribution"]
+        )
+
+    def test_execute_matches_sequential_operations(self):
+        for post_processing in PIPELINES:
+            for owned in (False, True):
+                df = timeseries_df.copy()
+                expected = apply_sequentially(timeseries_df, post_processing)
+                result = PostProcessingPipeline(post_processing).execute(
+                    df, owned=owned
+                )
+                assert_frame_equal(result, expected)
+                if not owned:
+                    assert_frame_equal(df, timeseries_df)
+
+    def test_sort_select(self):
+        for sort_columns in (
+            {"category": True, "asc_idx": False},
+            {"dept": False, "idx_nulls": True},
+        ):
+            post_processing = [
+                {"operation": "sort", "options": {"columns": sort_columns}},
+                {
+                    "operation": "select",
+                    "options": {
+                        "columns": ["name", "asc_idx", "category"],
+                        "rename": {"asc_idx": "idx"},
+                    },
+                },
+            ]
+            assert_frame_equal(
+                PostProcessingPipeline(post_processing).execute(categories_df),
+                apply_sequentially(categories_df, post_processing),
+            )
+
+    def test_validation(self):
+        valid = {"operation": "sort", "options": {"columns": {"y": True}}}
+        for post_process in [
+            {"options": {}},
+            {"operation": "foo", "options": {}},
+            {"operation": "DataFrame", "options": {}},
+            {"operation": "sort", "options": {"foo": "bar"}},
+            {"operation": "diff", "options": {"columns": ["y"]}},
+        ]:
+            with self.assertRaises(QueryObjectValidationError):
+                PostProcessingPipeline([valid, post_process])
+
+        with self.assertRaises(QueryObjectValidationError):
+            PostProcessingPipeline(
+                [{"operation": "diff", "options": {"columns": {"foo": "bar"}}}]
+            ).execute(timeseries_df)
+        with self.assertRaises(QueryObjectValidationError):
+            PostProcessingPipeline(
+                [
+                    {"operation": "sort", "options": {"columns": {"foo": True}}},
+                    {"operation": "select", "options": {"columns": ["name"]}},
+                ]
+            ).execute(categories_df)
+
+    @patch("superset.common.post_processing.current_app")
+    def test_stats(self, current_app):
+        stats_logger = current_app.config["STATS_LOGGER"]
+        PostProcessingPipeline(PIPELINES[0]).execute(timeseries_df)
+        self.assertEqual(
+            [call[0][0] for call in stats_logger.timing.call_args_list],
+            [
+                "post_processing.cum_diff_rolling.time",
+                "post_processing.select.time",
+                "post_processing.sort.time",
+            ],
+        )
+        self.assertEqual(
+            [call[0][0] for call in stats_logger.gauge.call_args_list],
+            [
+                "post_processing.cum_diff_rolling.memory",
+                "post_processing.select.memory",
+                "post_processing.sort.memory",
+            ],
+        )
@@ -15,13 +15,15 @@
 # specific language governing permissions and limitations
 # under the License.
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List, Optional
 from unittest.mock import patch
 
 import pytest
+from cachelib import SimpleCache
 from contextlib2 import contextmanager
 from freezegun import freeze_time
+from slack.errors import SlackApiError
 from sqlalchemy.sql import func
 
 from superset import db
@@ -44,8 +46,13 @@ from superset.reports.commands.exceptions import (
     ReportScheduleNotificationError,
     ReportSchedulePreviousWorkingError,
 )
-from superset.reports.commands.execute import AsyncExecuteReportScheduleCommand
+from superset.reports.commands.execute import (
+    AsyncExecuteAlertsCommand,
+    AsyncExecuteReportScheduleCommand,
+    AsyncSendReportScheduleCommand,
+)
 from superset.utils.core import get_example_database
+from superset.utils.screenshots import ChartScreenshot
 from tests.reports.utils import insert_report_schedule
 from tests.test_app import app
 from tests.utils import read_fixture
@@ -340,6 +347,65 @@ def create_mul_alert_email_chart(request):
             db.session.commit()
 
 
+@pytest.yield_fixture()
+def create_no_alerts_same_query():
+    with app.app_context():
+        chart = db.session.query(Slice).first()
+        example_database = get_example_database()
+        report_schedules = [
+            insert_report_schedule(
+                type=ReportScheduleType.ALERT,
+                name=f"alert{threshold}",
+                crontab="0 9 * * *",
+                sql="SELECT {{ 5 + 5 }} as metric",
+                chart=chart,
+                database=example_database,
+                validator_type=ReportScheduleValidatorType.OPERATOR,
+                validator_config_json=json.dumps({"op": ">", "threshold": threshold}),
+            )
+            for threshold in (10, 20)
+        ]
+        yield report_schedules
+
+        for report_schedule in report_schedules:
+            for log in report_schedule.logs:
+                db.session.delete(log)
+            db.session.delete(report_schedule)
+        db.session.commit()
+
+
+@pytest.yield_fixture()
+def create_reports_same_chart():
+    with app.app_context():
+        chart = db.session.query(Slice).first()
+        report_schedules = [
+            insert_report_schedule(
+                type=ReportScheduleType.REPORT,
+                name=f"report{i}",
+                crontab="0 9 * * *",
+                chart=chart,
+                recipients=[
+                    ReportRecipients(
+                        type=ReportRecipientType.EMAIL,
+                        recipient_config_json=json.dumps({"target": f"{i}@email.com"}),
+                    ),
+                    ReportRecipients(
+                        type=ReportRecipientType.SLACK,
+                        recipient_config_json=json.dumps({"target": f"#channel{i}"}),
+                    ),
+                ],
+            )
+            for i in range(2)
+        ]
+        yield report_schedules
+
+        for report_schedule in report_schedules:
+            for log in report_schedule.logs:
+                db.session.delete(log)
+            db.session.delete(report_schedule)
+        db.session.commit()
+
+
 @pytest.mark.usefixtures("create_report_email_chart")
 @patch("superset.reports.notifications.email.send_email_smtp")
 @patch("superset.utils.screenshots.ChartScreenshot.compute_and_cache")
@@ -455,6 +521,25 @@ def test_report_schedule_working(create_report_slack_chart_working):
     assert create_report_slack_chart_working.last_state == ReportLogState.WORKING
 
 
+def test_report_schedule_working_timeout():
+    """
+    ExecuteReport Command: Test report schedule working for too long runs again
+    """
+    with app.app_context():
+        report_schedule = ReportSchedule(
+            type=ReportScheduleType.REPORT,
+            last_state=ReportLogState.WORKING,
+            last_eval_dttm=datetime.utcnow(),
+        )
+        with pytest.raises(ReportSchedulePreviousWorkingError):
+            AsyncExecuteReportScheduleCommand.validate_schedule(report_schedule)
+
+        report_schedule.last_eval_dttm = datetime.utcnow() - timedelta(
+            seconds=app.config["REPORT_WORKING_TIMEOUT_SECONDS"] + 1
+        )
+        AsyncExecuteReportScheduleCommand.validate_schedule(report_schedule)
+
+
 @pytest.mark.usefixtures("create_report_email_dashboard")
 @patch("superset.reports.notifications.email.send_email_smtp")
 @patch("superset.utils.screenshots.DashboardScreenshot.compute_and_cache")
@@ -529,3 +614,180 @@ def test_email_mul_alert(create_mul_alert_email_chart):
             AsyncExecuteReportScheduleCommand(
                 create_mul_alert_email_chart.id, datetime.utcnow()
             ).run()
+
+
+@pytest.mark.usefixtures("create_no_alerts_same_query")
+def test_alerts_share_query(create_no_alerts_same_query):
+    """
+    ExecuteReport Command: Test alerts with the same query run it once
+    """
+    with patch.object(
+        Database, "get_df", autospec=True, side_effect=Database.get_df
+    ) as get_df_mock:
+        with freeze_time("2020-01-01T00:00:00Z"):
+            AsyncExecuteAlertsCommand(
+                [report_schedule.id for report_schedule in create_no_alerts_same_query],
+                datetime.utcnow(),
+            ).run()
+    get_df_mock.assert_called_once()
+    assert get_df_mock.call_args[0][1] == "SELECT 10 as metric"
+    db.session.commit()
+    for report_schedule in create_no_alerts_same_query:
+        db.session.refresh(report_schedule)
+        assert report_schedule.last_state == ReportLogState.NOOP
+        assert report_schedule.last_value == 10
+
+
+@pytest.mark.usefixtures("create_no_alerts_same_query")
+def test_alerts_skip_query_when_invalid(create_no_alerts_same_query):
+    """
+    ExecuteReport Command: Test alerts in their grace period don't run their query
+    """
+    for report_schedule in create_no_alerts_same_query:
+        report_schedule.last_state = ReportLogState.SUCCESS
+        report_schedule.grace_period = 3600
+    db.session.add(
+        ReportExecutionLog(
+            scheduled_dttm=datetime.utcnow(),
+            end_dttm=datetime.utcnow(),
+            state=ReportLogState.SUCCESS,
+            report_schedule=create_no_alerts_same_query[0],
+        )
+    )
+    db.session.commit()
+    with patch.object(Database, "get_df", autospec=True) as get_df_mock:
+        AsyncExecuteAlertsCommand(
+            [report_schedule.id for report_schedule in create_no_alerts_same_query],
+            datetime.utcnow(),
+        ).run()
+    get_df_mock.assert_not_called()
+
+
+@pytest.mark.usefixtures("create_alert_email_chart")
+@patch("superset.reports.notifications.email.send_email_smtp")
+@patch("superset.utils.screenshots.ChartScreenshot.compute_and_cache")
+def test_alerts_send_separately(screenshot_mock, email_mock, create_alert_email_chart):
+    """
+    ExecuteReport Command: Test the notifications of triggered alerts of a group
+    are left to be sent separately
+    """
+    screenshot_mock.return_value = read_fixture("sample.png")
+
+    with freeze_time("2020-01-01T00:00:00Z"):
+        scheduled_dttm = datetime.utcnow()
+        triggered = AsyncExecuteAlertsCommand(
+            [create_alert_email_chart.id], scheduled_dttm
+        ).run()
+    assert [model_id for model_id, _start_dttm in triggered] == [
+        create_alert_email_chart.id
+    ]
+    email_mock.assert_not_called()
+    db.session.commit()
+    db.session.refresh(create_alert_email_chart)
+    assert create_alert_email_chart.last_state == ReportLogState.WORKING
+
+    with freeze_time("2020-01-01T00:00:00Z"):
+        AsyncSendReportScheduleCommand(
+            create_alert_email_chart.id, scheduled_dttm, triggered[0][1]
+        ).run()
+    email_mock.assert_called_once()
+    assert_log(ReportLogState.SUCCESS)
+
+
+@pytest.mark.usefixtures("create_alert_email_chart")
+def test_alerts_send_unexpected_error(create_alert_email_chart):
+    """
+    ExecuteReport Command: Test a triggered alert is not left working when its
+    notifications fail unexpectedly
+    """
+    with patch.object(
+        AsyncSendReportScheduleCommand, "_send", side_effect=RuntimeError("boom")
+    ), pytest.raises(RuntimeError):
+        AsyncSendReportScheduleCommand(
+            create_alert_email_chart.id, datetime.utcnow(), datetime.utcnow()
+        ).run()
+
+    assert_log(ReportLogState.ERROR, error_message="boom")
+    db.session.refresh(create_alert_email_chart)
+    assert create_alert_email_chart.last_state == ReportLogState.ERROR
+
+
+@pytest.mark.usefixtures("create_reports_same_chart")
+@patch("superset.reports.notifications.slack.WebClient.files_upload")
+@patch("superset.reports.notifications.email.send_email_smtp")
+@patch("superset.utils.screenshots.ChartScreenshot.compute_and_cache")
+def test_reports_share_screenshot(
+    screenshot_mock, email_mock, file_upload_mock, create_reports_same_chart
+):
+    """
+    ExecuteReport Command: Test reports of the same chart share a screenshot
+    and notify all their recipients
+    """
+    screenshot = read_fixture("sample.png")
+    screenshot_mock.return_value = screenshot
+
+    with patch(
+        "superset.reports.commands.execute.thumbnail_cache", SimpleCache()
+    ), freeze_time("2020-01-01T00:00:00Z"):
+        for report_schedule in create_reports_same_chart:
+            AsyncExecuteReportScheduleCommand(
+                report_schedule.id, datetime.utcnow()
+            ).run()
+
+    screenshot_mock.assert_called_once()
+    assert sorted(call[0][0] for call in email_mock.call_args_list) == [
+        "0@email.com",
+        "1@email.com",
+    ]
+    assert sorted(call[1]["channels"] for call in file_upload_mock.call_args_list) == [
+        "#channel0",
+        "#channel1",
+    ]
+    for call in email_mock.call_args_list:
+        assert list(call[1]["images"].values()) == [screenshot]
+
+
+@pytest.mark.usefixtures("create_reports_same_chart")
+@patch("superset.reports.notifications.slack.WebClient.files_upload")
+@patch("superset.reports.notifications.email.send_email_smtp")
+@patch("superset.utils.screenshots.ChartScreenshot.compute_and_cache")
+def test_report_notification_fails(
+    screenshot_mock, email_mock, file_upload_mock, create_reports_same_chart
+):
+    """
+    ExecuteReport Command: Test a failing notification does not prevent the
+    others from being sent
+    """
+    screenshot_mock.return_value = read_fixture("sample.png")
+    file_upload_mock.side_effect = SlackApiError("Failed", {})
+    report_schedule = create_reports_same_chart[0]
+
+    with pytest.raises(ReportScheduleNotificationError):
+        AsyncExecuteReportScheduleCommand(report_schedule.id, datetime.utcnow()).run()
+
+    email_mock.assert_called_once()
+    file_upload_mock.assert_called_once()
+    db.session.commit()
+    db.session.refresh(report_schedule)
+    assert report_schedule.last_state == ReportLogState.ERROR
+
+
+@patch("superset.reports.commands.execute.SCREENSHOT_LOCK_TIMEOUT", 0)
+@patch("superset.utils.screenshots.ChartScreenshot.compute_and_cache")
+def test_report_screenshot_lock_timeout(screenshot_mock):
+    """
+    ExecuteReport Command: Test a report that timed out waiting for the
+    screenshot of another report leaves its lock alone
+    """
+    screenshot_mock.return_value = read_fixture("sample.png")
+    cache = SimpleCache()
+    with patch(
+        "superset.reports.commands.execute.thumbnail_cache", cache
+    ), patch.object(cache, "add", return_value=False), patch.object(
+        cache, "delete"
+    ) as delete_mock, app.app_context():
+        image = AsyncExecuteReportScheduleCommand._compute_screenshot(
+            ChartScreenshot("/chart", "digest"), None
+        )
+    assert image == screenshot_mock.return_value
+    delete_mock.assert_not_called()
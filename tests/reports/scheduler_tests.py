@@ -0,0 +1,92 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from freezegun import freeze_time
+
+from superset import db
+from superset.models.reports import ReportScheduleType
+from superset.models.slice import Slice
+from superset.tasks.scheduler import cron_schedule_window, scheduler
+from tests.reports.utils import insert_report_schedule
+from tests.test_app import app
+
+
+@pytest.yield_fixture()
+def create_report_schedule():
+    with app.app_context():
+        report_schedule = insert_report_schedule(
+            type=ReportScheduleType.REPORT,
+            name="report",
+            crontab="0 9 * * *",
+            chart=db.session.query(Slice).first(),
+        )
+        yield report_schedule
+
+        db.session.delete(report_schedule)
+        db.session.commit()
+
+
+def test_cron_schedule_window():
+    """
+    Scheduler: Test the times a crontab fires within a window
+    """
+    schedules, next_schedule = cron_schedule_window(
+        "*/10 * * * *", datetime(2020, 1, 1, 8, 59), datetime(2020, 1, 1, 9, 30)
+    )
+    assert schedules == [
+        datetime(2020, 1, 1, 9, 0),
+        datetime(2020, 1, 1, 9, 10),
+        datetime(2020, 1, 1, 9, 20),
+    ]
+    assert next_schedule == datetime(2020, 1, 1, 9, 30)
+
+
+@pytest.mark.usefixtures("create_report_schedule")
+@patch("superset.tasks.scheduler.execute.apply_async")
+def test_scheduler_next_eval_dttm(execute_mock, create_report_schedule):
+    """
+    Scheduler: Test only report schedules that are due are scheduled
+    """
+    report_schedule_id = create_report_schedule.id
+    with freeze_time("2020-01-01T08:59:55Z"):
+        scheduler.run()
+    execute_mock.assert_called_once_with(
+        (report_schedule_id, datetime(2020, 1, 1, 9, 0),),
+        eta=datetime(2020, 1, 1, 9, 0),
+    )
+    db.session.expire_all()
+    assert create_report_schedule.next_eval_dttm == datetime(2020, 1, 2, 9, 0)
+
+    # not scheduled again until the next time the crontab fires
+    execute_mock.reset_mock()
+    with freeze_time("2020-01-01T09:00:00Z"):
+        scheduler.run()
+    execute_mock.assert_not_called()
+
+    # changing the crontab clears the next evaluation time
+    create_report_schedule.crontab = "0 10 * * *"
+    db.session.commit()
+    assert create_report_schedule.next_eval_dttm is None
+    with freeze_time("2020-01-01T09:59:55Z"):
+        scheduler.run()
+    execute_mock.assert_called_once_with(
+        (report_schedule_id, datetime(2020, 1, 1, 10, 0),),
+        eta=datetime(2020, 1, 1, 10, 0),
+    )
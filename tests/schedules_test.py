@@ -16,9 +16,10 @@
 # under the License.
 # isort:skip_file
 from datetime import datetime, timedelta
+from io import BytesIO
 from unittest.mock import Mock, patch, PropertyMock
 
-from flask_babel import gettext as __
+import pandas as pd
 import pytest
 from selenium.common.exceptions import WebDriverException
 from slack import errors, WebClient
@@ -33,7 +34,7 @@ from superset.models.schedules import (
     SliceEmailSchedule,
 )
 from superset.tasks.schedules import (
-    create_webdriver,
+    borrow_webdriver,
     deliver_dashboard,
     deliver_slice,
     next_schedules,
@@ -165,16 +166,17 @@ class TestSchedules(SupersetTestCase):
         self.assertEqual(schedules[59], datetime.strptime("2018-03-30 17:40:00", fmt))
         self.assertEqual(schedules[60], datetime.strptime("2018-05-04 17:10:00", fmt))
 
-    @patch("superset.tasks.schedules.firefox.webdriver.WebDriver")
+    @patch("superset.utils.webdriver.firefox.webdriver.WebDriver")
     def test_create_driver(self, mock_driver_class):
         mock_driver = Mock()
         mock_driver_class.return_value = mock_driver
         mock_driver.find_elements_by_id.side_effect = [True, False]
 
-        create_webdriver(db.session)
+        with borrow_webdriver(db.session, (800, 600)):
+            pass
         mock_driver.add_cookie.assert_called_once()
 
-    @patch("superset.tasks.schedules.firefox.webdriver.WebDriver")
+    @patch("superset.utils.webdriver.firefox.webdriver.WebDriver")
     @patch("superset.tasks.schedules.send_email_smtp")
     @patch("superset.tasks.schedules.time")
     def test_deliver_dashboard_inline(self, mtime, send_email_smtp, driver_class):
@@ -207,7 +209,7 @@ class TestSchedules(SupersetTestCase):
         driver.screenshot.assert_not_called()
         send_email_smtp.assert_called_once()
 
-    @patch("superset.tasks.schedules.firefox.webdriver.WebDriver")
+    @patch("superset.utils.webdriver.firefox.webdriver.WebDriver")
     @patch("superset.tasks.schedules.send_email_smtp")
     @patch("superset.tasks.schedules.time")
     def test_deliver_dashboard_as_attachment(
@@ -250,7 +252,7 @@ class TestSchedules(SupersetTestCase):
             element.screenshot_as_png,
         )
 
-    @patch("superset.tasks.schedules.firefox.webdriver.WebDriver")
+    @patch("superset.utils.webdriver.firefox.webdriver.WebDriver")
     @patch("superset.tasks.schedules.send_email_smtp")
     @patch("superset.tasks.schedules.time")
     def test_dashboard_chrome_like(self, mtime, send_email_smtp, driver_class):
@@ -293,7 +295,7 @@ class TestSchedules(SupersetTestCase):
             driver.screenshot.return_value,
         )
 
-    @patch("superset.tasks.schedules.firefox.webdriver.WebDriver")
+    @patch("superset.utils.webdriver.firefox.webdriver.WebDriver")
     @patch("superset.tasks.schedules.send_email_smtp")
     @patch("superset.tasks.schedules.time")
     def test_deliver_email_options(self, mtime, send_email_smtp, driver_class):
@@ -335,7 +337,7 @@ class TestSchedules(SupersetTestCase):
         self.assertEqual(send_email_smtp.call_args[1]["bcc"], self.BCC)
 
     @patch("superset.tasks.slack_util.WebClient.files_upload")
-    @patch("superset.tasks.schedules.firefox.webdriver.WebDriver")
+    @patch("superset.utils.webdriver.firefox.webdriver.WebDriver")
     @patch("superset.tasks.schedules.send_email_smtp")
     @patch("superset.tasks.schedules.time")
     def test_deliver_slice_inline_image(
@@ -388,7 +390,7 @@ class TestSchedules(SupersetTestCase):
         )
 
     @patch("superset.tasks.slack_util.WebClient.files_upload")
-    @patch("superset.tasks.schedules.firefox.webdriver.WebDriver")
+    @patch("superset.utils.webdriver.firefox.webdriver.WebDriver")
     @patch("superset.tasks.schedules.send_email_smtp")
     @patch("superset.tasks.schedules.time")
     def test_deliver_slice_attachment(
@@ -442,17 +444,12 @@ class TestSchedules(SupersetTestCase):
         )
 
     @patch("superset.tasks.slack_util.WebClient.files_upload")
-    @patch("superset.tasks.schedules.urllib.request.OpenerDirector.open")
-    @patch("superset.tasks.schedules.urllib.request.urlopen")
+    @patch("superset.viz.BaseViz.get_df")
     @patch("superset.tasks.schedules.send_email_smtp")
-    def test_deliver_slice_csv_attachment(
-        self, send_email_smtp, mock_open, mock_urlopen, files_upload
-    ):
-        response = Mock()
-        mock_open.return_value = response
-        mock_urlopen.return_value = response
-        mock_urlopen.return_value.getcode.return_value = 200
-        response.read.return_value = self.CSV
+    def test_deliver_slice_csv_attachment(self, send_email_smtp, get_df, files_upload):
+        df = pd.read_csv(BytesIO(self.CSV))
+        get_df.return_value = df
+        csv = df.to_csv(index=False).encode()
 
         schedule = (
             db.session.query(SliceEmailSchedule).filter_by(id=self.slice_schedule).one()
@@ -473,32 +470,27 @@ class TestSchedules(SupersetTestCase):
 
         send_email_smtp.assert_called_once()
 
-        file_name = __("%(name)s.csv", name=schedule.slice.slice_name)
+        file_name = f"{schedule.slice.slice_name}.csv"
 
-        self.assertEqual(send_email_smtp.call_args[1]["data"][file_name], self.CSV)
+        self.assertEqual(send_email_smtp.call_args[1]["data"][file_name], csv)
 
         self.assertEqual(
             files_upload.call_args[1],
             {
                 "channels": "#test_channel",
-                "file": self.CSV,
+                "file": csv,
                 "initial_comment": f"\n        *Participants*\n\n        <http://0.0.0.0:8080/superset/slice/{schedule.slice_id}/|Explore in Superset>\n        ",
                 "title": "[Report]  Participants",
             },
         )
 
     @patch("superset.tasks.slack_util.WebClient.files_upload")
-    @patch("superset.tasks.schedules.urllib.request.urlopen")
-    @patch("superset.tasks.schedules.urllib.request.OpenerDirector.open")
+    @patch("superset.viz.BaseViz.get_df")
     @patch("superset.tasks.schedules.send_email_smtp")
-    def test_deliver_slice_csv_inline(
-        self, send_email_smtp, mock_open, mock_urlopen, files_upload
-    ):
-        response = Mock()
-        mock_open.return_value = response
-        mock_urlopen.return_value = response
-        mock_urlopen.return_value.getcode.return_value = 200
-        response.read.return_value = self.CSV
+    def test_deliver_slice_csv_inline(self, send_email_smtp, get_df, files_upload):
+        df = pd.read_csv(BytesIO(self.CSV))
+        get_df.return_value = df
+        csv = df.to_csv(index=False).encode()
         schedule = (
             db.session.query(SliceEmailSchedule).filter_by(id=self.slice_schedule).one()
         )
@@ -520,12 +512,13 @@ class TestSchedules(SupersetTestCase):
 
         self.assertIsNone(send_email_smtp.call_args[1]["data"])
         self.assertTrue("<table " in send_email_smtp.call_args[0][2])
+        self.assertIn(f"<td>{df.iloc[0, 0]}</td>", send_email_smtp.call_args[0][2])
 
         self.assertEqual(
             files_upload.call_args[1],
             {
                 "channels": "#test_channel",
-                "file": self.CSV,
+                "file": csv,
                 "initial_comment": f"\n        *Participants*\n\n        <http://0.0.0.0:8080/superset/slice/{schedule.slice_id}/|Explore in Superset>\n        ",
                 "title": "[Report]  Participants",
             },
@@ -667,10 +667,13 @@ class TestRolePermission(SupersetTestCase):
         self.assertIn(("can_import_dashboards", "Superset"), perm_set)
         self.assertIn(("can_this_form_post", "CsvToDatabaseView"), perm_set)
         self.assertIn(("can_this_form_get", "CsvToDatabaseView"), perm_set)
+        self.assertIn(("can_this_form_post", "ColumnarToDatabaseView"), perm_set)
+        self.assertIn(("can_this_form_get", "ColumnarToDatabaseView"), perm_set)
         self.assert_can_menu("Manage", perm_set)
         self.assert_can_menu("Annotation Layers", perm_set)
         self.assert_can_menu("CSS Templates", perm_set)
         self.assert_can_menu("Upload a CSV", perm_set)
+        self.assert_can_menu("Upload a Columnar File", perm_set)
         self.assertIn(("all_datasource_access", "all_datasource_access"), perm_set)
 
     def assert_cannot_alpha(self, perm_set):
@@ -15,18 +15,30 @@
 # specific language governing permissions and limitations
 # under the License.
 # isort:skip_file
+import json
 import re
 from typing import Any, Dict, NamedTuple, List, Pattern, Tuple, Union
 from unittest.mock import patch
+import pandas as pd
 import pytest
+from cachelib import SimpleCache
+from pandas.testing import assert_frame_equal
 
 import tests.test_app
-from superset import db
+from superset import app, db
+from superset.common.post_processing import PostProcessingPipeline
 from superset.connectors.sqla.models import SqlaTable, TableColumn
+from superset.connectors.sqla.pushdown import TRANSLATIONS
 from superset.db_engine_specs.druid import DruidEngineSpec
 from superset.exceptions import QueryObjectValidationError
+from superset.extensions import cache_manager
 from superset.models.core import Database
-from superset.utils.core import DbColumnType, get_example_database, FilterOperator
+from superset.utils.core import (
+    DbColumnType,
+    DTTM_ALIAS,
+    FilterOperator,
+    get_example_database,
+)
 
 from .base_tests import SupersetTestCase
 
@@ -165,6 +177,59 @@ class TestDatabaseModel(SupersetTestCase):
             db.session.delete(table)
         db.session.commit()
 
+    def test_values_for_column(self):
+        table = self.get_table_by_name("birth_names")
+        values = table.values_for_column("gender")
+        self.assertEqual(sorted(values), ["boy", "girl"])
+
+        self.assertEqual(table.values_for_column("gender", search="gi"), ["girl"])
+        self.assertEqual(table.values_for_column("gender", search="%"), [])
+        self.assertEqual(table.values_for_column("gender", limit=1, offset=1), ["girl"])
+
+    def test_distinct_values_are_cached(self):
+        from superset.common.distinct_values import get_cache_key, get_distinct_values
+
+        table = self.get_table_by_name("birth_names")
+        cache = {}
+        with patch("superset.common.distinct_values.cache_manager") as cache_manager:
+            cache_manager.data_cache.get.side_effect = cache.get
+            cache_manager.data_cache.set.side_effect = lambda key, value, timeout: cache.update(
+                {key: value}
+            )
+            with patch.object(
+                SqlaTable, "values_for_column", return_value=["boy", "girl"]
+            ) as values_for_column:
+                get_distinct_values(table, "gender")
+                get_distinct_values(table, "gender")
+                self.assertEqual(values_for_column.call_count, 1)
+                get_distinct_values(table, "gender", search="b")
+                self.assertEqual(values_for_column.call_count, 2)
+                get_distinct_values(table, "gender", force=True)
+                self.assertEqual(values_for_column.call_count, 3)
+
+        self.assertNotEqual(
+            get_cache_key(table, "gender"), get_cache_key(table, "name")
+        )
+
+    def test_distinct_values_cache_key_extra_cache_keys(self):
+        from superset.common.distinct_values import get_cache_key
+
+        table = SqlaTable(
+            table_name="test_distinct_values_extra_cache_keys_table",
+            sql="SELECT '{{ url_param(\"country\") }}' AS country",
+            database=get_example_database(),
+        )
+
+        def cache_key(country: str) -> str:
+            form_data = json.dumps({"url_params": {"country": country}})
+            with app.test_request_context(
+                "/superset/filter/", query_string={"form_data": form_data}
+            ):
+                return get_cache_key(table, "country")
+
+        self.assertEqual(cache_key("uk"), cache_key("uk"))
+        self.assertNotEqual(cache_key("uk"), cache_key("us"))
+
     def test_where_operators(self):
         class FilterTestCase(NamedTuple):
             operator: str
@@ -306,3 +371,213 @@ class TestDatabaseModel(SupersetTestCase):
         assert cols["mycase"].expression == ""
         assert VIRTUAL_TABLE_STRING_TYPES[backend].match(cols["mycase"].type)
         assert cols["expr"].expression == "case when 1 then 1 else 0 end"
+
+    def test_post_processing_pushdown(self):
+        database = get_example_database()
+        if database.backend not in ("postgresql", "sqlite"):
+            return
+        table = SqlaTable(
+            table_name="pushdown_table",
+            database=database,
+            sql=(
+                "select 'a' as dept, 'x' as name, 1 as value union all "
+                "select 'a', 'y', 3 union all select 'b', 'z', 2 union all "
+                "select 'b', 'w', null union all select 'a', 'v', 5 union all "
+                "select null, 'u', 7 union all select 'b', 't', 4"
+            ),
+        )
+        for column_name in ("dept", "name", "value"):
+            TableColumn(column_name=column_name, table=table)
+        query_obj = {
+            "granularity": None,
+            "from_dttm": None,
+            "to_dttm": None,
+            "columns": ["dept", "name", "value"],
+            "metrics": [],
+            "is_timeseries": False,
+            "filter": [],
+            "extras": {},
+        }
+        pivot = {
+            "operation": "pivot",
+            "options": {
+                "index": ["dept"],
+                "aggregates": {"value": {"operator": "sum"}},
+            },
+        }
+        pipelines = [
+            [
+                {"operation": "sort", "options": {"columns": {"value": False}}},
+                {
+                    "operation": "cum",
+                    "options": {"columns": {"value": "cum"}, "operator": "sum"},
+                },
+                {"operation": "diff", "options": {"columns": {"value": "diff"}}},
+                {
+                    "operation": "rolling",
+                    "options": {
+                        "columns": {"value": "rolling"},
+                        "rolling_type": "mean",
+                        "window": 2,
+                    },
+                },
+                {
+                    "operation": "select",
+                    "options": {"exclude": ["name"], "rename": {"dept": "team"}},
+                },
+            ],
+            [
+                {
+                    "operation": "aggregate",
+                    "options": {
+                        "groupby": ["dept"],
+                        "aggregates": {
+                            "total": {"column": "value", "operator": "sum"},
+                            "rows": {"column": "name", "operator": "count"},
+                        },
+                    },
+                },
+                {"operation": "sort", "options": {"columns": {"total": False}}},
+            ],
+            # pivot can't be pushed down, nor anything after it
+            [
+                {"operation": "sort", "options": {"columns": {"name": True}}},
+                pivot,
+                {"operation": "sort", "options": {"columns": {"dept": True}}},
+            ],
+        ]
+        remaining = [[], [], pipelines[2][1:]]
+
+        def to_numeric(df: pd.DataFrame) -> pd.DataFrame:
+            # sqlite doesn't type the columns of unions
+            return df.apply(pd.to_numeric, errors="ignore")
+
+        df = to_numeric(table.query(query_obj).df)
+        db_engine_spec = database.db_engine_spec
+        with patch.object(
+            db_engine_spec, "post_processing_pushdown", frozenset(TRANSLATIONS)
+        ):
+            for post_processing, expected_remaining in zip(pipelines, remaining):
+                result = table.query({**query_obj, "post_processing": post_processing})
+                self.assertEqual(result.post_processing, expected_remaining)
+                assert_frame_equal(
+                    PostProcessingPipeline(result.post_processing)
+                    .execute(to_numeric(result.df))
+                    .reset_index(drop=True),
+                    PostProcessingPipeline(post_processing)
+                    .execute(df)
+                    .reset_index(drop=True),
+                    check_dtype=False,
+                )
+
+            # pandas has no cumulative mean, the operation is left to it
+            cum_mean = {
+                "operation": "cum",
+                "options": {"columns": {"value": "cum"}, "operator": "mean"},
+            }
+            result = table.query(
+                {**query_obj, "post_processing": [pipelines[0][0], cum_mean]}
+            )
+            self.assertEqual(result.post_processing, [cum_mean])
+
+        # nothing is pushed down to engines that don't support it
+        result = table.query({**query_obj, "post_processing": pipelines[0]})
+        self.assertEqual(result.post_processing, pipelines[0])
+        assert_frame_equal(to_numeric(result.df), df)
+
+    def test_post_processing_pushdown_converted_timestamp(self):
+        database = get_example_database()
+        if database.backend not in ("postgresql", "sqlite"):
+            return
+        table = SqlaTable(
+            table_name="pushdown_timestamp_table",
+            database=database,
+            sql=(
+                "select '02/01/2020' as ds, 1 as value "
+                "union all select '01/02/2020', 2"
+            ),
+        )
+        ds = TableColumn(
+            column_name="ds",
+            is_dttm=True,
+            type="VARCHAR",
+            python_date_format="%d/%m/%Y",
+            table=table,
+        )
+        TableColumn(column_name="value", type="INTEGER", table=table)
+        sort = {"operation": "sort", "options": {"columns": {DTTM_ALIAS: True}}}
+        query_obj = {
+            "granularity": "ds",
+            "from_dttm": None,
+            "to_dttm": None,
+            "groupby": [],
+            "metrics": [
+                {"label": "count", "expressionType": "SQL", "sqlExpression": "COUNT(*)"}
+            ],
+            "is_timeseries": True,
+            "filter": [],
+            "extras": {},
+            "post_processing": [sort],
+        }
+        with patch.object(
+            database.db_engine_spec, "post_processing_pushdown", frozenset(TRANSLATIONS)
+        ):
+            # the strings don't sort like the dates they are parsed to
+            result = table.query(query_obj)
+            self.assertEqual(result.post_processing, [sort])
+
+            ds.python_date_format = None
+            result = table.query(query_obj)
+            self.assertEqual(result.post_processing, [])
+
+            ds.python_date_format = "%d/%m/%Y"
+            ds.type = "TIMESTAMP"
+            result = table.query(query_obj)
+            self.assertEqual(result.post_processing, [])
+
+    def test_prequery_cache(self):
+        database = get_example_database()
+        if database.backend != "sqlite":
+            return
+        table = SqlaTable(
+            table_name="prequery_table",
+            database=database,
+            sql=(
+                "select '2020-01-01 00:00:00' as ds, 'a' as dept, 1 as value "
+                "union all select '2020-01-02 00:00:00', 'b', 3 "
+                "union all select '2020-01-02 00:00:00', 'c', 2"
+            ),
+        )
+        TableColumn(column_name="ds", is_dttm=True, type="TIMESTAMP", table=table)
+        TableColumn(column_name="dept", type="VARCHAR", table=table)
+        TableColumn(column_name="value", type="INTEGER", table=table)
+        metric = {
+            "label": "sum_value",
+            "expressionType": "SQL",
+            "sqlExpression": "SUM(value)",
+        }
+        query_obj = {
+            "granularity": "ds",
+            "from_dttm": None,
+            "to_dttm": None,
+            "groupby": ["dept"],
+            "metrics": [metric],
+            "is_timeseries": True,
+            "timeseries_limit": 2,
+            "timeseries_limit_metric": metric,
+            "filter": [],
+            "extras": {"time_grain_sqla": "P1D"},
+        }
+        with patch.object(database.db_engine_spec, "allows_joins", False), patch.object(
+            cache_manager, "_data_cache", SimpleCache()
+        ), patch.object(
+            SqlaTable, "_run_query", autospec=True, side_effect=SqlaTable._run_query
+        ) as run_query:
+            first = table.query(query_obj)
+            # a chart that only presents the same top series differently
+            second = table.query({**query_obj, "order_desc": False})
+
+        # the prequery of the second chart came from the cache
+        self.assertEqual(run_query.call_count, 3)
+        self.assertEqual(sorted(first.df["dept"].unique()), ["b", "c"])
+        assert_frame_equal(first.df, second.df)
@@ -23,18 +23,22 @@ from random import random
 from unittest import mock
 
 import prison
+from flask_caching import Cache
 
 import tests.test_app
-from superset import db, security_manager
+from superset import app, db, security_manager
 from superset.connectors.sqla.models import SqlaTable
 from superset.db_engine_specs import BaseEngineSpec
+from superset.extensions import cache_manager
 from superset.models.sql_lab import Query, SavedQuery
 from superset.result_set import SupersetResultSet
 from superset.sql_parse import CtasMethod
+from superset.utils import query_feed
 from superset.utils.core import (
     datetime_to_epoch,
     get_example_database,
     get_main_database,
+    QueryStatus,
 )
 
 from .base_tests import SupersetTestCase
@@ -265,6 +269,65 @@ class TestSqlLab(SupersetTestCase):
         # Redirects to the login page
         self.assertEqual(403, resp.status_code)
 
+    def test_queries_feed_endpoint(self):
+        self.run_some_queries()
+        self.login("admin")
+
+        # without a known version the queries table is always queried
+        data = self.get_json_resp("/superset/queries_feed/?last_updated_ms=0")
+        self.assertIsNone(data["version"])
+        self.assertEqual(2, len(data["queries"]))
+
+        with mock.patch(
+            "superset.utils.query_feed.get_version", return_value=42
+        ) as get_version:
+            data = self.get_json_resp("/superset/queries_feed/?last_updated_ms=0")
+            self.assertEqual(42, data["version"])
+            self.assertEqual(2, len(data["queries"]))
+
+            # unchanged since the last version, nothing to return
+            with mock.patch(
+                "superset.views.core.Superset._get_queries_changed_since"
+            ) as get_queries_changed_since:
+                data = self.get_json_resp(
+                    "/superset/queries_feed/?last_updated_ms=0&version=42"
+                )
+                get_queries_changed_since.assert_not_called()
+            self.assertEqual({"version": 42, "queries": {}}, data)
+
+            get_version.return_value = 43
+            data = self.get_json_resp(
+                "/superset/queries_feed/?last_updated_ms=0&version=42"
+            )
+            self.assertEqual(43, data["version"])
+            self.assertEqual(2, len(data["queries"]))
+
+    def test_queries_feed_version(self):
+        user_id = security_manager.find_user("admin").id
+        cache = Cache(app, config={"CACHE_TYPE": "simple"})
+        with mock.patch.object(cache_manager, "_cache", cache), mock.patch.dict(
+            app.config, {"SQLLAB_QUERIES_FEED": True}
+        ):
+            self.assertIsNone(query_feed.get_version(user_id))
+
+            query = Query(
+                client_id="client_id_feed",
+                database_id=get_example_database().id,
+                sql="SELECT 1",
+                user_id=user_id,
+            )
+            db.session.add(query)
+            db.session.commit()
+            version = query_feed.get_version(user_id)
+            self.assertIsNotNone(version)
+
+            query.status = QueryStatus.SUCCESS
+            db.session.commit()
+            self.assertGreater(query_feed.get_version(user_id), version)
+
+            db.session.delete(query)
+            db.session.commit()
+
     def test_search_query_on_db_id(self):
         self.run_some_queries()
         self.login("admin")
@@ -18,7 +18,10 @@
 """Unit tests for Superset cache warmup"""
 import datetime
 import json
-from unittest.mock import MagicMock
+import time
+from unittest.mock import MagicMock, patch, PropertyMock
+
+from cachelib import SimpleCache
 
 from sqlalchemy import String, Date, Float
 
@@ -30,11 +33,15 @@ from superset.utils.core import get_example_database
 
 from superset import db
 
-from superset.models.core import Log
+from superset.db_engine_specs.base import BaseEngineSpec
+from superset.extensions import cache_manager
+from superset.models.core import Database, Log
 from superset.models.tags import get_tag, ObjectTypes, TaggedObject, TagTypes
 from superset.tasks.cache import (
     DashboardTagsStrategy,
     get_form_data,
+    refresh_datasources_cache,
+    refresh_datasources_caches,
     TopNDashboardsStrategy,
 )
 
@@ -254,3 +261,42 @@ class TestCacheWarmUp(SupersetTestCase):
         result = sorted(strategy.get_urls())
         expected = sorted(tag1_urls + tag2_urls)
         self.assertEqual(result, expected)
+
+    def test_refresh_datasources_cache_by_schema(self):
+        database = get_example_database()
+        table_names = database.get_all_table_names_in_schema(schema="main", cache=False)
+        cache = SimpleCache()
+        with patch.multiple(
+            cache_manager.data_cache,
+            get=cache.get,
+            set=cache.set,
+            set_many=cache.set_many,
+        ), patch.object(
+            Database, "db_engine_spec", new_callable=PropertyMock
+        ) as db_engine_spec:
+            db_engine_spec.return_value = BaseEngineSpec
+            result = refresh_datasources_cache(database.id)
+
+        self.assertEqual(result["database"], database.database_name)
+        self.assertEqual(result["schemas"], 1)
+        self.assertEqual(result["tables"], len(table_names))
+        self.assertEqual(
+            cache.get(f"db:{database.id}:schema:main:table_list"), table_names
+        )
+        self.assertEqual(
+            cache.get(f"db:{database.id}:schema:None:table_list"), table_names
+        )
+
+    def test_refresh_datasources_caches_timeout(self):
+        def refresh(database_id):
+            if database_id == 1:
+                time.sleep(2)
+            return {"database": str(database_id)}
+
+        with patch(
+            "superset.tasks.cache.refresh_datasources_cache", side_effect=refresh
+        ):
+            results = refresh_datasources_caches([1, 2], timeout=1)
+
+        self.assertEqual(results[1], {"error": "Timed out after 1 seconds"})
+        self.assertEqual(results[2], {"database": "2"})
@@ -107,6 +107,9 @@ class CeleryConfig(object):
 
 CELERY_CONFIG = CeleryConfig
 
+# tests mock a new webdriver for every screenshot
+WEBDRIVER_POOL_SIZE = 0
+
 CUSTOM_TEMPLATE_PROCESSORS = {
     CustomPrestoTemplateProcessor.engine: CustomPrestoTemplateProcessor
 }
@@ -17,16 +17,28 @@
 # from superset import db
 # from superset.models.dashboard import Dashboard
 import urllib.request
+from datetime import datetime
 from unittest import skipUnless
 from unittest.mock import patch
 
+from cachelib import SimpleCache
 from flask_testing import LiveServerTestCase
 from sqlalchemy.sql import func
 
 from superset import db, is_feature_enabled, security_manager, thumbnail_cache
+from superset.connectors.sqla.models import SqlaTable
 from superset.extensions import machine_auth_provider_factory
 from superset.models.dashboard import Dashboard
 from superset.models.slice import Slice
+from superset.tasks.thumbnails import (
+    cache_chart_thumbnail,
+    discard_thumbnail_changes,
+    publish_thumbnail_changes,
+    schedule_chart_thumbnail,
+    track_chart_change,
+    track_dashboard_change,
+    update_thumbnails,
+)
 from superset.utils.screenshots import ChartScreenshot, DashboardScreenshot
 from superset.utils.urls import get_url_path
 from tests.test_app import app
@@ -96,11 +108,11 @@ class TestThumbnails(SupersetTestCase):
         self.login(username="admin")
         uri = f"api/v1/dashboard/{dashboard.id}/thumbnail/{dashboard.digest}/"
         with patch(
-            "superset.tasks.thumbnails.cache_dashboard_thumbnail.delay"
-        ) as mock_task:
+            "superset.dashboards.api.schedule_dashboard_thumbnail"
+        ) as mock_schedule:
             rv = self.client.get(uri)
             self.assertEqual(rv.status_code, 202)
-            mock_task.assert_called_with(dashboard.id, force=True)
+            mock_schedule.assert_called_once()
 
     @skipUnless((is_feature_enabled("THUMBNAILS")), "Thumbnails feature")
     def test_get_async_dashboard_notfound(self):
@@ -132,12 +144,10 @@ class TestThumbnails(SupersetTestCase):
         chart = db.session.query(Slice).all()[0]
         self.login(username="admin")
         uri = f"api/v1/chart/{chart.id}/thumbnail/{chart.digest}/"
-        with patch(
-            "superset.tasks.thumbnails.cache_chart_thumbnail.delay"
-        ) as mock_task:
+        with patch("superset.charts.api.schedule_chart_thumbnail") as mock_schedule:
             rv = self.client.get(uri)
             self.assertEqual(rv.status_code, 202)
-            mock_task.assert_called_with(chart.id, force=True)
+            mock_schedule.assert_called_once()
 
     @skipUnless((is_feature_enabled("THUMBNAILS")), "Thumbnails feature")
     def test_get_async_chart_notfound(self):
@@ -215,3 +225,127 @@ class TestThumbnails(SupersetTestCase):
         self.assertRedirects(
             rv, f"api/v1/dashboard/{dashboard.id}/thumbnail/{dashboard.digest}/"
         )
+
+    def test_chart_digest(self):
+        """
+            Thumbnails: Chart digest changes with form data and datasource
+        """
+        table = SqlaTable(table_name="tbl", changed_on=datetime(2020, 1, 1))
+        chart = Slice(params='{"a": 1}', datasource_type="table", table=table)
+        digest = chart.digest
+        self.assertEqual(chart.digest, digest)
+        table.changed_on = datetime(2020, 1, 2)
+        self.assertNotEqual(chart.digest, digest)
+        digest = chart.digest
+        chart.params = '{"a": 2}'
+        self.assertNotEqual(chart.digest, digest)
+
+    def test_dashboard_digest(self):
+        """
+            Thumbnails: Dashboard digest changes with its charts
+        """
+        chart = Slice(params='{"a": 1}', datasource_type="table", table=None)
+        dashboard = Dashboard(position_json="{}", slices=[chart])
+        db.session.add(dashboard)
+        db.session.flush()
+        digest = dashboard.digest
+        self.assertEqual(dashboard.digest, digest)
+        chart.params = '{"a": 2}'
+        self.assertNotEqual(dashboard.digest, digest)
+        db.session.rollback()
+
+    @patch("superset.tasks.thumbnails.update_thumbnails.delay")
+    def test_publish_thumbnail_changes(self, mock_delay):
+        """
+            Thumbnails: Update the thumbnails of the committed changes
+        """
+        chart = Slice(params="{}", datasource_type="table")
+        dashboard = Dashboard(position_json="{}", slices=[chart])
+        session = db.session()
+        session.add(dashboard)
+        session.flush()
+        track_chart_change(None, None, chart)
+        track_dashboard_change(None, None, dashboard)
+        discard_thumbnail_changes(session)
+        publish_thumbnail_changes(session)
+        mock_delay.assert_not_called()
+
+        track_chart_change(None, None, chart)
+        track_dashboard_change(None, None, dashboard)
+        publish_thumbnail_changes(session)
+        mock_delay.assert_called_once_with([chart.id], [dashboard.id])
+
+        # the dashboards of the changed charts are updated as well
+        with patch.object(Slice, "update_thumbnail") as mock_chart, patch.object(
+            Dashboard, "update_thumbnail"
+        ) as mock_dashboard:
+            update_thumbnails([chart.id], [])
+        mock_chart.assert_called_once()
+        mock_dashboard.assert_called_once()
+        session.rollback()
+
+    @patch("superset.utils.screenshots.ChartScreenshot.resize_images")
+    @patch("superset.utils.screenshots.ChartScreenshot.get_screenshot")
+    def test_compute_and_cache_thumb_sizes(self, mock_screenshot, mock_resize):
+        """
+            Thumbnails: Cache every thumbnail size from one screenshot
+        """
+        mock_screenshot.return_value = self.mock_image
+        mock_resize.return_value = {(400, 300): b"small"}
+        cache = SimpleCache()
+        screenshot = ChartScreenshot("/chart", "digest")
+        payload = screenshot.compute_and_cache(cache=cache)
+        self.assertEqual(payload, self.mock_image)
+        mock_screenshot.assert_called_once()
+        mock_resize.assert_called_once_with(self.mock_image, thumb_sizes=[(400, 300)])
+        self.assertEqual(screenshot.get_from_cache(cache).read(), self.mock_image)
+        self.assertEqual(
+            screenshot.get_from_cache(cache, thumb_size=(400, 300)).read(), b"small"
+        )
+
+    @patch("superset.tasks.thumbnails.cache_chart_thumbnail.apply_async")
+    def test_schedule_chart_thumbnail(self, mock_apply_async):
+        """
+            Thumbnails: Schedule a chart thumbnail once per digest
+        """
+        cache = SimpleCache()
+        with patch("superset.tasks.thumbnails.thumbnail_cache", cache):
+            self.assertTrue(schedule_chart_thumbnail("/chart", "digest"))
+            self.assertFalse(schedule_chart_thumbnail("/chart", "digest"))
+            mock_apply_async.assert_called_once_with(
+                kwargs={
+                    "url": "/chart",
+                    "digest": "digest",
+                    "force": False,
+                    "thumb_size": None,
+                },
+                countdown=app.config["THUMBNAIL_DEBOUNCE_SECONDS"],
+            )
+
+            # already cached thumbnails are not computed again
+            mock_apply_async.reset_mock()
+            screenshot = ChartScreenshot("/chart", "cached")
+            cache.set(screenshot.cache_key(), self.mock_image)
+            self.assertFalse(schedule_chart_thumbnail("/chart", "cached"))
+            self.assertTrue(schedule_chart_thumbnail("/chart", "cached", force=True))
+            mock_apply_async.assert_called_once()
+
+    @patch("superset.utils.screenshots.ChartScreenshot.compute_and_cache")
+    @patch("superset.tasks.thumbnails.cache_chart_thumbnail.apply_async")
+    def test_cache_chart_thumbnail_superseded(self, mock_apply_async, mock_compute):
+        """
+            Thumbnails: Skip chart thumbnails of outdated digests
+        """
+        cache = SimpleCache()
+        with patch("superset.tasks.thumbnails.thumbnail_cache", cache):
+            schedule_chart_thumbnail("/chart", "first")
+            schedule_chart_thumbnail("/chart", "second")
+            self.assertEqual(mock_apply_async.call_count, 2)
+
+            cache_chart_thumbnail("/chart", "first")
+            mock_compute.assert_not_called()
+            cache_chart_thumbnail("/chart", "second")
+            mock_compute.assert_called_once()
+
+            # the jobs are done, so the thumbnail can be queued again
+            self.assertTrue(schedule_chart_thumbnail("/chart", "second", force=True))
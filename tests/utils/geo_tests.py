@@ -0,0 +1,84 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import random
+from typing import List
+
+import geohash as geohash_lib
+import numpy as np
+from geopy.point import Point
+
+from superset.utils import geo
+from tests.base_tests import SupersetTestCase
+
+
+def random_geohashes(count: int, max_length: int) -> List[str]:
+    rng = random.Random(42)
+    return [
+        "".join(
+            rng.choice(geo.GEOHASH_ALPHABET) for _ in range(rng.randint(0, max_length))
+        )
+        for _ in range(count)
+    ]
+
+
+class GeoTests(SupersetTestCase):
+    def test_geohash_decode(self):
+        codes = random_geohashes(1000, 30) + ["DR5REGW3PG6F", "s", ""]
+        latitudes, longitudes = geo.geohash_decode(codes)
+        for code, lat, lon in zip(codes, latitudes, longitudes):
+            self.assertEqual((lat, lon), geohash_lib.decode(code))
+
+    def test_geohash_decode_invalid(self):
+        for codes in [["dr5a"], ["d\x00r5"], [None], [1.0], ["dr5é"]]:
+            with self.assertRaises(ValueError):
+                geo.geohash_decode(codes)
+
+    def test_geohash_encode(self):
+        rng = random.Random(42)
+        latitudes = [rng.uniform(-90, 90) for _ in range(1000)] + [-90, 0, 45]
+        longitudes = [rng.uniform(-500, 500) for _ in range(1000)] + [180, -0.0, 540]
+        for precision in [1, 12, 19, 24]:
+            codes = geo.geohash_encode(latitudes, longitudes, precision)
+            for lat, lon, code in zip(latitudes, longitudes, codes):
+                self.assertEqual(code, geohash_lib.encode(lat, lon, precision))
+
+    def test_geohash_encode_invalid(self):
+        with self.assertRaises(ValueError):
+            geo.geohash_encode([90], [0])
+        with self.assertRaises(ValueError):
+            geo.geohash_encode([0], [np.nan])
+
+    def test_parse_points(self):
+        points = [
+            "1.23, 3.21",
+            "1.23 3.21",
+            "-0, -0",
+            "+1.5,-2",
+            "0, 190",
+            "40.71277496, -74.00597306, 5.5km",
+            "40°42′46″N 74°00′21″W",
+        ]
+        df = geo.parse_points(points)
+        self.assertEqual(list(df.columns), ["latitude", "longitude", "altitude"])
+        for point, row in zip(points, df.itertuples(index=False)):
+            self.assertEqual(tuple(row), tuple(Point(point)))
+
+    def test_parse_points_invalid(self):
+        with self.assertRaises(ValueError):
+            geo.parse_points(["1.23, 3.21", "91, 0"])
+        with self.assertRaises(ValueError):
+            geo.parse_points(["1.23, 3.21", "NULL"])
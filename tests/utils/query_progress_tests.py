@@ -0,0 +1,66 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from unittest.mock import MagicMock, patch
+
+from superset.utils.core import QueryStatus
+from superset.utils.query_progress import QueryProgressTracker
+from tests.base_tests import SupersetTestCase
+
+
+class QueryProgressTrackerTests(SupersetTestCase):
+    def get_tracker(self):
+        query = MagicMock(id=1, progress=0, status=QueryStatus.RUNNING)
+        session = MagicMock()
+        return QueryProgressTracker(query, session), query, session
+
+    @patch("superset.utils.query_progress.is_stop_requested", return_value=False)
+    def test_updates_are_coalesced(self, is_stop_requested):
+        tracker, query, session = self.get_tracker()
+        tracker.flush_interval = 60
+
+        # the first update is written right away
+        with tracker.tick():
+            tracker.update(progress=10)
+        self.assertEqual(query.progress, 10)
+        self.assertEqual(session.commit.call_count, 1)
+
+        # following ones are buffered until the interval elapses
+        for progress in (20, 15, 30):
+            with tracker.tick():
+                tracker.update(progress=progress)
+        self.assertEqual(query.progress, 10)
+        self.assertEqual(session.commit.call_count, 1)
+
+        tracker.finish()
+        self.assertEqual(query.progress, 30)
+        self.assertEqual(session.commit.call_count, 2)
+        self.assertEqual(tracker.ticks, 4)
+
+    @patch("superset.utils.query_progress.is_stop_requested", return_value=True)
+    def test_stop_flag(self, is_stop_requested):
+        tracker, query, session = self.get_tracker()
+        self.assertTrue(tracker.should_stop())
+        session.refresh.assert_not_called()
+
+    @patch("superset.utils.query_progress.is_stop_requested", return_value=False)
+    def test_stopped_query_row(self, is_stop_requested):
+        tracker, query, session = self.get_tracker()
+        query.status = QueryStatus.STOPPED
+        with tracker.tick():
+            tracker.update(progress=50)
+        self.assertTrue(tracker.stopped)
+        session.commit.assert_not_called()
@@ -0,0 +1,91 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import builtins
+import os
+import sys
+import tempfile
+import unittest
+
+from superset.utils.startup_profile import StartupProfiler
+
+
+class StartupProfilerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        package = os.path.join(self.tmp_dir.name, "startup_profile_package")
+        os.mkdir(package)
+        with open(os.path.join(package, "__init__.py"), "w") as init:
+            init.write("from .child import DELAY\n")
+        with open(os.path.join(package, "child.py"), "w") as child:
+            child.write("import time\n\nDELAY = 0.05\ntime.sleep(DELAY)\n")
+        sys.path.insert(0, self.tmp_dir.name)
+
+    def tearDown(self):
+        sys.path.remove(self.tmp_dir.name)
+        for name in ("startup_profile_package", "startup_profile_package.child"):
+            sys.modules.pop(name, None)
+        self.tmp_dir.cleanup()
+
+    def test_profile(self):
+        original_import = builtins.__import__
+        profiler = StartupProfiler(enabled=True)
+        with profiler.profile():
+            with profiler.step("import_package"):
+                import startup_profile_package  # pylint: disable=unused-import
+            with profiler.step("import_again"):
+                import startup_profile_package  # pylint: disable=reimported
+        assert builtins.__import__ is original_import
+
+        assert [name for name, _elapsed in profiler.steps] == [
+            "import_package",
+            "import_again",
+        ]
+        assert profiler.steps[0][1] >= 0.05
+        # the relative import of the child is resolved, and its time isn't
+        # counted twice in the package
+        assert set(profiler.modules) == {
+            "startup_profile_package",
+            "startup_profile_package.child",
+        }
+        assert profiler.modules["startup_profile_package.child"] >= 0.05
+        assert profiler.modules["startup_profile_package"] < 0.05
+        report = profiler.report(1)
+        assert "import_package" in report
+        assert "startup_profile_package.child" in report.splitlines()[-1]
+
+    def test_disabled(self):
+        original_import = builtins.__import__
+        profiler = StartupProfiler()
+        with profiler.profile():
+            assert builtins.__import__ is original_import
+            with profiler.step("import_package"):
+                import startup_profile_package  # pylint: disable=unused-import
+        assert profiler.steps == []
+        assert profiler.modules == {}
+
+    def test_start_stop(self):
+        original_import = builtins.__import__
+        profiler = StartupProfiler(enabled=True)
+        profiler.start()
+        # profiling a context doesn't stop the imports timed from before
+        with profiler.profile():
+            pass
+        import startup_profile_package  # pylint: disable=unused-import
+
+        profiler.stop()
+        assert builtins.__import__ is original_import
+        assert "startup_profile_package.child" in profiler.modules
@@ -0,0 +1,117 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from unittest.mock import Mock, patch
+
+from flask_caching import Cache
+
+from superset import app, db
+from superset.extensions import cache_manager
+from superset.utils.core import DatasourceName, get_example_database
+from superset.utils.table_search import (
+    table_name_index_cache,
+    TableNameIndex,
+    TableNameIndexCache,
+)
+from tests.base_tests import SupersetTestCase
+
+NAMES = [
+    DatasourceName("birth_names", "main"),
+    DatasourceName("energy_usage", "main"),
+    DatasourceName("wb_health_population", "main"),
+    DatasourceName("ab_role", "main"),
+    DatasourceName("ab_user", "other"),
+]
+
+
+def get_label(name: DatasourceName) -> str:
+    return f"{name.schema}.{name.table}"
+
+
+class TableNameIndexTests(SupersetTestCase):
+    def test_search(self):
+        index = TableNameIndex(NAMES, get_label)
+        for substr in ["", "a", "ab", "ab_", "_us", "main.ab", "population", "zzz"]:
+            expected = sorted(
+                [name for name in NAMES if substr in get_label(name)], key=get_label
+            )
+            self.assertEqual(index.search(substr), expected)
+            self.assertEqual(index.count(substr), len(expected))
+
+    def test_search_limit(self):
+        index = TableNameIndex(NAMES, get_label)
+        self.assertEqual(
+            index.search("ab", limit=1), [DatasourceName("ab_role", "main")]
+        )
+        self.assertEqual(len(index.search(None, limit=2)), 2)
+
+    def test_cache(self):
+        cache = TableNameIndexCache(max_entries=2)
+        loader = Mock(return_value=TableNameIndex(NAMES, get_label))
+
+        cache.get((1, None, "table"), loader, timeout=60)
+        cache.get((1, None, "table"), loader, timeout=60)
+        self.assertEqual(loader.call_count, 1)
+
+        cache.get((1, None, "table"), loader, timeout=60, force=True)
+        self.assertEqual(loader.call_count, 2)
+
+        cache.invalidate(1)
+        cache.get((1, None, "table"), loader, timeout=60)
+        self.assertEqual(loader.call_count, 3)
+
+        # least recently used entries are evicted
+        cache.get((2, None, "table"), loader, timeout=60)
+        cache.get((3, None, "table"), loader, timeout=60)
+        cache.get((1, None, "table"), loader, timeout=60)
+        self.assertEqual(loader.call_count, 6)
+
+    def test_cache_invalidated_across_processes(self):
+        # the indexes of two processes sharing a cache
+        first, second = TableNameIndexCache(), TableNameIndexCache()
+        loader = Mock(return_value=TableNameIndex(NAMES, get_label))
+        key = (1, None, "table")
+        with patch.object(
+            cache_manager, "_cache", Cache(app, config={"CACHE_TYPE": "simple"})
+        ):
+            first.get(key, loader, timeout=60)
+            second.get(key, loader, timeout=60)
+            self.assertEqual(loader.call_count, 2)
+
+            first.invalidate(1)
+            second.get(key, loader, timeout=60)
+            self.assertEqual(loader.call_count, 3)
+            second.get(key, loader, timeout=60)
+            self.assertEqual(loader.call_count, 3)
+
+            second.get(key, loader, timeout=60, force=True)
+            first.get(key, loader, timeout=60)
+            self.assertEqual(loader.call_count, 5)
+
+    def test_cache_invalidated_on_database_update(self):
+        database = get_example_database()
+        loader = Mock(return_value=TableNameIndex(NAMES, get_label))
+        key = (database.id, None, "table")
+
+        table_name_index_cache.get(key, loader, timeout=60)
+        verbose_name = database.verbose_name
+        database.verbose_name = "table search"
+        db.session.commit()
+        table_name_index_cache.get(key, loader, timeout=60)
+        self.assertEqual(loader.call_count, 2)
+
+        database.verbose_name = verbose_name
+        db.session.commit()
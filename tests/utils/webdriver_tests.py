@@ -0,0 +1,89 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from unittest.mock import Mock, patch
+
+from superset.utils.webdriver import WebDriverPool
+from tests.base_tests import SupersetTestCase
+
+
+@patch("superset.utils.webdriver.machine_auth_provider_factory")
+@patch("superset.utils.webdriver.firefox.webdriver.WebDriver")
+class WebDriverPoolTests(SupersetTestCase):
+    def get_pool(self, size=1, max_uses=10):
+        pool = WebDriverPool("firefox")
+        pool.size = size
+        pool.max_uses = max_uses
+        pool._slots = None
+        return pool
+
+    def screenshot(self, pool, user):
+        with pool.borrow(user, (800, 600)) as driver:
+            return driver
+
+    def test_sessions_are_reused(self, driver_class, auth_factory):
+        driver_class.side_effect = lambda **kwargs: Mock()
+        authenticate = auth_factory.instance.authenticate_webdriver
+        pool = self.get_pool()
+        admin, alpha = Mock(id=1), Mock(id=2)
+
+        driver = self.screenshot(pool, admin)
+        self.assertIs(self.screenshot(pool, admin), driver)
+        self.assertEqual(driver_class.call_count, 1)
+        # the cookies of the user are kept
+        self.assertEqual(authenticate.call_count, 1)
+        driver.delete_all_cookies.assert_not_called()
+
+        # the session is authenticated again for another user
+        self.assertIs(self.screenshot(pool, alpha), driver)
+        self.assertEqual(authenticate.call_count, 2)
+        driver.delete_all_cookies.assert_called_once()
+        driver.quit.assert_not_called()
+
+    def test_sessions_are_recycled(self, driver_class, auth_factory):
+        driver_class.side_effect = lambda **kwargs: Mock()
+        pool = self.get_pool(max_uses=2)
+        user = Mock(id=1)
+
+        driver = self.screenshot(pool, user)
+        self.assertIs(self.screenshot(pool, user), driver)
+        driver.quit.assert_called_once()
+        self.assertIsNot(self.screenshot(pool, user), driver)
+
+    def test_broken_sessions_are_closed(self, driver_class, auth_factory):
+        driver_class.side_effect = lambda **kwargs: Mock()
+        pool = self.get_pool()
+        user = Mock(id=1)
+
+        with self.assertRaises(ValueError):
+            with pool.borrow(user, (800, 600)) as driver:
+                raise ValueError()
+        driver.quit.assert_called_once()
+
+        # unresponsive sessions are not lent
+        driver = self.screenshot(pool, user)
+        type(driver).current_url = property(Mock(side_effect=Exception))
+        self.assertIsNot(self.screenshot(pool, user), driver)
+        driver.quit.assert_called_once()
+
+    def test_no_pool(self, driver_class, auth_factory):
+        driver_class.side_effect = lambda **kwargs: Mock()
+        pool = self.get_pool(size=0)
+        user = Mock(id=1)
+
+        driver = self.screenshot(pool, user)
+        driver.quit.assert_called_once()
+        self.assertIsNot(self.screenshot(pool, user), driver)
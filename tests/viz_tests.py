@@ -794,6 +794,29 @@ class TestPartitionViz(SupersetTestCase):
         self.assertEqual(1, len(nest[0]["children"][0]["children"]))
         self.assertEqual(1, len(nest[0]["children"][0]["children"][0]["children"]))
 
+    def test_nest_values_lists_descendants_only(self):
+        df = pd.DataFrame(
+            {
+                "groupA": ["a1", "a1", "a1", "b1"],
+                "groupB": ["a2", "a2", "b2", "a2"],
+                "groupC": ["a3", "b3", "a3", "a3"],
+                "metric1": [1, 2, 3, 4],
+            }
+        )
+        test_viz = viz.PartitionViz(Mock(), {})
+        groups = ["groupA", "groupB", "groupC"]
+        nest = test_viz.nest_values(test_viz.levels_for("agg_sum", groups, df))
+        a1 = nest[0]["children"][0]
+        self.assertEqual(6, a1["val"])
+        self.assertEqual(
+            [("a1", "a2", "a3"), ("a1", "a2", "b3")],
+            [node["name"] for node in a1["children"][0]["children"]],
+        )
+        self.assertEqual(
+            [("a1", "b2", "a3")],
+            [node["name"] for node in a1["children"][1]["children"]],
+        )
+
     def test_nest_procs_returns_hierarchy(self):
         raw = {}
         raw[DTTM_ALIAS] = [100, 200, 300, 100, 200, 300, 100, 200, 300]
@@ -873,6 +896,52 @@ class TestPartitionViz(SupersetTestCase):
         self.assertEqual(7, len(test_viz.nest_values.mock_calls))
 
 
+class TestTreemapViz(SupersetTestCase):
+    def test_get_data(self):
+        df = pd.DataFrame(
+            {
+                "groupA": ["a1", "a1", "b1"],
+                "groupB": ["a2", "b2", "a2"],
+                "groupC": ["a3", "a3", "b3"],
+                "metric1": [1, 2, 3],
+            }
+        )
+        form_data = {"groupby": ["groupA", "groupB", "groupC"]}
+        data = viz.TreemapViz(Mock(), form_data).get_data(df)
+        self.assertEqual(
+            [
+                {
+                    "name": "metric1",
+                    "children": [
+                        {
+                            "name": "a1",
+                            "children": [
+                                {
+                                    "name": "a2",
+                                    "children": [{"name": "a3", "value": 1}],
+                                },
+                                {
+                                    "name": "b2",
+                                    "children": [{"name": "a3", "value": 2}],
+                                },
+                            ],
+                        },
+                        {
+                            "name": "b1",
+                            "children": [
+                                {
+                                    "name": "a2",
+                                    "children": [{"name": "b3", "value": 3}],
+                                }
+                            ],
+                        },
+                    ],
+                }
+            ],
+            data,
+        )
+
+
 class TestRoseVis(SupersetTestCase):
     def test_rose_vis_get_data(self):
         raw = {}
@@ -1081,6 +1150,41 @@ class TestBaseDeckGLViz(SupersetTestCase):
         with self.assertRaises(SpatialException):
             test_viz_deckgl.parse_coordinates("fldkjsalkj,fdlaskjfjadlksj")
 
+    def test_process_spatial_data_obj(self):
+        form_data = load_fixture("deck_path_form_data.json")
+        form_data["delimited"] = {"type": "delimited", "lonlatCol": "lonlat"}
+        form_data["geohash"] = {"type": "geohash", "geohashCol": "code"}
+        datasource = self.get_datasource_mock()
+        test_viz_deckgl = viz.BaseDeckGLViz(datasource, form_data)
+        df = pd.DataFrame(
+            {
+                "lonlat": ["1.23, 3.21", None, "40°42′46″N 74°00′21″W"],
+                "code": ["dr5regw3pg6f", "s", "r3gx2u9qdevk"],
+            }
+        )
+        df = test_viz_deckgl.process_spatial_data_obj("delimited", df)
+        df = test_viz_deckgl.process_spatial_data_obj("geohash", df)
+        self.assertEqual(list(df.columns), ["delimited", "geohash"])
+        self.assertEqual(
+            df["delimited"].tolist(),
+            [
+                test_viz_deckgl.parse_coordinates(value)
+                for value in ["1.23, 3.21", None, "40°42′46″N 74°00′21″W"]
+            ],
+        )
+        self.assertEqual(
+            df["geohash"].tolist(),
+            [
+                test_viz_deckgl.reverse_geohash_decode(value)
+                for value in ["dr5regw3pg6f", "s", "r3gx2u9qdevk"]
+            ],
+        )
+
+        df = pd.DataFrame({"lonlat": ["1.23, 3.21", "NULL"]})
+        with self.assertRaises(SpatialException) as context:
+            test_viz_deckgl.process_spatial_data_obj("delimited", df)
+        self.assertIn("NULL", str(context.exception))
+
     @patch("superset.utils.core.uuid.uuid4")
     def test_filter_nulls(self, mock_uuid4):
         mock_uuid4.return_value = uuid.UUID("12345678123456781234567812345678")